@@ -0,0 +1,15 @@
+"""Run the scaffold validation toolkit from the repository root.
+
+Usage: python scripts/validate.py <command> [options]
+"""
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tests"))
+
+from scaffold_validation.cli import main  # noqa: E402
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""Shared helpers for the unit tests."""
+
+import os
+from pathlib import Path
+
+
+def write(path: Path, text: str = "# Title\n", mtime_ns: int | None = None) -> None:
+    """Write ``text`` to ``path``, creating parent directories; optionally backdate it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
@@ -0,0 +1,9 @@
+"""Shared validation toolkit for the scaffold test suite.
+
+Test modules import from here so the tree is walked, read and tokenized
+once per process. The same engine backs the ``scripts/validate.py`` CLI.
+"""
+
+from scaffold_validation.corpus import Corpus, Document, load_corpus
+
+__all__ = ["Corpus", "Document", "load_corpus"]
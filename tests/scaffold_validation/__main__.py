@@ -0,0 +1,6 @@
+import sys
+
+from scaffold_validation.cli import main
+
+
+sys.exit(main())
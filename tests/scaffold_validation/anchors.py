@@ -0,0 +1,54 @@
+"""GitHub-compatible heading slugs for fragment (``#anchor``) validation.
+
+Slugs follow GitHub's renderer: inline markup is reduced to its text, the
+result is lowercased, everything except letters, digits, ``_``, ``-`` and
+spaces is dropped, and spaces become hyphens. Repeated slugs in one file
+get ``-1``, ``-2``... suffixes in document order. Explicit HTML anchors
+(``<a name="...">`` / ``id="..."``) are indexed as written.
+"""
+
+import re
+from typing import Iterable
+
+from scaffold_validation.tokenizer import Heading
+
+
+INLINE_LINK_PATTERN = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+HTML_TAG_PATTERN = re.compile(r"<[^<>]*>")
+HTML_ANCHOR_PATTERN = re.compile(r"<a\s[^<>]*?\b(?:name|id)\s*=\s*[\"']([^\"']+)[\"']", re.IGNORECASE)
+SLUG_DROP_PATTERN = re.compile(r"[^\w\- ]", re.UNICODE)
+
+
+def github_slug(text: str) -> str:
+    text = INLINE_LINK_PATTERN.sub(r"\1", text)
+    text = HTML_TAG_PATTERN.sub("", text)
+    return SLUG_DROP_PATTERN.sub("", text.strip().lower()).replace(" ", "-")
+
+
+class Slugger:
+    """Slugs for one file's headings in order, with GitHub's duplicate suffixes.
+
+    ``seen`` holds every slug issued so far.
+    """
+
+    def __init__(self) -> None:
+        self.seen: dict[str, int] = {}
+
+    def __call__(self, text: str) -> str:
+        base = github_slug(text)
+        slug = base
+        while slug in self.seen:
+            self.seen[base] += 1
+            slug = f"{base}-{self.seen[base]}"
+        self.seen.setdefault(slug, 0)
+        return slug
+
+
+def heading_slugs(headings: Iterable[Heading]) -> list[str]:
+    """Slugs for ``headings`` in order, with GitHub's duplicate suffixes."""
+    slugger = Slugger()
+    return [slugger(heading.text) for heading in headings]
+
+
+def html_anchors(text: str) -> list[str]:
+    return HTML_ANCHOR_PATTERN.findall(text)
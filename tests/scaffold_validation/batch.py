@@ -0,0 +1,203 @@
+"""Validate many repositories in one process pool.
+
+Downstream projects created from the scaffolds each run the validators in
+their own CI job, paying interpreter start-up, imports and regex
+compilation every time. ``validate_repositories`` instead splits every
+root into the same scaffold and document-chunk tasks ``validate_tree``
+uses and feeds them all to a single pool: worker processes import the
+check modules once, so the fixed cost is paid per worker rather than per
+repository. Tasks are queued repository by repository, and a worker holds
+only the corpus and manifest of the repository it is on. The process-wide
+``load_corpus``/``load_manifest`` caches are never touched, so a batch
+always sees the trees as they are now.
+
+Each repository's report is merged exactly as ``validate_tree`` would
+merge it, so a batch entry matches a standalone run. Timings are the
+worker seconds spent on that repository's tasks.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+import time
+from typing import Any, Callable, Iterable
+
+from scaffold_validation.corpus import Corpus
+from scaffold_validation.manifest import Manifest, read_manifest
+from scaffold_validation.parallel import (
+    DEFAULT_CHUNK_SIZE,
+    Report,
+    Task,
+    TaskResult,
+    default_jobs,
+    document_results,
+    format_report,
+    merge,
+    plan_tasks,
+    scaffold_results,
+)
+
+
+@dataclass
+class RepositoryResult:
+    root: str
+    report: Report
+    scaffolds: int
+    documents: int
+    seconds: float
+    # Set when the root could not be validated at all.
+    error: str = ""
+
+    @property
+    def failures(self) -> list[str]:
+        return [self.error] if self.error else format_report(self.report)
+
+
+@dataclass
+class BatchReport:
+    repositories: list[RepositoryResult]
+    jobs: int
+    # Wall time for the whole batch; compare with the summed worker seconds.
+    seconds: float
+
+    @property
+    def failing(self) -> list[RepositoryResult]:
+        return [repository for repository in self.repositories if repository.failures]
+
+    @property
+    def worker_seconds(self) -> float:
+        return sum(repository.seconds for repository in self.repositories)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "jobs": self.jobs,
+            "seconds": round(self.seconds, 6),
+            "worker_seconds": round(self.worker_seconds, 6),
+            "repositories": [
+                {
+                    "root": repository.root,
+                    "error": repository.error,
+                    "scaffolds": repository.scaffolds,
+                    "documents": repository.documents,
+                    "seconds": round(repository.seconds, 6),
+                    "failures": {
+                        check: failures
+                        for check, failures in repository.report.items()
+                        if failures
+                    },
+                }
+                for repository in self.repositories
+            ],
+        }
+
+
+def read_root_list(path: Path) -> list[Path]:
+    """One repository root per line; blanks and ``#`` comments are skipped.
+
+    Relative roots are resolved against the list file's directory.
+    """
+    roots: list[Path] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        entry = line.split("#", 1)[0].strip()
+        if entry:
+            roots.append((path.parent / entry).resolve())
+    return roots
+
+
+# The repository this process is working on. The pool dispatches tasks in
+# submission order, so once a worker takes a task for the next repository
+# every task of the previous one has been handed out; replacing the entry
+# then drops that corpus as soon as its last task here has finished.
+_current: tuple[str, Corpus, Manifest] | None = None
+
+
+def _repository(root: str) -> tuple[Corpus, Manifest]:
+    global _current
+    if _current is None or _current[0] != root:
+        _current = None  # Let the previous corpus go before reading the next.
+        corpus = Corpus(Path(root))
+        _current = (root, corpus, read_manifest(corpus.root, corpus))
+    return _current[1], _current[2]
+
+
+def _timed_task(
+    kind: str, root: str, subject: str | tuple[str, ...]
+) -> tuple[TaskResult, float]:
+    started = time.perf_counter()
+    corpus, manifest = _repository(root)
+    if kind == "scaffold":
+        result = scaffold_results(corpus, manifest, subject)
+    else:
+        result = document_results(corpus, subject)
+    return result, time.perf_counter() - started
+
+
+def _plan(root: Path, chunk_size: int) -> tuple[Path, list[Task], str]:
+    root = root.resolve()
+    if not root.is_dir():
+        return root, [], f"{root} is not a directory"
+    try:
+        return root, plan_tasks(*_repository(str(root)), chunk_size), ""
+    except (OSError, ValueError) as error:
+        return root, [], f"{root}: {error}"
+
+
+def _collect(
+    root: Path, tasks: list[Task], error: str, outcomes: Iterable[Callable[[], Any]]
+) -> RepositoryResult:
+    """Merge one repository's results; each outcome returns its task's result or raises."""
+    results: list[TaskResult] = []
+    seconds = 0.0
+    for task, outcome in zip(tasks, outcomes):
+        try:
+            result, elapsed = outcome()
+        except Exception as exception:
+            error = error or f"{root}: {task[0]} task failed: {exception!r}"
+            continue
+        results.append(result)
+        seconds += elapsed
+    return RepositoryResult(
+        str(root),
+        merge(results),
+        sum(1 for task in tasks if task[0] == "scaffold"),
+        sum(len(task[2]) for task in tasks if task[0] == "document"),
+        seconds,
+        error,
+    )
+
+
+def validate_repositories(
+    roots: Iterable[Path], jobs: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> BatchReport:
+    """Validate every root with one shared pool; results follow the order of ``roots``.
+
+    A root that is missing, whose manifest cannot be read, or whose tasks
+    raise, is reported with an error instead of aborting the batch.
+    """
+    global _current
+    started = time.perf_counter()
+    jobs = default_jobs() if jobs is None else jobs
+    repositories: list[RepositoryResult] = []
+    try:
+        if jobs <= 1:
+            # Plan and run each repository in turn, so only one corpus is alive.
+            for root in roots:
+                root, tasks, error = _plan(root, chunk_size)
+                outcomes = (partial(_timed_task, *task) for task in tasks)
+                repositories.append(_collect(root, tasks, error, outcomes))
+        else:
+            plans = []
+            for root in roots:
+                plans.append(_plan(root, chunk_size))
+                _current = None
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                submitted = [
+                    [pool.submit(_timed_task, *task) for task in tasks] for _, tasks, _ in plans
+                ]
+                for (root, tasks, error), futures in zip(plans, submitted):
+                    outcomes = (future.result for future in futures)
+                    repositories.append(_collect(root, tasks, error, outcomes))
+    finally:
+        _current = None
+    return BatchReport(repositories, jobs, time.perf_counter() - started)
@@ -0,0 +1,305 @@
+"""Benchmarks for the validation engine on synthetic scaffold trees."""
+
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import multiprocessing
+from pathlib import Path
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Iterable
+
+from scaffold_validation import checks
+from scaffold_validation.corpus import READ_CHUNK_SIZE, Corpus, load_corpus
+from scaffold_validation.history import collect, weekly_metrics
+from scaffold_validation.parallel import default_jobs, validate_tree
+from scaffold_validation.stream import scan_failures
+from scaffold_validation.synthetic import (
+    FAULTS,
+    LOG_SHAPES,
+    generate_tree,
+    inject_faults,
+    write_history,
+    write_log,
+)
+from scaffold_validation.tokenizer import Token, tokenize
+
+
+def _job_counts() -> list[int]:
+    counts = [1]
+    while counts[-1] * 2 <= default_jobs():
+        counts.append(counts[-1] * 2)
+    if counts[-1] != default_jobs():
+        counts.append(default_jobs())
+    return counts
+
+
+def parallel_speedup(
+    scaffolds: int = 200, jobs: list[int] | None = None, paragraphs: int = 8
+) -> list[dict[str, float]]:
+    """Time ``validate_tree`` per worker count on one synthetic tree.
+
+    Every run starts from an empty corpus so forked workers do not inherit
+    the parent's parsed documents. Raises if any report differs from serial.
+    """
+    rows: list[dict[str, float]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        generate_tree(root, scaffolds, paragraphs)
+        baseline = None
+        serial_seconds = 0.0
+        for count in jobs or _job_counts():
+            load_corpus.cache_clear()
+            started = time.perf_counter()
+            report = validate_tree(root, jobs=count)
+            seconds = time.perf_counter() - started
+            if baseline is None:
+                baseline, serial_seconds = report, seconds
+            elif report != baseline:
+                raise AssertionError(f"report with {count} jobs differs from the first run")
+            rows.append(
+                {"jobs": count, "seconds": seconds, "speedup": serial_seconds / seconds}
+            )
+    load_corpus.cache_clear()
+    return rows
+
+
+LEGACY_FENCE_PATTERN = re.compile(r"```[\s\S]*?```", re.MULTILINE)
+LEGACY_LINK_PATTERN = re.compile(r"\[[^\]]*\]\(([^)]+)\)")
+
+PATHOLOGICAL_INPUTS: dict[str, Callable[[int], str]] = {
+    "open-brackets": lambda size: "[" * size,
+    "unclosed-targets": lambda size: "[a](" * (size // 4),
+    "unterminated-fence": lambda size: "```\n" + "`` [x](y\n" * (size // 9),
+    "placeholder-braces": lambda size: "{" * size,
+    "well-formed": lambda size: "## Heading\n\nSee [guide](guide.md).\n\n" * (size // 40),
+}
+
+
+def _legacy_links(text: str) -> list[str]:
+    return LEGACY_LINK_PATTERN.findall(LEGACY_FENCE_PATTERN.sub("", text))
+
+
+def _tokenize(text: str) -> list[Token]:
+    return list(tokenize(text.splitlines()))
+
+
+def tokenizer_stress(
+    sizes: list[int], include_legacy: bool = True
+) -> list[dict[str, float | str]]:
+    """Time the tokenizer (and optionally the old regex scan) per input shape."""
+    rows: list[dict[str, float | str]] = []
+    for shape, build in PATHOLOGICAL_INPUTS.items():
+        for size in sizes:
+            text = build(size)
+            row: dict[str, float | str] = {"shape": shape, "bytes": len(text)}
+            started = time.perf_counter()
+            _tokenize(text)
+            row["tokenizer_seconds"] = time.perf_counter() - started
+            if include_legacy:
+                started = time.perf_counter()
+                _legacy_links(text)
+                row["legacy_seconds"] = time.perf_counter() - started
+            rows.append(row)
+    return rows
+
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+
+def validator_names() -> list[str]:
+    return [*checks.TREE_CHECKS, *checks.SCAFFOLD_CHECKS]
+
+
+def peak_rss_kib() -> int:
+    """Peak resident set size of this process in KiB (0 where unsupported)."""
+    if resource is None:  # pragma: no cover - Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_validator(root: str, name: str) -> dict[str, Any]:
+    """Run one validator over the whole tree from a cold corpus.
+
+    Files and bytes are what the validator actually pulled through the
+    corpus, so throughput reflects its real I/O footprint.
+    """
+    corpus = Corpus(Path(root))
+    started = time.perf_counter()
+    if name in checks.TREE_CHECKS:
+        check = checks.TREE_CHECKS[name]
+        failures = [
+            failure
+            for path in corpus.markdown_paths()
+            for failure in check(corpus, corpus.document(path))
+        ]
+    else:
+        scaffold_check = checks.SCAFFOLD_CHECKS[name]
+        failures = [
+            failure
+            for scaffold in corpus.scaffold_names()
+            for failure in scaffold_check(corpus, scaffold)
+        ]
+    seconds = time.perf_counter() - started
+    return {
+        "validator": name,
+        "files": corpus.files_read,
+        "bytes": corpus.bytes_read,
+        "seconds": seconds,
+        "files_per_second": corpus.files_read / seconds if seconds else 0.0,
+        "bytes_per_second": corpus.bytes_read / seconds if seconds else 0.0,
+        "peak_rss_kib": peak_rss_kib(),
+        "failures": len(failures),
+    }
+
+
+def validator_throughput(
+    root: Path, validators: list[str] | None = None, isolate: bool = True
+) -> list[dict[str, Any]]:
+    """Benchmark each validator on ``root``.
+
+    With ``isolate`` every validator runs in a freshly spawned interpreter,
+    so its peak RSS is its own rather than the high-water mark of the ones
+    before it.
+    """
+    rows: list[dict[str, Any]] = []
+    for name in validators or validator_names():
+        if not isolate:
+            rows.append(run_validator(str(root), name))
+            continue
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            rows.append(pool.submit(run_validator, str(root), name).result())
+    return rows
+
+
+def synthetic_throughput(
+    scaffolds: int = 700,
+    paragraphs: int = 8,
+    faults: dict[str, int] | None = None,
+    seed: int = 0,
+    validators: list[str] | None = None,
+    isolate: bool = True,
+) -> list[dict[str, Any]]:
+    """``validator_throughput`` on a generated tree with injected faults.
+
+    Raises if a validator reports fewer failures than were injected for it.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        names = generate_tree(root, scaffolds, paragraphs)
+        injected = inject_faults(root, names, faults or {}, seed)
+        rows = validator_throughput(root, validators, isolate)
+
+    for row in rows:
+        expected = sum(1 for fault in injected if FAULTS[fault.kind] == row["validator"])
+        if row["failures"] < expected:
+            raise AssertionError(
+                f"{row['validator']} reported {row['failures']} failure(s) "
+                f"for {expected} injected fault(s)"
+            )
+    return rows
+
+
+LOG_NAME = "implementation-log.md"
+
+
+def scan_log(root: str, mode: str, chunk_size: int) -> dict[str, Any]:
+    """Run the tree checks on ``LOG_NAME`` by loading it (``"load"``) or streaming it."""
+    corpus = Corpus(Path(root))
+    path = corpus.root / LOG_NAME
+    started = time.perf_counter()
+    if mode == "load":
+        document = corpus.document(path)
+        failures = {name: check(corpus, document) for name, check in checks.TREE_CHECKS.items()}
+    else:
+        failures = scan_failures(corpus, path, chunk_size)
+    return {
+        "mode": mode,
+        "seconds": time.perf_counter() - started,
+        "peak_rss_kib": peak_rss_kib(),
+        "failures": failures,
+    }
+
+
+def stream_memory(
+    sizes_mib: list[int],
+    chunk_size: int = READ_CHUNK_SIZE,
+    shapes: Iterable[str] = LOG_SHAPES,
+) -> list[dict[str, Any]]:
+    """Peak RSS and time of loading versus streaming one log per size and shape.
+
+    Every measurement runs in a freshly spawned interpreter. Raises if the
+    two modes report different failures.
+    """
+    rows: list[dict[str, Any]] = []
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for size, shape in itertools.product(sizes_mib, shapes):
+            write_log(root / LOG_NAME, size * 1024 * 1024, shape)
+            results = {}
+            for mode in ("load", "stream"):
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    results[mode] = pool.submit(scan_log, str(root), mode, chunk_size).result()
+            if results["load"]["failures"] != results["stream"]["failures"]:
+                raise AssertionError(
+                    f"streamed failures differ from loaded ones at {size} MiB ({shape})"
+                )
+            for result in results.values():
+                rows.append(
+                    {
+                        "mib": size,
+                        "shape": shape,
+                        "mode": result["mode"],
+                        "seconds": result["seconds"],
+                        "peak_rss_kib": result["peak_rss_kib"],
+                        "failures": sum(len(found) for found in result["failures"].values()),
+                    }
+                )
+    return rows
+
+
+def history_collection(changes: int, new_changes: int = 10) -> list[dict[str, Any]]:
+    """Time a full collection, an incremental one and the weekly metrics.
+
+    The synthetic repository's branch is first rewound by ``new_changes``
+    first-parent commits, collected, then restored and collected again.
+    """
+    rows: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        repository = Path(tmp) / "repository"
+        commits = write_history(repository, changes)
+        checkpoint = Path(tmp) / "history.bin"
+        head = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=repository, capture_output=True, check=True
+        ).stdout.decode("ascii").strip()
+
+        def move(target: str) -> None:
+            subprocess.run(["git", "update-ref", "HEAD", target], cwd=repository, check=True)
+
+        move(f"HEAD~{new_changes}")
+        for target in (None, head, None):
+            if target:
+                move(target)
+            collection = collect(repository, checkpoint)
+            rows.append(
+                {
+                    "phase": collection.mode,
+                    "commits": collection.new_commits,
+                    "seconds": collection.seconds,
+                }
+            )
+        started = time.perf_counter()
+        weeks = weekly_metrics(collection.history)
+        rows.append(
+            {"phase": "metrics", "commits": commits, "seconds": time.perf_counter() - started}
+        )
+        rows[-1]["weeks"] = len(weeks)
+    return rows
@@ -0,0 +1,282 @@
+"""Persistent incremental cache for per-file validation results.
+
+Results are keyed by the file's SHA-256 and by a validator version derived
+from the source of the check modules, so editing a check invalidates every
+entry while editing one guide invalidates only that guide. A ``(mtime_ns,
+size)`` signature short-circuits hashing for files that have not been
+touched since the last run.
+
+Cross-file checks cache only what is a pure function of file content (the
+extracted link targets, the README text) and re-evaluate their dependencies
+(target existence, the list of numbered guides) on every run.
+
+Markdown files over ``corpus.stream_threshold`` are never loaded: they are
+hashed in chunks and checked with ``stream.scan_failures``, one pass per
+file serving every tree check. Their link and anchor failures are taken
+from that pass directly rather than cached, since they depend on other
+files.
+"""
+
+from functools import lru_cache
+import hashlib
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any, Callable
+
+from scaffold_validation import anchors, checks, corpus as corpus_module, stream, tokenizer
+from scaffold_validation.corpus import READ_CHUNK_SIZE, REPO_ROOT, Corpus, load_corpus
+
+
+CACHE_ENV = "SCAFFOLD_VALIDATION_CACHE"
+CACHE_SCHEMA = "1"
+DEFAULT_CACHE_PATH = Path(".validation-cache") / "results.json"
+DISABLED_VALUES = {"", "0", "off", "false", "no"}
+# Files modified this recently are re-hashed next run: an edit landing in
+# the same mtime tick as the recorded signature would otherwise go unseen.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+@lru_cache(maxsize=None)
+def validator_version() -> str:
+    digest = hashlib.sha256(CACHE_SCHEMA.encode("utf-8"))
+    sources = {
+        anchors.__file__,
+        checks.__file__,
+        corpus_module.__file__,
+        stream.__file__,
+        tokenizer.__file__,
+        __file__,
+    }
+    for module_path in sorted(sources):
+        digest.update(Path(module_path).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def file_digest(path: Path, chunk_size: int = READ_CHUNK_SIZE) -> str:
+    """``Document.digest`` of ``path``, hashed a chunk at a time."""
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def default_cache_path(root: Path = REPO_ROOT) -> Path | None:
+    configured = os.environ.get(CACHE_ENV)
+    if configured is None:
+        return root / DEFAULT_CACHE_PATH
+    if configured.strip().lower() in DISABLED_VALUES:
+        return None
+    return Path(configured)
+
+
+class ValidationCache:
+    """Per-file check results for one corpus, persisted as JSON."""
+
+    def __init__(self, corpus: Corpus, path: Path | None = None):
+        self.corpus = corpus
+        self.path = path
+        self.version = validator_version()
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._data = self._load()
+        # Relative path -> (digest, scan_failures) for streamed files.
+        self._scans: dict[str, tuple[str, dict[str, list[str]]]] = {}
+
+    def _empty(self) -> dict[str, Any]:
+        return {"version": self.version, "files": {}, "results": {}}
+
+    def _load(self) -> dict[str, Any]:
+        if self.path is None or not self.path.is_file():
+            return self._empty()
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return self._empty()
+        if not isinstance(data, dict) or data.get("version") != self.version:
+            return self._empty()
+        return data
+
+    def digest(self, path: Path) -> str:
+        relative = self.corpus.relative(path)
+        stat = path.stat()
+        signature = [stat.st_mtime_ns, stat.st_size]
+        entry = self._data["files"].get(relative)
+        if entry is not None and entry["stat"] == signature:
+            return entry["sha256"]
+
+        if self.corpus.is_large(path):
+            digest = file_digest(path)
+        else:
+            digest = self.corpus.document(path).digest
+        if time.time_ns() - stat.st_mtime_ns > RACY_WINDOW_NS:
+            self._data["files"][relative] = {"stat": signature, "sha256": digest}
+            self._dirty = True
+        return digest
+
+    def scan(self, path: Path) -> dict[str, list[str]]:
+        """``stream.scan_failures`` for a large file, once per content digest."""
+        relative = self.corpus.relative(path)
+        digest = self.digest(path)
+        scanned = self._scans.get(relative)
+        if scanned is None or scanned[0] != digest:
+            scanned = self._scans[relative] = (digest, stream.scan_failures(self.corpus, path))
+        return scanned[1]
+
+    def lookup(self, check: str, subject: str, key: str, compute: Callable[[], Any]) -> Any:
+        results = self._data["results"].setdefault(check, {})
+        entry = results.get(subject)
+        if entry is not None and entry["key"] == key:
+            self.hits += 1
+            return entry["value"]
+
+        self.misses += 1
+        value = compute()
+        results[subject] = {"key": key, "value": value}
+        self._dirty = True
+        return value
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temporary.write_text(json.dumps(self._data, sort_keys=True), encoding="utf-8")
+        os.replace(temporary, self.path)
+        self._dirty = False
+
+
+@lru_cache(maxsize=None)
+def load_cache(root: Path = REPO_ROOT) -> ValidationCache:
+    """Process-wide in-memory cache bound to the shared corpus for ``root``.
+
+    Nothing is read from or written to disk, so the unit suite always runs
+    every check; only the ``check`` and ``changed`` commands persist results.
+    """
+    return ValidationCache(load_corpus(root))
+
+
+def document_failures(cache: ValidationCache, check: str, paths: list[Path]) -> list[str]:
+    run_check = checks.DOCUMENT_CHECKS[check]
+    failures: list[str] = []
+    for path in paths:
+        if check in checks.TREE_CHECKS and cache.corpus.is_large(path):
+            compute = lambda: cache.scan(path)[check]
+        else:
+            compute = lambda: run_check(cache.corpus.document(path))
+        failures.extend(
+            cache.lookup(check, cache.corpus.relative(path), cache.digest(path), compute)
+        )
+    cache.save()
+    return failures
+
+
+def link_targets(cache: ValidationCache, path: Path) -> list[tuple[str, str]]:
+    return cache.lookup(
+        "link-targets",
+        cache.corpus.relative(path),
+        cache.digest(path),
+        lambda: checks.local_link_targets(cache.corpus.document(path)),
+    )
+
+
+def link_failures(
+    cache: ValidationCache,
+    paths: list[Path],
+    exists: Callable[[Path], bool] | None = None,
+) -> list[str]:
+    exists = exists or cache.corpus.exists
+    failures: list[str] = []
+    for path in paths:
+        if cache.corpus.is_large(path):
+            failures.extend(cache.scan(path)["links"])
+            continue
+        relative = cache.corpus.relative(path)
+        targets = link_targets(cache, path)
+        failures.extend(checks.link_failures(cache.corpus.root, relative, targets, exists))
+    cache.save()
+    return failures
+
+
+def heading_anchors(cache: ValidationCache, relative: str) -> frozenset[str] | None:
+    """The slug index of a corpus file, or ``None`` if it is not in the corpus."""
+    if relative not in cache.corpus.relative_files:
+        return None
+    path = cache.corpus.root / relative
+    return frozenset(
+        cache.lookup(
+            "heading-anchors",
+            relative,
+            cache.digest(path),
+            lambda: sorted(cache.corpus.anchors(relative)),
+        )
+    )
+
+
+def anchor_failures(cache: ValidationCache, paths: list[Path]) -> list[str]:
+    failures: list[str] = []
+    for path in paths:
+        if cache.corpus.is_large(path):
+            failures.extend(cache.scan(path)["anchors"])
+            continue
+        relative = cache.corpus.relative(path)
+        anchored = cache.lookup(
+            "anchor-links",
+            relative,
+            cache.digest(path),
+            lambda: checks.anchor_links(cache.corpus.document(path)),
+        )
+        failures.extend(
+            checks.anchor_failures(relative, anchored, lambda target: heading_anchors(cache, target))
+        )
+    cache.save()
+    return failures
+
+
+def readme_index_failures(
+    cache: ValidationCache, scaffold: str, numbered_guides: list[str]
+) -> list[str]:
+    readme_path = cache.corpus.root / scaffold / "README.md"
+    key = "|".join([cache.digest(readme_path), *numbered_guides])
+    failures = cache.lookup(
+        "readme-index",
+        f"{scaffold}/README.md",
+        key,
+        lambda: checks.readme_index_failures(
+            scaffold, cache.corpus.document(readme_path), numbered_guides
+        ),
+    )
+    cache.save()
+    return failures
+
+
+def suite_failures(cache: ValidationCache) -> list[str]:
+    """Every cacheable check over the whole tree, in a stable order."""
+    corpus = cache.corpus
+    markdown = corpus.markdown_paths()
+    failures = document_failures(cache, "h1", markdown)
+    failures += document_failures(cache, "numbered-h1", markdown)
+    failures += document_failures(cache, "fences", markdown)
+    failures += link_failures(cache, markdown)
+    failures += anchor_failures(cache, markdown)
+
+    for scaffold in corpus.scaffold_names():
+        scaffold_dir = corpus.root / scaffold
+        templates = [
+            path
+            for path in corpus.children(scaffold_dir / "templates")
+            if path.name.endswith(".md.template")
+        ]
+        failures += document_failures(cache, "template-actionability", templates)
+
+        playbook = scaffold_dir / "07-agent-prompts.md"
+        if corpus.relative(playbook) in corpus.relative_files:
+            failures += document_failures(cache, "prompt-structure", [playbook])
+
+        failures += readme_index_failures(
+            cache, scaffold, checks.numbered_guides(corpus, scaffold)
+        )
+    return failures
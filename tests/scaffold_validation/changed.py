@@ -0,0 +1,169 @@
+"""Validation scoped to files changed since a git base ref.
+
+Changed paths come from plain ``git diff --name-status`` against the
+merge base of the ref and ``HEAD`` (so work that landed on the base
+branch since the branch point is left out), plus untracked files.
+Besides the changed files themselves, every markdown file that links to
+a changed, deleted or renamed path is re-validated through a reverse
+link index, so broken inbound links still surface when only the target
+moved. A change to a scaffold's top-level files or templates re-runs
+that scaffold's manifest checklist.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+import subprocess
+
+from scaffold_validation.cache import (
+    ValidationCache,
+    anchor_failures,
+    document_failures,
+    link_failures,
+    link_targets,
+)
+from scaffold_validation.manifest import (
+    MANIFEST_NAME,
+    TEMPLATES_DIR,
+    load_manifest,
+    run_checklist,
+)
+from scaffold_validation.walk import IGNORE_FILE
+
+
+# Changes under these prefixes alter how every file is judged.
+VALIDATOR_PREFIXES = ("tests/scaffold_validation/",)
+# Changes to these files alter which checks run and which files are seen.
+VALIDATOR_FILES = frozenset({MANIFEST_NAME, IGNORE_FILE})
+
+
+@dataclass
+class ChangeSet:
+    changed: set[str] = field(default_factory=set)
+    deleted: set[str] = field(default_factory=set)
+
+    @property
+    def touched(self) -> set[str]:
+        return self.changed | self.deleted
+
+
+def _git(root: Path, *args: str) -> list[str]:
+    completed = subprocess.run(
+        ["git", *args], cwd=root, capture_output=True, check=True
+    )
+    return [entry for entry in completed.stdout.decode("utf-8").split("\0") if entry]
+
+
+def parse_name_status(entries: list[str]) -> ChangeSet:
+    """Parse ``git diff --name-status -z`` output into a change set."""
+    changes = ChangeSet()
+    position = 0
+    while position < len(entries):
+        status = entries[position]
+        kind = status[0]
+        if kind in "RC":
+            source, destination = entries[position + 1], entries[position + 2]
+            if kind == "R":
+                changes.deleted.add(source)
+            changes.changed.add(destination)
+            position += 3
+            continue
+        path = entries[position + 1]
+        if kind == "D":
+            changes.deleted.add(path)
+        else:
+            changes.changed.add(path)
+        position += 2
+    return changes
+
+
+def git_changes(root: Path, base: str) -> ChangeSet:
+    """Paths that differ between the merge base of ``base`` and ``HEAD`` and the working tree."""
+    (merge_base,) = _git(root, "merge-base", base, "HEAD")
+    changes = parse_name_status(
+        _git(
+            root,
+            "diff",
+            "--name-status",
+            "-z",
+            "--find-renames",
+            "--relative",
+            merge_base.strip(),
+            "--",
+        )
+    )
+    changes.changed.update(_git(root, "ls-files", "--others", "--exclude-standard", "-z"))
+    return changes
+
+
+def reverse_link_index(cache: ValidationCache) -> dict[str, set[str]]:
+    """Map each root-relative link target to the markdown files linking to it."""
+    index: dict[str, set[str]] = {}
+    for path in cache.corpus.markdown_paths():
+        source = cache.corpus.relative(path)
+        for _, target in link_targets(cache, path):
+            index.setdefault(target.rstrip("/"), set()).add(source)
+    return index
+
+
+def link_dependents(index: dict[str, set[str]], changes: ChangeSet) -> set[str]:
+    dependents: set[str] = set()
+    for path in changes.changed:
+        dependents |= index.get(path, set())
+    for path in changes.deleted:
+        # A deletion can also remove the directory a link points at.
+        for candidate in (path, *map(str, PurePosixPath(path).parents)):
+            dependents |= index.get(candidate, set())
+    # A deleted directory takes every link target below it along.
+    prefixes = tuple(f"{path}/" for path in changes.deleted)
+    if prefixes:
+        for target, sources in index.items():
+            if target.startswith(prefixes):
+                dependents |= sources
+    return dependents
+
+
+def is_validator_change(path: str) -> bool:
+    return path.startswith(VALIDATOR_PREFIXES) or path in VALIDATOR_FILES
+
+
+def checklist_scaffolds(scaffolds: list[str], changes: ChangeSet) -> list[str]:
+    """Scaffolds with a touched top-level file or template, in manifest order."""
+    touched: set[str] = set()
+    for path in changes.touched:
+        parts = PurePosixPath(path).parts
+        if len(parts) >= 2 and (len(parts) == 2 or parts[1] == TEMPLATES_DIR):
+            touched.add(parts[0])
+    return [scaffold for scaffold in scaffolds if scaffold in touched]
+
+
+def changed_failures(cache: ValidationCache, changes: ChangeSet) -> tuple[list[str], list[str]]:
+    """Failures for the changed scope, plus the files whose links were checked."""
+    corpus = cache.corpus
+    manifest = load_manifest(corpus.root)
+    if any(is_validator_change(path) for path in changes.touched):
+        markdown = corpus.markdown_paths()
+        link_scope = [corpus.relative(path) for path in markdown]
+        scaffolds = manifest.names
+    else:
+        present = corpus.relative_files
+        changed = sorted(path for path in changes.changed if path in present)
+        markdown = [corpus.root / path for path in changed if path.endswith(".md")]
+        index = reverse_link_index(cache)
+        link_scope = sorted(
+            {*(corpus.relative(path) for path in markdown), *link_dependents(index, changes)}
+            & present
+        )
+        scaffolds = checklist_scaffolds(manifest.names, changes)
+
+    failures = document_failures(cache, "h1", markdown)
+    failures += document_failures(cache, "numbered-h1", markdown)
+    failures += document_failures(cache, "fences", markdown)
+    failures += link_failures(cache, [corpus.root / path for path in link_scope])
+    failures += anchor_failures(cache, [corpus.root / path for path in link_scope])
+
+    checklist = tuple(
+        requirement for requirement in manifest.checklist if requirement.scaffold in scaffolds
+    )
+    for _, _, scaffold_failures in run_checklist(corpus, checklist):
+        failures += scaffold_failures
+    return failures, link_scope
@@ -0,0 +1,392 @@
+"""Validation checks shared by the test modules and the CLI.
+
+Document checks are pure functions of one document's content and return a
+list of failure messages, which is what lets results be cached by content
+hash. Checks that also depend on other files (link targets, README index
+coverage) return the data needed to re-evaluate those dependencies cheaply.
+
+Scaffold checks take a corpus and a scaffold name; scaffolds never read
+each other's files, so these can run in any order or process.
+"""
+
+import os
+from pathlib import Path
+import re
+from typing import Callable
+from urllib.parse import unquote
+
+from scaffold_validation.corpus import Corpus, Document
+from scaffold_validation.tokenizer import Fence
+
+
+NUMBERED_FILE_PATTERN = re.compile(r"^(\d{2})-.*\.md$")
+BACKTICK_PATH_PATTERN = re.compile(r"`[^`/\\]*[/\\][^`]+`")
+NUMBERED_SECTION_PATTERN = re.compile(r"^###\s+\d+\.", re.MULTILINE)
+PROMPT_HEADING_PATTERN = re.compile(
+    r"^(###\s+Prompt:.*|##\s+Prompt\s+\d+:.*|##\s+.*Prompt\s*)$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def h1_failures(document: Document) -> list[str]:
+    content = document.text.strip()
+    return first_line_h1_failures(document.relative, content.splitlines()[0] if content else None)
+
+
+def first_line_h1_failures(relative: str, first_line: str | None) -> list[str]:
+    """``first_line`` is the first line of the stripped text, ``None`` if it is empty."""
+    if first_line is None:
+        return [f"{relative} is empty"]
+    if not first_line.startswith("# "):
+        return [f"{relative} first line is not an H1: {first_line}"]
+    return []
+
+
+def numbered_h1_failures(document: Document) -> list[str]:
+    first_line = document.lines[0] if document.lines else ""
+    return numbered_prefix_failures(document.path.name, document.relative, first_line)
+
+
+def numbered_prefix_failures(name: str, relative: str, first_line: str) -> list[str]:
+    match = NUMBERED_FILE_PATTERN.match(name)
+    if not match:
+        return []
+
+    expected_prefix = f"# {match.group(1)}"
+    if not first_line.strip().startswith(expected_prefix):
+        return [f"{relative} should start with '{expected_prefix}'"]
+    return []
+
+
+def fence_failures(document: Document) -> list[str]:
+    return [
+        unterminated_fence_failure(document.relative, fence)
+        for fence in document.fences
+        if fence.end is None
+    ]
+
+
+def unterminated_fence_failure(relative: str, fence: Fence) -> str:
+    return f"{relative} has an unterminated code fence opened at line {fence.start}"
+
+
+def template_actionability_failures(document: Document) -> list[str]:
+    content = document.text
+    if not content.strip().startswith("# "):
+        return [f"{document.relative} should start with an H1"]
+
+    has_placeholder = bool(document.placeholders)
+    has_checklist = "- [ ]" in content
+    has_table = "|" in content
+
+    if not (has_placeholder or has_checklist or has_table):
+        return [f"{document.relative} lacks placeholders/checklists/tables"]
+    return []
+
+
+def prompt_structure_failures(document: Document) -> list[str]:
+    failures: list[str] = []
+    content = document.text
+
+    prompt_headings = PROMPT_HEADING_PATTERN.findall(content)
+    code_block_pairs = content.count("```") // 2
+
+    if len(prompt_headings) < 5:
+        failures.append(
+            f"{document.relative} has too few prompt sections ({len(prompt_headings)} < 5)"
+        )
+
+    if code_block_pairs < len(prompt_headings):
+        failures.append(
+            f"{document.relative} has fewer code blocks ({code_block_pairs}) than prompt sections ({len(prompt_headings)})"
+        )
+
+    if "Tasks:" not in content and "1." not in content:
+        failures.append(f"{document.relative} lacks actionable task instructions")
+
+    return failures
+
+
+DOCUMENT_CHECKS: dict[str, Callable[[Document], list[str]]] = {
+    "h1": h1_failures,
+    "numbered-h1": numbered_h1_failures,
+    "fences": fence_failures,
+    "template-actionability": template_actionability_failures,
+    "prompt-structure": prompt_structure_failures,
+}
+
+
+def should_validate(target: str) -> bool:
+    stripped = target.strip()
+    if not stripped:
+        return False
+    if stripped.startswith(("http://", "https://", "mailto:", "#")):
+        return False
+    return True
+
+
+def local_link_target(parent: Path, raw_target: str) -> str | None:
+    """Root-relative path a link in directory ``parent`` points at, if it is local."""
+    target = raw_target.split("#", 1)[0].strip()
+    if not should_validate(target):
+        return None
+    return os.path.normpath(parent / target).replace(os.sep, "/")
+
+
+def local_link_targets(document: Document) -> list[tuple[str, str]]:
+    """``(raw target, root-relative target path)`` for every local link."""
+    parent = Path(document.relative).parent
+    targets: list[tuple[str, str]] = []
+    for raw_target in document.links:
+        target = local_link_target(parent, raw_target)
+        if target is not None:
+            targets.append((raw_target, target))
+    return targets
+
+
+def linked_files(document: Document) -> set[str]:
+    """Root-relative files the local and anchored links in ``document`` point at."""
+    targets = {target for _, target in local_link_targets(document)}
+    return targets | {target for _, target, _ in anchor_links(document)}
+
+
+def link_failures(
+    root: Path,
+    relative: str,
+    targets: list[tuple[str, str]],
+    exists: Callable[[Path], bool],
+) -> list[str]:
+    failures: list[str] = []
+    for raw_target, target in targets:
+        path = root / target
+        if not exists(path):
+            failures.append(f"{relative} -> {raw_target} (resolved to {path.resolve()})")
+    return failures
+
+
+def anchor_links(document: Document) -> list[tuple[str, str, str]]:
+    """``(raw target, root-relative markdown file, fragment)`` per anchored link.
+
+    Same-file ``#anchor`` links point at the document itself; links whose
+    path part is not a local ``.md`` file are left to the link check.
+    """
+    parent = Path(document.relative).parent
+    anchored: list[tuple[str, str, str]] = []
+    for raw_target in document.links:
+        link = anchor_link(document.relative, parent, raw_target)
+        if link is not None:
+            anchored.append(link)
+    return anchored
+
+
+def anchor_link(relative: str, parent: Path, raw_target: str) -> tuple[str, str, str] | None:
+    path, separator, fragment = raw_target.strip().partition("#")
+    if not separator or not fragment:
+        return None
+    if not path:
+        return raw_target, relative, fragment
+    if should_validate(path) and path.endswith(".md"):
+        return raw_target, os.path.normpath(parent / path).replace(os.sep, "/"), fragment
+    return None
+
+
+def anchor_failures(
+    relative: str,
+    anchored: list[tuple[str, str, str]],
+    anchors_for: Callable[[str], frozenset[str] | None],
+) -> list[str]:
+    """Fragments missing from their target's slug index.
+
+    ``anchors_for`` returns ``None`` for targets outside the corpus; those
+    are reported by the link check, not here.
+    """
+    failures: list[str] = []
+    for raw_target, target, fragment in anchored:
+        anchors = anchors_for(target)
+        if anchors is None:
+            continue
+        wanted = unquote(fragment)
+        if wanted not in anchors and wanted.lower() not in anchors:
+            failures.append(f"{relative} -> {raw_target} (no heading anchor #{wanted} in {target})")
+    return failures
+
+
+def corpus_link_failures(corpus: Corpus, document: Document) -> list[str]:
+    targets = local_link_targets(document)
+    return link_failures(corpus.root, document.relative, targets, corpus.exists)
+
+
+def corpus_anchor_failures(corpus: Corpus, document: Document) -> list[str]:
+    def anchors_for(target: str) -> frozenset[str] | None:
+        if target not in corpus.relative_files:
+            return None
+        return corpus.anchors(target)
+
+    return anchor_failures(document.relative, anchor_links(document), anchors_for)
+
+
+TREE_CHECKS: dict[str, Callable[[Corpus, Document], list[str]]] = {
+    "h1": lambda corpus, document: h1_failures(document),
+    "numbered-h1": lambda corpus, document: numbered_h1_failures(document),
+    "fences": lambda corpus, document: fence_failures(document),
+    "links": corpus_link_failures,
+    "anchors": corpus_anchor_failures,
+}
+
+
+def readme_index_failures(
+    scaffold: str, readme: Document, numbered_guides: list[str]
+) -> list[str]:
+    failures: list[str] = []
+    content = readme.text
+
+    for guide in numbered_guides:
+        expected_link = f"[{guide}]({guide})"
+        if expected_link not in content:
+            failures.append(f"{scaffold}/README.md missing document index link for {guide}")
+
+    has_templates_index = "[templates/](templates/)" in content
+    has_templates_section = "## templates" in readme.lowered and "(templates/" in content
+
+    if not (has_templates_index or has_templates_section):
+        failures.append(f"{scaffold}/README.md missing templates/ index link")
+
+    return failures
+
+
+def numbered_guides(corpus: Corpus, scaffold: str) -> list[str]:
+    return sorted(
+        path.name
+        for path in corpus.children(corpus.root / scaffold)
+        if NUMBERED_FILE_PATTERN.match(path.name)
+    )
+
+
+def readme_table_link_failures(corpus: Corpus, scaffold: str) -> list[str]:
+    readme = corpus.scaffold_document(scaffold, "README.md")
+    links = readme.table_links
+    if len(links) < 10:
+        return [f"{scaffold}/README.md expected at least 10 table links, found {len(links)}"]
+
+    failures: list[str] = []
+    for raw_link in links:
+        link = raw_link.split("#", 1)[0]
+        if not corpus.exists(readme.path.parent / link):
+            failures.append(f"{scaffold}/README.md broken table link: {raw_link}")
+    return failures
+
+
+def agents_contract_failures(corpus: Corpus, scaffold: str) -> list[str]:
+    failures: list[str] = []
+    agents_template = corpus.scaffold_document(scaffold, "templates", "AGENTS.md.template")
+    content = agents_template.text
+    lowered = agents_template.lowered
+    relative = f"{scaffold}/templates/AGENTS.md.template"
+
+    if not content.lstrip().startswith("# AGENTS.md"):
+        failures.append(f"{relative} must start with '# AGENTS.md'")
+
+    has_mission_or_phase = (
+        "## mission" in lowered
+        or "## current phase" in lowered
+        or "## current stage" in lowered
+    )
+    if not has_mission_or_phase:
+        failures.append(f"{relative} missing mission/current phase section")
+
+    has_sources_section = (
+        "read these files" in lowered
+        or "read in this order" in lowered
+        or "sources of truth" in lowered
+        or "source of truth" in lowered
+    )
+    if not has_sources_section:
+        failures.append(f"{relative} missing source navigation section")
+
+    path_refs = BACKTICK_PATH_PATTERN.findall(content)
+    if len(path_refs) < 2:
+        failures.append(
+            f"{relative} has too few file path references ({len(path_refs)} < 2)"
+        )
+    return failures
+
+
+def readme_operator_failures(corpus: Corpus, scaffold: str) -> list[str]:
+    failures: list[str] = []
+    content = corpus.scaffold_document(scaffold, "README.md").lowered
+
+    if not (
+        "## when to use this scaffold" in content
+        or "## who is this for?" in content
+    ):
+        failures.append(
+            f"{scaffold}/README.md missing audience section (when-to-use or who-is-this-for)"
+        )
+
+    if "## how to use this scaffold" not in content:
+        failures.append(f"{scaffold}/README.md missing section: ## how to use this scaffold")
+
+    if "document index" not in content:
+        failures.append(f"{scaffold}/README.md missing document index section")
+
+    if "(templates/)" not in content and "## templates" not in content:
+        failures.append(
+            f"{scaffold}/README.md missing templates guidance (templates section or templates/ link)"
+        )
+    return failures
+
+
+def process_overview_failures(corpus: Corpus, scaffold: str) -> list[str]:
+    process_overview = corpus.scaffold_document(scaffold, "01-process-overview.md")
+    lowered = process_overview.lowered
+
+    phase_mentions = lowered.count("phase")
+    lifecycle_mentions = lowered.count("lifecycle")
+    numbered_sections = len(NUMBERED_SECTION_PATTERN.findall(process_overview.text))
+
+    if phase_mentions < 3 and lifecycle_mentions < 1 and numbered_sections < 4:
+        return [
+            f"{scaffold}/01-process-overview.md appears shallow (phase={phase_mentions}, lifecycle={lifecycle_mentions}, numbered={numbered_sections})"
+        ]
+    return []
+
+
+def template_set_failures(corpus: Corpus, scaffold: str) -> list[str]:
+    templates = [
+        path
+        for path in corpus.children(corpus.root / scaffold / "templates")
+        if path.name.endswith(".md.template")
+    ]
+    if len(templates) < 4:
+        return [f"{scaffold}/templates has too few markdown templates ({len(templates)} < 4)"]
+
+    failures: list[str] = []
+    for path in templates:
+        failures.extend(template_actionability_failures(corpus.document(path)))
+    return failures
+
+
+def prompt_playbook_failures(corpus: Corpus, scaffold: str) -> list[str]:
+    playbook = corpus.root / scaffold / "07-agent-prompts.md"
+    if corpus.relative(playbook) not in corpus.relative_files:
+        return []
+    return prompt_structure_failures(corpus.document(playbook))
+
+
+def readme_index_coverage_failures(corpus: Corpus, scaffold: str) -> list[str]:
+    return readme_index_failures(
+        scaffold,
+        corpus.scaffold_document(scaffold, "README.md"),
+        numbered_guides(corpus, scaffold),
+    )
+
+
+SCAFFOLD_CHECKS: dict[str, Callable[[Corpus, str], list[str]]] = {
+    "readme-table-links": readme_table_link_failures,
+    "agents-contract": agents_contract_failures,
+    "readme-operator-sections": readme_operator_failures,
+    "readme-index": readme_index_coverage_failures,
+    "process-overview-depth": process_overview_failures,
+    "template-actionability": template_set_failures,
+    "prompt-structure": prompt_playbook_failures,
+}
@@ -0,0 +1,1004 @@
+"""Command-line interface for the scaffold validation toolkit."""
+
+import argparse
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+import time
+from typing import Any
+
+from scaffold_validation.batch import read_root_list, validate_repositories
+from scaffold_validation.benchmarks import (
+    history_collection,
+    parallel_speedup,
+    stream_memory,
+    synthetic_throughput,
+    tokenizer_stress,
+    validator_names,
+)
+from scaffold_validation.cache import ValidationCache, default_cache_path, suite_failures
+from scaffold_validation.changed import changed_failures, git_changes
+from scaffold_validation.context import TokenCountCache, default_count_cache_path, pack_context
+from scaffold_validation.corpus import READ_CHUNK_SIZE, REPO_ROOT, Corpus, read_profile
+from scaffold_validation.duplicates import (
+    DEFAULT_THRESHOLD,
+    default_duplicates_path,
+    find_duplicates,
+)
+from scaffold_validation.evaluation import CRITERIA, default_evaluation_path, evaluate
+from scaffold_validation.graph import LinkGraph, default_roots
+from scaffold_validation.history import (
+    collect,
+    default_checkpoint_path,
+    format_duration,
+    metrics_json,
+    render_scoreboard,
+    weekly_metrics,
+)
+from scaffold_validation.instrument import instrumented_run, summarize
+from scaffold_validation.lsp import LanguageServer
+from scaffold_validation.parallel import format_report, validate_tree
+from scaffold_validation.prompts import compile_library, default_library_path, load_library
+from scaffold_validation.render import (
+    RenderResult,
+    TemplateEngine,
+    load_projects,
+    load_variables,
+)
+from scaffold_validation.report import (
+    DEFAULT_BUDGET,
+    budget_violations,
+    json_report,
+    sarif_report,
+    write_report,
+)
+from scaffold_validation.search import SearchIndex, default_index_path, update_index
+from scaffold_validation.shards import (
+    CostHistory,
+    combine_coverage,
+    default_costs_path,
+    merge_shard_results,
+    run_shard,
+)
+from scaffold_validation.synthetic import FAULTS, generate_tree, inject_faults
+from scaffold_validation.upgrade import OUTCOMES, upgrade_projects
+from scaffold_validation.urls import (
+    DEFAULT_PER_HOST,
+    DEFAULT_TIMEOUT,
+    DEFAULT_TTL,
+    UrlCache,
+    check_urls,
+    default_url_cache_path,
+    external_links,
+)
+from scaffold_validation.walk import load_ignore_rules
+from scaffold_validation.watch import (
+    DEFAULT_POLL_INTERVAL,
+    Revalidation,
+    format_revalidation,
+    make_watcher,
+    watch,
+)
+
+
+def _stats(args: argparse.Namespace) -> int:
+    profile = read_profile(args.root, passes=args.passes)
+    for key, value in profile.items():
+        rendered = f"{value:.6f}" if isinstance(value, float) else str(value)
+        print(f"{key:>20}: {rendered}")
+    return 0 if profile["bytes_read"] == profile["bytes_on_disk"] else 1
+
+
+def _check(args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+    cache_path = None if args.no_cache else default_cache_path(args.root)
+    cache = ValidationCache(Corpus(args.root), cache_path)
+    failures = suite_failures(cache)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    for failure in failures:
+        print(f"- {failure}")
+    print(
+        f"{len(failures)} failure(s); cache hits={cache.hits} misses={cache.misses}; "
+        f"files read={cache.corpus.files_read}; {elapsed_ms:.1f} ms"
+    )
+    return 1 if failures else 0
+
+
+def _changed(args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+    changes = git_changes(args.root, args.base)
+    cache = ValidationCache(Corpus(args.root), default_cache_path(args.root))
+    failures, link_scope = changed_failures(cache, changes)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    for failure in failures:
+        print(f"- {failure}")
+    print(
+        f"{len(failures)} failure(s) across {len(changes.touched)} changed path(s); "
+        f"links checked in {len(link_scope)} file(s); {elapsed_ms:.1f} ms"
+    )
+    return 1 if failures else 0
+
+
+def _run(args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+    lines = format_report(validate_tree(args.root, jobs=args.jobs))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    for line in lines:
+        print(line)
+    print(f"{len(lines)} failure(s); {elapsed_ms:.1f} ms")
+    return 1 if lines else 0
+
+
+def _batch(args: argparse.Namespace) -> int:
+    roots = list(args.roots)
+    if args.from_file:
+        roots += read_root_list(args.from_file)
+    if not roots:
+        print("no repositories given", file=sys.stderr)
+        return 2
+    batch = validate_repositories(roots, jobs=args.jobs)
+
+    for repository in batch.repositories:
+        failures = repository.failures
+        print(
+            f"{repository.root}: {len(failures)} failure(s), {repository.documents} document(s), "
+            f"{repository.scaffolds} scaffold(s), {repository.seconds * 1000:.1f} ms"
+        )
+        for failure in failures:
+            print(f"  {failure}")
+    if args.json:
+        write_report(args.json, batch.to_json())
+    total = sum(len(repository.failures) for repository in batch.repositories)
+    print(
+        f"{len(batch.repositories)} repositories, {len(batch.failing)} failing, "
+        f"{total} failure(s); {batch.worker_seconds:.2f}s of checks in "
+        f"{batch.seconds:.2f}s with {batch.jobs} job(s)"
+    )
+    return 1 if batch.failing else 0
+
+
+def _bench_parallel(args: argparse.Namespace) -> int:
+    print(f"{'jobs':>6} {'seconds':>10} {'speedup':>8}")
+    for row in parallel_speedup(args.scaffolds, args.jobs):
+        print(f"{row['jobs']:>6} {row['seconds']:>10.3f} {row['speedup']:>7.2f}x")
+    return 0
+
+
+def _bench_tokenizer(args: argparse.Namespace) -> int:
+    print(f"{'shape':>20} {'bytes':>10} {'tokenizer s':>12} {'legacy s':>10}")
+    for row in tokenizer_stress(args.sizes, include_legacy=not args.skip_legacy):
+        legacy = f"{row['legacy_seconds']:>10.4f}" if "legacy_seconds" in row else f"{'-':>10}"
+        print(f"{row['shape']:>20} {row['bytes']:>10} {row['tokenizer_seconds']:>12.4f} {legacy}")
+    return 0
+
+
+def _bench_stream(args: argparse.Namespace) -> int:
+    header = f"{'MiB':>6} {'shape':>16} {'mode':>7} {'seconds':>9}"
+    print(f"{header} {'peak RSS MiB':>13} {'failures':>9}")
+    for row in stream_memory(args.sizes, args.chunk_size):
+        print(
+            f"{row['mib']:>6} {row['shape']:>16} {row['mode']:>7} {row['seconds']:>9.2f} "
+            f"{row['peak_rss_kib'] / 1024:>13.1f} {row['failures']:>9}"
+        )
+    return 0
+
+
+def _bench_history(args: argparse.Namespace) -> int:
+    print(f"{'phase':>12} {'commits':>8} {'seconds':>8}")
+    for row in history_collection(args.changes, args.new):
+        print(f"{row['phase']:>12} {row['commits']:>8} {row['seconds']:>8.3f}")
+    return 0
+
+
+def _watch(args: argparse.Namespace) -> int:
+    def report(result: Revalidation) -> None:
+        for line in format_revalidation(result):
+            print(line, flush=True)
+
+    watcher = make_watcher(args.root, load_ignore_rules(args.root), args.poll, args.interval)
+    print(f"watching {args.root} ({type(watcher).__name__}); Ctrl-C to stop", flush=True)
+    watch(args.root, report, watcher)
+    return 0
+
+
+def _print_render(result: RenderResult) -> None:
+    prose = result.unfilled_names()
+    in_code = len(result.unfilled_names(include_code=True)) - len(prose)
+    print(f"{result.output}: {len(result.files)} file(s)")
+    if prose:
+        print(f"  unfilled: {', '.join('{' + name + '}' for name in prose)}")
+    if in_code:
+        print(f"  {in_code} unfilled placeholder(s) inside code blocks")
+
+
+def _render(args: argparse.Namespace) -> int:
+    engine = TemplateEngine(Corpus(args.root))
+    if args.scaffold not in engine.corpus.scaffold_names():
+        print(f"unknown scaffold: {args.scaffold}")
+        return 2
+    variables = load_variables(args.vars) if args.vars else {}
+    if args.projects:
+        projects = load_projects(args.projects)
+        results = engine.render_batch(args.scaffold, projects, args.projects.parent, variables)
+    else:
+        results = [engine.render_scaffold(args.scaffold, variables, args.output)]
+
+    for result in results:
+        _print_render(result)
+    print(
+        f"rendered {len(results)} project(s) from {engine.compilations} compiled template(s)"
+    )
+    return 1 if args.strict and any(result.unfilled_names() for result in results) else 0
+
+
+def _upgrade(args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+    results = upgrade_projects(args.root, args.directory, jobs=args.jobs, dry_run=args.dry_run)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    totals = dict.fromkeys(OUTCOMES, 0)
+    for result in results:
+        changed = {
+            name: outcome
+            for name, outcome in result.outcomes.items()
+            if outcome != "unchanged"
+        }
+        for outcome in result.outcomes.values():
+            totals[outcome] += 1
+        if changed:
+            print(result.project)
+            for name, outcome in sorted(changed.items()):
+                print(f"  {outcome:>9} {name}")
+    summary = ", ".join(f"{count} {outcome}" for outcome, count in totals.items() if count)
+    prefix = "would upgrade" if args.dry_run else "upgraded"
+    print(f"{prefix} {len(results)} project(s): {summary or 'nothing to do'}; {elapsed_ms:.1f} ms")
+    return 1 if any(result.conflicts for result in results) else 0
+
+
+def _graph(args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+    corpus = Corpus(args.root)
+    graph = LinkGraph.from_corpus(corpus)
+    analysis = graph.analyze(args.roots or default_roots(corpus))
+    cycles = graph.cycles()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if args.path:
+        path = analysis.path(args.path)
+        print(" -> ".join(path) if path else f"{args.path} is not reachable from the roots")
+        return 0 if path else 1
+
+    print("most linked:")
+    for relative, degree in analysis.most_linked(args.top):
+        print(f"  {degree:>4} {relative}")
+    for component in cycles:
+        print(f"cycle of {len(component)}: {', '.join(component)}")
+    for orphan in analysis.orphans:
+        print(f"orphan: {orphan}")
+    print(
+        f"{sum(graph.present)} document(s), {graph.edge_count} link(s), "
+        f"{len(analysis.reachable)} reachable from {len(analysis.roots)} root(s), "
+        f"{len(analysis.orphans)} orphan(s), {len(cycles)} cycle(s); {elapsed_ms:.1f} ms"
+    )
+    return 1 if args.strict and analysis.orphans else 0
+
+
+def _search(args: argparse.Namespace) -> int:
+    path = args.index or default_index_path(args.root)
+    update = None
+    if not args.no_refresh or not path.is_file():
+        update = update_index(Corpus(args.root), path)
+    started = time.perf_counter()
+    with SearchIndex(path) as index:
+        hits = index.search(" ".join(args.query), args.top, args.prompts)
+        sections = index.section_count
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    for hit in hits:
+        label = "prompt: " if hit.kind == "prompt" else ""
+        print(f"{hit.score:>7.2f}  {hit.location}:{hit.line}  {label}{hit.heading}")
+    if update is not None:
+        print(
+            f"index {update.mode}: {update.reindexed} of {update.documents} file(s) "
+            f"re-indexed in {update.seconds * 1000:.1f} ms"
+        )
+    print(f"{len(hits)} hit(s) from {sections} section(s) in {elapsed_ms:.2f} ms")
+    return 0 if hits else 1
+
+
+def _duplicates(args: argparse.Namespace) -> int:
+    path = None if args.no_cache else args.index or default_duplicates_path(args.root)
+    report = find_duplicates(Corpus(args.root), path, args.threshold)
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(report.to_json(), indent=2) + "\n", encoding="utf-8")
+
+    if args.all:
+        for group in report.copies():
+            print(f"identical in {len(group)} files:")
+            for section in group:
+                print(f"  {section.location}:{section.line}")
+    for pair in report.diverging:
+        print(f"{pair.similarity:.2f}  {pair.first.location}  <->  {pair.second.location}")
+    print(
+        f"{report.sections} section(s) in {report.documents} file(s), "
+        f"{report.reindexed} re-read; {len(report.copies())} group(s) of identical copies, "
+        f"{len(report.diverging)} diverging pair(s) at {args.threshold:.2f} "
+        f"from {report.candidates} candidate(s); {report.seconds * 1000:.1f} ms"
+    )
+    return 0
+
+
+def _evaluate(args: argparse.Namespace) -> int:
+    path = None if args.no_cache else default_evaluation_path(args.root)
+    evaluation = evaluate(Corpus(args.root), path)
+    width = max((len(score.scaffold) for score in evaluation.scores), default=0)
+    print(f"{'scaffold':<{width}}  {'  '.join(name[:4] for name in CRITERIA)}  score  status")
+    for score in evaluation.scores:
+        cells = "  ".join(f"{value:>4}" for value in score.scores)
+        print(f"{score.scaffold:<{width}}  {cells}  {score.total:>5}  {score.status}")
+
+    if evaluation.unreviewed:
+        print(f"no effectiveness review: {', '.join(evaluation.unreviewed)}")
+    for difference in evaluation.differences:
+        print(
+            f"  {difference.scaffold} {difference.column}: "
+            f"matrix {difference.matrix}, computed {difference.computed}"
+        )
+
+    relative = evaluation.matrix.relative_to(args.root).as_posix()
+    if args.write and evaluation.stale:
+        evaluation.matrix.write_text(evaluation.updated, encoding="utf-8")
+        state = f"{relative} updated"
+    elif evaluation.stale:
+        state = f"{relative} differs from the computed scores; --write replaces its table"
+    else:
+        state = f"{relative} is up to date"
+    print(
+        f"{evaluation.runs} run(s), {evaluation.reviews} review(s), {evaluation.parsed} parsed "
+        f"in {evaluation.seconds * 1000:.1f} ms; {state}"
+    )
+    return 1 if evaluation.stale and not args.write else 0
+
+
+def _history(args: argparse.Namespace) -> int:
+    repository = args.repo or args.root
+    checkpoint = None if args.no_checkpoint else default_checkpoint_path(repository, args.root)
+    try:
+        collection = collect(repository, checkpoint)
+    except (OSError, subprocess.CalledProcessError) as error:
+        print(f"git history of {repository} could not be read: {error}", file=sys.stderr)
+        return 2
+    started = time.perf_counter()
+    weeks = weekly_metrics(collection.history, args.weeks)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    print(
+        f"{'week':<10} {'changes':>7} {'lead time':>9} {'commits':>7} {'churn':>8} "
+        f"{'files':>6} {'reverts':>7} {'hotfixes':>8} {'authors':>7}"
+    )
+    for week in weeks:
+        print(
+            f"{week.week.isoformat():<10} {week.changes:>7} "
+            f"{format_duration(week.median_lead_seconds):>9} {week.commits:>7} "
+            f"{week.churn:>8} {week.files:>6} {week.reverts:>7} {week.hotfixes:>8} "
+            f"{week.authors:>7}"
+        )
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(metrics_json(weeks), indent=2) + "\n", encoding="utf-8")
+    if args.scoreboard and weeks:
+        args.scoreboard.parent.mkdir(parents=True, exist_ok=True)
+        args.scoreboard.write_text(
+            render_scoreboard(Corpus(args.root), weeks[-1]), encoding="utf-8"
+        )
+    print(
+        f"{len(collection.history)} commit(s), {collection.new_commits} read from git "
+        f"({collection.mode}) in {collection.seconds * 1000:.1f} ms; "
+        f"metrics in {elapsed_ms:.1f} ms"
+    )
+    return 0
+
+
+def _pack(args: argparse.Namespace) -> int:
+    counts = TokenCountCache(None if args.no_cache else default_count_cache_path(args.root))
+    pack = pack_context(args.agents, args.budget, args.base, counts)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(pack.render(), encoding="utf-8")
+    else:
+        sys.stdout.write(pack.render())
+    # The bundle may be on stdout; keep the report off it.
+    report = sys.stderr if args.output is None else sys.stdout
+    for packed in pack.files:
+        if packed.whole:
+            kind, detail = "whole", ""
+        else:
+            kind, detail = "sliced", f" ({len(packed.sections)} of {packed.section_count} sections)"
+        print(f"  {kind:>7} {packed.tokens:>7}  {packed.relative}{detail}", file=report)
+    for relative in pack.omitted:
+        print(f"  {'omitted':>7} {'':>7}  {relative}", file=report)
+    for reference in pack.missing:
+        print(f"  {'missing':>7} {'':>7}  {reference}", file=report)
+    for reference in pack.directories:
+        print(f"  {'dir':>7} {'':>7}  {reference}", file=report)
+    share = pack.saved_tokens / pack.naive_tokens * 100 if pack.naive_tokens else 0.0
+    print(
+        f"packed {pack.tokens} of {pack.budget} budget tokens from {len(pack.files)} file(s); "
+        f"naive concatenation {pack.naive_tokens}, saved {pack.saved_tokens} ({share:.1f}%)",
+        file=report,
+    )
+    return 0
+
+
+def _urls(args: argparse.Namespace) -> int:
+    links = external_links(Corpus(args.root))
+    cache = UrlCache(
+        None if args.no_cache else default_url_cache_path(args.root), ttl=args.ttl * 3600
+    )
+    report = check_urls(links, cache, per_host=args.per_host, timeout=args.timeout)
+
+    for result in report.broken:
+        reason = result.error or f"HTTP {result.status}"
+        print(f"- {result.url} ({reason}, {result.attempts} attempt(s))")
+        for location in links[result.url]:
+            print(f"    linked from {location}")
+    print(
+        f"{len(report.results)} URL(s), {len(report.broken)} broken; "
+        f"{report.requests} request(s) over {report.connections} connection(s), "
+        f"cache hits={report.cache_hits}; {report.seconds * 1000:.1f} ms"
+    )
+    return 1 if report.broken else 0
+
+
+def _prompts(args: argparse.Namespace) -> int:
+    path = args.output or default_library_path(args.root)
+    index = compile_library(Corpus(args.root), path)
+    for scaffold, entries in index["prompts"].items():
+        print(f"{scaffold}: {len(entries)} prompt(s)")
+        for name in entries:
+            print(f"  {name}")
+    total = sum(len(entries) for entries in index["prompts"].values())
+    print(f"{total} prompt(s) compiled to {path} (version {index['version']})")
+    return 0
+
+
+def _prompt(args: argparse.Namespace) -> int:
+    path = args.library or default_library_path(args.root)
+    library = load_library(Corpus(args.root), path)
+    try:
+        prompt = library.get(args.scaffold, args.name)
+    except KeyError:
+        names = ", ".join(library.names(args.scaffold)) or "none"
+        print(f"unknown prompt {args.name!r} for {args.scaffold}; available: {names}")
+        return 2
+    try:
+        if args.batch:
+            rows = json.loads(args.batch.read_text(encoding="utf-8"))
+            print(json.dumps(prompt.fill_batch(rows, args.partial), indent=2, ensure_ascii=False))
+        elif args.vars:
+            sys.stdout.write(prompt.fill(load_variables(args.vars), args.partial))
+        else:
+            print(f"{prompt.title} [{prompt.scaffold}/{prompt.name} @ {prompt.version}]")
+            print(f"parameters: {', '.join(prompt.parameters) or 'none'}")
+            sys.stdout.write(prompt.text)
+    except ValueError as error:
+        print(error)
+        return 1
+    return 0
+
+
+def _lsp(args: argparse.Namespace) -> int:
+    return LanguageServer(args.root).serve(sys.stdin.buffer, sys.stdout.buffer)
+
+
+def _budget(value: str) -> tuple[str, float]:
+    check, separator, seconds = value.rpartition("=")
+    try:
+        return (check if separator else DEFAULT_BUDGET), float(seconds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected [CHECK=]SECONDS: {value!r}") from None
+
+
+def _profile(args: argparse.Namespace) -> int:
+    summary = summarize(instrumented_run(args.root), top=args.top)
+    budgets = dict(args.budget)
+    violations = budget_violations(summary, budgets)
+    if args.json:
+        write_report(args.json, json_report(summary, budgets, violations))
+    if args.sarif:
+        write_report(args.sarif, sarif_report(summary, violations))
+
+    print(f"{'check':>26} {'seconds':>9} {'files':>6} {'bytes':>9} {'stats':>6} {'failures':>9}")
+    for check, totals in summary["checks"].items():
+        print(
+            f"{check:>26} {totals['seconds']:>9.4f} {totals['files']:>6} {totals['bytes']:>9} "
+            f"{totals['stat_calls']:>6} {totals['failures']:>9}"
+        )
+    print(f"\nslowest {len(summary['slowest_files'])} file(s):")
+    for entry in summary["slowest_files"]:
+        print(f"  {entry['seconds'] * 1000:>8.2f} ms  {entry['path']}")
+    for violation in violations:
+        print(f"budget exceeded: {violation}")
+    failures = summary["totals"]["failures"]
+    print(f"{failures} failure(s); {summary['totals']['seconds']:.3f} s in checks")
+    return 1 if failures or violations else 0
+
+
+def _fault_count(value: str) -> tuple[str, int]:
+    kind, _, count = value.partition("=")
+    if kind not in FAULTS or not count.isdigit():
+        raise argparse.ArgumentTypeError(
+            f"expected KIND=COUNT with KIND one of {', '.join(FAULTS)}: {value!r}"
+        )
+    return kind, int(count)
+
+
+def _generate(args: argparse.Namespace) -> int:
+    names = generate_tree(args.output, args.scaffolds, args.paragraphs)
+    for fault in inject_faults(args.output, names, dict(args.fault), args.seed):
+        print(f"{fault.kind:>20} {fault.relative}")
+    print(f"{len(names)} scaffold(s), {len(names) * 15 + 1} file(s) under {args.output}")
+    return 0
+
+
+def _test_shard(args: argparse.Namespace) -> int:
+    history = CostHistory(args.costs or default_costs_path(args.root))
+    start = args.start or args.root / "tests"
+    result = run_shard(start, args.index, args.count, history, stream=sys.stderr)
+    if args.output:
+        write_report(args.output, result)
+    print(
+        f"shard {args.index + 1}/{args.count}: {len(result['tests'])} test(s), "
+        f"{len(result['failures'])} failure(s); predicted {result['predicted_seconds']:.2f}s, "
+        f"took {result['seconds']:.2f}s"
+    )
+    return 1 if result["failures"] else 0
+
+
+def _merge(paths: list[Path], args: argparse.Namespace) -> int:
+    results: list[dict[str, Any]] = []
+    unreadable: list[str] = []
+    for path in paths:
+        try:
+            results.append(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError) as error:
+            unreadable.append(f"cannot read shard results {path}: {error}")
+    history = CostHistory(args.costs or default_costs_path(args.root))
+    merged = merge_shard_results(results, history)
+    merged.problems[:0] = unreadable
+    history.save()
+
+    for failure in merged.failures:
+        print(f"{failure['kind']}: {failure['test']}")
+        print(failure["detail"].rstrip())
+    for problem in merged.problems:
+        print(f"problem: {problem}")
+    for test_id in merged.missing:
+        print(f"not run: {test_id}")
+    for test_id in merged.duplicated:
+        print(f"run twice: {test_id}")
+    shard_times = ", ".join(f"{seconds:.2f}s" for seconds in merged.shard_seconds)
+    print(
+        f"{len(merged.outcomes)} of {len(merged.suite)} test(s) across {merged.shards} shard(s), "
+        f"{len(merged.failures)} failure(s); shard times {shard_times}"
+    )
+    code = 0 if merged.ok else 1
+    if args.coverage:
+        try:
+            total = combine_coverage(args.coverage, args.rcfile or args.root / ".coveragerc")
+        except ImportError:
+            print("coverage is not installed; cannot combine shard coverage", file=sys.stderr)
+            return 2
+        except ValueError as error:
+            print(f"problem: {error}")
+            return 1
+        if args.fail_under is not None and total < args.fail_under:
+            print(f"coverage {total:.2f}% is below the {args.fail_under:g}% floor")
+            code = 1
+    return code
+
+
+def _merge_shards(args: argparse.Namespace) -> int:
+    return _merge(args.results, args)
+
+
+def _test(args: argparse.Namespace) -> int:
+    output = args.output_dir or args.root / ".validation-cache" / "shards"
+    output.mkdir(parents=True, exist_ok=True)
+    for stale in [*output.glob("shard-*.json"), *output.glob(".coverage*")]:
+        stale.unlink()
+    tests = Path(__file__).resolve().parents[1]
+    path = os.pathsep.join(filter(None, [str(tests), os.environ.get("PYTHONPATH")]))
+    env = {**os.environ, "PYTHONPATH": path}
+    prefix = [sys.executable]
+    if args.coverage:
+        rcfile = args.rcfile or args.root / ".coveragerc"
+        prefix += ["-m", "coverage", "run", f"--rcfile={rcfile}", "--parallel-mode"]
+        env["COVERAGE_FILE"] = str(output / ".coverage")
+    paths = [output / f"shard-{index}.json" for index in range(args.shards)]
+    workers = [
+        subprocess.Popen(
+            [
+                *prefix,
+                "-m",
+                "scaffold_validation",
+                "--root",
+                str(args.root),
+                "test-shard",
+                "--index",
+                str(index),
+                "--count",
+                str(args.shards),
+                "--output",
+                str(path),
+                *(["--costs", str(args.costs)] if args.costs else []),
+            ],
+            env=env,
+        )
+        for index, path in enumerate(paths)
+    ]
+    for worker in workers:
+        worker.wait()
+    missing = [path for path in paths if not path.is_file()]
+    if missing:
+        print(f"shard(s) produced no result: {', '.join(map(str, missing))}", file=sys.stderr)
+        return 2
+    args.coverage = [output] if args.coverage else None
+    return _merge(paths, args)
+
+
+def _bench_validators(args: argparse.Namespace) -> int:
+    rows = synthetic_throughput(
+        args.scaffolds, args.paragraphs, dict(args.fault), args.seed, args.validators
+    )
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+    print(
+        f"{'validator':>26} {'files':>7} {'files/s':>10} {'MB/s':>8} "
+        f"{'peak RSS MiB':>13} {'failures':>9}"
+    )
+    for row in rows:
+        print(
+            f"{row['validator']:>26} {row['files']:>7} {row['files_per_second']:>10.0f} "
+            f"{row['bytes_per_second'] / 1e6:>8.2f} {row['peak_rss_kib'] / 1024:>13.1f} "
+            f"{row['failures']:>9}"
+        )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="validate", description=__doc__)
+    parser.add_argument("--root", type=Path, default=REPO_ROOT)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    test_shard = commands.add_parser(
+        "test-shard", help="run one cost-balanced shard of the unittest suite"
+    )
+    test_shard.add_argument("--index", type=int, required=True, help="0-based shard index")
+    test_shard.add_argument("--count", type=int, required=True, help="total number of shards")
+    test_shard.add_argument("--output", type=Path, help="write the shard result as JSON")
+    test_shard.add_argument("--start", type=Path, help="test directory (default: ROOT/tests)")
+    test_shard.add_argument(
+        "--costs", type=Path, help="cost history (default: .validation-cache/test-costs.json)"
+    )
+    test_shard.set_defaults(handler=_test_shard)
+
+    merge_shards = commands.add_parser(
+        "merge-shards", help="combine shard results and coverage; record test costs"
+    )
+    merge_shards.add_argument("results", nargs="+", type=Path, help="shard result files")
+    merge_shards.add_argument(
+        "--coverage", nargs="+", type=Path, help="coverage data files or directories to combine"
+    )
+    merge_shards.add_argument("--fail-under", type=float, help="minimum total coverage")
+    merge_shards.add_argument("--rcfile", type=Path, help="coverage config (default: .coveragerc)")
+    merge_shards.add_argument("--costs", type=Path, help="cost history to update")
+    merge_shards.set_defaults(handler=_merge_shards)
+
+    test = commands.add_parser("test", help="run the suite as local shard processes and merge")
+    test.add_argument("--shards", type=int, default=2, help="worker processes")
+    test.add_argument("--coverage", action="store_true", help="run shards under coverage")
+    test.add_argument("--fail-under", type=float, help="minimum total coverage")
+    test.add_argument("--rcfile", type=Path, help="coverage config (default: .coveragerc)")
+    test.add_argument("--costs", type=Path, help="cost history to read and update")
+    test.add_argument(
+        "--output-dir", type=Path, help="shard results (default: .validation-cache/shards)"
+    )
+    test.set_defaults(handler=_test)
+
+    stats = commands.add_parser("stats", help="profile corpus reads and tokenization")
+    stats.add_argument("--passes", type=int, default=5)
+    stats.set_defaults(handler=_stats)
+
+    check = commands.add_parser("check", help="run the per-file checks incrementally")
+    check.add_argument("--no-cache", action="store_true", help="force a cold run")
+    check.set_defaults(handler=_check)
+
+    changed = commands.add_parser(
+        "changed", help="validate files changed since a git ref and their dependents"
+    )
+    changed.add_argument("--base", required=True, help="git ref to diff against")
+    changed.set_defaults(handler=_changed)
+
+    run = commands.add_parser("run", help="run every check across a process pool")
+    run.add_argument("--jobs", type=int, default=None, help="worker count (default: all cores)")
+    run.set_defaults(handler=_run)
+
+    batch = commands.add_parser(
+        "batch", help="validate many repositories in one worker pool with one report"
+    )
+    batch.add_argument("roots", nargs="*", type=Path, help="repository roots")
+    batch.add_argument(
+        "--from", dest="from_file", type=Path, help="file listing one repository root per line"
+    )
+    batch.add_argument("--jobs", type=int, default=None, help="worker count (default: all cores)")
+    batch.add_argument("--json", type=Path, help="also write the aggregated report as JSON")
+    batch.set_defaults(handler=_batch)
+
+    bench_parallel = commands.add_parser(
+        "bench-parallel", help="measure process-pool speedup on a synthetic tree"
+    )
+    bench_parallel.add_argument("--scaffolds", type=int, default=200)
+    bench_parallel.add_argument("--jobs", type=int, nargs="+", default=None)
+    bench_parallel.set_defaults(handler=_bench_parallel)
+
+    bench_tokenizer = commands.add_parser(
+        "bench-tokenizer", help="time the tokenizer on pathological inputs"
+    )
+    bench_tokenizer.add_argument("--sizes", type=int, nargs="+", default=[10_000, 20_000, 40_000])
+    bench_tokenizer.add_argument(
+        "--skip-legacy", action="store_true", help="do not time the old regex scan"
+    )
+    bench_tokenizer.set_defaults(handler=_bench_tokenizer)
+
+    bench_stream = commands.add_parser(
+        "bench-stream", help="peak RSS of loading versus streaming one large log"
+    )
+    bench_stream.add_argument(
+        "--sizes", type=int, nargs="+", default=[16, 64, 256], help="log sizes in MiB"
+    )
+    bench_stream.add_argument(
+        "--chunk-size", type=int, default=READ_CHUNK_SIZE, help="bytes per read"
+    )
+    bench_stream.set_defaults(handler=_bench_stream)
+
+    bench_history = commands.add_parser(
+        "bench-history", help="time full and incremental history collection on a synthetic repo"
+    )
+    bench_history.add_argument(
+        "--changes", type=int, default=100_000, help="changes landed on the synthetic main"
+    )
+    bench_history.add_argument(
+        "--new", type=int, default=10, help="changes the incremental run picks up"
+    )
+    bench_history.set_defaults(handler=_bench_history)
+
+    profile = commands.add_parser(
+        "profile", help="time every check per file and scaffold; write JSON/SARIF reports"
+    )
+    profile.add_argument("--json", type=Path, help="write the JSON report here")
+    profile.add_argument("--sarif", type=Path, help="write a SARIF 2.1.0 log here")
+    profile.add_argument("--top", type=int, default=10, help="slowest files to list")
+    profile.add_argument(
+        "--budget",
+        type=_budget,
+        action="append",
+        default=[],
+        metavar="[CHECK=]SECONDS",
+        help="fail when a check (or, without CHECK, any check) exceeds SECONDS",
+    )
+    profile.set_defaults(handler=_profile)
+
+    render = commands.add_parser(
+        "render", help="render a scaffold's templates/ for one project or a batch"
+    )
+    render.add_argument("scaffold")
+    target = render.add_mutually_exclusive_group(required=True)
+    target.add_argument("--output", type=Path, help="directory for one rendered project")
+    target.add_argument(
+        "--projects",
+        type=Path,
+        help='JSON list of {"output": dir, "variables": {...}}; dirs relative to the file',
+    )
+    render.add_argument(
+        "--vars", type=Path, help="JSON object of placeholder values (batch defaults)"
+    )
+    render.add_argument(
+        "--strict", action="store_true", help="fail when prose placeholders stay unfilled"
+    )
+    render.set_defaults(handler=_render)
+
+    upgrade = commands.add_parser(
+        "upgrade", help="merge template changes into rendered projects under a directory"
+    )
+    upgrade.add_argument("directory", type=Path)
+    upgrade.add_argument("--jobs", type=int, default=None, help="worker count (default: all cores)")
+    upgrade.add_argument(
+        "--dry-run", action="store_true", help="report outcomes without writing files"
+    )
+    upgrade.set_defaults(handler=_upgrade)
+
+    graph = commands.add_parser(
+        "graph", help="link-graph reachability, orphans, cycles and in-degree"
+    )
+    graph.add_argument(
+        "--roots", nargs="+", help="entry documents (default: README.md and scaffold READMEs)"
+    )
+    graph.add_argument("--path", help="print the shortest link path from the roots to this file")
+    graph.add_argument("--top", type=int, default=10, help="most-linked documents to list")
+    graph.add_argument("--strict", action="store_true", help="fail when orphans exist")
+    graph.set_defaults(handler=_graph)
+
+    search = commands.add_parser(
+        "search", help="BM25 search over guide sections and agent prompts"
+    )
+    search.add_argument("query", nargs="+")
+    search.add_argument("--top", type=int, default=10)
+    search.add_argument(
+        "--prompts", action="store_true", help="only sections of 07-agent-prompts.md prompts"
+    )
+    search.add_argument(
+        "--index", type=Path, help="index file (default: .validation-cache/search.idx)"
+    )
+    search.add_argument(
+        "--no-refresh", action="store_true", help="query the index as is, without re-indexing"
+    )
+    search.set_defaults(handler=_search)
+
+    duplicates = commands.add_parser(
+        "duplicates", help="near-duplicate heading sections across files (MinHash/LSH)"
+    )
+    duplicates.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"estimated Jaccard similarity to report (default: {DEFAULT_THRESHOLD})",
+    )
+    duplicates.add_argument(
+        "--all", action="store_true", help="also list identical copies, not only diverging ones"
+    )
+    duplicates.add_argument("--json", type=Path, help="write the report as JSON")
+    duplicates.add_argument(
+        "--index", type=Path, help="signature file (default: .validation-cache/duplicates.json)"
+    )
+    duplicates.add_argument("--no-cache", action="store_true", help="re-hash every file")
+    duplicates.set_defaults(handler=_duplicates)
+
+    evaluate_command = commands.add_parser(
+        "evaluate", help="score scaffolds from gold-standard runs and reviews"
+    )
+    evaluate_command.add_argument(
+        "--write", action="store_true", help="regenerate the evaluation matrix table"
+    )
+    evaluate_command.add_argument("--no-cache", action="store_true", help="re-parse every artifact")
+    evaluate_command.set_defaults(handler=_evaluate)
+
+    history = commands.add_parser(
+        "history", help="weekly delivery metrics from git history for the metrics scoreboard"
+    )
+    history.add_argument("--repo", type=Path, help="git repository (default: --root)")
+    history.add_argument("--weeks", type=int, default=8, help="latest weeks to report")
+    history.add_argument(
+        "--scoreboard", type=Path, help="write the latest week as a filled metrics scoreboard"
+    )
+    history.add_argument("--json", type=Path, help="write the reported weeks as JSON")
+    history.add_argument(
+        "--no-checkpoint", action="store_true", help="read the whole history, keep no checkpoint"
+    )
+    history.set_defaults(handler=_history)
+
+    pack = commands.add_parser(
+        "pack", help="bundle the files an AGENTS.md references within a token budget"
+    )
+    pack.add_argument("agents", type=Path, help="an AGENTS.md (or AGENTS.md.template)")
+    pack.add_argument("--budget", type=int, required=True, help="token budget for the bundle")
+    pack.add_argument(
+        "--base", type=Path, help="directory paths are relative to (default: the file's)"
+    )
+    pack.add_argument("--output", type=Path, help="write the bundle here instead of stdout")
+    pack.add_argument("--no-cache", action="store_true", help="recount every file")
+    pack.set_defaults(handler=_pack)
+
+    urls = commands.add_parser("urls", help="check external http(s) links concurrently")
+    urls.add_argument(
+        "--per-host", type=int, default=DEFAULT_PER_HOST, help="concurrent requests per host"
+    )
+    urls.add_argument(
+        "--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per request"
+    )
+    urls.add_argument(
+        "--ttl", type=float, default=DEFAULT_TTL / 3600, help="hours a working URL stays cached"
+    )
+    urls.add_argument("--no-cache", action="store_true", help="request every URL")
+    urls.set_defaults(handler=_urls)
+
+    prompts = commands.add_parser(
+        "prompts", help="compile every 07-agent-prompts.md into the prompt library"
+    )
+    prompts.add_argument(
+        "--output",
+        type=Path,
+        help="artifact path (default: .validation-cache/prompt-library.jsonl)",
+    )
+    prompts.set_defaults(handler=_prompts)
+
+    prompt = commands.add_parser("prompt", help="show or fill one compiled prompt")
+    prompt.add_argument("scaffold")
+    prompt.add_argument("name", help="prompt name or heading title")
+    prompt.add_argument(
+        "--library",
+        type=Path,
+        help="compiled library to read or refresh (default: .validation-cache/prompt-library.jsonl)",
+    )
+    fill = prompt.add_mutually_exclusive_group()
+    fill.add_argument("--vars", type=Path, help="JSON object of parameter values")
+    fill.add_argument("--batch", type=Path, help="JSON list of parameter objects; prints JSON")
+    prompt.add_argument(
+        "--partial", action="store_true", help="leave missing parameters in place"
+    )
+    prompt.set_defaults(handler=_prompt)
+
+    watch_command = commands.add_parser(
+        "watch", help="revalidate changed files and their dependents on every save"
+    )
+    watch_command.add_argument(
+        "--poll", action="store_true", help="poll file signatures instead of using inotify"
+    )
+    watch_command.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help="polling interval in seconds",
+    )
+    watch_command.set_defaults(handler=_watch)
+
+    lsp = commands.add_parser(
+        "lsp", help="language server on stdin/stdout publishing diagnostics while editing"
+    )
+    lsp.set_defaults(handler=_lsp)
+
+    generate = commands.add_parser(
+        "generate", help="write a synthetic scaffold tree, optionally with faults"
+    )
+    generate.add_argument("output", type=Path)
+    generate.add_argument("--scaffolds", type=int, default=700, help="15 files per scaffold")
+    generate.add_argument("--paragraphs", type=int, default=8)
+    generate.add_argument(
+        "--fault", type=_fault_count, action="append", default=[], metavar="KIND=COUNT"
+    )
+    generate.add_argument("--seed", type=int, default=0)
+    generate.set_defaults(handler=_generate)
+
+    bench_validators = commands.add_parser(
+        "bench-validators", help="files/s, bytes/s and peak RSS per validator"
+    )
+    bench_validators.add_argument("--scaffolds", type=int, default=700)
+    bench_validators.add_argument("--paragraphs", type=int, default=8)
+    bench_validators.add_argument(
+        "--fault", type=_fault_count, action="append", default=[], metavar="KIND=COUNT"
+    )
+    bench_validators.add_argument("--seed", type=int, default=0)
+    bench_validators.add_argument(
+        "--validators", nargs="+", choices=validator_names(), default=None
+    )
+    bench_validators.add_argument("--json", action="store_true", help="print rows as JSON")
+    bench_validators.set_defaults(handler=_bench_validators)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    args.root = args.root.resolve()
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
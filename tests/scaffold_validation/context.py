@@ -0,0 +1,261 @@
+"""Token-budgeted context bundles from the file references in an AGENTS.md.
+
+Every AGENTS.md names the files an agent should read as backtick paths
+(the ``BACKTICK_PATH_PATTERN`` check enforces at least two). The packer
+resolves those paths against the project, drops duplicates, orders them
+with the "source of truth" / "read these files" section first, and fills
+a token budget in that order: whole files while they fit, then the
+heading sections of a file that does not, in document order. Directory
+references such as ``src/app/`` are listed separately rather than packed.
+
+Token counts are an estimate (word pieces, digit groups and punctuation,
+see ``count_tokens``) because no tokenizer ships with the toolkit; they
+are stable across runs, which is what budgeting needs. Per-file and
+per-section counts are cached by content digest.
+"""
+
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import re
+from typing import Any
+
+from scaffold_validation.anchors import heading_slugs
+from scaffold_validation.checks import BACKTICK_PATH_PATTERN
+from scaffold_validation.corpus import REPO_ROOT, Corpus, Document
+
+
+COUNTER_VERSION = "approx-1"
+DEFAULT_COUNT_CACHE = Path(".validation-cache") / "token-counts.json"
+SOURCE_SECTION_PATTERN = re.compile(
+    r"read these files|read in this order|sources? of truth", re.IGNORECASE
+)
+TOKEN_PIECE_PATTERN = re.compile(r"[^\W\d_]+|\d+|\S", re.UNICODE)
+# Bundle entries start with this header so agents can tell files apart.
+HEADER = "<!-- context: {location} ({tokens} tokens) -->\n"
+
+
+def count_tokens(text: str) -> int:
+    """Approximate BPE token count: long words and digit runs split into pieces."""
+    total = 0
+    for piece in TOKEN_PIECE_PATTERN.findall(text):
+        if piece[0].isdigit():
+            total += (len(piece) + 2) // 3
+        elif piece[0].isalpha():
+            total += 1 + (len(piece) - 1) // 8
+        else:
+            total += 1
+    return total
+
+
+@dataclass(frozen=True)
+class Reference:
+    path: str
+    line: int
+    # 0 inside a source-of-truth section, 1 anywhere else.
+    priority: int
+
+
+def references(document: Document) -> list[Reference]:
+    """Backtick file paths in ``document``, source-of-truth sections first.
+
+    Commands (anything with a space), placeholders and URLs are skipped.
+    """
+    headings = {heading.line: heading.text for heading in document.headings}
+    found: list[Reference] = []
+    priority = 1
+    for number, line in enumerate(document.lines, start=1):
+        if number in headings:
+            priority = 0 if SOURCE_SECTION_PATTERN.search(headings[number]) else 1
+        for match in BACKTICK_PATH_PATTERN.finditer(line):
+            path = match.group(0)[1:-1].strip()
+            if any(character in path for character in " {}<>*") or "://" in path:
+                continue
+            found.append(Reference(path.removeprefix("./"), number, priority))
+    return sorted(found, key=lambda reference: reference.priority)
+
+
+@dataclass(frozen=True)
+class Slice:
+    """Lines ``[start, end)`` of a file; ``anchor`` is empty for text above the first heading."""
+
+    anchor: str
+    start: int
+    end: int
+    tokens: int
+
+
+def document_slices(document: Document) -> list[Slice]:
+    lines = document.lines
+    if not document.relative.endswith(".md"):
+        return [Slice("", 0, len(lines), count_tokens(document.text))]
+    starts = [
+        (heading.line - 1, slug)
+        for heading, slug in zip(document.headings, heading_slugs(document.headings))
+    ]
+    if not starts or starts[0][0] > 0:
+        starts.insert(0, (0, ""))
+    slices: list[Slice] = []
+    for position, (start, anchor) in enumerate(starts):
+        end = starts[position + 1][0] if position + 1 < len(starts) else len(lines)
+        slices.append(Slice(anchor, start, end, count_tokens("\n".join(lines[start:end]))))
+    return slices
+
+
+class TokenCountCache:
+    """Whole-file and per-section token counts keyed by content digest."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._counts: dict[str, Any] = {}
+        if path is not None and path.is_file():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            if isinstance(data, dict) and data.get("counter") == COUNTER_VERSION:
+                self._counts = data["counts"]
+
+    def slices(self, document: Document) -> list[Slice]:
+        entry = self._counts.get(document.digest)
+        if entry is not None:
+            self.hits += 1
+            return [Slice(*values) for values in entry]
+        self.misses += 1
+        slices = document_slices(document)
+        self._counts[document.digest] = [
+            [piece.anchor, piece.start, piece.end, piece.tokens] for piece in slices
+        ]
+        self._dirty = True
+        return slices
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temporary.write_text(
+            json.dumps({"counter": COUNTER_VERSION, "counts": self._counts}), encoding="utf-8"
+        )
+        os.replace(temporary, self.path)
+        self._dirty = False
+
+
+def default_count_cache_path(root: Path = REPO_ROOT) -> Path:
+    return root / DEFAULT_COUNT_CACHE
+
+
+@dataclass
+class PackedFile:
+    relative: str
+    tokens: int
+    # Included anchors when the file was sliced; empty when it went in whole.
+    sections: list[str]
+    section_count: int
+    text: str
+
+    @property
+    def whole(self) -> bool:
+        return not self.sections
+
+
+@dataclass
+class ContextPack:
+    budget: int
+    naive_tokens: int
+    files: list[PackedFile] = field(default_factory=list)
+    omitted: list[str] = field(default_factory=list)
+    missing: list[str] = field(default_factory=list)
+    # Referenced directories; they name where to look rather than what to read.
+    directories: list[str] = field(default_factory=list)
+
+    @property
+    def tokens(self) -> int:
+        return sum(packed.tokens for packed in self.files)
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.naive_tokens - self.tokens
+
+    def render(self) -> str:
+        return "".join(packed.text for packed in self.files)
+
+
+def _entry(relative: str, anchors: list[str], body: str, tokens: int) -> tuple[str, int]:
+    location = relative
+    if anchors:
+        location += "#" + ",#".join(anchor or "top" for anchor in anchors)
+    header = HEADER.format(location=location, tokens=tokens)
+    text = header + body + ("" if body.endswith("\n") else "\n")
+    return text, tokens + count_tokens(header)
+
+
+def pack_context(
+    agents: Path, budget: int, base: Path | None = None, counts: TokenCountCache | None = None
+) -> ContextPack:
+    """Fill ``budget`` tokens with the files ``agents`` references, resolved against ``base``.
+
+    ``naive_tokens`` is what concatenating every referenced file once in
+    full would cost; header lines count against the budget. Files are read
+    afresh on every call, so a long-lived caller packs the current text.
+    """
+    base = (base or agents.parent).resolve()
+    counts = counts or TokenCountCache()
+    corpus = Corpus(base)
+    agents_document = Document(agents, agents.name, agents.read_text(encoding="utf-8"))
+
+    pack = ContextPack(budget, 0)
+    seen: set[Path] = set()
+    remaining = budget
+    for reference in references(agents_document):
+        path = Path(os.path.normpath(base / reference.path))
+        if reference.path.endswith("/") or path.is_dir():
+            if reference.path not in pack.directories:
+                pack.directories.append(reference.path)
+            continue
+        if not path.is_file() or not path.is_relative_to(base):
+            if reference.path not in pack.missing:
+                pack.missing.append(reference.path)
+            continue
+        if path in seen:
+            continue
+        seen.add(path)
+        document = corpus.document(path)
+        slices = counts.slices(document)
+        whole_tokens = sum(piece.tokens for piece in slices)
+        pack.naive_tokens += whole_tokens
+
+        text, cost = _entry(document.relative, [], document.text, whole_tokens)
+        if cost <= remaining:
+            pack.files.append(PackedFile(document.relative, cost, [], len(slices), text))
+            remaining -= cost
+            continue
+
+        chosen: list[Slice] = []
+        for piece in slices:
+            anchors = [chosen_piece.anchor for chosen_piece in chosen] + [piece.anchor]
+            tokens = sum(chosen_piece.tokens for chosen_piece in chosen) + piece.tokens
+            if _entry(document.relative, anchors, "", tokens)[1] <= remaining:
+                chosen.append(piece)
+        if not chosen:
+            pack.omitted.append(document.relative)
+            continue
+        body = "\n".join("\n".join(document.lines[piece.start : piece.end]) for piece in chosen)
+        text, cost = _entry(
+            document.relative,
+            [piece.anchor for piece in chosen],
+            body,
+            sum(piece.tokens for piece in chosen),
+        )
+        pack.files.append(
+            PackedFile(
+                document.relative, cost, [piece.anchor for piece in chosen], len(slices), text
+            )
+        )
+        remaining -= cost
+    counts.save()
+    return pack
@@ -0,0 +1,339 @@
+"""Single-pass markdown corpus shared by every validation test module.
+
+The tree is walked once per process and each file is read at most once.
+Each document is tokenized in one linear pass on first access (see
+``tokenizer``); headings, links, fences, table rows and placeholders are
+views over that token list, so test classes that ask for them share one
+parse.
+"""
+
+import codecs
+from functools import cached_property, lru_cache
+import hashlib
+from pathlib import Path
+import time
+from typing import Iterable, Iterator
+
+from scaffold_validation.anchors import Slugger, heading_slugs, html_anchors
+from scaffold_validation.tokenizer import (
+    ChecklistItem,
+    Fence,
+    Heading,
+    Link,
+    Placeholder,
+    TableRow,
+    Token,
+    scan_links,
+    tokenize,
+)
+from scaffold_validation.walk import StatCache, Tree, load_ignore_rules, walk_tree
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+# Files larger than this are scanned in chunks (see ``stream``) rather than loaded.
+STREAM_THRESHOLD = 8 * 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+
+TOKEN_KINDS = (
+    "headings",
+    "links",
+    "fences",
+    "table_rows",
+    "table_links",
+    "placeholders",
+    "checklist",
+    "anchors",
+)
+
+
+def iter_lines(path: Path, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[str]:
+    """The lines ``Document.lines`` would hold for ``path``, read a chunk at a time.
+
+    Memory is one chunk plus the longest line, whatever the file size. A
+    carriage return ending a chunk is held back in case the next chunk
+    starts with a line feed, so CRLF split across chunks is one break.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    with path.open("rb") as handle:
+        while True:
+            data = handle.read(chunk_size)
+            text = pending + decoder.decode(data, final=not data)
+            held = ""
+            if data and text.endswith("\r"):
+                text, held = text[:-1], "\r"
+            parts = text.replace("\r\n", "\n").splitlines(keepends=True)
+            pending = held
+            if data and parts and parts[-1].splitlines()[0] == parts[-1]:
+                # The last line continues in the next chunk.
+                pending = parts.pop() + held
+            for part in parts:
+                yield part.splitlines()[0]
+            if not data:
+                return
+
+
+def stream_anchors(path: Path, chunk_size: int = READ_CHUNK_SIZE) -> frozenset[str]:
+    """``Document.anchors`` for ``path`` without loading it; HTML anchors match per line."""
+    found: set[str] = set()
+    slugger = Slugger()
+
+    def lines() -> Iterator[str]:
+        for line in iter_lines(path, chunk_size):
+            if "<" in line:
+                found.update(html_anchors(line))
+            yield line
+
+    for token in tokenize(lines()):
+        if isinstance(token, Heading):
+            slugger(token.text)
+    return frozenset(found.union(slugger.seen))
+
+
+class Document:
+    """One markdown or template file, read once and tokenized on demand."""
+
+    def __init__(self, path: Path, relative: str, text: str, digest: str = ""):
+        self.path = path
+        self.relative = relative
+        self.text = text
+        self.digest = digest
+
+    @cached_property
+    def lines(self) -> list[str]:
+        return self.text.splitlines()
+
+    @cached_property
+    def lowered(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def tokens(self) -> list[Token]:
+        return list(tokenize(self.lines))
+
+    def _tokens_of(self, kind: type) -> list:
+        return [token for token in self.tokens if isinstance(token, kind)]
+
+    @cached_property
+    def link_tokens(self) -> list[Link]:
+        """Links outside fenced and indented code."""
+        return self._tokens_of(Link)
+
+    @cached_property
+    def links(self) -> list[str]:
+        """Raw link targets outside fenced and indented code."""
+        return [link.target for link in self.link_tokens]
+
+    @cached_property
+    def table_rows(self) -> list[TableRow]:
+        return self._tokens_of(TableRow)
+
+    @cached_property
+    def table_links(self) -> list[str]:
+        """Targets of table cells that consist of exactly one link."""
+        targets: list[str] = []
+        for row in self.table_rows:
+            for cell in row.cells:
+                links = list(scan_links(cell, row.line))
+                if (
+                    len(links) == 1
+                    and links[0].text
+                    and cell == f"[{links[0].text}]({links[0].target})"
+                ):
+                    targets.append(links[0].target)
+        return targets
+
+    @cached_property
+    def placeholders(self) -> list[str]:
+        """``{placeholder}`` spans anywhere in the file, code included."""
+        return [placeholder.name for placeholder in self._tokens_of(Placeholder)]
+
+    @cached_property
+    def checklist(self) -> list[ChecklistItem]:
+        return self._tokens_of(ChecklistItem)
+
+    @cached_property
+    def fences(self) -> list[Fence]:
+        return sorted(self._tokens_of(Fence), key=lambda fence: fence.start)
+
+    @cached_property
+    def headings(self) -> list[Heading]:
+        """ATX headings outside code."""
+        return self._tokens_of(Heading)
+
+    @cached_property
+    def anchors(self) -> frozenset[str]:
+        """Fragment identifiers GitHub generates for this file."""
+        return frozenset(heading_slugs(self.headings)) | frozenset(html_anchors(self.text))
+
+
+class Corpus:
+    """Index of a scaffold tree; documents are read lazily and exactly once."""
+
+    def __init__(self, root: Path = REPO_ROOT, stream_threshold: int = STREAM_THRESHOLD):
+        self.root = root
+        self.stream_threshold = stream_threshold
+        self.bytes_read = 0
+        self.files_read = 0
+        self.walk_seconds = 0.0
+        self.read_seconds = 0.0
+        self.ignore_rules = load_ignore_rules(root)
+        self._documents: dict[Path, Document] = {}
+        self._streamed_anchors: dict[Path, frozenset[str]] = {}
+        self._tree: Tree | None = None
+        self._stats: StatCache | None = None
+
+    def _walk(self) -> Tree:
+        if self._tree is None:
+            started = time.perf_counter()
+            self._tree = walk_tree(self.root, self.ignore_rules)
+            self._stats = StatCache(self._tree)
+            self.walk_seconds += time.perf_counter() - started
+        return self._tree
+
+    @property
+    def files(self) -> list[Path]:
+        """Every file under the root outside ignored directories, sorted."""
+        return self._walk().files
+
+    @property
+    def directories(self) -> list[Path]:
+        return self._walk().directories
+
+    @property
+    def stat_calls(self) -> int:
+        """Filesystem stats issued for lookups the walk could not answer."""
+        return self._stats.stat_calls if self._stats is not None else 0
+
+    @cached_property
+    def relative_files(self) -> frozenset[str]:
+        return frozenset(self.relative(path) for path in self.files)
+
+    def relative(self, path: Path) -> str:
+        return path.relative_to(self.root).as_posix()
+
+    def document(self, path: Path) -> Document:
+        document = self._documents.get(path)
+        if document is None:
+            started = time.perf_counter()
+            data = path.read_bytes()
+            self.bytes_read += len(data)
+            self.files_read += 1
+            text = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+            digest = hashlib.sha256(data).hexdigest()
+            document = Document(path, self.relative(path), text, digest)
+            self._documents[path] = document
+            self.read_seconds += time.perf_counter() - started
+        return document
+
+    def overlay(self, relative: str, text: str | None) -> Document | None:
+        """Serve ``text`` for ``relative`` instead of the file, e.g. an unsaved buffer.
+
+        ``None`` drops the overlay so the next access reads the file again.
+        """
+        path = self.root / relative
+        if text is None:
+            self._documents.pop(path, None)
+            return None
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        document = Document(path, relative, text, digest)
+        self._documents[path] = document
+        return document
+
+    def refresh(self, relatives: Iterable[str]) -> None:
+        """Re-walk on next access and drop ``relatives``; other documents stay cached."""
+        self._tree = None
+        self._stats = None
+        self.__dict__.pop("relative_files", None)
+        for relative in relatives:
+            self._documents.pop(self.root / relative, None)
+            self._streamed_anchors.pop(self.root / relative, None)
+
+    def is_large(self, path: Path) -> bool:
+        """Whether ``path`` should be streamed; documents already loaded never are."""
+        return path not in self._documents and path.stat().st_size > self.stream_threshold
+
+    def anchors(self, relative: str) -> frozenset[str]:
+        """``Document.anchors`` of ``relative``; large files are streamed, not loaded."""
+        path = self.root / relative
+        if not self.is_large(path):
+            return self.document(path).anchors
+        anchors = self._streamed_anchors.get(path)
+        if anchors is None:
+            anchors = self._streamed_anchors[path] = stream_anchors(path)
+        return anchors
+
+    def exists(self, path: Path) -> bool:
+        self._walk()
+        return self._stats.exists(path)
+
+    def is_file(self, path: Path) -> bool:
+        self._walk()
+        return self._stats.is_file(path)
+
+    def is_dir(self, path: Path) -> bool:
+        self._walk()
+        return self._stats.is_dir(path)
+
+    def markdown_paths(self) -> list[Path]:
+        return [path for path in self.files if path.suffix == ".md"]
+
+    def template_paths(self) -> list[Path]:
+        return [path for path in self.files if path.name.endswith(".md.template")]
+
+    def markdown(self) -> list[Document]:
+        return [self.document(path) for path in self.markdown_paths()]
+
+    def templates(self) -> list[Document]:
+        return [self.document(path) for path in self.template_paths()]
+
+    def children(self, directory: Path) -> list[Path]:
+        """Files and directories directly inside ``directory``."""
+        return self._walk().children.get(directory, [])
+
+    def scaffold_names(self) -> list[str]:
+        """Top-level directories shaped like a scaffold (README + templates/)."""
+        return [
+            path.name
+            for path in self.children(self.root)
+            if f"{path.name}/README.md" in self.relative_files
+            and (path / "templates") in self._walk().children
+        ]
+
+    def scaffold_document(self, scaffold: str, *parts: str) -> Document:
+        return self.document(self.root.joinpath(scaffold, *parts))
+
+
+@lru_cache(maxsize=None)
+def load_corpus(root: Path = REPO_ROOT) -> Corpus:
+    """Process-wide corpus for ``root``; every caller gets the same instance."""
+    return Corpus(root)
+
+
+def read_profile(root: Path = REPO_ROOT, passes: int = 5) -> dict[str, float]:
+    """Time ``passes`` full token sweeps over a fresh corpus.
+
+    ``bytes_read`` equals ``bytes_on_disk`` when every file is read once,
+    however many sweeps ask for it.
+    """
+    corpus = Corpus(root)
+    sweep_seconds: list[float] = []
+    for _ in range(passes):
+        started = time.perf_counter()
+        for document in (*corpus.markdown(), *corpus.templates()):
+            for token in TOKEN_KINDS:
+                getattr(document, token)
+        sweep_seconds.append(time.perf_counter() - started)
+
+    documents = {*corpus.markdown_paths(), *corpus.template_paths()}
+    return {
+        "files": len(documents),
+        "bytes_on_disk": sum(path.stat().st_size for path in documents),
+        "bytes_read": corpus.bytes_read,
+        "files_read": corpus.files_read,
+        "walk_seconds": corpus.walk_seconds,
+        "read_seconds": corpus.read_seconds,
+        "first_sweep_seconds": sweep_seconds[0],
+        "warm_sweep_seconds": min(sweep_seconds[1:], default=0.0),
+    }
@@ -0,0 +1,310 @@
+"""Near-duplicate heading sections across scaffolds, via MinHash and LSH.
+
+Each heading section of a guide or template (see
+``search.section_spans``) is reduced to its set of word
+``SHINGLE_SIZE``-grams and a MinHash signature of ``SIGNATURE_SIZE``
+values. Signatures use one-permutation hashing: every
+shingle is hashed once into one of the bins, each bin keeps its minimum,
+and empty bins borrow from the next filled bin (densification). A
+signature therefore costs one pass over the section, and the share of
+equal bins between two signatures estimates the Jaccard similarity of
+their shingle sets.
+
+Locality-sensitive hashing splits every signature into ``BANDS`` bands.
+Sections that share a band become candidate pairs, so the number of
+comparisons grows with the number of similar sections, not with the
+square of all sections. Candidates at or above the threshold are
+reported as identical copies (same normalized words) or diverging ones.
+
+Signatures persist in ``.validation-cache/duplicates.json`` next to each
+file's digest; an update re-reads and re-hashes only files whose
+``(mtime_ns, size)`` signature and digest changed.
+"""
+
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
+import struct
+import time
+from typing import Any
+import zlib
+
+from scaffold_validation.cache import RACY_WINDOW_NS
+from scaffold_validation.corpus import REPO_ROOT, Corpus, Document
+from scaffold_validation.search import section_spans
+
+
+DEFAULT_INDEX_PATH = Path(".validation-cache") / "duplicates.json"
+INDEX_VERSION = 1
+SHINGLE_SIZE = 5
+SIGNATURE_SIZE = 64
+BANDS = 16
+ROWS = SIGNATURE_SIZE // BANDS
+# Sections shorter than this many shingles (about a sentence) are skipped.
+MIN_SHINGLES = 12
+DEFAULT_THRESHOLD = 0.6
+WORD_PATTERN = re.compile(r"\w+")
+# Bin values use the hash bits above the bin number; a value borrowed
+# from ``distance`` bins away is offset by ``distance * BIN_RANGE``.
+BIN_RANGE = 1 << (32 - (SIGNATURE_SIZE - 1).bit_length())
+_SIGNATURE = struct.Struct(f"<{SIGNATURE_SIZE}I")
+
+
+def words(text: str) -> list[str]:
+    return WORD_PATTERN.findall(text.lower())
+
+
+def shingle_hashes(tokens: list[str]) -> set[int]:
+    return {
+        zlib.crc32(" ".join(tokens[start : start + SHINGLE_SIZE]).encode("utf-8"))
+        for start in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash(hashes: set[int]) -> tuple[int, ...]:
+    """Densified one-permutation MinHash signature of a non-empty hash set."""
+    bins: list[int | None] = [None] * SIGNATURE_SIZE
+    for value in hashes:
+        slot, rank = value % SIGNATURE_SIZE, value // SIGNATURE_SIZE
+        current = bins[slot]
+        if current is None or rank < current:
+            bins[slot] = rank
+    signature: list[int] = []
+    for slot in range(SIGNATURE_SIZE):
+        distance = 0
+        while bins[(slot + distance) % SIGNATURE_SIZE] is None:
+            distance += 1
+        signature.append(bins[(slot + distance) % SIGNATURE_SIZE] + distance * BIN_RANGE)
+    return tuple(signature)
+
+
+def similarity(first: tuple[int, ...], second: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return sum(1 for a, b in zip(first, second) if a == b) / SIGNATURE_SIZE
+
+
+@dataclass(frozen=True)
+class SectionRef:
+    relative: str
+    heading: str
+    anchor: str
+    line: int
+
+    @property
+    def location(self) -> str:
+        return f"{self.relative}#{self.anchor}" if self.anchor else self.relative
+
+
+@dataclass(frozen=True)
+class SectionSignature:
+    section: SectionRef
+    # Digest of the section's normalized words; equal digests are identical copies.
+    digest: str
+    signature: tuple[int, ...]
+
+
+def document_signatures(document: Document) -> list[SectionSignature]:
+    """Signatures of the sections of ``document`` long enough to compare."""
+    signatures: list[SectionSignature] = []
+    for line, end, heading, anchor in section_spans(document):
+        tokens = words("\n".join(document.lines[line:end]))
+        hashes = shingle_hashes(tokens)
+        if len(hashes) < MIN_SHINGLES:
+            continue
+        digest = hashlib.sha256(" ".join(tokens).encode("utf-8")).hexdigest()[:16]
+        section = SectionRef(document.relative, heading, anchor, max(line, 1))
+        signatures.append(SectionSignature(section, digest, minhash(hashes)))
+    return signatures
+
+
+def default_duplicates_path(root: Path = REPO_ROOT) -> Path:
+    return root / DEFAULT_INDEX_PATH
+
+
+class SignatureIndex:
+    """Per-file section signatures, persisted as JSON and refreshed incrementally."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self.documents: dict[str, dict[str, Any]] = {}
+        self.reindexed = 0
+        self._dirty = False
+        if path is not None and path.is_file():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            if isinstance(data, dict) and data.get("version") == self._version():
+                self.documents = data.get("documents", {})
+
+    @staticmethod
+    def _version() -> str:
+        return f"{INDEX_VERSION}:{SHINGLE_SIZE}:{SIGNATURE_SIZE}:{MIN_SHINGLES}"
+
+    def update(self, corpus: Corpus) -> int:
+        """Re-hash files that changed since the last update; returns how many."""
+        documents: dict[str, dict[str, Any]] = {}
+        self.reindexed = 0
+        for path in (*corpus.markdown_paths(), *corpus.template_paths()):
+            relative = corpus.relative(path)
+            stat = path.stat()
+            signature = [stat.st_mtime_ns, stat.st_size]
+            settled = time.time_ns() - stat.st_mtime_ns > RACY_WINDOW_NS
+            entry = self.documents.get(relative)
+            if entry is not None and entry["stat"] == signature:
+                documents[relative] = entry
+                continue
+            document = corpus.document(path)
+            if entry is None or entry["sha256"] != document.digest:
+                entry = {
+                    "sha256": document.digest,
+                    "sections": [
+                        [
+                            found.section.line,
+                            found.section.heading,
+                            found.section.anchor,
+                            found.digest,
+                            _SIGNATURE.pack(*found.signature).hex(),
+                        ]
+                        for found in document_signatures(document)
+                    ],
+                }
+                self.reindexed += 1
+            documents[relative] = {**entry, "stat": signature if settled else None}
+        self._dirty = self._dirty or documents != self.documents
+        self.documents = documents
+        return self.reindexed
+
+    def signatures(self) -> list[SectionSignature]:
+        return [
+            SectionSignature(
+                SectionRef(relative, heading, anchor, line),
+                digest,
+                _SIGNATURE.unpack(bytes.fromhex(packed)),
+            )
+            for relative, entry in sorted(self.documents.items())
+            for line, heading, anchor, digest, packed in entry["sections"]
+        ]
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temporary.write_text(
+            json.dumps({"version": self._version(), "documents": self.documents}),
+            encoding="utf-8",
+        )
+        os.replace(temporary, self.path)
+        self._dirty = False
+
+
+@dataclass(frozen=True)
+class SimilarPair:
+    first: SectionRef
+    second: SectionRef
+    similarity: float
+    identical: bool
+
+
+@dataclass
+class DuplicateReport:
+    pairs: list[SimilarPair]
+    documents: int
+    sections: int
+    reindexed: int
+    # Pairs that shared an LSH band and had their signatures compared.
+    candidates: int
+    seconds: float
+
+    @property
+    def identical(self) -> list[SimilarPair]:
+        return [pair for pair in self.pairs if pair.identical]
+
+    @property
+    def diverging(self) -> list[SimilarPair]:
+        return [pair for pair in self.pairs if not pair.identical]
+
+    def copies(self) -> list[list[SectionRef]]:
+        """Sections with identical words, one group per text, each sorted by location."""
+        groups: dict[SectionRef, set[SectionRef]] = {}
+        for pair in self.identical:
+            group = groups.get(pair.first, {pair.first}) | groups.get(pair.second, {pair.second})
+            for section in group:
+                groups[section] = group
+        unique = {id(group): group for group in groups.values()}.values()
+        ordered = [sorted(group, key=lambda section: section.location) for group in unique]
+        return sorted(ordered, key=lambda group: group[0].location)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "documents": self.documents,
+            "sections": self.sections,
+            "reindexed": self.reindexed,
+            "candidates": self.candidates,
+            "seconds": round(self.seconds, 6),
+            "pairs": [
+                {
+                    "first": pair.first.location,
+                    "second": pair.second.location,
+                    "similarity": pair.similarity,
+                    "identical": pair.identical,
+                }
+                for pair in self.pairs
+            ],
+        }
+
+
+def similar_pairs(
+    signatures: list[SectionSignature], threshold: float = DEFAULT_THRESHOLD
+) -> tuple[list[SimilarPair], int]:
+    """Pairs of sections in different files at or above ``threshold``, most similar first.
+
+    Also returns the number of candidate pairs LSH produced.
+    """
+    buckets: dict[tuple[int, tuple[int, ...]], list[int]] = {}
+    for number, found in enumerate(signatures):
+        for band in range(BANDS):
+            key = (band, found.signature[band * ROWS : (band + 1) * ROWS])
+            buckets.setdefault(key, []).append(number)
+    candidates: set[tuple[int, int]] = set()
+    for members in buckets.values():
+        for position, first in enumerate(members):
+            for second in members[position + 1 :]:
+                candidates.add((first, second))
+
+    pairs: list[SimilarPair] = []
+    for first, second in candidates:
+        a, b = sorted(
+            (signatures[first], signatures[second]), key=lambda found: found.section.location
+        )
+        if a.section.relative == b.section.relative:
+            continue
+        score = similarity(a.signature, b.signature)
+        if score >= threshold:
+            pairs.append(SimilarPair(a.section, b.section, score, a.digest == b.digest))
+    pairs.sort(key=lambda pair: (-pair.similarity, pair.first.location, pair.second.location))
+    return pairs, len(candidates)
+
+
+def find_duplicates(
+    corpus: Corpus, path: Path | None = None, threshold: float = DEFAULT_THRESHOLD
+) -> DuplicateReport:
+    """Refresh the signature index at ``path`` (``None`` keeps it in memory) and pair sections."""
+    started = time.perf_counter()
+    index = SignatureIndex(path)
+    index.update(corpus)
+    index.save()
+    signatures = index.signatures()
+    pairs, candidates = similar_pairs(signatures, threshold)
+    return DuplicateReport(
+        pairs,
+        len(index.documents),
+        len(signatures),
+        index.reindexed,
+        candidates,
+        time.perf_counter() - started,
+    )
@@ -0,0 +1,539 @@
+"""Gold-standard scores computed from execution and review artifacts.
+
+``meta/self-application/gold-standard/scaffold-evaluation-matrix.md``
+scores every scaffold 0–2 on the five criteria of
+``framework-gold-standard.md`` (0 not satisfied, 1 partially satisfied,
+2 satisfied with evidence). This module derives those scores from the
+artifacts and reports where the hand-edited matrix disagrees. Artifacts
+are parsed once into an ``EvidenceTable``: one ``array`` column per
+field, one row per execution run and per review, so scoring is a single
+pass over integers however many runs accumulate.
+
+Each score reads the framework's criterion literally:
+
+- Structural integrity ("passes all repository contract tests; required
+  guides/templates/links are complete"): 2 when the scaffold's manifest
+  checklist passes and its links resolve, 1 with failures, 0 when the
+  scaffold is missing.
+- Operator clarity ("README + AGENTS template provide unambiguous run
+  order"): whether they are unambiguous is a reviewer's judgement, so
+  the review's score is used; without a review the files existing is
+  only partial evidence (1), and a missing file is 0.
+- Execution effectiveness ("a realistic run demonstrates successful
+  outcome; run includes evidence artifacts"): 2 with a run whose
+  ``run-summary.md`` records an outcome and lists outputs that all
+  exist, 1 with only other runs or ``meta/self-application/<scaffold>/``
+  artifacts, 0 without any.
+- Safety resilience ("explicit rollback/abort behavior; no unsafe
+  shortcuts required"): 2 when a review verified the rollback path and
+  needed no unsafe workaround, 1 when only one holds or the scaffold's
+  documents spell out rollback or abort behavior, 0 otherwise.
+- Reproducibility ("repeat the flow with equivalent result; evidence is
+  stored in-repo"): 2 with two complete runs and a review reporting an
+  equivalent result, 1 with any stored run evidence, 0 without.
+
+Statuses follow the matrix legend, in the order of the framework's
+rating levels: ``Gold validated`` when structurally sound and the Gold
+threshold holds (at least 9, effectiveness and safety both 2), ``Silver
+validated`` when the automated integrity checks pass, ``In progress``
+when the scaffold exists but they fail, ``Not started`` otherwise.
+
+Parsed artifacts persist in ``.validation-cache/evaluation.json`` keyed
+by ``(mtime_ns, size)`` and digest, so adding a run parses one file.
+"""
+
+from array import array
+from dataclasses import dataclass
+import json
+import os
+from pathlib import Path
+import re
+import time
+from typing import Any
+
+from scaffold_validation import checks
+from scaffold_validation.cache import RACY_WINDOW_NS
+from scaffold_validation.corpus import REPO_ROOT, Corpus, Document
+from scaffold_validation.manifest import Manifest, load_manifest, run_checklist
+
+
+GOLD_STANDARD_DIR = "meta/self-application/gold-standard"
+SELF_APPLICATION_DIR = "meta/self-application"
+MATRIX_NAME = "scaffold-evaluation-matrix.md"
+DEFAULT_EVALUATION_PATH = Path(".validation-cache") / "evaluation.json"
+INDEX_VERSION = 2
+
+# Review labels, in matrix column order.
+CRITERIA = (
+    "Structural integrity",
+    "Operator clarity",
+    "Execution effectiveness",
+    "Safety resilience",
+    "Reproducibility",
+)
+STRUCTURE, CLARITY, EFFECTIVENESS, SAFETY, REPRODUCIBILITY = range(len(CRITERIA))
+MATRIX_HEADER = (
+    "| Scaffold | Structural integrity | Operator clarity | Effectiveness evidence "
+    "| Safety resilience | Reproducibility | Score | Status | Evidence |"
+)
+MATRIX_ALIGNMENT = "|---|---:|---:|---:|---:|---:|---:|---|---|"
+GOLD_SCORE = 9
+# Words that make a scaffold's rollback or abort behavior explicit.
+SAFETY_PATTERN = re.compile(r"\broll(?:back|ing back| back)\b|\babort", re.IGNORECASE)
+
+NOT_STARTED = "Not started"
+IN_PROGRESS = "In progress"
+SILVER = "Silver validated"
+GOLD = "Gold validated"
+
+# Evidence cells list the review and at most this many of the latest runs.
+EVIDENCE_RUNS = 3
+RUN_PATTERN = re.compile(r"run-(\d+)")
+FIELD_PATTERN = re.compile(r"-\s+([^`:?]+)[?:]\s*`([^`]*)`")
+OUTPUT_PATTERN = re.compile(r"`([^`]+)`")
+UNKNOWN = -1
+
+
+def _answer(value: str | None) -> int:
+    """``yes``/``no`` review answers as 1/0; anything else is unknown."""
+    if value is None:
+        return UNKNOWN
+    return {"yes": 1, "no": 0}.get(value.strip().lower(), UNKNOWN)
+
+
+def review_fields(document: Document) -> dict[str, str]:
+    """``- Label: `value``` and ``- Question? `value``` lines, first occurrence wins."""
+    fields: dict[str, str] = {}
+    for line in document.lines:
+        match = FIELD_PATTERN.match(line.strip())
+        if match:
+            fields.setdefault(match.group(1).strip(), match.group(2).strip())
+    return fields
+
+
+def parse_review(document: Document) -> dict[str, Any]:
+    fields = review_fields(document)
+    scores = []
+    for criterion in CRITERIA:
+        value = fields.get(criterion, "")
+        scores.append(int(value) if value in {"0", "1", "2"} else UNKNOWN)
+    return {
+        "kind": "review",
+        "scaffold": fields.get("Scaffold", ""),
+        "scores": scores,
+        "rollback": _answer(fields.get("Rollback path verified")),
+        "unsafe": _answer(fields.get("Unsafe workaround needed")),
+        "equivalent": _answer(fields.get("Equivalent result achieved")),
+    }
+
+
+def parse_run_summary(document: Document) -> dict[str, Any]:
+    """The files listed under ``## Outputs produced`` and the ``## Outcome`` bullet count."""
+    outputs: list[str] = []
+    outcome = 0
+    section = ""
+    for line in document.lines:
+        if line.startswith("#"):
+            section = line.lstrip("#").strip().lower()
+        elif line.lstrip().startswith("- "):
+            if section == "outputs produced":
+                outputs += OUTPUT_PATTERN.findall(line)
+            elif section == "outcome":
+                outcome += 1
+    return {"kind": "run", "outputs": outputs, "outcome": outcome}
+
+
+def default_evaluation_path(root: Path = REPO_ROOT) -> Path:
+    return root / DEFAULT_EVALUATION_PATH
+
+
+class ArtifactIndex:
+    """Parsed run summaries and reviews, persisted as JSON and refreshed incrementally."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self.records: dict[str, dict[str, Any]] = {}
+        self.parsed = 0
+        self._dirty = False
+        if path is not None and path.is_file():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            if isinstance(data, dict) and data.get("version") == INDEX_VERSION:
+                self.records = data.get("records", {})
+
+    def update(self, corpus: Corpus, paths: list[Path]) -> int:
+        """Re-parse ``paths`` that changed since the last update; returns how many."""
+        records: dict[str, dict[str, Any]] = {}
+        self.parsed = 0
+        for path in paths:
+            relative = corpus.relative(path)
+            stat = path.stat()
+            signature = [stat.st_mtime_ns, stat.st_size]
+            settled = time.time_ns() - stat.st_mtime_ns > RACY_WINDOW_NS
+            entry = self.records.get(relative)
+            if entry is not None and entry["stat"] == signature:
+                records[relative] = entry
+                continue
+            document = corpus.document(path)
+            if entry is None or entry["sha256"] != document.digest:
+                parse = parse_run_summary if path.name == "run-summary.md" else parse_review
+                entry = {"sha256": document.digest, "record": parse(document)}
+                self.parsed += 1
+            records[relative] = {**entry, "stat": signature if settled else None}
+        self._dirty = self._dirty or records != self.records
+        self.records = records
+        return self.parsed
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temporary.write_text(
+            json.dumps({"version": INDEX_VERSION, "records": self.records}), encoding="utf-8"
+        )
+        os.replace(temporary, self.path)
+        self._dirty = False
+
+
+class EvidenceTable:
+    """Runs and reviews as parallel columns; scaffolds are row ids into ``scaffolds``."""
+
+    def __init__(self, scaffolds: list[str]):
+        self.scaffolds = scaffolds
+        self._ids = {name: number for number, name in enumerate(scaffolds)}
+        self.run_scaffold = array("H")
+        self.run_number = array("I")
+        self.run_outputs = array("H")
+        self.run_present = array("H")
+        self.run_outcome = array("H")
+        self.run_path: list[str] = []
+        self.review_scaffold = array("H")
+        self.review_scores = [array("b") for _ in CRITERIA]
+        self.review_rollback = array("b")
+        self.review_unsafe = array("b")
+        self.review_equivalent = array("b")
+        self.review_path: list[str] = []
+
+    def add_run(
+        self, scaffold: str, number: int, outputs: int, present: int, outcome: int, path: str
+    ) -> None:
+        if scaffold not in self._ids:
+            return
+        self.run_scaffold.append(self._ids[scaffold])
+        self.run_number.append(number)
+        self.run_outputs.append(outputs)
+        self.run_present.append(present)
+        self.run_outcome.append(outcome)
+        self.run_path.append(path)
+
+    def add_review(self, record: dict[str, Any], path: str) -> None:
+        if record["scaffold"] not in self._ids:
+            return
+        self.review_scaffold.append(self._ids[record["scaffold"]])
+        for column, score in zip(self.review_scores, record["scores"]):
+            column.append(score)
+        self.review_rollback.append(record["rollback"])
+        self.review_unsafe.append(record["unsafe"])
+        self.review_equivalent.append(record["equivalent"])
+        self.review_path.append(path)
+
+    @property
+    def runs(self) -> int:
+        return len(self.run_number)
+
+    @property
+    def reviews(self) -> int:
+        return len(self.review_path)
+
+
+def load_evidence(
+    corpus: Corpus, scaffolds: list[str], index: ArtifactIndex | None = None
+) -> EvidenceTable:
+    """Parse (or reuse) every run summary and review under the gold-standard workspace."""
+    index = index or ArtifactIndex()
+    workspace = corpus.root / GOLD_STANDARD_DIR
+    # (scaffold, number, run directory, names inside it)
+    runs: list[tuple[str, int, Path, set[str]]] = []
+    for scaffold_dir in corpus.children(workspace / "executions"):
+        for run_dir in corpus.children(scaffold_dir):
+            match = RUN_PATTERN.fullmatch(run_dir.name)
+            if match:
+                names = {child.name for child in corpus.children(run_dir)}
+                runs.append((scaffold_dir.name, int(match.group(1)), run_dir, names))
+    runs.sort(key=lambda run: run[:2])
+    review_paths = [
+        path
+        for path in corpus.children(workspace / "reviews")
+        if path.name.endswith("-effectiveness-review.md")
+    ]
+    summaries = [
+        run_dir / "run-summary.md" for _, _, run_dir, names in runs if "run-summary.md" in names
+    ]
+    index.update(corpus, summaries + review_paths)
+
+    table = EvidenceTable(scaffolds)
+    for scaffold, number, run_dir, names in runs:
+        summary = corpus.relative(run_dir / "run-summary.md")
+        entry = index.records.get(summary) if "run-summary.md" in names else None
+        outputs = entry["record"]["outputs"] if entry else []
+        present = sum(
+            name in names if "/" not in name else corpus.is_file(run_dir / name)
+            for name in outputs
+        )
+        outcome = entry["record"]["outcome"] if entry else 0
+        table.add_run(scaffold, number, len(outputs), present, outcome, summary)
+    for path in review_paths:
+        relative = corpus.relative(path)
+        record = index.records[relative]["record"]
+        if not record["scaffold"]:
+            record = {**record, "scaffold": path.name.removesuffix("-effectiveness-review.md")}
+        table.add_review(record, relative)
+    return table
+
+
+def _scaffold_markdown(corpus: Corpus, scaffold: str) -> list[Document]:
+    prefix = f"{scaffold}/"
+    return [
+        corpus.document(path)
+        for path in corpus.markdown_paths() + corpus.template_paths()
+        if corpus.relative(path).startswith(prefix)
+    ]
+
+
+def structural_scores(corpus: Corpus, manifest: Manifest) -> dict[str, int]:
+    """2 when a scaffold's checklist passes and its links resolve, 1 with failures, 0 when missing."""
+    scores: dict[str, int] = {}
+    for scaffold in manifest.names:
+        if not corpus.is_dir(corpus.root / scaffold):
+            scores[scaffold] = 0
+            continue
+        results = run_checklist(corpus, manifest.checklist_for(scaffold))
+        failing = any(failures for _, _, failures in results) or any(
+            checks.corpus_link_failures(corpus, document)
+            for document in _scaffold_markdown(corpus, scaffold)
+            if document.relative.endswith(".md")
+        )
+        scores[scaffold] = 1 if failing else 2
+    return scores
+
+
+@dataclass(frozen=True)
+class ScaffoldScore:
+    scaffold: str
+    scores: tuple[int, ...]
+    status: str
+    # Matrix-relative links or notes backing the scores.
+    evidence: tuple[str, ...]
+    reviewed: bool = False
+
+    @property
+    def total(self) -> int:
+        return sum(self.scores)
+
+
+def score_scaffolds(
+    corpus: Corpus, table: EvidenceTable, structure: dict[str, int]
+) -> list[ScaffoldScore]:
+    """Apply the scoring rules to every scaffold of ``table``, in table order."""
+    count = len(table.scaffolds)
+    complete = [0] * count
+    runs: list[list[int]] = [[] for _ in range(count)]
+    for row in range(table.runs):
+        scaffold = table.run_scaffold[row]
+        outputs = table.run_outputs[row]
+        if outputs and table.run_present[row] == outputs and table.run_outcome[row]:
+            complete[scaffold] += 1
+        runs[scaffold].append(row)
+    # The last review of a scaffold wins.
+    reviews = {table.review_scaffold[row]: row for row in range(table.reviews)}
+
+    results: list[ScaffoldScore] = []
+    for number, scaffold in enumerate(table.scaffolds):
+        directory = corpus.root / scaffold
+        exists = corpus.is_dir(directory)
+        self_applied = bool(corpus.children(corpus.root / SELF_APPLICATION_DIR / scaffold))
+        evidence_stored = bool(runs[number]) or self_applied
+        review = reviews.get(number)
+
+        scores = [0] * len(CRITERIA)
+        scores[STRUCTURE] = structure.get(scaffold, 0)
+        documented = corpus.is_file(directory / "README.md") and corpus.is_file(
+            directory / "templates" / "AGENTS.md.template"
+        )
+        if documented:
+            reviewed = table.review_scores[CLARITY][review] if review is not None else UNKNOWN
+            scores[CLARITY] = reviewed if reviewed != UNKNOWN else 1
+        scores[EFFECTIVENESS] = 2 if complete[number] else 1 if evidence_stored else 0
+        rollback = review is not None and table.review_rollback[review] == 1
+        safe = review is not None and table.review_unsafe[review] == 0
+        if rollback and safe:
+            scores[SAFETY] = 2
+        elif rollback or safe or (exists and _documents_safety(corpus, scaffold)):
+            scores[SAFETY] = 1
+        equivalent = review is not None and table.review_equivalent[review] == 1
+        if complete[number] >= 2 and equivalent:
+            scores[REPRODUCIBILITY] = 2
+        elif evidence_stored:
+            scores[REPRODUCIBILITY] = 1
+
+        if not exists:
+            status = NOT_STARTED
+        elif scores[STRUCTURE] < 2:
+            status = IN_PROGRESS
+        elif (
+            sum(scores) >= GOLD_SCORE and scores[EFFECTIVENESS] == 2 and scores[SAFETY] == 2
+        ):
+            status = GOLD
+        else:
+            status = SILVER
+
+        evidence: list[str] = []
+        if review is not None:
+            evidence.append(f"[{scaffold} review]({_matrix_link(table.review_path[review])})")
+        shown = runs[number][-EVIDENCE_RUNS:]
+        if len(runs[number]) > len(shown):
+            evidence.append(f"{len(runs[number]) - len(shown)} earlier run(s)")
+        evidence += [
+            f"[run-{table.run_number[row]:03d}]({_matrix_link(table.run_path[row])})"
+            for row in shown
+        ]
+        if self_applied:
+            evidence.append("self-application run artifacts")
+        if not evidence and exists:
+            evidence.append("tests + docs only")
+        results.append(
+            ScaffoldScore(scaffold, tuple(scores), status, tuple(evidence), review is not None)
+        )
+    return results
+
+
+def _documents_safety(corpus: Corpus, scaffold: str) -> bool:
+    return any(
+        SAFETY_PATTERN.search(document.text) for document in _scaffold_markdown(corpus, scaffold)
+    )
+
+
+def _matrix_link(relative: str) -> str:
+    return relative[len(GOLD_STANDARD_DIR) + 1 :]
+
+
+def matrix_rows(scores: list[ScaffoldScore]) -> list[str]:
+    rows = [MATRIX_HEADER, MATRIX_ALIGNMENT]
+    for score in scores:
+        cells = [
+            score.scaffold,
+            *map(str, score.scores),
+            str(score.total),
+            score.status,
+            ", ".join(score.evidence),
+        ]
+        rows.append(f"| {' | '.join(cells)} |")
+    return rows
+
+
+def update_matrix(text: str, scores: list[ScaffoldScore]) -> str:
+    """``text`` with its scaffold table replaced; everything around it is kept."""
+    lines = text.splitlines()
+    start = next(
+        (number for number, line in enumerate(lines) if line.startswith("| Scaffold |")), None
+    )
+    rows = matrix_rows(scores)
+    if start is None:
+        return text.rstrip("\n") + "\n\n" + "\n".join(rows) + "\n"
+    end = start
+    while end < len(lines) and lines[end].startswith("|"):
+        end += 1
+    return "\n".join([*lines[:start], *rows, *lines[end:]]) + "\n"
+
+
+def matrix_cells(text: str) -> dict[str, list[str]]:
+    """Scaffold -> the cells of its row in the matrix table, scaffold name excluded."""
+    rows: dict[str, list[str]] = {}
+    in_table = False
+    for line in text.splitlines():
+        if line.startswith("| Scaffold |"):
+            in_table = True
+            continue
+        if not in_table:
+            continue
+        if not line.startswith("|"):
+            break
+        cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+        if cells and not set(cells[0]) <= set("-: "):
+            rows[cells[0]] = cells[1:]
+    return rows
+
+
+@dataclass(frozen=True)
+class Difference:
+    scaffold: str
+    # A matrix column name, or "row" when the scaffold has no row.
+    column: str
+    matrix: str
+    computed: str
+
+
+def matrix_differences(text: str, scores: list[ScaffoldScore]) -> list[Difference]:
+    """Scores, totals and statuses on which the matrix disagrees with ``scores``."""
+    columns = [*CRITERIA, "Score", "Status"]
+    rows = matrix_cells(text)
+    differences: list[Difference] = []
+    for score in scores:
+        cells = rows.get(score.scaffold)
+        if cells is None:
+            differences.append(Difference(score.scaffold, "row", "missing", "computed"))
+            continue
+        computed = [*map(str, score.scores), str(score.total), score.status]
+        for column, matrix, value in zip(columns, cells, computed):
+            if matrix != value:
+                differences.append(Difference(score.scaffold, column, matrix, value))
+    return differences
+
+
+@dataclass
+class Evaluation:
+    scores: list[ScaffoldScore]
+    runs: int
+    reviews: int
+    parsed: int
+    seconds: float
+    matrix: Path
+    current: str
+    updated: str
+
+    @property
+    def stale(self) -> bool:
+        return self.current != self.updated
+
+    @property
+    def differences(self) -> list[Difference]:
+        return matrix_differences(self.current, self.scores)
+
+    @property
+    def unreviewed(self) -> list[str]:
+        return [score.scaffold for score in self.scores if not score.reviewed]
+
+
+def evaluate(corpus: Corpus, path: Path | None = None) -> Evaluation:
+    """Score every manifest scaffold, refreshing the artifact index at ``path`` if given."""
+    started = time.perf_counter()
+    manifest = load_manifest(corpus.root)
+    index = ArtifactIndex(path)
+    table = load_evidence(corpus, manifest.names, index)
+    index.save()
+    scores = score_scaffolds(corpus, table, structural_scores(corpus, manifest))
+    matrix = corpus.root / GOLD_STANDARD_DIR / MATRIX_NAME
+    current = matrix.read_text(encoding="utf-8") if matrix.is_file() else ""
+    return Evaluation(
+        scores,
+        table.runs,
+        table.reviews,
+        index.parsed,
+        time.perf_counter() - started,
+        matrix,
+        current,
+        update_matrix(current, scores),
+    )
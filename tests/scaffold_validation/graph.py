@@ -0,0 +1,262 @@
+"""Link graph over the markdown documents of a scaffold tree.
+
+Every document (and every markdown link target, present or not) is
+interned to an integer ID once; adjacency is one ``array('I')`` of target
+IDs per node in each direction, so the whole graph for the repository is a
+few kilobytes. ``analyze`` answers reachability, orphan, in-degree and
+shortest-path questions from a single breadth-first pass over the edges;
+``cycles`` finds strongly connected components in another.
+
+Links to a directory point at that directory's ``README.md``, which is
+what GitHub renders for them. Links to anything but markdown are left to
+the link check. ``update`` replaces one document's edges in place, so a
+long-running integration (an editor, a CI daemon) never rebuilds it.
+"""
+
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable
+
+from scaffold_validation import checks
+from scaffold_validation.corpus import Corpus, Document
+
+
+INDEX_NAME = "README.md"
+
+
+def document_targets(corpus: Corpus, document: Document) -> list[str]:
+    """Root-relative markdown documents ``document`` links to, deduplicated."""
+    targets: dict[str, None] = {}
+    for raw_target, target in checks.local_link_targets(document):
+        if target.endswith(".md"):
+            targets[target] = None
+        elif raw_target.split("#", 1)[0].rstrip().endswith("/") or corpus.is_dir(
+            corpus.root / target
+        ):
+            targets[INDEX_NAME if target == "." else f"{target}/{INDEX_NAME}"] = None
+    targets.pop(document.relative, None)
+    return list(targets)
+
+
+def default_roots(corpus: Corpus) -> list[str]:
+    """The root ``README.md`` plus every scaffold's document index."""
+    roots = [f"{scaffold}/{INDEX_NAME}" for scaffold in corpus.scaffold_names()]
+    if INDEX_NAME in corpus.relative_files:
+        roots.insert(0, INDEX_NAME)
+    return roots
+
+
+@dataclass
+class GraphAnalysis:
+    roots: list[str]
+    # Per node ID; -1 where unreached.
+    distances: array
+    parents: array
+    in_degree: array
+    nodes: list[str]
+    ids: dict[str, int]
+    present: bytearray
+
+    @property
+    def reachable(self) -> list[str]:
+        return [self.nodes[node] for node, distance in enumerate(self.distances) if distance >= 0]
+
+    @property
+    def orphans(self) -> list[str]:
+        """Present documents no root reaches."""
+        return sorted(
+            self.nodes[node]
+            for node, distance in enumerate(self.distances)
+            if distance < 0 and self.present[node]
+        )
+
+    def distance(self, relative: str) -> int | None:
+        node = self.ids.get(relative)
+        if node is None:
+            return None
+        distance = self.distances[node]
+        return distance if distance >= 0 else None
+
+    def path(self, relative: str) -> list[str]:
+        """Shortest link path from the nearest root to ``relative``; empty if unreached."""
+        if self.distance(relative) is None:
+            return []
+        node = self.ids[relative]
+        path: list[int] = []
+        while node >= 0:
+            path.append(node)
+            node = self.parents[node]
+        return [self.nodes[node] for node in reversed(path)]
+
+    def most_linked(self, top: int = 10) -> list[tuple[str, int]]:
+        ranked = sorted(
+            (
+                (self.nodes[node], degree)
+                for node, degree in enumerate(self.in_degree)
+                if degree and self.present[node]
+            ),
+            key=lambda entry: (-entry[1], entry[0]),
+        )
+        return ranked[:top]
+
+
+class LinkGraph:
+    """Directed link graph with integer node IDs and array adjacency."""
+
+    def __init__(self) -> None:
+        self.nodes: list[str] = []
+        self.present = bytearray()
+        self._ids: dict[str, int] = {}
+        self._outgoing: list[array] = []
+        self._incoming: list[array] = []
+
+    @classmethod
+    def from_corpus(cls, corpus: Corpus) -> "LinkGraph":
+        graph = cls()
+        for document in corpus.markdown():
+            graph.update(document.relative, document_targets(corpus, document))
+        return graph
+
+    def node(self, relative: str) -> int:
+        """ID of ``relative``, interning it (as absent) on first sight."""
+        node = self._ids.get(relative)
+        if node is None:
+            node = len(self.nodes)
+            self._ids[relative] = node
+            self.nodes.append(relative)
+            self.present.append(0)
+            self._outgoing.append(array("I"))
+            self._incoming.append(array("I"))
+        return node
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(targets) for targets in self._outgoing)
+
+    def update(self, relative: str, targets: Iterable[str] | None) -> None:
+        """Replace the outgoing edges of ``relative``; ``None`` removes the document.
+
+        Node IDs are never reused, so a removed document keeps its ID (and
+        its inbound edges) and comes back under it if re-added.
+        """
+        source = self.node(relative)
+        for target in self._outgoing[source]:
+            incoming = self._incoming[target]
+            del incoming[incoming.index(source)]
+        self._outgoing[source] = array("I")
+        if targets is None:
+            self.present[source] = 0
+            return
+        self.present[source] = 1
+        outgoing = array("I", dict.fromkeys(self.node(target) for target in targets))
+        self._outgoing[source] = outgoing
+        for target in outgoing:
+            self._incoming[target].append(source)
+
+    def update_from_corpus(self, corpus: Corpus, relatives: Iterable[str]) -> None:
+        """Re-read the edges of changed markdown files (after ``corpus.refresh``)."""
+        for relative in relatives:
+            if not relative.endswith(".md"):
+                continue
+            if relative in corpus.relative_files:
+                document = corpus.document(corpus.root / relative)
+                self.update(relative, document_targets(corpus, document))
+            else:
+                self.update(relative, None)
+
+    def outgoing(self, relative: str) -> list[str]:
+        node = self._ids.get(relative)
+        return [] if node is None else [self.nodes[target] for target in self._outgoing[node]]
+
+    def incoming(self, relative: str) -> list[str]:
+        node = self._ids.get(relative)
+        return [] if node is None else sorted(self.nodes[source] for source in self._incoming[node])
+
+    def analyze(self, roots: Iterable[str]) -> GraphAnalysis:
+        """Breadth-first pass from ``roots``: distances, shortest-path parents, in-degrees."""
+        count = len(self.nodes)
+        distances = array("i", [-1]) * count
+        parents = array("i", [-1]) * count
+        in_degree = array("I", [0]) * count
+        queue: deque[int] = deque()
+        root_list = [root for root in roots if root in self._ids and self.present[self._ids[root]]]
+        for root in root_list:
+            node = self._ids[root]
+            if distances[node] < 0:
+                distances[node] = 0
+                queue.append(node)
+        for source, targets in enumerate(self._outgoing):
+            for target in targets:
+                in_degree[target] += 1
+        while queue:
+            source = queue.popleft()
+            for target in self._outgoing[source]:
+                if distances[target] < 0 and self.present[target]:
+                    distances[target] = distances[source] + 1
+                    parents[target] = source
+                    queue.append(target)
+        return GraphAnalysis(
+            root_list,
+            distances,
+            parents,
+            in_degree,
+            list(self.nodes),
+            dict(self._ids),
+            bytearray(self.present),
+        )
+
+    def shortest_path(self, source: str, target: str) -> list[str]:
+        """Fewest-links path from ``source`` to ``target``; empty when there is none."""
+        return self.analyze([source]).path(target)
+
+    def cycles(self) -> list[list[str]]:
+        """Strongly connected components of two or more present documents.
+
+        Iterative Tarjan, so deep link chains cannot hit the recursion limit.
+        """
+        count = len(self.nodes)
+        index = array("i", [-1]) * count
+        low = array("i", [0]) * count
+        on_stack = bytearray(count)
+        stack: list[int] = []
+        components: list[list[str]] = []
+        counter = 0
+        for start in range(count):
+            if index[start] >= 0 or not self.present[start]:
+                continue
+            work = [(start, 0)]
+            while work:
+                node, position = work.pop()
+                if position == 0:
+                    index[node] = low[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = 1
+                targets = self._outgoing[node]
+                while position < len(targets):
+                    target = targets[position]
+                    position += 1
+                    if not self.present[target]:
+                        continue
+                    if index[target] < 0:
+                        work.append((node, position))
+                        work.append((target, 0))
+                        break
+                    if on_stack[target]:
+                        low[node] = min(low[node], index[target])
+                else:
+                    if low[node] == index[node]:
+                        component: list[int] = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = 0
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1:
+                            components.append(sorted(self.nodes[member] for member in component))
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+        return sorted(components, key=lambda component: (-len(component), component))
@@ -0,0 +1,428 @@
+"""Delivery metrics from git history for the greenfield metrics scoreboard.
+
+``git log --reverse --numstat`` is streamed line by line into one compact
+record per commit: typed ``array`` columns for the author and commit
+times, first and second parent (as row numbers), lines added and
+deleted, files touched, author and revert/hotfix flags, plus the 20-byte
+commit ids. The columns persist in a checkpoint together with the HEAD
+they cover; the next run asks git only for ``<checkpoint>..HEAD`` and
+appends. A checkpoint whose HEAD is no longer an ancestor (rewritten
+history) is rebuilt from scratch.
+
+Weekly metrics are single passes over those columns:
+
+- Throughput: changes landed on HEAD's first-parent line, each merge or
+  direct commit counting once.
+- Lead time: from the first authored commit of a change to its landing.
+  For a merge that is the earliest author time on the merged branch,
+  otherwise the commit's own author time.
+- Churn: lines added and deleted and files touched by non-merge commits.
+- Reverts and hotfixes: commits whose subject starts with ``Revert`` or
+  mentions ``hotfix``.
+"""
+
+from array import array
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+import hashlib
+import json
+import os
+from pathlib import Path
+import statistics
+import struct
+import subprocess
+import sys
+import time
+from typing import IO, Any
+
+from scaffold_validation.corpus import REPO_ROOT, Corpus
+from scaffold_validation.render import compile_template
+
+
+CHECKPOINT_DIR = Path(".validation-cache") / "history"
+CHECKPOINT_MAGIC = b"SVHIST\0\0"
+CHECKPOINT_VERSION = 1
+SCOREBOARD_TEMPLATE = "greenfield/templates/metrics-scoreboard.md.template"
+WEEK_SECONDS = 7 * 24 * 3600
+# Weeks start on Monday; the Unix epoch fell on a Thursday.
+WEEK_OFFSET = -3 * 24 * 3600
+NO_PARENT = -1
+REVERT = 1
+HOTFIX = 2
+LOG_FORMAT = "--format=%x1e%H%x1f%P%x1f%at%x1f%ct%x1f%aE%x1f%s"
+_HEADER = struct.Struct("<8sII")
+
+# Column name -> array typecode, in checkpoint order.
+COLUMNS = {
+    "author_time": "q",
+    "commit_time": "q",
+    "first_parent": "i",
+    "second_parent": "i",
+    "added": "I",
+    "deleted": "I",
+    "files": "I",
+    "author": "I",
+    "flags": "B",
+}
+
+
+def _flags(subject: str) -> int:
+    flags = REVERT if subject.startswith("Revert ") else 0
+    return flags | (HOTFIX if "hotfix" in subject.lower() else 0)
+
+
+def week_start(timestamp: int) -> date:
+    """The Monday (UTC) of the week containing ``timestamp``."""
+    monday = (timestamp - WEEK_OFFSET) // WEEK_SECONDS * WEEK_SECONDS + WEEK_OFFSET
+    return datetime.fromtimestamp(monday, timezone.utc).date()
+
+
+class History:
+    """Per-commit records in oldest-first order, one ``array`` per column."""
+
+    def __init__(self) -> None:
+        self.head = ""
+        self.ids = bytearray()
+        self.authors: list[str] = []
+        self.columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+        self._rows: dict[bytes, int] | None = None
+        self._author_ids: dict[str, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.columns["commit_time"])
+
+    def row(self, commit: str) -> int:
+        """Row of ``commit`` (hex id), or ``NO_PARENT`` if it is not recorded."""
+        if self._rows is None:
+            self._rows = {
+                bytes(self.ids[offset : offset + 20]): number
+                for number, offset in enumerate(range(0, len(self.ids), 20))
+            }
+        return self._rows.get(bytes.fromhex(commit), NO_PARENT)
+
+    def _author(self, email: str) -> int:
+        if self._author_ids is None:
+            self._author_ids = {author: number for number, author in enumerate(self.authors)}
+        number = self._author_ids.get(email)
+        if number is None:
+            number = self._author_ids[email] = len(self.authors)
+            self.authors.append(email)
+        return number
+
+    def append(self, header: bytes, added: int, deleted: int, files: int) -> None:
+        """Add one ``LOG_FORMAT`` commit line (without the leading separator)."""
+        commit, parents, author_time, commit_time, email, subject = (
+            header.decode("utf-8", "replace").split("\x1f", 5)
+        )
+        parent_rows = [self.row(parent) for parent in parents.split()]
+        columns = self.columns
+        columns["author_time"].append(int(author_time))
+        columns["commit_time"].append(int(commit_time))
+        columns["first_parent"].append(parent_rows[0] if parent_rows else NO_PARENT)
+        columns["second_parent"].append(parent_rows[1] if len(parent_rows) > 1 else NO_PARENT)
+        columns["added"].append(added)
+        columns["deleted"].append(deleted)
+        columns["files"].append(files)
+        columns["author"].append(self._author(email.lower()))
+        columns["flags"].append(_flags(subject))
+        raw = bytes.fromhex(commit)
+        if self._rows is not None:
+            self._rows[raw] = len(self.ids) // 20
+        self.ids += raw
+        self.head = commit
+
+    def read_log(self, stream: IO[bytes]) -> int:
+        """Append every commit of a ``LOG_FORMAT`` ``--numstat`` stream; returns how many."""
+        count = 0
+        header: bytes | None = None
+        added = deleted = files = 0
+        for line in stream:
+            if line.startswith(b"\x1e"):
+                if header is not None:
+                    self.append(header, added, deleted, files)
+                    count += 1
+                header = line[1:].rstrip(b"\r\n")
+                added = deleted = files = 0
+            elif b"\t" in line:
+                plus, minus, _ = line.split(b"\t", 2)
+                # Binary files report "-" for both counts.
+                added += int(plus) if plus != b"-" else 0
+                deleted += int(minus) if minus != b"-" else 0
+                files += 1
+        if header is not None:
+            self.append(header, added, deleted, files)
+            count += 1
+        return count
+
+    def save(self, path: Path) -> None:
+        meta = json.dumps(
+            {"head": self.head, "authors": self.authors, "byteorder": sys.byteorder}
+        ).encode("utf-8")
+        parts = [_HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, len(meta)), meta]
+        parts.append(struct.pack("<Q", len(self)))
+        parts.append(bytes(self.ids))
+        parts += [column.tobytes() for column in self.columns.values()]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary.write_bytes(b"".join(parts))
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "History | None":
+        """The checkpoint at ``path``, or ``None`` when it is missing or unreadable."""
+        try:
+            data = path.read_bytes()
+            magic, version, size = _HEADER.unpack_from(data)
+            if magic != CHECKPOINT_MAGIC or version != CHECKPOINT_VERSION:
+                return None
+            offset = _HEADER.size
+            meta = json.loads(data[offset : offset + size])
+            offset += size
+            (count,) = struct.unpack_from("<Q", data, offset)
+            offset += 8
+        except (OSError, ValueError, struct.error):
+            return None
+        if meta.get("byteorder") != sys.byteorder:
+            return None
+        history = cls()
+        history.head = meta["head"]
+        history.authors = meta["authors"]
+        history.ids = bytearray(data[offset : offset + 20 * count])
+        offset += 20 * count
+        for column in history.columns.values():
+            end = offset + column.itemsize * count
+            column.frombytes(data[offset:end])
+            offset = end
+        if len(history.ids) != 20 * count or offset != len(data):
+            return None
+        return history
+
+
+def default_checkpoint_path(repository: Path, root: Path = REPO_ROOT) -> Path:
+    """Checkpoint for ``repository`` under ``root``'s cache, keyed by its resolved path."""
+    key = hashlib.sha256(str(repository.resolve()).encode("utf-8")).hexdigest()[:16]
+    return root / CHECKPOINT_DIR / f"{key}.bin"
+
+
+def _git(repository: Path, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], cwd=repository, capture_output=True)
+
+
+def stream_log(history: History, repository: Path, revisions: str) -> int:
+    """Append the commits of ``revisions`` (oldest first) straight from git's output."""
+    command = [
+        "git",
+        "log",
+        "--reverse",
+        "--topo-order",
+        "--no-renames",
+        "--numstat",
+        LOG_FORMAT,
+        revisions,
+        "--",
+    ]
+    with subprocess.Popen(command, cwd=repository, stdout=subprocess.PIPE) as process:
+        count = history.read_log(process.stdout)
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command)
+    return count
+
+
+@dataclass
+class Collection:
+    history: History
+    new_commits: int
+    # "full", "incremental" or "current".
+    mode: str
+    seconds: float
+
+
+def collect(repository: Path, checkpoint: Path | None = None) -> Collection:
+    """Bring the checkpoint of ``repository`` up to its HEAD, reading only new commits."""
+    started = time.perf_counter()
+    completed = _git(repository, "rev-parse", "--verify", "HEAD")
+    head = completed.stdout.decode("ascii").strip() if completed.returncode == 0 else ""
+    history = History.load(checkpoint) if checkpoint is not None else None
+    if history is not None and history.head == head:
+        return Collection(history, 0, "current", time.perf_counter() - started)
+
+    mode = "incremental"
+    if (
+        history is None
+        or not history.head
+        or _git(repository, "merge-base", "--is-ancestor", history.head, "HEAD").returncode
+    ):
+        history, mode = History(), "full"
+    count = 0
+    if head:
+        revisions = f"{history.head}..HEAD" if mode == "incremental" else "HEAD"
+        count = stream_log(history, repository, revisions)
+    history.head = head
+    if checkpoint is not None:
+        history.save(checkpoint)
+    return Collection(history, count, mode, time.perf_counter() - started)
+
+
+@dataclass(frozen=True)
+class WeekMetrics:
+    week: date
+    changes: int
+    commits: int
+    median_lead_seconds: float | None
+    added: int
+    deleted: int
+    files: int
+    reverts: int
+    hotfixes: int
+    authors: int
+
+    @property
+    def churn(self) -> int:
+        return self.added + self.deleted
+
+
+def mainline(history: History) -> list[int]:
+    """Rows on HEAD's first-parent line, oldest first."""
+    rows: list[int] = []
+    row = history.row(history.head) if history.head else NO_PARENT
+    first_parent = history.columns["first_parent"]
+    while row != NO_PARENT:
+        rows.append(row)
+        row = first_parent[row]
+    rows.reverse()
+    return rows
+
+
+def lead_times(history: History, rows: list[int]) -> list[int]:
+    """Seconds from first authored commit to landing, for each mainline row."""
+    columns = history.columns
+    author_time, commit_time = columns["author_time"], columns["commit_time"]
+    first_parent, second_parent = columns["first_parent"], columns["second_parent"]
+    on_mainline = bytearray(len(history))
+    for row in rows:
+        on_mainline[row] = 1
+    leads: list[int] = []
+    for row in rows:
+        started = author_time[row]
+        branch = second_parent[row]
+        # Follow the merged branch back to where it left the mainline.
+        while branch != NO_PARENT and not on_mainline[branch]:
+            started = min(started, author_time[branch])
+            branch = first_parent[branch]
+        leads.append(max(commit_time[row] - started, 0))
+    return leads
+
+
+def weekly_metrics(history: History, weeks: int | None = None) -> list[WeekMetrics]:
+    """Metrics per week, oldest first; ``weeks`` keeps only the latest ones."""
+    columns = history.columns
+    commit_time = columns["commit_time"]
+    weekly: dict[int, dict[str, Any]] = {}
+
+    def bucket(timestamp: int) -> dict[str, Any]:
+        key = (timestamp - WEEK_OFFSET) // WEEK_SECONDS
+        found = weekly.get(key)
+        if found is None:
+            found = weekly[key] = {
+                "start": timestamp,
+                "changes": 0,
+                "commits": 0,
+                "leads": [],
+                "added": 0,
+                "deleted": 0,
+                "files": 0,
+                "reverts": 0,
+                "hotfixes": 0,
+                "authors": set(),
+            }
+        return found
+
+    rows = mainline(history)
+    for row, lead in zip(rows, lead_times(history, rows)):
+        found = bucket(commit_time[row])
+        found["changes"] += 1
+        found["leads"].append(lead)
+    for row, (timestamp, second, added, deleted, files, author, flags) in enumerate(
+        zip(
+            commit_time,
+            columns["second_parent"],
+            columns["added"],
+            columns["deleted"],
+            columns["files"],
+            columns["author"],
+            columns["flags"],
+        )
+    ):
+        found = bucket(timestamp)
+        found["authors"].add(author)
+        if second != NO_PARENT:
+            continue
+        found["commits"] += 1
+        found["added"] += added
+        found["deleted"] += deleted
+        found["files"] += files
+        found["reverts"] += flags & REVERT
+        found["hotfixes"] += (flags & HOTFIX) >> 1
+
+    keys = sorted(weekly)
+    if weeks is not None:
+        keys = keys[-weeks:] if weeks > 0 else []
+    return [
+        WeekMetrics(
+            week_start(weekly[key]["start"]),
+            weekly[key]["changes"],
+            weekly[key]["commits"],
+            float(statistics.median(weekly[key]["leads"])) if weekly[key]["leads"] else None,
+            weekly[key]["added"],
+            weekly[key]["deleted"],
+            weekly[key]["files"],
+            weekly[key]["reverts"],
+            weekly[key]["hotfixes"],
+            len(weekly[key]["authors"]),
+        )
+        for key in keys
+    ]
+
+
+def format_duration(seconds: float | None) -> str:
+    if seconds is None:
+        return "n/a"
+    if seconds >= 86400:
+        return f"{seconds / 86400:.1f} d"
+    if seconds >= 3600:
+        return f"{seconds / 3600:.1f} h"
+    return f"{seconds / 60:.0f} min"
+
+
+def render_scoreboard(corpus: Corpus, metrics: WeekMetrics) -> str:
+    """The greenfield scoreboard template for ``metrics.week`` with git-derived lines filled."""
+    template = compile_template(corpus.document(corpus.root / SCOREBOARD_TEMPLATE))
+    text, _ = template.render({"date": metrics.week.isoformat()})
+    values = {
+        "- Tasks completed:": str(metrics.changes),
+        "- Median lead time (intent → done):": format_duration(metrics.median_lead_seconds),
+        "- Reverts / hotfixes:": f"{metrics.reverts} / {metrics.hotfixes}",
+    }
+    lines = [
+        f"{line} {values[line.strip()]}" if line.strip() in values else line
+        for line in text.splitlines()
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def metrics_json(metrics: list[WeekMetrics]) -> list[dict[str, Any]]:
+    return [
+        {
+            "week": week.week.isoformat(),
+            "changes": week.changes,
+            "commits": week.commits,
+            "median_lead_seconds": week.median_lead_seconds,
+            "added": week.added,
+            "deleted": week.deleted,
+            "files": week.files,
+            "reverts": week.reverts,
+            "hotfixes": week.hotfixes,
+            "authors": week.authors,
+        }
+        for week in metrics
+    ]
@@ -0,0 +1,168 @@
+"""Per-check, per-file and per-scaffold cost accounting for a validation run.
+
+``instrumented_run`` runs every validator serially over one cold corpus and
+wraps each call in a ``Measurement``: wall time plus the corpus counters
+(files read, bytes read, stat calls) it advanced. A file's read cost is
+charged to the first check that touched it, which is where a cold run
+actually pays it. Files over the corpus stream threshold are scanned once
+(see ``stream``), and the scan is likewise charged to the first tree check.
+
+Scaffolds come from the manifest, as in ``validate_tree``: each scaffold's
+``structure`` requirements and contracts are measured through
+``run_checklist``, and contracts are skipped for a scaffold with a missing
+file, so a declared scaffold without a directory still shows up.
+"""
+
+from dataclasses import asdict, dataclass, field
+from pathlib import Path, PurePosixPath
+import time
+from typing import Any, Callable
+
+from scaffold_validation import checks
+from scaffold_validation.corpus import Corpus
+from scaffold_validation.manifest import (
+    STRUCTURE_CHECK,
+    Requirement,
+    read_manifest,
+    run_checklist,
+)
+from scaffold_validation.stream import scan_failures
+
+
+@dataclass
+class Measurement:
+    check: str
+    subject: str
+    scaffold: str
+    seconds: float
+    files: int
+    bytes: int
+    stat_calls: int
+    failures: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Totals:
+    seconds: float = 0.0
+    files: int = 0
+    bytes: int = 0
+    stat_calls: int = 0
+    failures: int = 0
+
+    def add(self, measurement: Measurement) -> None:
+        self.seconds += measurement.seconds
+        self.files += measurement.files
+        self.bytes += measurement.bytes
+        self.stat_calls += measurement.stat_calls
+        self.failures += len(measurement.failures)
+
+
+def _measure(
+    corpus: Corpus, check: str, subject: str, scaffold: str, run: Callable[[], list[str]]
+) -> Measurement:
+    files, read, stats = corpus.files_read, corpus.bytes_read, corpus.stat_calls
+    started = time.perf_counter()
+    failures = run()
+    return Measurement(
+        check,
+        subject,
+        scaffold,
+        time.perf_counter() - started,
+        corpus.files_read - files,
+        corpus.bytes_read - read,
+        corpus.stat_calls - stats,
+        failures,
+    )
+
+
+def instrumented_run(root: Path) -> list[Measurement]:
+    """Every tree check per markdown file, then every checklist check per scaffold."""
+    corpus = Corpus(root)
+    manifest = read_manifest(corpus.root, corpus)
+    scaffolds = set(manifest.names)
+    measurements: list[Measurement] = []
+    scans: dict[Path, dict[str, list[str]]] = {}
+
+    def tree_check(name: str, check: Callable, path: Path) -> list[str]:
+        if not corpus.is_large(path):
+            return check(corpus, corpus.document(path))
+        if path not in scans:
+            scans[path] = scan_failures(corpus, path)
+        return scans[path][name]
+
+    for name, check in checks.TREE_CHECKS.items():
+        for path in corpus.markdown_paths():
+            relative = corpus.relative(path)
+            top = PurePosixPath(relative).parts[0]
+            measurements.append(
+                _measure(
+                    corpus,
+                    name,
+                    relative,
+                    top if top in scaffolds else "",
+                    lambda: tree_check(name, check, path),
+                )
+            )
+    def checklist_check(requirements: tuple[Requirement, ...]) -> list[str]:
+        return [
+            failure
+            for _, _, failures in run_checklist(corpus, requirements)
+            for failure in failures
+        ]
+
+    incomplete: set[str] = set()
+    for name in [STRUCTURE_CHECK, *checks.SCAFFOLD_CHECKS]:
+        for scaffold in sorted(scaffolds):
+            requirements = tuple(
+                requirement
+                for requirement in manifest.checklist_for(scaffold)
+                if requirement.check == name
+            )
+            if not requirements or scaffold in incomplete:
+                continue
+            measurement = _measure(
+                corpus, name, scaffold, scaffold, lambda: checklist_check(requirements)
+            )
+            measurements.append(measurement)
+            if name == STRUCTURE_CHECK and measurement.failures:
+                incomplete.add(scaffold)
+    return measurements
+
+
+def _totals(measurements: list[Measurement], key: Callable[[Measurement], str]) -> dict[str, Totals]:
+    grouped: dict[str, Totals] = {}
+    for measurement in measurements:
+        grouped.setdefault(key(measurement), Totals()).add(measurement)
+    return grouped
+
+
+def summarize(measurements: list[Measurement], top: int = 10) -> dict[str, Any]:
+    """Totals per check and per scaffold, the ``top`` slowest files, and all failures.
+
+    Scaffold-level checks have no single file, so only tree checks rank files.
+    """
+    per_file = _totals(
+        [m for m in measurements if m.check in checks.TREE_CHECKS], lambda m: m.subject
+    )
+    slowest = sorted(per_file.items(), key=lambda item: (-item[1].seconds, item[0]))[:top]
+    overall = Totals()
+    for measurement in measurements:
+        overall.add(measurement)
+    return {
+        "totals": asdict(overall),
+        "checks": {
+            name: asdict(totals)
+            for name, totals in _totals(measurements, lambda m: m.check).items()
+        },
+        "scaffolds": {
+            name: asdict(totals)
+            for name, totals in sorted(_totals(measurements, lambda m: m.scaffold).items())
+            if name
+        },
+        "slowest_files": [{"path": path, **asdict(totals)} for path, totals in slowest],
+        "failures": [
+            {"check": m.check, "subject": m.subject, "message": failure}
+            for m in measurements
+            for failure in m.failures
+        ],
+    }
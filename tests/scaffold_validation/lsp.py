@@ -0,0 +1,568 @@
+"""Language server that publishes scaffold diagnostics while files are edited.
+
+``LanguageServer`` speaks the Language Server Protocol (JSON-RPC with
+``Content-Length`` framing) over stdin/stdout. A ``Workspace`` keeps one
+corpus, the link graph and the last diagnostics in memory; open editor
+buffers are overlaid on the corpus, so checks see unsaved text and the
+files on disk are never re-read for them.
+
+Buffers are synced incrementally. After an edit only the edited file is
+re-checked with the tree checks (h1, numbered-h1, fences, links,
+anchors), plus the files linking to it when its anchors changed, and its
+scaffold's manifest checklist is re-run. Everything else is already
+tokenized, so a delta costs a few milliseconds. Files on disk over the
+corpus stream threshold are scanned (see ``stream``), never loaded.
+
+The server also resolves relative links for go-to-definition and
+completes ``{placeholder}`` names used across the templates.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+import json
+import os
+from pathlib import Path, PurePosixPath
+import re
+import time
+from typing import Any, BinaryIO, Callable
+from urllib.parse import unquote, urlparse
+from urllib.request import url2pathname
+
+from scaffold_validation import checks
+from scaffold_validation.anchors import heading_slugs
+from scaffold_validation.corpus import Corpus, Document
+from scaffold_validation.manifest import load_manifest, run_checklist
+from scaffold_validation.stream import linked_files, scan_failures
+from scaffold_validation.tokenizer import scan_links
+
+
+SOURCE = "scaffold-validation"
+SEVERITY_ERROR = 1
+COMPLETION_KIND_VARIABLE = 6
+SYNC_INCREMENTAL = 2
+# JSON-RPC and LSP error codes.
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+SERVER_NOT_INITIALIZED = -32002
+
+FENCE_LINE_PATTERN = re.compile(r"opened at line (\d+)$")
+LINK_TARGET_PATTERNS = (
+    re.compile(r" -> (.*) \((?:resolved to|no heading anchor) "),
+    re.compile(r"broken table link: (.*)$"),
+)
+PLACEHOLDER_NAME_PATTERN = re.compile(r"[^{}\n]*")
+
+
+def uri_to_path(uri: str) -> Path | None:
+    parsed = urlparse(uri)
+    if parsed.scheme != "file":
+        return None
+    return Path(url2pathname(parsed.path))
+
+
+def utf16_units(line: str, index: int) -> int:
+    """LSP column of the character at Python ``index`` in ``line``."""
+    return index + sum(1 for character in line[:index] if ord(character) > 0xFFFF)
+
+
+def utf16_index(line: str, units: int) -> int:
+    """Python index of LSP column ``units`` in ``line``."""
+    count = 0
+    for index, character in enumerate(line):
+        if count >= units:
+            return index
+        count += 2 if ord(character) > 0xFFFF else 1
+    return len(line)
+
+
+def position_offset(text: str, position: dict[str, int]) -> int:
+    offset = 0
+    for _ in range(position["line"]):
+        newline = text.find("\n", offset)
+        if newline < 0:
+            return len(text)
+        offset = newline + 1
+    end = text.find("\n", offset)
+    end = len(text) if end < 0 else end
+    return offset + utf16_index(text[offset:end], position["character"])
+
+
+def apply_change(text: str, change: dict[str, Any]) -> str:
+    """Apply one ``contentChanges`` entry; an entry without a range replaces everything."""
+    if "range" not in change:
+        return change["text"]
+    start = position_offset(text, change["range"]["start"])
+    end = position_offset(text, change["range"]["end"])
+    return text[:start] + change["text"] + text[end:]
+
+
+@dataclass(frozen=True)
+class Diagnostic:
+    check: str
+    message: str
+    # Zero-based line and UTF-16 columns, as LSP counts them.
+    line: int
+    start: int
+    end: int
+
+    def to_lsp(self) -> dict[str, Any]:
+        return {
+            "range": {
+                "start": {"line": self.line, "character": self.start},
+                "end": {"line": self.line, "character": self.end},
+            },
+            "severity": SEVERITY_ERROR,
+            "source": SOURCE,
+            "code": self.check,
+            "message": self.message,
+        }
+
+
+def _line_end(line: str) -> int:
+    return utf16_units(line, len(line))
+
+
+def locate(document: Document | None, check: str, message: str) -> Diagnostic:
+    """Place a failure message on the line (and link target) it is about."""
+    if document is None or not document.lines:
+        return Diagnostic(check, message, 0, 0, 0)
+    fence = FENCE_LINE_PATTERN.search(message)
+    if fence:
+        line = int(fence.group(1)) - 1
+        return Diagnostic(check, message, line, 0, _line_end(document.lines[line]))
+    for pattern in LINK_TARGET_PATTERNS:
+        match = pattern.search(message)
+        if not match:
+            continue
+        needle = f"]({match.group(1)})"
+        for line, text in enumerate(document.lines):
+            column = text.find(needle)
+            if column >= 0:
+                start = column + 2
+                end = start + len(match.group(1))
+                return Diagnostic(
+                    check, message, line, utf16_units(text, start), utf16_units(text, end)
+                )
+    return Diagnostic(check, message, 0, 0, _line_end(document.lines[0]))
+
+
+class Workspace:
+    """Corpus with editor buffers overlaid, plus the link graph and current diagnostics."""
+
+    def __init__(self, root: Path):
+        self.corpus = Corpus(root)
+        self.manifest = load_manifest(root)
+        self.buffers: dict[str, str] = {}
+        self.seconds = 0.0
+        self._outgoing: dict[str, set[str]] = {}
+        self._incoming: dict[str, set[str]] = {}
+        self._documents: dict[str, list[Diagnostic]] = {}
+        self._scaffolds: dict[str, dict[str, list[Diagnostic]]] = {}
+        self._placeholders: dict[str, list[str]] = {}
+
+    @property
+    def root(self) -> Path:
+        return self.corpus.root
+
+    def start(self) -> None:
+        """Build the link graph and placeholder index; nothing is validated yet."""
+        for path in self.corpus.markdown_paths():
+            relative = self.corpus.relative(path)
+            self._link(relative, self._targets(relative))
+        for document in self.corpus.templates():
+            self._placeholders[document.relative] = document.placeholders
+
+    def relative(self, uri: str) -> str | None:
+        """Root-relative path for ``uri``, or ``None`` outside the workspace."""
+        path = uri_to_path(uri)
+        if path is None:
+            return None
+        try:
+            return path.resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return None
+
+    def known(self, relative: str) -> bool:
+        return relative in self.buffers or relative in self.corpus.relative_files
+
+    def document(self, relative: str) -> Document | None:
+        if not self.known(relative):
+            return None
+        return self.corpus.document(self.root / relative)
+
+    def _targets(self, relative: str) -> set[str]:
+        path = self.root / relative
+        if self.corpus.is_large(path):
+            return linked_files(self.corpus, path)
+        return checks.linked_files(self.corpus.document(path))
+
+    def _link(self, relative: str, targets: set[str] | None = None) -> None:
+        for target in self._outgoing.pop(relative, set()):
+            self._incoming.get(target, set()).discard(relative)
+        if targets is None:
+            return
+        self._outgoing[relative] = targets
+        for target in targets:
+            self._incoming.setdefault(target, set()).add(relative)
+
+    def _dependents(self, relative: str) -> set[str]:
+        """Files linking to ``relative`` or a directory containing it."""
+        dependents = set(self._incoming.get(relative, set()))
+        for parent in PurePosixPath(relative).parents:
+            dependents |= self._incoming.get(str(parent), set())
+        return dependents
+
+    def _check_document(self, relative: str) -> None:
+        if not relative.endswith(".md") or not self.known(relative):
+            self._link(relative)
+            self._documents.pop(relative, None)
+            return
+        self._link(relative, self._targets(relative))
+        path = self.root / relative
+        if self.corpus.is_large(path):
+            # Too large to load; the diagnostics go on the first line.
+            self._documents[relative] = [
+                locate(None, name, message)
+                for name, failures in scan_failures(self.corpus, path).items()
+                for message in failures
+            ]
+            return
+        document = self.corpus.document(path)
+        self._documents[relative] = [
+            locate(document, name, message)
+            for name, check in checks.TREE_CHECKS.items()
+            for message in check(self.corpus, document)
+        ]
+
+    def _subject(self, scaffold: str, message: str) -> str:
+        candidate = message.split(" ", 1)[0].rstrip(":")
+        return candidate if self.known(candidate) else f"{scaffold}/README.md"
+
+    def _check_scaffold(self, scaffold: str) -> set[str]:
+        """Re-run ``scaffold``'s checklist; returns the files whose results may have changed."""
+        previous = self._scaffolds.pop(scaffold, {})
+        results: dict[str, list[Diagnostic]] = {}
+        for check, _, failures in run_checklist(
+            self.corpus, self.manifest.checklist_for(scaffold)
+        ):
+            for message in failures:
+                subject = self._subject(scaffold, message)
+                results.setdefault(subject, []).append(
+                    locate(self.document(subject), check, message)
+                )
+        self._scaffolds[scaffold] = results
+        return set(previous) | set(results)
+
+    def diagnostics(self, relative: str) -> list[Diagnostic]:
+        found = list(self._documents.get(relative, []))
+        for results in self._scaffolds.values():
+            found += results.get(relative, [])
+        return found
+
+    def placeholder_names(self) -> Counter[str]:
+        return Counter(
+            name[1:-1] for names in self._placeholders.values() for name in names
+        )
+
+    def revalidate(
+        self, relatives: set[str], dependents: set[str] | None = None
+    ) -> dict[str, list[Diagnostic]]:
+        """Re-check ``relatives`` and ``dependents``; diagnostics for every file touched."""
+        started = time.perf_counter()
+        touched = set(relatives) | (dependents or set())
+        for relative in sorted(touched):
+            self._check_document(relative)
+        scaffolds = {PurePosixPath(relative).parts[0] for relative in relatives}
+        for scaffold in sorted(scaffolds & set(self.manifest.specs)):
+            touched |= self._check_scaffold(scaffold)
+        for relative in relatives:
+            document = self.document(relative) if relative.endswith(".md.template") else None
+            if document is not None:
+                self._placeholders[relative] = document.placeholders
+            else:
+                self._placeholders.pop(relative, None)
+        self.seconds = time.perf_counter() - started
+        return {relative: self.diagnostics(relative) for relative in sorted(touched)}
+
+    def edit(self, relative: str, text: str | None) -> dict[str, list[Diagnostic]]:
+        """Overlay ``text`` for ``relative`` (``None`` goes back to disk) and revalidate.
+
+        Files linking here are re-checked only when the anchors they may
+        point at changed.
+        """
+        anchors = self.corpus.anchors(relative) if self.known(relative) else None
+        if text is None:
+            self.buffers.pop(relative, None)
+        else:
+            self.buffers[relative] = text
+        self.corpus.overlay(relative, text)
+        after = self.corpus.anchors(relative) if self.known(relative) else None
+        changed = after != anchors
+        dependents = set(self._incoming.get(relative, set())) if changed else set()
+        return self.revalidate({relative}, dependents)
+
+    def files_changed(self, relatives: set[str]) -> dict[str, list[Diagnostic]]:
+        """Files were created, deleted or rewritten on disk; open buffers still win."""
+        self.corpus.refresh(relatives)
+        for relative in relatives & set(self.buffers):
+            self.corpus.overlay(relative, self.buffers[relative])
+        dependents: set[str] = set()
+        for relative in relatives:
+            dependents |= self._dependents(relative)
+        return self.revalidate(relatives, dependents)
+
+    def definition(self, relative: str, line: int, character: int) -> dict[str, Any] | None:
+        """Location of the local link target under the cursor, if any."""
+        document = self.document(relative)
+        if document is None or line >= len(document.lines):
+            return None
+        text = document.lines[line]
+        index = utf16_index(text, character)
+        cursor = 0
+        for link in scan_links(text, line + 1):
+            source = f"[{link.text}]({link.target})"
+            start = text.find(source, cursor)
+            cursor = start + len(source)
+            if start <= index <= cursor:
+                return self._resolve(relative, link.target)
+        return None
+
+    def _resolve(self, relative: str, raw_target: str) -> dict[str, Any] | None:
+        path, _, fragment = raw_target.strip().partition("#")
+        if not path:
+            target = relative
+        elif checks.should_validate(path):
+            parent = PurePosixPath(relative).parent
+            target = os.path.normpath(parent / unquote(path)).replace(os.sep, "/")
+        else:
+            return None
+        if self.corpus.is_dir(self.root / target) and self.known(f"{target}/README.md"):
+            target = f"{target}/README.md"
+        if not self.known(target):
+            return None
+        line = 0
+        document = self.document(target)
+        if fragment and target.endswith(".md"):
+            wanted = unquote(fragment).lower()
+            for heading, slug in zip(document.headings, heading_slugs(document.headings)):
+                if slug == wanted:
+                    line = heading.line - 1
+                    break
+        position = {"line": line, "character": 0}
+        return {
+            "uri": (self.root / target).as_uri(),
+            "range": {"start": position, "end": position},
+        }
+
+    def completion(self, relative: str, line: int, character: int) -> list[dict[str, Any]]:
+        """Placeholder names when the cursor is inside an unclosed ``{``."""
+        document = self.document(relative)
+        if document is None or line >= len(document.lines):
+            return []
+        text = document.lines[line]
+        index = utf16_index(text, character)
+        opening = text.rfind("{", 0, index)
+        if opening < 0 or not PLACEHOLDER_NAME_PATTERN.fullmatch(text[opening + 1 : index]):
+            return []
+        closing = "" if text.startswith("}", index) else "}"
+        edit_range = {
+            "start": {"line": line, "character": utf16_units(text, opening + 1)},
+            "end": {"line": line, "character": character},
+        }
+        return [
+            {
+                "label": name,
+                "kind": COMPLETION_KIND_VARIABLE,
+                "detail": f"used {count} time{'s' if count != 1 else ''} in templates",
+                "sortText": f"{rank:05d}",
+                "textEdit": {"range": edit_range, "newText": f"{name}{closing}"},
+            }
+            for rank, (name, count) in enumerate(self.placeholder_names().most_common())
+        ]
+
+
+def read_message(stream: BinaryIO) -> dict[str, Any] | None:
+    """Next JSON-RPC message, or ``None`` at end of input."""
+    length: int | None = None
+    while True:
+        header = stream.readline()
+        if not header:
+            return None
+        header = header.strip()
+        if not header:
+            if length is None:
+                continue
+            break
+        name, _, value = header.decode("ascii").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return json.loads(stream.read(length).decode("utf-8"))
+
+
+def write_message(stream: BinaryIO, message: dict[str, Any]) -> None:
+    body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    stream.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+    stream.flush()
+
+
+class LanguageServer:
+    """LSP request and notification handlers around one ``Workspace``."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.workspace: Workspace | None = None
+        self.shutdown_requested = False
+        self._output: BinaryIO | None = None
+        self._uris: dict[str, str] = {}
+        self._published: dict[str, list[dict[str, Any]]] = {}
+        self._handlers: dict[str, Callable[[dict[str, Any]], Any]] = {
+            "initialize": self._initialize,
+            "initialized": lambda params: None,
+            "shutdown": self._shutdown,
+            "textDocument/didOpen": self._did_open,
+            "textDocument/didChange": self._did_change,
+            "textDocument/didSave": self._did_save,
+            "textDocument/didClose": self._did_close,
+            "textDocument/definition": self._definition,
+            "textDocument/completion": self._completion,
+            "workspace/didChangeWatchedFiles": self._did_change_watched_files,
+        }
+
+    def serve(self, reader: BinaryIO, writer: BinaryIO) -> int:
+        """Handle messages until ``exit``; 0 when a ``shutdown`` came first."""
+        self._output = writer
+        while True:
+            message = read_message(reader)
+            if message is None or message.get("method") == "exit":
+                return 0 if self.shutdown_requested else 1
+            self.handle(message)
+
+    def _send(self, message: dict[str, Any]) -> None:
+        write_message(self._output, {"jsonrpc": "2.0", **message})
+
+    def handle(self, message: dict[str, Any]) -> None:
+        method = message.get("method", "")
+        params = message.get("params") or {}
+        is_request = "id" in message
+        handler = self._handlers.get(method)
+        if handler is None:
+            if is_request:
+                self._error(message["id"], METHOD_NOT_FOUND, f"unsupported method: {method}")
+            return
+        if self.workspace is None and method != "initialize":
+            if is_request:
+                self._error(message["id"], SERVER_NOT_INITIALIZED, "server not initialized")
+            return
+        try:
+            result = handler(params)
+        except Exception as error:
+            if is_request:
+                self._error(message["id"], INTERNAL_ERROR, f"{method} failed: {error!r}")
+            else:
+                self._send(
+                    {
+                        "method": "window/logMessage",
+                        "params": {"type": 1, "message": f"{method} failed: {error!r}"},
+                    }
+                )
+            return
+        if is_request:
+            self._send({"id": message["id"], "result": result})
+
+    def _error(self, request_id: Any, code: int, text: str) -> None:
+        self._send({"id": request_id, "error": {"code": code, "message": text}})
+
+    def _publish(self, results: dict[str, list[Diagnostic]], always: set[str]) -> None:
+        for relative, diagnostics in results.items():
+            payload = [diagnostic.to_lsp() for diagnostic in diagnostics]
+            if relative not in always and self._published.get(relative, []) == payload:
+                continue
+            self._published[relative] = payload
+            uri = self._uris.get(relative) or (self.workspace.root / relative).as_uri()
+            self._send(
+                {
+                    "method": "textDocument/publishDiagnostics",
+                    "params": {"uri": uri, "diagnostics": payload},
+                }
+            )
+
+    def _initialize(self, params: dict[str, Any]) -> dict[str, Any]:
+        root = self.root
+        if params.get("rootUri"):
+            root = uri_to_path(params["rootUri"]) or root
+        elif params.get("rootPath"):
+            root = Path(params["rootPath"])
+        self.workspace = Workspace(root.resolve())
+        self.workspace.start()
+        return {
+            "capabilities": {
+                "textDocumentSync": {
+                    "openClose": True,
+                    "change": SYNC_INCREMENTAL,
+                    "save": {"includeText": False},
+                },
+                "definitionProvider": True,
+                "completionProvider": {"triggerCharacters": ["{"]},
+            },
+            "serverInfo": {"name": SOURCE},
+        }
+
+    def _shutdown(self, params: dict[str, Any]) -> None:
+        self.shutdown_requested = True
+
+    def _document(self, params: dict[str, Any]) -> str | None:
+        uri = params["textDocument"]["uri"]
+        relative = self.workspace.relative(uri)
+        if relative is not None:
+            self._uris[relative] = uri
+        return relative
+
+    def _did_open(self, params: dict[str, Any]) -> None:
+        relative = self._document(params)
+        if relative is not None:
+            text = params["textDocument"]["text"]
+            self._publish(self.workspace.edit(relative, text), {relative})
+
+    def _did_change(self, params: dict[str, Any]) -> None:
+        relative = self._document(params)
+        if relative is None or relative not in self.workspace.buffers:
+            return
+        text = self.workspace.buffers[relative]
+        for change in params["contentChanges"]:
+            text = apply_change(text, change)
+        self._publish(self.workspace.edit(relative, text), {relative})
+
+    def _did_save(self, params: dict[str, Any]) -> None:
+        relative = self._document(params)
+        if relative is not None and relative not in self.workspace.corpus.relative_files:
+            # A new file now exists on disk, so links to it resolve.
+            self._publish(self.workspace.files_changed({relative}), set())
+
+    def _did_close(self, params: dict[str, Any]) -> None:
+        relative = self._document(params)
+        if relative is not None and relative in self.workspace.buffers:
+            self._publish(self.workspace.edit(relative, None), set())
+
+    def _did_change_watched_files(self, params: dict[str, Any]) -> None:
+        relatives = {
+            relative
+            for change in params.get("changes", [])
+            if (relative := self.workspace.relative(change["uri"])) is not None
+        }
+        if relatives:
+            self._publish(self.workspace.files_changed(relatives), set())
+
+    def _position(self, params: dict[str, Any]) -> tuple[str | None, int, int]:
+        position = params["position"]
+        return self._document(params), position["line"], position["character"]
+
+    def _definition(self, params: dict[str, Any]) -> dict[str, Any] | None:
+        relative, line, character = self._position(params)
+        if relative is None:
+            return None
+        return self.workspace.definition(relative, line, character)
+
+    def _completion(self, params: dict[str, Any]) -> dict[str, Any]:
+        relative, line, character = self._position(params)
+        items = [] if relative is None else self.workspace.completion(relative, line, character)
+        return {"isIncomplete": False, "items": items}
@@ -0,0 +1,227 @@
+"""Declarative scaffold manifest and the checklist engine that runs it.
+
+``scaffolds.toml`` at the repository root names every scaffold and what
+it must contain: guides (file names or globs), templates, and the named
+contracts from ``checks.SCAFFOLD_CHECKS``. ``load_manifest`` compiles it
+once into a flat, ordered checklist of ``Requirement`` entries with globs
+already turned into regexes; ``run_checklist`` walks that list in a single
+pass, answering file requirements from the corpus walk (one directory
+listing per directory, no stats) and running contracts only for
+scaffolds whose files are all present.
+
+A tree without a manifest (a synthetic tree, a downstream repository)
+falls back to the directories shaped like a scaffold and every contract,
+which is what the validators did before the manifest existed.
+"""
+
+from dataclasses import dataclass
+from fnmatch import translate
+from functools import cached_property, lru_cache
+import hashlib
+from pathlib import Path
+import re
+import tomllib
+from typing import Any
+
+from scaffold_validation import checks
+from scaffold_validation.corpus import REPO_ROOT, Corpus
+
+
+MANIFEST_NAME = "scaffolds.toml"
+STRUCTURE_CHECK = "structure"
+PROMPTS_FILE = "07-agent-prompts.md"
+PROMPTS_CONTRACT = "prompt-structure"
+TEMPLATES_DIR = "templates"
+SPEC_KEYS = {"guides", "templates", "contracts", "prompts"}
+
+
+@dataclass(frozen=True)
+class ScaffoldSpec:
+    name: str
+    guides: tuple[str, ...]
+    templates: tuple[str, ...]
+    contracts: tuple[str, ...]
+    prompts: bool
+
+    @property
+    def required_files(self) -> tuple[str, ...]:
+        """Scaffold-relative names and globs, the templates directory included."""
+        files = [*self.guides, f"{TEMPLATES_DIR}/"]
+        files += [f"{TEMPLATES_DIR}/{template}" for template in self.templates]
+        if self.prompts and PROMPTS_FILE not in files:
+            files.append(PROMPTS_FILE)
+        return tuple(files)
+
+    @property
+    def all_contracts(self) -> tuple[str, ...]:
+        if self.prompts and PROMPTS_CONTRACT not in self.contracts:
+            return (*self.contracts, PROMPTS_CONTRACT)
+        return self.contracts
+
+
+@dataclass(frozen=True)
+class Requirement:
+    scaffold: str
+    # STRUCTURE_CHECK for file requirements, otherwise a SCAFFOLD_CHECKS name.
+    check: str
+    # Scaffold-relative file, glob or ``dir/``; empty for the scaffold
+    # directory itself and for contracts.
+    target: str = ""
+    pattern: re.Pattern[str] | None = None
+
+
+def _strings(value: Any, key: str, source: str) -> tuple[str, ...]:
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"{source}: {key} must be a list of strings")
+    return tuple(value)
+
+
+def _spec(
+    name: str, table: dict[str, Any], defaults: dict[str, Any], source: str
+) -> ScaffoldSpec:
+    unknown = set(table) - SPEC_KEYS
+    if unknown:
+        raise ValueError(f"{source}: unknown key(s) for {name}: {', '.join(sorted(unknown))}")
+    merged = {**defaults, **table}
+    spec = ScaffoldSpec(
+        name,
+        _strings(merged.get("guides", []), "guides", source),
+        _strings(merged.get("templates", []), "templates", source),
+        _strings(merged.get("contracts", []), "contracts", source),
+        bool(merged.get("prompts", False)),
+    )
+    unknown = set(spec.all_contracts) - set(checks.SCAFFOLD_CHECKS)
+    if unknown:
+        names = ", ".join(sorted(unknown))
+        raise ValueError(f"{source}: unknown contract(s) for {name}: {names}")
+    return spec
+
+
+def _compile(spec: ScaffoldSpec) -> list[Requirement]:
+    requirements = [Requirement(spec.name, STRUCTURE_CHECK)]
+    for target in spec.required_files:
+        name = target.rstrip("/").rpartition("/")[2]
+        requirements.append(
+            Requirement(spec.name, STRUCTURE_CHECK, target, re.compile(translate(name)))
+        )
+    requirements += [Requirement(spec.name, contract) for contract in spec.all_contracts]
+    return requirements
+
+
+class Manifest:
+    """Scaffold specs in manifest order plus their compiled checklist."""
+
+    def __init__(self, specs: list[ScaffoldSpec], source: str = "", digest: str = ""):
+        self.specs = {spec.name: spec for spec in specs}
+        self.source = source
+        self.digest = digest
+
+    @classmethod
+    def parse(cls, text: str, source: str = MANIFEST_NAME) -> "Manifest":
+        try:
+            data = tomllib.loads(text)
+        except tomllib.TOMLDecodeError as error:
+            raise ValueError(f"{source}: {error}") from None
+        defaults = data.get("defaults", {})
+        unknown = set(defaults) - SPEC_KEYS
+        if unknown:
+            raise ValueError(f"{source}: unknown default key(s): {', '.join(sorted(unknown))}")
+        specs = [
+            _spec(name, table, defaults, source)
+            for name, table in data.get("scaffolds", {}).items()
+        ]
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        return cls(specs, source, digest)
+
+    @classmethod
+    def discovered(cls, corpus: Corpus) -> "Manifest":
+        """No file requirements, every contract: the pre-manifest behaviour."""
+        contracts = tuple(checks.SCAFFOLD_CHECKS)
+        return cls(
+            [ScaffoldSpec(name, (), (), contracts, False) for name in corpus.scaffold_names()]
+        )
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.specs)
+
+    def names_with(self, contract: str) -> list[str]:
+        return [name for name, spec in self.specs.items() if contract in spec.all_contracts]
+
+    @cached_property
+    def checklist(self) -> tuple[Requirement, ...]:
+        if not self.source:
+            # Discovered scaffolds already have the shape; only contracts apply.
+            return tuple(
+                Requirement(name, contract)
+                for name, spec in self.specs.items()
+                for contract in spec.all_contracts
+            )
+        return tuple(
+            requirement for spec in self.specs.values() for requirement in _compile(spec)
+        )
+
+    def checklist_for(self, scaffold: str) -> tuple[Requirement, ...]:
+        return tuple(
+            requirement for requirement in self.checklist if requirement.scaffold == scaffold
+        )
+
+
+def read_manifest(root: Path, corpus: Corpus | None = None) -> Manifest:
+    """The compiled manifest at ``root``, or the fallback discovered in ``corpus``."""
+    path = root / MANIFEST_NAME
+    if not path.is_file():
+        return Manifest.discovered(corpus or Corpus(root))
+    return Manifest.parse(path.read_text(encoding="utf-8"), str(path))
+
+
+@lru_cache(maxsize=None)
+def load_manifest(root: Path = REPO_ROOT) -> Manifest:
+    """``read_manifest`` for ``root``, cached per process."""
+    return read_manifest(root)
+
+
+def run_checklist(
+    corpus: Corpus, checklist: tuple[Requirement, ...]
+) -> list[tuple[str, str, list[str]]]:
+    """``(check, scaffold, failures)`` per check and scaffold, in checklist order.
+
+    Contracts are skipped for a scaffold with a missing file: every contract
+    reads files the structure requirements guarantee.
+    """
+    results: dict[tuple[str, str], list[str]] = {}
+    listings: dict[str, list[str]] = {}
+    missing: set[str] = set()
+    incomplete: set[str] = set()
+    for requirement in checklist:
+        scaffold = requirement.scaffold
+        failures = results.setdefault((requirement.check, scaffold), [])
+        if scaffold in missing:
+            # One failure for a missing scaffold directory says enough.
+            continue
+        if requirement.check != STRUCTURE_CHECK:
+            if scaffold not in incomplete:
+                failures.extend(checks.SCAFFOLD_CHECKS[requirement.check](corpus, scaffold))
+            continue
+        if not requirement.target:
+            if not corpus.is_dir(corpus.root / scaffold):
+                failures.append(f"missing scaffold directory: {scaffold}")
+                missing.add(scaffold)
+            continue
+
+        parent, _, _ = requirement.target.rstrip("/").rpartition("/")
+        directory = f"{scaffold}/{parent}" if parent else scaffold
+        if directory not in listings:
+            listings[directory] = [
+                child.name for child in corpus.children(corpus.root / directory)
+            ]
+        wants_directory = requirement.target.endswith("/")
+        found = any(
+            requirement.pattern.fullmatch(child)
+            and corpus.is_dir(corpus.root / directory / child) == wants_directory
+            for child in listings[directory]
+        )
+        if not found:
+            failures.append(f"{scaffold}: missing {requirement.target}")
+            incomplete.add(scaffold)
+    return [(check, scaffold, failures) for (check, scaffold), failures in results.items()]
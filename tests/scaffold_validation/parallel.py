@@ -0,0 +1,125 @@
+"""Fan scaffold and document checks out across a process pool.
+
+Each scaffold is one task running its manifest checklist (see
+``manifest``); markdown files are split into fixed-size chunks running
+every tree-wide document check, streamed for files too large to load (see
+``stream``). Each worker keeps its own process-wide corpus, so a file is
+read at most once per worker. Results are merged by check and sorted by
+subject, which makes the report independent of worker count and
+completion order.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+from pathlib import Path
+
+from scaffold_validation import checks
+from scaffold_validation.corpus import Corpus, load_corpus
+from scaffold_validation.manifest import (
+    STRUCTURE_CHECK,
+    Manifest,
+    load_manifest,
+    run_checklist,
+)
+from scaffold_validation.stream import scan_failures
+
+
+DEFAULT_CHUNK_SIZE = 32
+
+Report = dict[str, list[str]]
+TaskResult = list[tuple[str, str, list[str]]]
+Task = tuple[str, str, str | tuple[str, ...]]
+
+
+def default_jobs() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def scaffold_results(corpus: Corpus, manifest: Manifest, scaffold: str) -> TaskResult:
+    return run_checklist(corpus, manifest.checklist_for(scaffold))
+
+
+def document_results(corpus: Corpus, relatives: tuple[str, ...]) -> TaskResult:
+    results: TaskResult = []
+    for relative in relatives:
+        path = corpus.root / relative
+        if corpus.is_large(path):
+            results += [
+                (name, relative, failures)
+                for name, failures in scan_failures(corpus, path).items()
+            ]
+            continue
+        document = corpus.document(path)
+        for name, check in checks.TREE_CHECKS.items():
+            results.append((name, relative, check(corpus, document)))
+    return results
+
+
+def _scaffold_task(root: str, scaffold: str) -> TaskResult:
+    return scaffold_results(load_corpus(Path(root)), load_manifest(Path(root)), scaffold)
+
+
+def _document_task(root: str, relatives: tuple[str, ...]) -> TaskResult:
+    return document_results(load_corpus(Path(root)), relatives)
+
+
+def run_task(kind: str, root: str, subject: str | tuple[str, ...]) -> TaskResult:
+    if kind == "scaffold":
+        return _scaffold_task(root, subject)
+    return _document_task(root, subject)
+
+
+def merge(results: list[TaskResult]) -> Report:
+    """Group task results by check, ordered by subject."""
+    grouped: dict[str, list[tuple[str, list[str]]]] = {}
+    for result in results:
+        for check, subject, failures in result:
+            grouped.setdefault(check, []).append((subject, failures))
+
+    order = [*checks.TREE_CHECKS, STRUCTURE_CHECK, *checks.SCAFFOLD_CHECKS]
+    report: Report = {}
+    for check in order:
+        entries = sorted(grouped.get(check, []), key=lambda entry: entry[0])
+        report[check] = [failure for _, failures in entries for failure in failures]
+    return report
+
+
+def plan_tasks(corpus: Corpus, manifest: Manifest, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list[Task]:
+    """One task per manifest scaffold and one per ``chunk_size`` markdown files."""
+    root = str(corpus.root)
+    markdown = [corpus.relative(path) for path in corpus.markdown_paths()]
+    tasks: list[Task] = [("scaffold", root, scaffold) for scaffold in manifest.names]
+    tasks += [
+        ("document", root, tuple(markdown[start : start + chunk_size]))
+        for start in range(0, len(markdown), chunk_size)
+    ]
+    return tasks
+
+
+def tree_tasks(root: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list[Task]:
+    return plan_tasks(Corpus(root), load_manifest(root), chunk_size)
+
+
+def validate_tree(
+    root: Path, jobs: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Report:
+    """Run every scaffold and tree-wide check under ``root``.
+
+    ``jobs=1`` runs serially in-process; any other value uses a process pool
+    (``None`` sizes it to the available cores). Output is identical either way.
+    """
+    jobs = default_jobs() if jobs is None else jobs
+    tasks = tree_tasks(root, chunk_size)
+    kinds, roots, subjects = zip(*tasks) if tasks else ((), (), ())
+    if jobs <= 1:
+        results = list(map(run_task, kinds, roots, subjects))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(run_task, kinds, roots, subjects))
+    return merge(results)
+
+
+def format_report(report: Report) -> list[str]:
+    return [f"[{check}] {failure}" for check, failures in report.items() for failure in failures]
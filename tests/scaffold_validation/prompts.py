@@ -0,0 +1,267 @@
+"""Prompt library compiled from every scaffold's ``07-agent-prompts.md``.
+
+A prompt is a heading matching ``PROMPT_HEADING_PATTERN`` and the first
+fenced block under it; ``{placeholder}`` spans in that block are its
+parameters. ``compile_library`` writes all prompts to one artifact: a
+first line holding the index (scaffold -> prompt name -> byte range) and
+the digests of the playbooks it was built from, followed by one JSON
+record per prompt with the body already split into literals and slots
+(see ``render.compile_text``). ``PromptLibrary`` reads only the index up
+front and seeks to a record the first time a prompt is asked for, so
+tooling never parses markdown and filling a prompt is a single join.
+
+The index also records each playbook's ``(mtime_ns, size)``; checking
+that the library is current hashes only playbooks whose signature moved.
+"""
+
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
+import time
+from typing import Any, Iterable, Mapping
+
+from scaffold_validation.anchors import Slugger, github_slug
+from scaffold_validation.cache import RACY_WINDOW_NS
+from scaffold_validation.checks import PROMPT_HEADING_PATTERN
+from scaffold_validation.corpus import REPO_ROOT, Corpus, Document
+from scaffold_validation.render import CompiledTemplate, Slot, compile_text
+
+
+PROMPTS_FILE = "07-agent-prompts.md"
+LIBRARY_SCHEMA = 1
+DEFAULT_LIBRARY_PATH = Path(".validation-cache") / "prompt-library.jsonl"
+NAME_AFFIX_PATTERN = re.compile(r"^prompt(?:\s+\d+)?\s*:\s*|\s+prompt$", re.IGNORECASE)
+
+
+def prompt_title(title: str) -> str:
+    """The heading without its ``Prompt N:`` prefix or ``Prompt`` suffix."""
+    return NAME_AFFIX_PATTERN.sub("", title.strip())
+
+
+def prompt_name(title: str) -> str:
+    """``"Prompt 2: Mitigation — Rollback"`` -> ``"mitigation--rollback"``."""
+    return github_slug(prompt_title(title))
+
+
+@dataclass(frozen=True)
+class Prompt:
+    scaffold: str
+    name: str
+    title: str
+    line: int
+    # Digest prefix of the body; changes whenever the prompt text does.
+    version: str
+    template: CompiledTemplate
+
+    @property
+    def parameters(self) -> list[str]:
+        return list(dict.fromkeys(slot.name for slot in self.template.slots))
+
+    @property
+    def text(self) -> str:
+        return self.template.render({})[0]
+
+    def fill(self, values: Mapping[str, str], partial: bool = False) -> str:
+        """The body with ``values`` substituted; missing parameters raise unless ``partial``."""
+        text, unfilled = self.template.render(values)
+        if unfilled and not partial:
+            missing = ", ".join(dict.fromkeys(slot.name for slot in unfilled))
+            raise ValueError(f"{self.scaffold}/{self.name} is missing parameters: {missing}")
+        return text
+
+    def fill_batch(self, rows: Iterable[Mapping[str, str]], partial: bool = False) -> list[str]:
+        return [self.fill(row, partial) for row in rows]
+
+
+def extract_prompts(document: Document, scaffold: str) -> list[Prompt]:
+    """Prompt sections of one playbook, in document order; sections without a fence are skipped."""
+    headings = document.headings
+    fences = [fence for fence in document.fences if fence.end is not None]
+    prompts: list[Prompt] = []
+    # Repeated titles get GitHub-style suffixes, like their anchors, and a
+    # suffix never reuses a name another prompt already has.
+    names = Slugger()
+    for position, heading in enumerate(headings):
+        if not PROMPT_HEADING_PATTERN.match(document.lines[heading.line - 1].strip()):
+            continue
+        end = next(
+            (later.line for later in headings[position + 1 :] if later.level <= heading.level),
+            len(document.lines) + 1,
+        )
+        fence = next((fence for fence in fences if heading.line < fence.start < end), None)
+        if fence is None:
+            continue
+        body = "\n".join(document.lines[fence.start : fence.end - 1]) + "\n"
+        prompts.append(
+            Prompt(
+                scaffold,
+                names(prompt_title(heading.text)),
+                heading.text,
+                heading.line,
+                hashlib.sha256(body.encode("utf-8")).hexdigest()[:12],
+                compile_text(body, lambda line, placeholder: True, fence.start + 1),
+            )
+        )
+    return prompts
+
+
+def _record(prompt: Prompt) -> dict[str, Any]:
+    return {
+        "scaffold": prompt.scaffold,
+        "name": prompt.name,
+        "title": prompt.title,
+        "line": prompt.line,
+        "version": prompt.version,
+        "literals": list(prompt.template.literals),
+        "slots": [[slot.name, slot.line] for slot in prompt.template.slots],
+    }
+
+
+def _prompt(record: dict[str, Any]) -> Prompt:
+    slots = tuple(Slot(name, line, True) for name, line in record["slots"])
+    return Prompt(
+        record["scaffold"],
+        record["name"],
+        record["title"],
+        record["line"],
+        record["version"],
+        CompiledTemplate(tuple(record["literals"]), slots),
+    )
+
+
+def playbook_paths(corpus: Corpus) -> dict[str, Path]:
+    """Every scaffold's playbook, from the tree walk alone."""
+    return {
+        scaffold: corpus.root / scaffold / PROMPTS_FILE
+        for scaffold in corpus.scaffold_names()
+        if f"{scaffold}/{PROMPTS_FILE}" in corpus.relative_files
+    }
+
+
+def _signature(path: Path) -> list[int]:
+    stat = path.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _settled_signature(path: Path) -> list[int] | None:
+    """The signature, or ``None`` while an edit in the same mtime tick could go unseen."""
+    signature = _signature(path)
+    return signature if time.time_ns() - signature[0] > RACY_WINDOW_NS else None
+
+
+def library_version(sources: Mapping[str, str]) -> str:
+    digest = hashlib.sha256(f"schema {LIBRARY_SCHEMA}\n".encode("utf-8"))
+    for scaffold in sorted(sources):
+        digest.update(f"{scaffold} {sources[scaffold]}\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def compile_library(corpus: Corpus, path: Path) -> dict[str, Any]:
+    """Extract every playbook's prompts into the artifact at ``path``; returns its index."""
+    records: list[bytes] = []
+    prompts: dict[str, dict[str, list[int]]] = {}
+    sources: dict[str, str] = {}
+    stats: dict[str, list[int] | None] = {}
+    offset = 0
+    for scaffold, playbook in sorted(playbook_paths(corpus).items()):
+        # Stat before reading: a later edit then always moves the signature.
+        stats[scaffold] = _settled_signature(playbook)
+        document = corpus.document(playbook)
+        sources[scaffold] = document.digest
+        entries = prompts.setdefault(scaffold, {})
+        for prompt in extract_prompts(document, scaffold):
+            data = json.dumps(_record(prompt), ensure_ascii=False).encode("utf-8") + b"\n"
+            entries[prompt.name] = [offset, len(data)]
+            records.append(data)
+            offset += len(data)
+    index = {
+        "schema": LIBRARY_SCHEMA,
+        "version": library_version(sources),
+        "sources": sources,
+        "stats": stats,
+        "prompts": prompts,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with temporary.open("wb") as handle:
+        handle.write(json.dumps(index).encode("utf-8") + b"\n")
+        handle.writelines(records)
+    os.replace(temporary, path)
+    return index
+
+
+class PromptLibrary:
+    """Lazy reader for a compiled library; records are parsed on first use."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with path.open("rb") as handle:
+            header = handle.readline()
+        self.index: dict[str, Any] = json.loads(header)
+        if self.index.get("schema") != LIBRARY_SCHEMA:
+            raise ValueError(f"{path} is not a schema {LIBRARY_SCHEMA} prompt library")
+        self._base = len(header)
+        self._loaded: dict[tuple[str, str], Prompt] = {}
+
+    @property
+    def version(self) -> str:
+        return self.index["version"]
+
+    @property
+    def records_loaded(self) -> int:
+        return len(self._loaded)
+
+    def scaffolds(self) -> list[str]:
+        return sorted(self.index["prompts"])
+
+    def names(self, scaffold: str) -> list[str]:
+        return list(self.index["prompts"].get(scaffold, {}))
+
+    def is_current(self, corpus: Corpus) -> bool:
+        """Whether every playbook matches the build; only moved signatures are hashed."""
+        sources = self.index["sources"]
+        paths = playbook_paths(corpus)
+        if paths.keys() != sources.keys():
+            return False
+        stats = self.index.get("stats", {})
+        for scaffold, path in paths.items():
+            recorded = stats.get(scaffold)
+            if recorded is not None and recorded == _signature(path):
+                continue
+            if corpus.document(path).digest != sources[scaffold]:
+                return False
+        return True
+
+    def get(self, scaffold: str, name: str) -> Prompt:
+        """Look a prompt up by name or by heading title."""
+        entries = self.index["prompts"].get(scaffold, {})
+        key = name if name in entries else prompt_name(name)
+        if key not in entries:
+            raise KeyError(f"no prompt {name!r} in {scaffold}")
+        prompt = self._loaded.get((scaffold, key))
+        if prompt is None:
+            offset, length = entries[key]
+            with self.path.open("rb") as handle:
+                handle.seek(self._base + offset)
+                prompt = _prompt(json.loads(handle.read(length)))
+            self._loaded[(scaffold, key)] = prompt
+        return prompt
+
+
+def default_library_path(root: Path = REPO_ROOT) -> Path:
+    return root / DEFAULT_LIBRARY_PATH
+
+
+def load_library(corpus: Corpus, path: Path) -> PromptLibrary:
+    """The library at ``path``, recompiled first when a playbook changed since it was built."""
+    try:
+        library = PromptLibrary(path)
+    except (OSError, ValueError):
+        library = None
+    if library is None or not library.is_current(corpus):
+        compile_library(corpus, path)
+        library = PromptLibrary(path)
+    return library
@@ -0,0 +1,223 @@
+"""Compiled rendering of scaffold ``*.template`` files.
+
+A template is compiled once into alternating literal text and placeholder
+slots (``{PROJECT_NAME}``, ``{date}``, ``{Project Name}``...). Compiled
+forms are cached by content digest, so rendering a scaffold for hundreds
+of projects parses each template exactly once and every render is a
+single ``str.join``. A placeholder with no value is left as written and
+reported; slots inside code blocks are reported separately because many
+are literal braces (JSON bodies, format strings) rather than blanks.
+
+Every rendered directory gets a ``RENDER_MANIFEST`` recording the scaffold,
+the variables and, per file, the template text it came from and the digest
+of what was written, which is what ``upgrade`` merges against later.
+"""
+
+from dataclasses import dataclass, field
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Callable, Mapping
+
+from scaffold_validation.corpus import Corpus, Document
+from scaffold_validation.tokenizer import PLACEHOLDER_PATTERN, Placeholder
+
+
+TEMPLATE_SUFFIX = ".template"
+RENDER_MANIFEST = ".scaffold-render.json"
+
+
+@dataclass(frozen=True)
+class Slot:
+    name: str
+    line: int
+    in_code: bool
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """``literals[i]`` precedes ``slots[i]``; the last literal ends the text."""
+
+    literals: tuple[str, ...]
+    slots: tuple[Slot, ...]
+
+    @property
+    def names(self) -> frozenset[str]:
+        return frozenset(slot.name for slot in self.slots)
+
+    def render(self, variables: Mapping[str, str]) -> tuple[str, list[Slot]]:
+        """Rendered text and the slots left unfilled, in document order."""
+        parts: list[str] = []
+        unfilled: list[Slot] = []
+        for literal, slot in zip(self.literals, self.slots):
+            parts.append(literal)
+            value = variables.get(slot.name)
+            if value is None:
+                unfilled.append(slot)
+                parts.append(f"{{{slot.name}}}")
+            else:
+                parts.append(value)
+        parts.append(self.literals[-1])
+        return "".join(parts), unfilled
+
+
+def compile_text(
+    text: str, in_code: Callable[[int, str], bool], first_line: int = 1
+) -> CompiledTemplate:
+    """Split ``text`` into literals and slots; ``in_code(line, "{name}")`` tags each slot."""
+    literals: list[str] = []
+    slots: list[Slot] = []
+    position = 0
+    line = first_line
+    for match in PLACEHOLDER_PATTERN.finditer(text):
+        line += text.count("\n", position, match.start())
+        literals.append(text[position : match.start()])
+        name = match.group(0)
+        slots.append(Slot(name[1:-1], line, in_code(line, name)))
+        position = match.end()
+    literals.append(text[position:])
+    return CompiledTemplate(tuple(literals), tuple(slots))
+
+
+def compile_template(document: Document) -> CompiledTemplate:
+    """Compile ``document``; every slot of a non-markdown template counts as code."""
+    code_only = not document.relative.endswith(".md" + TEMPLATE_SUFFIX)
+    in_code = {
+        (token.line, token.name)
+        for token in document.tokens
+        if isinstance(token, Placeholder) and token.in_code
+    }
+    return compile_text(document.text, lambda line, name: code_only or (line, name) in in_code)
+
+
+@dataclass
+class RenderResult:
+    output: Path
+    files: list[str] = field(default_factory=list)
+    # Output file name -> unfilled slots.
+    unfilled: dict[str, list[Slot]] = field(default_factory=dict)
+
+    def unfilled_names(self, include_code: bool = False) -> list[str]:
+        return sorted(
+            {
+                slot.name
+                for slots in self.unfilled.values()
+                for slot in slots
+                if include_code or not slot.in_code
+            }
+        )
+
+
+class TemplateEngine:
+    """Compiles each distinct template body once per engine."""
+
+    def __init__(self, corpus: Corpus):
+        self.corpus = corpus
+        self.compilations = 0
+        self._compiled: dict[str, CompiledTemplate] = {}
+
+    def compiled(self, path: Path) -> CompiledTemplate:
+        document = self.corpus.document(path)
+        template = self._compiled.get(document.digest)
+        if template is None:
+            template = compile_template(document)
+            self._compiled[document.digest] = template
+            self.compilations += 1
+        return template
+
+    def template_paths(self, scaffold: str) -> list[Path]:
+        return [
+            path
+            for path in self.corpus.children(self.corpus.root / scaffold / "templates")
+            if path.name.endswith(TEMPLATE_SUFFIX)
+        ]
+
+    def render_scaffold(
+        self, scaffold: str, variables: Mapping[str, str], output: Path
+    ) -> RenderResult:
+        """Render every template of ``scaffold`` into ``output``, dropping ``.template``."""
+        result = RenderResult(output)
+        output.mkdir(parents=True, exist_ok=True)
+        manifest_files: dict[str, dict[str, str]] = {}
+        for path in self.template_paths(scaffold):
+            name = path.name[: -len(TEMPLATE_SUFFIX)]
+            text, unfilled = self.compiled(path).render(variables)
+            write_rendered(output / name, text)
+            result.files.append(name)
+            manifest_files[name] = template_record(self.corpus.document(path), text)
+            if unfilled:
+                result.unfilled[name] = unfilled
+        write_manifest(
+            output, {"scaffold": scaffold, "variables": dict(variables), "files": manifest_files}
+        )
+        return result
+
+    def render_batch(
+        self,
+        scaffold: str,
+        projects: list[dict[str, Any]],
+        base: Path,
+        defaults: Mapping[str, str] | None = None,
+    ) -> list[RenderResult]:
+        """Render ``scaffold`` once per project: ``{"output": dir, "variables": {...}}``.
+
+        Relative ``output`` directories are resolved against ``base``; project
+        variables override ``defaults``.
+        """
+        return [
+            self.render_scaffold(
+                scaffold, {**(defaults or {}), **project["variables"]}, base / project["output"]
+            )
+            for project in projects
+        ]
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def write_rendered(path: Path, text: str) -> None:
+    # newline="" keeps the template's "\n" line endings on every platform.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        handle.write(text)
+
+
+def template_record(template: Document, rendered: str) -> dict[str, str]:
+    return {
+        "template": template.relative,
+        "template_sha256": template.digest,
+        "template_text": template.text,
+        "rendered_sha256": text_digest(rendered),
+    }
+
+
+def read_manifest(output: Path) -> dict[str, Any]:
+    return json.loads((output / RENDER_MANIFEST).read_text(encoding="utf-8"))
+
+
+def write_manifest(output: Path, manifest: dict[str, Any]) -> None:
+    write_rendered(output / RENDER_MANIFEST, json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+
+
+def _variables(data: Any, source: Path) -> dict[str, str]:
+    if not isinstance(data, dict):
+        raise ValueError(f"{source} must map placeholder names to values")
+    return {str(name): str(value) for name, value in data.items()}
+
+
+def load_variables(path: Path) -> dict[str, str]:
+    """A JSON object mapping placeholder text (without braces) to its value."""
+    return _variables(json.loads(path.read_text(encoding="utf-8")), path)
+
+
+def load_projects(path: Path) -> list[dict[str, Any]]:
+    """A JSON list of ``{"output": ..., "variables": {...}}`` project entries."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, list) or not all(
+        isinstance(entry, dict) and "output" in entry for entry in data
+    ):
+        raise ValueError(f"{path} must contain a JSON list of objects with an 'output' key")
+    return [
+        {**entry, "variables": _variables(entry.get("variables", {}), path)} for entry in data
+    ]
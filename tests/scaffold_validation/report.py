@@ -0,0 +1,89 @@
+"""JSON and SARIF reports, and time budgets, for an instrumented run."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from scaffold_validation import checks
+from scaffold_validation.manifest import STRUCTURE_CHECK
+
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+BUDGET_RULE = "time-budget"
+# Budget key applying to every check without a budget of its own.
+DEFAULT_BUDGET = "*"
+
+
+def budget_violations(summary: dict[str, Any], budgets: dict[str, float]) -> list[str]:
+    """Checks whose total wall time exceeds their budget in seconds."""
+    violations: list[str] = []
+    for check, totals in summary["checks"].items():
+        limit = budgets.get(check, budgets.get(DEFAULT_BUDGET))
+        if limit is not None and totals["seconds"] > limit:
+            violations.append(
+                f"{check} took {totals['seconds']:.3f}s, over its {limit:g}s budget"
+            )
+    return violations
+
+
+def json_report(
+    summary: dict[str, Any], budgets: dict[str, float], violations: list[str]
+) -> dict[str, Any]:
+    return {**summary, "budget": {"limits": budgets, "violations": violations}}
+
+
+def _uri(check: str, subject: str) -> str:
+    return subject if check in checks.TREE_CHECKS else f"{subject}/"
+
+
+def sarif_report(summary: dict[str, Any], violations: list[str]) -> dict[str, Any]:
+    """SARIF 2.1.0 log: one result per failure and per budget violation.
+
+    Timing totals travel in the run's property bag so code-scanning UIs
+    show findings while the artifact still answers "what got slow".
+    """
+    rules = [
+        {"id": check, "shortDescription": {"text": f"{check} check"}}
+        for check in [*checks.TREE_CHECKS, STRUCTURE_CHECK, *checks.SCAFFOLD_CHECKS, BUDGET_RULE]
+    ]
+    results = [
+        {
+            "ruleId": failure["check"],
+            "level": "error",
+            "message": {"text": failure["message"]},
+            "locations": [
+                {
+                    "physicalLocation": {
+                        "artifactLocation": {
+                            "uri": _uri(failure["check"], failure["subject"]),
+                            "uriBaseId": "%SRCROOT%",
+                        }
+                    }
+                }
+            ],
+        }
+        for failure in summary["failures"]
+    ]
+    results += [
+        {"ruleId": BUDGET_RULE, "level": "error", "message": {"text": violation}}
+        for violation in violations
+    ]
+    return {
+        "$schema": SARIF_SCHEMA,
+        "version": "2.1.0",
+        "runs": [
+            {
+                "tool": {"driver": {"name": "scaffold-validation", "rules": rules}},
+                "results": results,
+                "properties": {
+                    "checks": summary["checks"],
+                    "slowestFiles": summary["slowest_files"],
+                },
+            }
+        ],
+    }
+
+
+def write_report(path: Path, report: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
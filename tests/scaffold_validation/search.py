@@ -0,0 +1,517 @@
+"""BM25 full-text search over scaffold guides and prompts.
+
+The unit of retrieval is a heading section: the heading plus the lines up
+to the next heading, so a hit lands on ``guide.md#anchor`` rather than on
+a whole file. Sections of ``07-agent-prompts.md`` whose heading is a
+prompt heading are tagged ``prompt``. Heading terms count
+``HEADING_WEIGHT`` times.
+
+The index is one binary file of named blocks (term strings sorted for
+binary search, postings as ``array`` columns, section metadata as string
+tables) opened with ``mmap``, so a query touches only the postings of its
+own terms and never parses the whole index. Rebuilds are incremental:
+files whose ``(mtime_ns, size)`` signature or digest is unchanged keep
+their sections, and only edited files are re-read and re-tokenized.
+"""
+
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+import heapq
+import json
+import math
+import mmap
+import os
+from pathlib import Path
+import re
+import struct
+import sys
+import time
+from typing import Any, Iterable
+
+from scaffold_validation.anchors import heading_slugs
+from scaffold_validation.cache import RACY_WINDOW_NS
+from scaffold_validation.checks import PROMPT_HEADING_PATTERN
+from scaffold_validation.corpus import REPO_ROOT, Corpus, Document
+
+
+DEFAULT_INDEX_PATH = Path(".validation-cache") / "search.idx"
+INDEX_MAGIC = b"SVSEARCH"
+INDEX_VERSION = 1
+PROMPTS_NAME = "07-agent-prompts.md"
+HEADING_WEIGHT = 3
+# Rewrite the index densely once this share of postings belongs to dead sections.
+COMPACT_RATIO = 0.25
+BM25_K1 = 1.2
+BM25_B = 0.75
+TERM_PATTERN = re.compile(r"[0-9a-z]+")
+STOPWORDS = frozenset(
+    "an and are as at be by do for from if in is it not of on or so that the this to "
+    "was we with you your".split()
+)
+
+_HEADER = struct.Struct("<8sII")
+_BLOCK = struct.Struct("<16sQQ")
+
+
+def terms(text: str) -> list[str]:
+    return [
+        term
+        for term in TERM_PATTERN.findall(text.lower())
+        if len(term) > 1 and term not in STOPWORDS
+    ]
+
+
+@dataclass
+class Section:
+    relative: str
+    heading: str
+    anchor: str
+    line: int
+    kind: str
+    terms: dict[str, int]
+
+    @property
+    def length(self) -> int:
+        return sum(self.terms.values())
+
+
+def section_spans(document: Document) -> list[tuple[int, int, str, str]]:
+    """``(heading line, end, heading, anchor)`` per heading section.
+
+    The body is ``document.lines[line:end]``. Text above the first heading
+    is a section at line 0 titled with the file's path and no anchor.
+    """
+    headings = document.headings
+    lines = document.lines
+    starts = [
+        (heading.line, heading.text, slug)
+        for heading, slug in zip(headings, heading_slugs(headings))
+    ]
+    preamble_end = starts[0][0] - 1 if starts else len(lines)
+    if any(line.strip() for line in lines[:preamble_end]):
+        starts.insert(0, (0, document.relative, ""))
+    ends = [start[0] - 1 for start in starts[1:]] + [len(lines)]
+    return [
+        (line, end, heading, anchor) for (line, heading, anchor), end in zip(starts, ends)
+    ]
+
+
+def document_sections(document: Document) -> list[Section]:
+    """One section per heading, plus one for any text above the first heading."""
+    lines = document.lines
+    prompts = document.path.name == PROMPTS_NAME
+    sections: list[Section] = []
+    for line, end, heading, anchor in section_spans(document):
+        kind = (
+            "prompt"
+            if line and prompts and PROMPT_HEADING_PATTERN.match(lines[line - 1].strip())
+            else "section"
+        )
+        counts = Counter(terms("\n".join(lines[line:end])))
+        for term in terms(heading) if line else ():
+            counts[term] += HEADING_WEIGHT
+        sections.append(Section(document.relative, heading, anchor, max(line, 1), kind, dict(counts)))
+    return sections
+
+
+@dataclass(frozen=True)
+class Hit:
+    relative: str
+    heading: str
+    anchor: str
+    line: int
+    kind: str
+    score: float
+
+    @property
+    def location(self) -> str:
+        return f"{self.relative}#{self.anchor}" if self.anchor else self.relative
+
+
+def _postings(sections: list[Section], first: int) -> dict[str, list[tuple[int, int]]]:
+    postings: dict[str, list[tuple[int, int]]] = {}
+    for number, section in enumerate(sections, start=first):
+        for term, count in section.terms.items():
+            postings.setdefault(term, []).append((number, min(count, 0xFFFF)))
+    return postings
+
+
+def _index_blocks(
+    base: "SearchIndex | None", sections: list[Section], dead: Iterable[int] = ()
+) -> dict[str, bytes]:
+    """Blocks of ``base`` (or of an empty index) with ``dead`` tombstoned and ``sections`` appended.
+
+    Postings of unchanged terms are copied as raw slices; only the new
+    sections' postings are built in Python.
+    """
+    first = base.section_count if base else 0
+    old_terms = {base.term(number): number for number in range(base.term_count)} if base else {}
+    new_postings = _postings(sections, first)
+
+    starts = array("I", [0])
+    section_chunks: list[bytes] = []
+    count_chunks: list[bytes] = []
+    total = 0
+    vocabulary = sorted(old_terms.keys() | new_postings.keys())
+    for term in vocabulary:
+        number = old_terms.get(term)
+        if number is not None:
+            start, end = base._starts[number], base._starts[number + 1]
+            section_chunks.append(base._posting_sections[start:end].tobytes())
+            count_chunks.append(base._posting_counts[start:end].tobytes())
+            total += end - start
+        added = new_postings.get(term, [])
+        if added:
+            section_chunks.append(array("I", (section for section, _ in added)).tobytes())
+            count_chunks.append(array("H", (count for _, count in added)).tobytes())
+            total += len(added)
+        starts.append(total)
+
+    live = bytearray(base._section_live if base else b"")
+    for number in dead:
+        live[number] = 0
+    live += b"\1" * len(sections)
+    lengths = array("I", base._section_lengths if base else [])
+    lengths.extend(section.length for section in sections)
+    live_lengths = [length for length, alive in zip(lengths, live) if alive]
+
+    paths = base.strings("paths") if base else []
+    path_ids = {relative: number for number, relative in enumerate(paths)}
+    for section in sections:
+        if section.relative not in path_ids:
+            path_ids[section.relative] = len(paths)
+            paths.append(section.relative)
+
+    def column(name: str, typecode: str, values: Iterable[int]) -> bytes:
+        return (base._column_bytes(name) if base else b"") + array(typecode, values).tobytes()
+
+    blocks = {
+        "postings.start": starts.tobytes(),
+        "postings.section": b"".join(section_chunks),
+        "postings.count": b"".join(count_chunks),
+        "sections.path": column("sections.path", "I", (path_ids[s.relative] for s in sections)),
+        "sections.line": column("sections.line", "I", (s.line for s in sections)),
+        "sections.terms": column("sections.terms", "I", (len(s.terms) for s in sections)),
+        "sections.prompt": column("sections.prompt", "B", (s.kind == "prompt" for s in sections)),
+        "sections.length": lengths.tobytes(),
+        "sections.live": bytes(live),
+        "stats": array(
+            "d",
+            [sum(live_lengths) / len(live_lengths) if live_lengths else 0.0, len(live_lengths)],
+        ).tobytes(),
+    }
+    blocks["terms.offsets"], blocks["terms.blob"] = _string_table(vocabulary)
+    blocks["paths.offsets"], blocks["paths.blob"] = _string_table(paths)
+    for name, field_name in (("headings", "heading"), ("anchors", "anchor")):
+        offsets, blob = _string_table(getattr(section, field_name) for section in sections)
+        if base:
+            offsets, blob = base._extend_table(name, offsets, blob)
+        blocks[f"{name}.offsets"], blocks[f"{name}.blob"] = offsets, blob
+    return blocks
+
+
+def _string_table(values: Iterable[str]) -> tuple[bytes, bytes]:
+    offsets = array("Q", [0])
+    blob = bytearray()
+    for value in values:
+        blob += value.encode("utf-8")
+        offsets.append(len(blob))
+    return offsets.tobytes(), bytes(blob)
+
+
+def write_index(path: Path, blocks: dict[str, bytes], meta: dict[str, Any]) -> None:
+    blocks = {**blocks, "meta": json.dumps({**meta, "byteorder": sys.byteorder}).encode("utf-8")}
+    directory = bytearray(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(blocks)))
+    offset = len(directory) + _BLOCK.size * len(blocks)
+    body = bytearray()
+    for name, data in blocks.items():
+        # Eight-byte alignment keeps every column castable in place.
+        body += b"\0" * (-(offset + len(body)) % 8)
+        directory += _BLOCK.pack(name.encode("ascii"), offset + len(body), len(data))
+        body += data
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    temporary.write_bytes(bytes(directory + body))
+    os.replace(temporary, path)
+
+
+class SearchIndex:
+    """Read-only view of an index file through ``mmap``.
+
+    Sections of changed or removed files stay in the postings, flagged dead
+    in ``sections.live``, until the next compaction; like Lucene, document
+    frequencies count them until then.
+    """
+
+    def __init__(self, path: Path):
+        with path.open("rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: list[memoryview] = [memoryview(self._map)]
+        magic, version, count = _HEADER.unpack_from(self._map)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {INDEX_VERSION} search index")
+        self._blocks: dict[str, tuple[int, int]] = {}
+        for number in range(count):
+            name, offset, length = _BLOCK.unpack_from(self._map, _HEADER.size + number * _BLOCK.size)
+            self._blocks[name.rstrip(b"\0").decode("ascii")] = (offset, length)
+
+        self._starts = self._column("postings.start", "I")
+        self._posting_sections = self._column("postings.section", "I")
+        self._posting_counts = self._column("postings.count", "H")
+        self._section_paths = self._column("sections.path", "I")
+        self._section_lines = self._column("sections.line", "I")
+        self._section_terms = self._column("sections.terms", "I")
+        self._section_lengths = self._column("sections.length", "I")
+        self._section_prompts = self._column("sections.prompt", "B")
+        self._section_live = self._column("sections.live", "B")
+        self._offsets = {
+            name: self._column(f"{name}.offsets", "Q")
+            for name in ("terms", "paths", "headings", "anchors")
+        }
+        self.average_length, live = self._column("stats", "d")
+        self.live_sections = int(live)
+        self.term_count = len(self._starts) - 1
+        self.section_count = len(self._section_lengths)
+        self.posting_count = len(self._posting_sections)
+
+    def _block(self, name: str) -> memoryview:
+        offset, length = self._blocks[name]
+        view = self._views[0][offset : offset + length]
+        self._views.append(view)
+        return view
+
+    def _column(self, name: str, typecode: str) -> memoryview:
+        view = self._block(name).cast(typecode)
+        self._views.append(view)
+        return view
+
+    def _column_bytes(self, name: str) -> bytes:
+        offset, length = self._blocks[name]
+        return self._map[offset : offset + length]
+
+    def _string(self, name: str, number: int) -> bytes:
+        offsets = self._offsets[name]
+        base = self._blocks[f"{name}.blob"][0]
+        return self._map[base + offsets[number] : base + offsets[number + 1]]
+
+    def _extend_table(self, name: str, offsets: bytes, blob: bytes) -> tuple[bytes, bytes]:
+        old_offsets = self._offsets[name]
+        shift = old_offsets[-1]
+        shifted = array("Q", (value + shift for value in array("Q", offsets)[1:]))
+        return (
+            self._column_bytes(f"{name}.offsets") + shifted.tobytes(),
+            self._column_bytes(f"{name}.blob") + blob,
+        )
+
+    def strings(self, name: str) -> list[str]:
+        return [
+            self._string(name, number).decode("utf-8")
+            for number in range(len(self._offsets[name]) - 1)
+        ]
+
+    def close(self) -> None:
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._map.close()
+
+    def __enter__(self) -> "SearchIndex":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def meta(self) -> dict[str, Any]:
+        return json.loads(self._column_bytes("meta"))
+
+    def term(self, number: int) -> str:
+        return self._string("terms", number).decode("utf-8")
+
+    def find(self, term: str) -> int:
+        """Term number by binary search over the sorted vocabulary; -1 if absent."""
+        wanted = term.encode("utf-8")
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._string("terms", middle) < wanted:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.term_count and self._string("terms", low) == wanted:
+            return low
+        return -1
+
+    def hit(self, section: int, score: float = 0.0) -> Hit:
+        return Hit(
+            self._string("paths", self._section_paths[section]).decode("utf-8"),
+            self._string("headings", section).decode("utf-8"),
+            self._string("anchors", section).decode("utf-8"),
+            self._section_lines[section],
+            "prompt" if self._section_prompts[section] else "section",
+            score,
+        )
+
+    def search(self, query: str, top: int = 10, prompts_only: bool = False) -> list[Hit]:
+        """BM25-ranked live sections for ``query``; ties keep index order."""
+        scores: dict[int, float] = {}
+        count = self.live_sections
+        average = self.average_length or 1.0
+        live = self._section_live
+        for term in dict.fromkeys(terms(query)):
+            number = self.find(term)
+            if number < 0:
+                continue
+            start, end = self._starts[number], self._starts[number + 1]
+            idf = math.log(1 + max(count - (end - start) + 0.5, 0.5) / (end - start + 0.5))
+            for position in range(start, end):
+                section = self._posting_sections[position]
+                if not live[section] or (prompts_only and not self._section_prompts[section]):
+                    continue
+                frequency = self._posting_counts[position]
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._section_lengths[section] / average)
+                scores[section] = scores.get(section, 0.0) + idf * frequency * (BM25_K1 + 1) / (
+                    frequency + norm
+                )
+        best = heapq.nlargest(top, scores.items(), key=lambda entry: (entry[1], -entry[0]))
+        return [self.hit(section, score) for section, score in best]
+
+    def dead_postings(self, numbers: Iterable[int]) -> int:
+        return sum(self._section_terms[number] for number in numbers)
+
+    def sections(self, numbers: set[int]) -> dict[int, Section]:
+        """Rebuild the given sections, term counts included, from the postings."""
+        rebuilt = {
+            number: Section(hit.relative, hit.heading, hit.anchor, hit.line, hit.kind, {})
+            for number, hit in ((number, self.hit(number)) for number in numbers)
+        }
+        for number in range(self.term_count):
+            term = None
+            for position in range(self._starts[number], self._starts[number + 1]):
+                section = rebuilt.get(self._posting_sections[position])
+                if section is not None:
+                    term = term or self.term(number)
+                    section.terms[term] = self._posting_counts[position]
+        return rebuilt
+
+
+def default_index_path(root: Path = REPO_ROOT) -> Path:
+    return root / DEFAULT_INDEX_PATH
+
+
+@dataclass
+class IndexUpdate:
+    documents: int
+    reindexed: int
+    sections: int
+    terms: int
+    seconds: float
+    # "unchanged", "appended", "compacted" or "built".
+    mode: str
+
+
+def _open_previous(path: Path) -> SearchIndex | None:
+    if not path.is_file():
+        return None
+    try:
+        index = SearchIndex(path)
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+    if index.meta.get("byteorder") != sys.byteorder:
+        index.close()
+        return None
+    return index
+
+
+def update_index(corpus: Corpus, path: Path) -> IndexUpdate:
+    """Bring the index at ``path`` up to date with ``corpus``, re-reading only changed files.
+
+    Changed files' old sections are tombstoned and their new sections
+    appended; once dead postings pass ``COMPACT_RATIO`` of the total, the
+    live sections are rewritten densely instead.
+    """
+    started = time.perf_counter()
+    previous = _open_previous(path)
+    try:
+        meta: dict[str, Any] = previous.meta if previous else {"documents": {}}
+        recorded: dict[str, Any] = meta["documents"]
+        documents: dict[str, Any] = {}
+        fresh: dict[str, list[Section]] = {}
+        dead: set[int] = set()
+        changed = False
+        for document_path in corpus.markdown_paths():
+            relative = corpus.relative(document_path)
+            stat = document_path.stat()
+            signature = [stat.st_mtime_ns, stat.st_size]
+            entry = recorded.get(relative)
+            # Freshly written files are re-hashed next time; see cache.RACY_WINDOW_NS.
+            settled = time.time_ns() - stat.st_mtime_ns > RACY_WINDOW_NS
+            if entry is not None and entry["stat"] == signature:
+                documents[relative] = entry
+                continue
+            document = corpus.document(document_path)
+            if entry is not None and entry["sha256"] == document.digest:
+                documents[relative] = {**entry, "stat": signature if settled else None}
+                changed = changed or settled
+                continue
+            fresh[relative] = document_sections(document)
+            documents[relative] = {"stat": signature if settled else None, "sha256": document.digest}
+            changed = True
+        for relative, entry in recorded.items():
+            if relative in fresh or relative not in documents:
+                first, count = entry["sections"]
+                dead.update(range(first, first + count))
+                changed = True
+
+        if previous is not None and not changed:
+            return IndexUpdate(
+                len(documents),
+                0,
+                previous.live_sections,
+                previous.term_count,
+                time.perf_counter() - started,
+                "unchanged",
+            )
+
+        new_sections = [section for relative in sorted(fresh) for section in fresh[relative]]
+        dead_postings = meta.get("dead_postings", 0)
+        if previous is not None:
+            dead_postings += previous.dead_postings(dead)
+        if previous is not None and dead_postings <= COMPACT_RATIO * previous.posting_count:
+            mode = "appended"
+            first = previous.section_count
+            blocks = _index_blocks(previous, new_sections, dead)
+        else:
+            mode = "compacted" if previous is not None else "built"
+            kept = sorted(
+                (entry for relative, entry in documents.items() if relative not in fresh),
+                key=lambda entry: entry["sections"][0],
+            )
+            numbers = {
+                number
+                for entry in kept
+                for number in range(entry["sections"][0], sum(entry["sections"]))
+            }
+            old = previous.sections(numbers) if previous is not None else {}
+            # Kept sections stay in their old order, packed from zero.
+            first, dead_postings = 0, 0
+            for entry in kept:
+                entry["sections"] = [first, entry["sections"][1]]
+                first += entry["sections"][1]
+            blocks = _index_blocks(None, [old[number] for number in sorted(old)] + new_sections)
+    finally:
+        if previous is not None:
+            previous.close()
+
+    for relative in sorted(fresh):
+        documents[relative]["sections"] = [first, len(fresh[relative])]
+        first += len(fresh[relative])
+    write_index(path, blocks, {"documents": documents, "dead_postings": dead_postings})
+    sections = sum(entry["sections"][1] for entry in documents.values())
+    terms_count = len(blocks["terms.offsets"]) // 8 - 1
+    return IndexUpdate(
+        len(documents), len(fresh), sections, terms_count, time.perf_counter() - started, mode
+    )
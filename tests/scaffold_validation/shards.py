@@ -0,0 +1,299 @@
+"""Split the unittest suite into cost-balanced shards and merge their results.
+
+``run_shard`` discovers the whole suite, plans every shard from the
+recorded cost of each test, and runs only its own part. Test files are
+the scheduling unit, because a file's imports and fixtures are paid once
+per shard that touches it; a file costing more than a shard's fair share
+is split test by test. Units are placed longest-first on the least loaded
+shard, which is deterministic for a given suite and history, so every
+shard of a run computes the same plan independently.
+
+Each shard writes a JSON result listing the whole suite and the outcome
+and duration of its own tests. ``merge_shard_results`` checks that every
+test ran exactly once, combines failures, and folds the durations back
+into the cost history for the next plan. ``combine_coverage`` merges the
+per-shard coverage data files so the coverage floor still applies to the
+suite as a whole.
+"""
+
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any, Iterable, Mapping, TextIO
+import unittest
+
+from scaffold_validation.corpus import REPO_ROOT
+
+
+DEFAULT_COSTS = Path(".validation-cache") / "test-costs.json"
+DEFAULT_PATTERN = "test_*.py"
+# Assumed cost of a test with no history; the mean of known tests when there is one.
+DEFAULT_TEST_COST = 0.05
+# Weight of the newest duration in the moving average.
+SMOOTHING = 0.5
+RESULT_SCHEMA = 1
+
+
+def iter_tests(suite: unittest.TestSuite) -> Iterable[unittest.TestCase]:
+    for item in suite:
+        if isinstance(item, unittest.TestSuite):
+            yield from iter_tests(item)
+        else:
+            yield item
+
+
+def discover(start: Path, pattern: str = DEFAULT_PATTERN) -> list[unittest.TestCase]:
+    """Every test under ``start`` in discovery order."""
+    suite = unittest.defaultTestLoader.discover(str(start), pattern, str(start))
+    return list(iter_tests(suite))
+
+
+def file_of(test_id: str) -> str:
+    """``"test_graph.LinkGraphTests.test_x"`` -> ``"test_graph"``."""
+    return test_id.split(".", 1)[0]
+
+
+class CostHistory:
+    """Smoothed seconds per test id, persisted as JSON."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self.tests: dict[str, float] = {}
+        if path is not None and path.is_file():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            if isinstance(data, dict) and isinstance(data.get("tests"), dict):
+                self.tests = data["tests"]
+
+    def cost(self, test_id: str) -> float:
+        known = self.tests.get(test_id)
+        if known is not None:
+            return known
+        if self.tests:
+            return sum(self.tests.values()) / len(self.tests)
+        return DEFAULT_TEST_COST
+
+    def files(self) -> dict[str, float]:
+        totals: dict[str, float] = {}
+        for test_id, seconds in self.tests.items():
+            totals[file_of(test_id)] = totals.get(file_of(test_id), 0.0) + seconds
+        return totals
+
+    def record(self, durations: Mapping[str, float], suite: Iterable[str] | None = None) -> None:
+        """Blend in new durations; tests no longer in ``suite`` are forgotten."""
+        for test_id, seconds in durations.items():
+            previous = self.tests.get(test_id)
+            if previous is not None:
+                seconds = SMOOTHING * seconds + (1 - SMOOTHING) * previous
+            self.tests[test_id] = round(seconds, 6)
+        if suite is not None:
+            keep = set(suite)
+            self.tests = {test_id: cost for test_id, cost in self.tests.items() if test_id in keep}
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temporary.write_text(
+            json.dumps({"tests": self.tests}, indent=1, sort_keys=True), encoding="utf-8"
+        )
+        os.replace(temporary, self.path)
+
+
+def default_costs_path(root: Path = REPO_ROOT) -> Path:
+    return root / DEFAULT_COSTS
+
+
+@dataclass
+class Shard:
+    index: int
+    tests: list[str] = field(default_factory=list)
+    cost: float = 0.0
+
+
+def plan_shards(test_ids: list[str], history: CostHistory, count: int) -> list[Shard]:
+    """Assign every test to one of ``count`` shards, balancing predicted cost.
+
+    Tests keep their discovery order within a shard.
+    """
+    if count < 1:
+        raise ValueError("shard count must be at least 1")
+    files: dict[str, list[str]] = {}
+    for test_id in test_ids:
+        files.setdefault(file_of(test_id), []).append(test_id)
+    costs = {test_id: history.cost(test_id) for test_id in test_ids}
+    fair_share = sum(costs.values()) / count
+
+    units: list[tuple[float, str, list[str]]] = []
+    for name, tests in files.items():
+        cost = sum(costs[test_id] for test_id in tests)
+        if cost > fair_share and len(tests) > 1:
+            units += [(costs[test_id], test_id, [test_id]) for test_id in tests]
+        else:
+            units.append((cost, name, tests))
+
+    shards = [Shard(index) for index in range(count)]
+    for cost, _, tests in sorted(units, key=lambda unit: (-unit[0], unit[1])):
+        shard = min(shards, key=lambda candidate: (candidate.cost, candidate.index))
+        shard.tests += tests
+        shard.cost += cost
+    order = {test_id: position for position, test_id in enumerate(test_ids)}
+    for shard in shards:
+        shard.tests.sort(key=order.__getitem__)
+    return shards
+
+
+class TimingResult(unittest.TextTestResult):
+    """Text result that also records each test's wall time."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.durations: dict[str, float] = {}
+        self._started = 0.0
+
+    def startTest(self, test: unittest.TestCase) -> None:
+        self._started = time.perf_counter()
+        super().startTest(test)
+
+    def stopTest(self, test: unittest.TestCase) -> None:
+        super().stopTest(test)
+        self.durations[test.id()] = time.perf_counter() - self._started
+
+
+def run_shard(
+    start: Path,
+    index: int,
+    count: int,
+    history: CostHistory,
+    pattern: str = DEFAULT_PATTERN,
+    stream: TextIO | None = None,
+) -> dict[str, Any]:
+    """Run shard ``index`` of ``count``; returns its JSON-ready result."""
+    if not 0 <= index < count:
+        raise ValueError(f"shard index {index} is outside 0..{count - 1}")
+    started = time.perf_counter()
+    tests = discover(start, pattern)
+    by_id = {test.id(): test for test in tests}
+    shard = plan_shards(list(by_id), history, count)[index]
+    runner = unittest.TextTestRunner(stream=stream, verbosity=1, resultclass=TimingResult)
+    result = runner.run(unittest.TestSuite(by_id[test_id] for test_id in shard.tests))
+
+    problems = [
+        *(("failure", test, trace) for test, trace in result.failures),
+        *(("error", test, trace) for test, trace in result.errors),
+        *(("unexpected-success", test, "") for test in result.unexpectedSuccesses),
+    ]
+    failed = {test.id() for _, test, _ in problems}
+    skipped = {test.id() for test, _ in result.skipped}
+    return {
+        "schema": RESULT_SCHEMA,
+        "index": index,
+        "count": count,
+        "suite": list(by_id),
+        "predicted_seconds": round(shard.cost, 6),
+        "seconds": round(time.perf_counter() - started, 6),
+        "tests": {
+            test_id: {
+                "outcome": (
+                    "failed" if test_id in failed else "skipped" if test_id in skipped else "passed"
+                ),
+                "seconds": round(result.durations.get(test_id, 0.0), 6),
+            }
+            for test_id in shard.tests
+        },
+        # Class and module fixture errors have no test id of their own.
+        "failures": [
+            {"test": test.id(), "kind": kind, "detail": trace} for kind, test, trace in problems
+        ],
+    }
+
+
+@dataclass
+class MergedRun:
+    shards: int
+    suite: list[str]
+    outcomes: dict[str, str]
+    failures: list[dict[str, str]]
+    shard_seconds: list[float]
+    # Tests of the suite no shard ran, and tests more than one shard ran.
+    missing: list[str]
+    duplicated: list[str]
+    problems: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.failures or self.missing or self.duplicated or self.problems)
+
+
+def merge_shard_results(
+    results: list[dict[str, Any]], history: CostHistory | None = None
+) -> MergedRun:
+    """Combine shard results, checking they cover the suite exactly once.
+
+    With ``history``, the measured durations are recorded for the next plan.
+    """
+    problems: list[str] = []
+    counts = {result.get("count") for result in results}
+    indexes = sorted(result.get("index") for result in results)
+    if any(result.get("schema") != RESULT_SCHEMA for result in results):
+        problems.append(f"shard results must use schema {RESULT_SCHEMA}")
+    if not results:
+        problems.append("no shard results to merge")
+    elif len(counts) != 1:
+        problems.append(f"shard results disagree on the shard count: {sorted(counts, key=str)}")
+    elif indexes != list(range(next(iter(counts)))):
+        problems.append(f"expected shards 0..{next(iter(counts)) - 1}, got {indexes}")
+    suites = {tuple(result["suite"]) for result in results}
+    if len(suites) > 1:
+        problems.append("shards discovered different suites; were they run on the same tree?")
+    suite = list(results[0]["suite"]) if results else []
+
+    outcomes: dict[str, str] = {}
+    durations: dict[str, float] = {}
+    duplicated: list[str] = []
+    failures: list[dict[str, str]] = []
+    for result in sorted(results, key=lambda result: result["index"]):
+        for test_id, entry in result["tests"].items():
+            if test_id in outcomes:
+                duplicated.append(test_id)
+            outcomes[test_id] = entry["outcome"]
+            durations[test_id] = entry["seconds"]
+        failures += result["failures"]
+    missing = [test_id for test_id in suite if test_id not in outcomes]
+    if history is not None:
+        history.record(durations, suite)
+    return MergedRun(
+        len(results),
+        suite,
+        outcomes,
+        failures,
+        [result["seconds"] for result in sorted(results, key=lambda result: result["index"])],
+        missing,
+        sorted(set(duplicated)),
+        problems,
+    )
+
+
+def combine_coverage(
+    data_paths: list[Path], rcfile: Path, stream: TextIO | None = None
+) -> float:
+    """Combine shard coverage data files and report; returns the total percentage.
+
+    Needs the ``coverage`` package, which CI installs; ``ImportError`` otherwise.
+    ``ValueError`` when there is no coverage data to combine or report.
+    """
+    import coverage
+    from coverage.exceptions import CoverageException
+
+    cov = coverage.Coverage(config_file=str(rcfile))
+    try:
+        cov.combine([str(path) for path in data_paths], strict=True)
+        cov.save()
+        return cov.report(file=stream)
+    except CoverageException as error:
+        raise ValueError(f"cannot combine shard coverage: {error}") from error
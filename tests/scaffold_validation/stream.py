@@ -0,0 +1,129 @@
+"""Constant-memory tree checks for markdown files too large to load.
+
+Instantiated logs (``implementation-log.md``, incident timelines) grow
+without bound. ``Corpus.document`` holds a file's text, its lines and its
+token list at once, so a file of a few hundred megabytes costs gigabytes.
+``scan_failures`` instead feeds ``corpus.iter_lines`` (fixed-size chunks,
+CRLF and multi-byte characters handled across chunk boundaries) through
+the same line tokenizer and evaluates every tree check as tokens go by.
+It keeps no text, lines or token list.
+
+The result matches the ``TREE_CHECKS`` messages in the same order. The
+only state that grows is one slug per distinct heading (GitHub numbers
+duplicate headings, and same-file ``#anchor`` links need the slugs) and
+same-file links that point further down than the scan has reached.
+Documents over ``corpus.stream_threshold`` bytes take this path in
+``parallel``, ``cache``, ``watch`` and ``lsp``; ``linked_files`` gives the
+latter two the link graph edges without loading the file either.
+"""
+
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import unquote
+
+from scaffold_validation import checks
+from scaffold_validation.anchors import Slugger, html_anchors
+from scaffold_validation.corpus import READ_CHUNK_SIZE, Corpus, iter_lines
+from scaffold_validation.tokenizer import Fence, Heading, Link, tokenize
+
+
+def scan_failures(
+    corpus: Corpus, path: Path, chunk_size: int = READ_CHUNK_SIZE
+) -> dict[str, list[str]]:
+    """``TREE_CHECKS`` failures for ``path`` from one streaming pass."""
+    relative = corpus.relative(path)
+    parent = Path(relative).parent
+    failures: dict[str, list[str]] = {name: [] for name in checks.TREE_CHECKS}
+    slugger = Slugger()
+    html: set[str] = set()
+    first_line = ""
+    # First non-blank line, and whether another follows: ``text.strip()`` trims
+    # the far end of that line only when it is also the last.
+    content_line: str | None = None
+    more_content = False
+
+    def lines() -> Iterator[str]:
+        nonlocal first_line, content_line, more_content
+        for number, line in enumerate(iter_lines(path, chunk_size)):
+            if number == 0:
+                first_line = line
+            if line.strip():
+                if content_line is None:
+                    content_line = line
+                else:
+                    more_content = True
+            if "<" in line:
+                html.update(html_anchors(line))
+            yield line
+
+    def anchors_for(target: str) -> frozenset[str] | None:
+        if target not in corpus.relative_files:
+            return None
+        return corpus.anchors(target)
+
+    def has_own_anchor(fragment: str) -> bool:
+        wanted = unquote(fragment)
+        return any(
+            candidate in slugger.seen or candidate in html
+            for candidate in (wanted, wanted.lower())
+        )
+
+    # (link position, message), so late same-file anchors keep link order.
+    anchor_failures: list[tuple[int, str]] = []
+    # Same-file links whose heading has not been seen yet.
+    forward: list[tuple[int, tuple[str, str, str]]] = []
+    position = 0
+    for token in tokenize(lines()):
+        if isinstance(token, Heading):
+            slugger(token.text)
+        elif isinstance(token, Fence) and token.end is None:
+            failures["fences"].append(checks.unterminated_fence_failure(relative, token))
+        elif isinstance(token, Link):
+            position += 1
+            target = checks.local_link_target(parent, token.target)
+            if target is not None:
+                failures["links"] += checks.link_failures(
+                    corpus.root, relative, [(token.target, target)], corpus.exists
+                )
+            anchored = checks.anchor_link(relative, parent, token.target)
+            if anchored is None:
+                continue
+            if anchored[1] != relative:
+                anchor_failures.extend(
+                    (position, message)
+                    for message in checks.anchor_failures(relative, [anchored], anchors_for)
+                )
+            elif not has_own_anchor(anchored[2]):
+                forward.append((position, anchored))
+    for position, anchored in forward:
+        if not has_own_anchor(anchored[2]):
+            anchor_failures.extend(
+                (position, message)
+                for message in checks.anchor_failures(
+                    relative, [anchored], lambda _: frozenset()
+                )
+            )
+    failures["anchors"] = [message for _, message in sorted(anchor_failures)]
+
+    if content_line is not None:
+        content_line = content_line.lstrip() if more_content else content_line.strip()
+    failures["h1"] = checks.first_line_h1_failures(relative, content_line)
+    failures["numbered-h1"] = checks.numbered_prefix_failures(path.name, relative, first_line)
+    return failures
+
+
+def linked_files(corpus: Corpus, path: Path, chunk_size: int = READ_CHUNK_SIZE) -> set[str]:
+    """``checks.linked_files`` for ``path`` from one streaming pass."""
+    relative = corpus.relative(path)
+    parent = Path(relative).parent
+    targets: set[str] = set()
+    for token in tokenize(iter_lines(path, chunk_size)):
+        if not isinstance(token, Link):
+            continue
+        target = checks.local_link_target(parent, token.target)
+        if target is not None:
+            targets.add(target)
+        anchored = checks.anchor_link(relative, parent, token.target)
+        if anchored is not None:
+            targets.add(anchored[1])
+    return targets
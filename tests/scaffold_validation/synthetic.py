@@ -0,0 +1,264 @@
+"""Synthetic scaffold trees shaped like the real ones, for benchmarks.
+
+Each scaffold is 15 files (README, nine numbered guides, five templates),
+so ``generate_tree(root, 700)`` yields a 10k-file tree. ``inject_faults``
+then breaks a reproducible sample of guides in ways the validators must
+catch. ``write_log`` produces one implementation log of a given size and
+``write_history`` a git repository with a given number of commits.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+import random
+import subprocess
+
+
+GUIDES = [
+    "00-philosophy.md",
+    "01-process-overview.md",
+    "02-assessment-checklist.md",
+    "03-planning-guide.md",
+    "04-phased-guide.md",
+    "05-safety-and-rollout.md",
+    "06-agents-md-guide.md",
+    "07-agent-prompts.md",
+    "08-progress-and-quality.md",
+]
+TEMPLATES = [
+    "AGENTS.md.template",
+    "plan.md.template",
+    "checklist.md.template",
+    "log.md.template",
+    "review.md.template",
+]
+LOG_SHAPES = ("entries", "unclosed-bracket")
+PARAGRAPH = (
+    "Work in small, verifiable increments and record evidence for every "
+    "decision so the next session can resume without re-reading the code.\n"
+)
+
+
+def _guide(scaffold: str, name: str, paragraphs: int) -> str:
+    number = name[:2]
+    title = name[3:-3].replace("-", " ").title()
+    lines = [f"# {number} — {title}", ""]
+    if name == "01-process-overview.md":
+        lines += [f"### {step}. Phase {step}\n\nPhase {step} of the lifecycle.\n" for step in range(1, 6)]
+    if name == "07-agent-prompts.md":
+        for step in range(1, 7):
+            lines += [
+                f"## Prompt {step}: Step {step}",
+                "",
+                "```text",
+                f"Tasks:\n1. Read {{SCAFFOLD_DIR}}/{GUIDES[step % 9]} for {scaffold}.",
+                "```",
+                "",
+            ]
+    for index in range(paragraphs):
+        sibling = GUIDES[(GUIDES.index(name) + index + 1) % len(GUIDES)]
+        lines += [f"## Section {index + 1}", "", PARAGRAPH, f"See [{sibling}]({sibling}).", ""]
+    return "\n".join(lines)
+
+
+def _readme(scaffold: str) -> str:
+    rows = [f"| [{guide}]({guide}) | {guide[3:-3]} |" for guide in GUIDES]
+    rows += [f"| [templates/{name}](templates/{name}) | template |" for name in TEMPLATES]
+    return "\n".join(
+        [
+            f"# {scaffold}",
+            "",
+            "## When to use this scaffold",
+            "",
+            PARAGRAPH,
+            "## How to use this scaffold",
+            "",
+            "Start with the philosophy guide, then follow the document index.",
+            "",
+            "## Document index",
+            "",
+            "| Document | Purpose |",
+            "|----------|---------|",
+            *rows,
+            "",
+            "See [templates/](templates/).",
+            "",
+        ]
+    )
+
+
+def _template(name: str) -> str:
+    if name == "AGENTS.md.template":
+        return (
+            "# AGENTS.md — {PROJECT_NAME}\n\n## Mission\n\n{MISSION}\n\n"
+            "## Read these files\n\n1. `docs/plan.md`\n2. `docs/checklist.md`\n"
+        )
+    return f"# {name[:-12].title()} — {{PROJECT_NAME}}\n\n- [ ] {{first step}}\n\n| Item | Status |\n|------|--------|\n"
+
+
+def generate_tree(root: Path, scaffolds: int, paragraphs: int = 8) -> list[str]:
+    """Write ``scaffolds`` scaffold directories plus a root README under ``root``."""
+    names = [f"scaffold-{index:04d}" for index in range(scaffolds)]
+    for scaffold in names:
+        directory = root / scaffold
+        (directory / "templates").mkdir(parents=True, exist_ok=True)
+        (directory / "README.md").write_text(_readme(scaffold), encoding="utf-8")
+        for guide in GUIDES:
+            (directory / guide).write_text(_guide(scaffold, guide, paragraphs), encoding="utf-8")
+        for template in TEMPLATES:
+            (directory / "templates" / template).write_text(_template(template), encoding="utf-8")
+
+    index = [f"- [{scaffold}/README.md]({scaffold}/README.md)" for scaffold in names]
+    (root / "README.md").write_text("# Synthetic scaffolds\n\n" + "\n".join(index) + "\n", encoding="utf-8")
+    return names
+
+
+def write_log(path: Path, size: int, shape: str = "entries") -> int:
+    """Write an implementation log of at least ``size`` bytes, one entry at a time.
+
+    Entries link to a sibling ``plan.md`` and to their own heading; the log
+    ends with one broken link and one unterminated fence. The
+    ``"unclosed-bracket"`` shape is instead one paragraph of pasted output
+    under a ``[`` that never closes. Returns the number of entries.
+    """
+    if shape not in LOG_SHAPES:
+        raise ValueError(f"unknown log shape {shape!r}; expected one of {', '.join(LOG_SHAPES)}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    (path.parent / "plan.md").write_text("# Plan\n", encoding="utf-8")
+    written = 0
+    entries = 0
+    with path.open("w", encoding="utf-8", newline="\n") as handle:
+        written += handle.write("# Implementation Log\n\n")
+        if shape == "unclosed-bracket":
+            written += handle.write("Pasted output [truncated\n")
+            while written < size:
+                entries += 1
+                written += handle.write(PARAGRAPH)
+            handle.write("\n")
+        while written < size:
+            entries += 1
+            written += handle.write(
+                f"## Entry {entries}\n\n{PARAGRAPH}\n"
+                f"Follows [the plan](plan.md); see [this entry](#entry-{entries}).\n\n"
+                f"```text\nstep {entries} passed\n```\n\n"
+            )
+        handle.write("See [the missing note](missing-note.md).\n\n```text\nnever closed\n")
+    return entries
+
+
+# Fault kind -> the tree check expected to report it.
+FAULTS = {
+    "broken-link": "links",
+    "missing-h1": "h1",
+    "unterminated-fence": "fences",
+    "broken-anchor": "anchors",
+}
+
+
+@dataclass(frozen=True)
+class InjectedFault:
+    kind: str
+    relative: str
+
+
+def _inject(path: Path, kind: str, serial: int) -> None:
+    text = path.read_text(encoding="utf-8")
+    if kind == "broken-link":
+        text += f"\nSee [missing guide](missing-{serial}.md).\n"
+    elif kind == "missing-h1":
+        text = "Untitled notes.\n" + text.split("\n", 1)[1]
+    elif kind == "unterminated-fence":
+        text += "\n```text\nnever closed\n"
+    else:
+        text += f"\nSee [the missing section](#no-such-section-{serial}).\n"
+    path.write_text(text, encoding="utf-8")
+
+
+def inject_faults(
+    root: Path, names: list[str], counts: dict[str, int], seed: int = 0
+) -> list[InjectedFault]:
+    """Break ``counts[kind]`` distinct guides per fault kind, reproducibly by ``seed``."""
+    unknown = set(counts) - set(FAULTS)
+    if unknown:
+        raise ValueError(f"unknown fault kind: {', '.join(sorted(unknown))}")
+    guides = [f"{scaffold}/{guide}" for scaffold in names for guide in GUIDES]
+    wanted = sum(counts.values())
+    if wanted > len(guides):
+        raise ValueError(f"cannot inject {wanted} faults into {len(guides)} guides")
+
+    sample = iter(random.Random(seed).sample(guides, wanted))
+    injected: list[InjectedFault] = []
+    for kind in FAULTS:
+        for _ in range(counts.get(kind, 0)):
+            relative = next(sample)
+            _inject(root / relative, kind, len(injected))
+            injected.append(InjectedFault(kind, relative))
+    return sorted(injected, key=lambda fault: (fault.kind, fault.relative))
+
+
+def write_history(repository: Path, changes: int, merge_every: int = 5) -> int:
+    """Create a git repository where ``changes`` changes land on ``main``; returns its commit count.
+
+    Every ``merge_every``-th change is a merge of a one-commit topic branch
+    authored a day earlier, the rest are direct commits. Changes land an
+    hour apart. The repository is written with one ``git fast-import``.
+    """
+    repository.mkdir(parents=True, exist_ok=True)
+    subprocess.run(["git", "init", "-q", str(repository)], check=True)
+    start = 1_600_000_000
+    stream = bytearray()
+    mark = 0
+    main = 0
+    for number in range(changes):
+        mark += 1
+        when = start + number * 3600
+        merge = main and merge_every and number % merge_every == 0
+        if merge:
+            branch = mark
+            stream += _fast_import_commit(
+                branch, "refs/heads/topic", main, when - 86400, when, number, "Add topic"
+            )
+            mark += 1
+            stream += _fast_import_commit(
+                mark, "refs/heads/main", main, when, when, None, "Merge topic", merge=branch
+            )
+        else:
+            subject = "Revert change" if number % 97 == 96 else f"Change {number}"
+            stream += _fast_import_commit(
+                mark, "refs/heads/main", main, when, when, number, subject
+            )
+        main = mark
+    subprocess.run(
+        ["git", "fast-import", "--quiet"], cwd=repository, input=bytes(stream), check=True
+    )
+    subprocess.run(["git", "symbolic-ref", "HEAD", "refs/heads/main"], cwd=repository, check=True)
+    return mark
+
+
+def _fast_import_commit(
+    mark: int,
+    ref: str,
+    parent: int,
+    authored: int,
+    committed: int,
+    number: int | None,
+    subject: str,
+    merge: int | None = None,
+) -> bytes:
+    message = subject.encode("utf-8")
+    lines = [
+        f"commit {ref}",
+        f"mark :{mark}",
+        f"author Dev {number or 0} <dev{(number or 0) % 7}@example.com> {authored} +0000",
+        f"committer Dev <dev@example.com> {committed} +0000",
+        f"data {len(message)}",
+    ]
+    body = "\n".join(lines).encode("utf-8") + b"\n" + message + b"\n"
+    if parent:
+        body += f"from :{parent}\n".encode("ascii")
+    if merge:
+        body += f"merge :{merge}\n".encode("ascii")
+    if number is not None:
+        content = f"line {number}\n".encode("utf-8")
+        body += f"M 644 inline file-{number % 50}.txt\ndata {len(content)}\n".encode("ascii")
+        body += content
+    return body + b"\n"
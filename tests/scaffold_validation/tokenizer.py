@@ -0,0 +1,266 @@
+"""Single-pass, line-oriented markdown tokenizer with linear running time.
+
+``tokenize`` walks the input once and yields tokens as it goes. Fenced code
+(backtick and tilde fences, CommonMark closing rules) and indented code
+blocks are tracked with a small state machine instead of a lazy
+``[\\s\\S]*?`` regex, and links are found with forward-only ``str.find``
+scans, so no character is examined more than a constant number of times
+however the input is shaped (unterminated fences, runs of ``[`` or ``(``).
+
+An unterminated fence runs to the end of the document, as in CommonMark;
+it is reported as a ``Fence`` with ``end=None``.
+"""
+
+from dataclasses import dataclass
+import re
+from typing import Generator, Iterable, Iterator, Union
+
+
+FENCE_OPEN_PATTERN = re.compile(r"[ \t]*(`{3,}|~{3,})")
+HEADING_OPEN_PATTERN = re.compile(r" {0,3}(#{1,6})(?=[ \t]|$)")
+CHECKLIST_PATTERN = re.compile(r"[ \t]*(?:[-*+]|\d{1,9}[.)])[ \t]+\[([ xX])\][ \t]+")
+LIST_ITEM_PATTERN = re.compile(r"[ \t]*(?:[-*+]|\d{1,9}[.)])(?:[ \t]|$)")
+PLACEHOLDER_PATTERN = re.compile(r"\{[^{}\n]+\}")
+# Characters of wrapped link text carried across lines before the open
+# ``[`` is dropped, so streaming a paragraph stays in constant memory.
+MAX_OPEN_LINK_TEXT = 16 * 1024
+
+
+@dataclass(frozen=True)
+class Heading:
+    level: int
+    text: str
+    line: int
+
+
+@dataclass(frozen=True)
+class Fence:
+    start: int
+    end: int | None
+    info: str
+    marker: str = "```"
+
+
+@dataclass(frozen=True)
+class IndentedCode:
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class Link:
+    text: str
+    target: str
+    line: int
+
+
+@dataclass(frozen=True)
+class TableRow:
+    cells: tuple[str, ...]
+    line: int
+
+
+@dataclass(frozen=True)
+class ChecklistItem:
+    checked: bool
+    text: str
+    line: int
+
+
+@dataclass(frozen=True)
+class Placeholder:
+    name: str
+    line: int
+    in_code: bool
+
+
+Token = Union[Heading, Fence, IndentedCode, Link, TableRow, ChecklistItem, Placeholder]
+
+
+class LinkScanner:
+    """Forward-only ``[text](target)`` scans over the lines of one paragraph.
+
+    Matches the leftmost-first semantics of ``\\[[^\\]]*\\]\\(([^)]+)\\)``:
+    link text ends at the first ``]`` and the target at the first ``)``.
+    Link text may wrap: a ``[`` with no ``]`` left on its line stays open
+    into the following lines until ``reset`` (a paragraph break) or until
+    it carries more than ``MAX_OPEN_LINK_TEXT`` characters, when it is
+    dropped and scanning restarts on the next line. Targets never span
+    lines. Each link reports the line its text starts on.
+    """
+
+    def __init__(self) -> None:
+        self._open: list[str] | None = None
+        self._open_line = 0
+        self._open_size = 0
+
+    def reset(self) -> None:
+        self._open = None
+
+    def _carry(self, text: str) -> None:
+        self._open_size += len(text) + 1
+        if self._open_size > MAX_OPEN_LINK_TEXT:
+            self._open = None
+        else:
+            self._open.append(text)
+
+    def scan(self, line: str, number: int) -> Iterator[Link]:
+        if self._open is None:
+            position = line.find("[")
+        else:
+            close = line.find("]")
+            if close == -1:
+                self._carry(line)
+                return
+            text = "\n".join([*self._open, line[:close]])
+            self._open = None
+            position = yield from self._target(line, text, close, self._open_line)
+        while position != -1:
+            close = line.find("]", position + 1)
+            if close == -1:
+                self._open, self._open_line, self._open_size = [], number, 0
+                self._carry(line[position + 1 :])
+                return
+            position = yield from self._target(line, line[position + 1 : close], close, number)
+
+    @staticmethod
+    def _target(line: str, text: str, close: int, number: int) -> Generator[Link, None, int]:
+        """Yield the link closed at ``close`` if a target follows; returns where to resume."""
+        if line.startswith("(", close + 1):
+            end = line.find(")", close + 2)
+            if end == -1:
+                return -1
+            if end > close + 2:
+                yield Link(text, line[close + 2 : end], number)
+                return line.find("[", end + 1)
+        # Any "[" before ``close`` shares the same first "]" and fails alike.
+        return line.find("[", close + 1)
+
+
+def scan_links(line: str, number: int) -> Iterator[Link]:
+    """Yield the links that open and close within ``line``."""
+    return LinkScanner().scan(line, number)
+
+
+def split_cells(line: str) -> tuple[str, ...]:
+    body = line.strip()
+    if body.startswith("|"):
+        body = body[1:]
+    if body.endswith("|"):
+        body = body[:-1]
+    return tuple(cell.strip() for cell in body.split("|"))
+
+
+def _heading_text(rest: str) -> str:
+    text = rest.strip()
+    trimmed = text.rstrip("#")
+    if trimmed != text and (not trimmed or trimmed[-1] in " \t"):
+        text = trimmed.rstrip()
+    return text
+
+
+def _indent(line: str) -> int:
+    width = 0
+    for character in line:
+        if character == " ":
+            width += 1
+        elif character == "\t":
+            width += 4 - width % 4
+        else:
+            break
+    return width
+
+
+def tokenize(lines: Iterable[str]) -> Iterator[Token]:
+    """Tokenize markdown lines (without trailing newlines) in one pass."""
+    fence: tuple[str, int, int, str, bool] | None = None  # char, length, start, info, in list
+    code_start: int | None = None
+    code_end = 0
+    previous_blank = True
+    in_list = False
+    links = LinkScanner()
+    number = 0
+
+    for number, line in enumerate(lines, start=1):
+        if fence is not None:
+            for match in PLACEHOLDER_PATTERN.finditer(line):
+                yield Placeholder(match.group(0), number, True)
+            stripped = line.strip()
+            marker, length, start, info, nested = fence
+            if (
+                (nested or _indent(line) < 4)
+                and len(stripped) >= length
+                and stripped == marker * len(stripped)
+            ):
+                yield Fence(start, number, info, marker * length)
+                fence = None
+                previous_blank = False
+            continue
+
+        blank = not line.strip()
+        indent = _indent(line)
+
+        if code_start is not None:
+            if blank or indent >= 4:
+                if not blank:
+                    code_end = number
+                for match in PLACEHOLDER_PATTERN.finditer(line):
+                    yield Placeholder(match.group(0), number, True)
+                previous_blank = blank
+                continue
+            yield IndentedCode(code_start, code_end)
+            code_start = None
+        elif not blank and indent >= 4 and previous_blank and not in_list:
+            code_start = code_end = number
+            links.reset()
+            for match in PLACEHOLDER_PATTERN.finditer(line):
+                yield Placeholder(match.group(0), number, True)
+            previous_blank = False
+            continue
+
+        previous_blank = blank
+        if blank:
+            links.reset()
+            continue
+
+        opening = FENCE_OPEN_PATTERN.match(line)
+        if opening and (indent < 4 or in_list):
+            run = opening.group(1)
+            info = line[opening.end() :].strip()
+            if run[0] == "~" or "`" not in info:
+                fence = (run[0], len(run), number, info, in_list)
+                links.reset()
+                continue
+
+        if LIST_ITEM_PATTERN.match(line):
+            in_list = True
+        elif indent == 0:
+            in_list = False
+
+        for match in PLACEHOLDER_PATTERN.finditer(line):
+            yield Placeholder(match.group(0), number, False)
+
+        heading = HEADING_OPEN_PATTERN.match(line)
+        table_row = line.lstrip().startswith("|")
+        if heading:
+            yield Heading(len(heading.group(1)), _heading_text(line[heading.end() :]), number)
+
+        if table_row:
+            yield TableRow(split_cells(line), number)
+
+        checklist = CHECKLIST_PATTERN.match(line)
+        if checklist:
+            yield ChecklistItem(checklist.group(1) != " ", line[checklist.end() :].strip(), number)
+
+        # Headings and table rows are single-line blocks.
+        if heading or table_row:
+            links.reset()
+            yield from scan_links(line, number)
+        else:
+            yield from links.scan(line, number)
+
+    if code_start is not None:
+        yield IndentedCode(code_start, code_end)
+    if fence is not None:
+        marker, length, start, info, _ = fence
+        yield Fence(start, None, info, marker * length)
@@ -0,0 +1,236 @@
+"""Carry template changes into projects rendered from a scaffold.
+
+Each rendered project holds a ``RENDER_MANIFEST`` (see ``render``) naming
+the template text every file came from. Upgrading a file is a line-based
+three-way merge of the base rendering (old template), the current file
+(local edits) and the new rendering (new template): hunks changed on only
+one side are applied, and hunks changed differently on both sides become
+conflict blocks. Files whose template digest did not change are skipped
+without being read, so an upgrade costs time in proportion to what
+changed. Projects are independent and run across a process pool; each
+run reads templates through its own corpus and template engine (one per
+worker), so a template is compiled at most once per process per run.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+import os
+from pathlib import Path
+
+from scaffold_validation.corpus import Corpus, Document
+from scaffold_validation.parallel import default_jobs
+from scaffold_validation.render import (
+    RENDER_MANIFEST,
+    TEMPLATE_SUFFIX,
+    TemplateEngine,
+    compile_template,
+    read_manifest,
+    template_record,
+    text_digest,
+    write_manifest,
+    write_rendered,
+)
+
+
+CONFLICT_LOCAL = "<<<<<<< local\n"
+CONFLICT_SEPARATOR = "=======\n"
+CONFLICT_TEMPLATE = ">>>>>>> template\n"
+PRUNED_DIRS = {".git", "node_modules", ".venv"}
+
+# Per-file outcomes, in report order.
+OUTCOMES = ("unchanged", "updated", "merged", "kept", "added", "conflict", "orphaned")
+
+
+@dataclass(frozen=True)
+class _Change:
+    start: int
+    end: int
+    lines: tuple[str, ...]
+    side: str
+
+
+def _changes(base: list[str], other: list[str], side: str) -> list[_Change]:
+    matcher = SequenceMatcher(None, base, other, autojunk=False)
+    return [
+        _Change(i1, i2, tuple(other[j1:j2]), side)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def _apply(base: list[str], start: int, end: int, changes: list[_Change]) -> list[str]:
+    lines: list[str] = []
+    position = start
+    for change in changes:
+        lines += base[position : change.start]
+        lines += change.lines
+        position = change.end
+    return lines + base[position:end]
+
+
+def _terminated(lines: list[str]) -> list[str]:
+    if lines and not lines[-1].endswith("\n"):
+        return [*lines[:-1], lines[-1] + "\n"]
+    return lines
+
+
+def merge3(base: str, local: str, theirs: str) -> tuple[str, int]:
+    """Three-way line merge; returns the merged text and the conflict count."""
+    base_lines = base.splitlines(keepends=True)
+    local_lines = local.splitlines(keepends=True)
+    their_lines = theirs.splitlines(keepends=True)
+    changes = sorted(
+        _changes(base_lines, local_lines, "local") + _changes(base_lines, their_lines, "theirs"),
+        key=lambda change: (change.start, change.end),
+    )
+
+    # Cluster changes whose base ranges overlap; an insertion at a range
+    # boundary joins the cluster because its position relative to the
+    # other side's edit is ambiguous.
+    clusters: list[list[_Change]] = []
+    high = -1
+    for change in changes:
+        touching = change.start == high and (
+            change.start == change.end or clusters[-1][-1].start == high
+        )
+        if clusters and (change.start < high or touching):
+            clusters[-1].append(change)
+            high = max(high, change.end)
+        else:
+            clusters.append([change])
+            high = change.end
+
+    merged: list[str] = []
+    conflicts = 0
+    position = 0
+    for cluster in clusters:
+        start = min(change.start for change in cluster)
+        end = max(change.end for change in cluster)
+        merged += base_lines[position:start]
+        local_side = [change for change in cluster if change.side == "local"]
+        their_side = [change for change in cluster if change.side == "theirs"]
+        local_version = _apply(base_lines, start, end, local_side)
+        their_version = _apply(base_lines, start, end, their_side)
+        if not their_side or local_version == their_version:
+            merged += local_version
+        elif not local_side:
+            merged += their_version
+        else:
+            conflicts += 1
+            merged += [CONFLICT_LOCAL, *_terminated(local_version), CONFLICT_SEPARATOR]
+            merged += [*_terminated(their_version), CONFLICT_TEMPLATE]
+        position = end
+    merged += base_lines[position:]
+    return "".join(merged), conflicts
+
+
+@dataclass
+class ProjectUpgrade:
+    project: str
+    outcomes: dict[str, str] = field(default_factory=dict)
+    conflicts: int = 0
+
+
+def upgrade_project(
+    root: Path, project: Path, dry_run: bool = False, engine: TemplateEngine | None = None
+) -> ProjectUpgrade:
+    """Upgrade one rendered ``project`` to the current templates under ``root``.
+
+    Pass one ``engine`` for many projects to compile each template once.
+    """
+    engine = engine or TemplateEngine(Corpus(root))
+    corpus = engine.corpus
+    manifest = read_manifest(project)
+    variables = manifest["variables"]
+    recorded = manifest["files"]
+    result = ProjectUpgrade(str(project))
+
+    current = {
+        path.name[: -len(TEMPLATE_SUFFIX)]: path
+        for path in engine.template_paths(manifest["scaffold"])
+    }
+    for name in sorted(recorded.keys() | current.keys()):
+        record = recorded.get(name)
+        if name not in current:
+            result.outcomes[name] = "orphaned"
+            continue
+        template = corpus.document(current[name])
+        if record is not None and record["template_sha256"] == template.digest:
+            result.outcomes[name] = "unchanged"
+            continue
+
+        theirs, _ = engine.compiled(current[name]).render(variables)
+        target = project / name
+        if record is None:
+            outcome = "kept" if target.exists() else "added"
+            text = None if target.exists() else theirs
+        elif not target.exists():
+            outcome, text = "added", theirs
+        else:
+            local = target.read_text(encoding="utf-8")
+            if text_digest(local) == record["rendered_sha256"]:
+                outcome, text = "updated", theirs
+            elif local == theirs:
+                outcome, text = "kept", None
+            else:
+                base_document = Document(target, record["template"], record["template_text"])
+                base, _ = compile_template(base_document).render(variables)
+                text, conflicts = merge3(base, local, theirs)
+                outcome = "conflict" if conflicts else "merged"
+                result.conflicts += conflicts
+
+        result.outcomes[name] = outcome
+        if dry_run:
+            continue
+        if text is not None:
+            write_rendered(target, text)
+        # The record always describes the pure rendering of the new
+        # template, so local edits (and unresolved conflict markers) still
+        # differ from it and are merged, never overwritten, next time.
+        recorded[name] = template_record(template, theirs)
+
+    if not dry_run and set(result.outcomes.values()) - {"unchanged", "orphaned"}:
+        write_manifest(project, manifest)
+    return result
+
+
+def find_projects(directory: Path) -> list[Path]:
+    """Directories under ``directory`` (itself included) holding a render manifest."""
+    projects: list[Path] = []
+    for current, dirnames, filenames in os.walk(directory):
+        dirnames[:] = sorted(name for name in dirnames if name not in PRUNED_DIRS)
+        if RENDER_MANIFEST in filenames:
+            projects.append(Path(current))
+    return sorted(projects)
+
+
+# The template engine of a pool worker, built once per worker by ``_start_worker``.
+_worker_engine: TemplateEngine | None = None
+
+
+def _start_worker(root: str) -> None:
+    global _worker_engine
+    _worker_engine = TemplateEngine(Corpus(Path(root)))
+
+
+def _upgrade_task(project: str, dry_run: bool) -> ProjectUpgrade:
+    engine = _worker_engine
+    return upgrade_project(engine.corpus.root, Path(project), dry_run, engine)
+
+
+def upgrade_projects(
+    root: Path, directory: Path, jobs: int | None = None, dry_run: bool = False
+) -> list[ProjectUpgrade]:
+    """Upgrade every rendered project under ``directory``; order follows the paths."""
+    projects = find_projects(directory)
+    jobs = default_jobs() if jobs is None else jobs
+    if jobs <= 1 or len(projects) <= 1:
+        # A private corpus: templates may have changed since a shared one was loaded.
+        engine = TemplateEngine(Corpus(root))
+        return [upgrade_project(root, project, dry_run, engine) for project in projects]
+    flags = [dry_run] * len(projects)
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_start_worker, initargs=(str(root),)
+    ) as pool:
+        return list(pool.map(_upgrade_task, map(str, projects), flags, chunksize=8))
@@ -0,0 +1,432 @@
+"""Concurrent checker for the external links the local link check skips.
+
+``checks.should_validate`` leaves every ``http(s)://`` target alone, so a
+dead reference in a guide goes unnoticed. ``check_urls`` requests each
+distinct URL once (fragments stripped) over asyncio streams: at most
+``per_host`` requests are in flight per host, idle keep-alive connections
+are reused, ``HEAD`` falls back to ``GET`` when a server rejects it (4xx
+or 501), and timeouts, connection errors, 429 and 5xx responses are
+retried with exponential backoff. Redirects are followed; the final
+status decides. Non-ASCII hosts are IDNA-encoded and paths and queries
+percent-encoded before they go on the wire.
+
+Results are cached on disk with a timestamp. Working URLs are trusted for
+``ttl`` seconds and failures for the much shorter ``error_ttl``, so a
+repeat run makes requests only for new or recently broken links.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import ssl
+import time
+from typing import Any, Callable, Iterable
+from urllib.parse import SplitResult, quote, urldefrag, urljoin, urlsplit
+
+from scaffold_validation.corpus import REPO_ROOT, Corpus
+
+
+DEFAULT_URL_CACHE = Path(".validation-cache") / "urls.json"
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_ERROR_TTL = 3600
+DEFAULT_PER_HOST = 4
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5
+MAX_REDIRECTS = 5
+# Bodies larger than this are not drained; the connection is dropped instead.
+MAX_DRAIN = 1 << 20
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+# Characters left as they are when percent-encoding a path or query; ``%``
+# keeps escapes the author already wrote intact.
+PATH_SAFE = "/%:@!$&'()*+,;="
+QUERY_SAFE = PATH_SAFE + "?"
+USER_AGENT = "scaffold-validation-url-check/1"
+
+
+def is_external(target: str) -> bool:
+    return target.strip().lower().startswith(("http://", "https://"))
+
+
+def external_links(corpus: Corpus) -> dict[str, list[str]]:
+    """Fragment-free URL -> ``file:line`` locations linking to it, in corpus order."""
+    found: dict[str, list[str]] = {}
+    for document in corpus.markdown():
+        for link in document.link_tokens:
+            if is_external(link.target):
+                url = urldefrag(link.target.strip())[0]
+                found.setdefault(url, []).append(f"{document.relative}:{link.line}")
+    return found
+
+
+@dataclass
+class UrlResult:
+    url: str
+    # Final status after redirects; 0 when no response was received.
+    status: int
+    error: str = ""
+    method: str = "HEAD"
+    attempts: int = 0
+    cached: bool = False
+    final_url: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 400 and not self.error
+
+
+class UrlCache:
+    """URL -> last result and when it was taken, persisted as JSON."""
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        ttl: float = DEFAULT_TTL,
+        error_ttl: float = DEFAULT_ERROR_TTL,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.clock = clock
+        self.hits = 0
+        self._dirty = False
+        self._entries: dict[str, dict[str, Any]] = {}
+        if path is not None and path.is_file():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            if isinstance(data, dict):
+                self._entries = data
+
+    def get(self, url: str) -> UrlResult | None:
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        result = UrlResult(
+            url, entry["status"], entry["error"], entry["method"], 0, True, entry["final_url"]
+        )
+        ttl = self.ttl if result.ok else self.error_ttl
+        if self.clock() - entry["checked"] >= ttl:
+            return None
+        self.hits += 1
+        return result
+
+    def put(self, result: UrlResult) -> None:
+        self._entries[result.url] = {
+            "status": result.status,
+            "error": result.error,
+            "method": result.method,
+            "final_url": result.final_url,
+            "checked": self.clock(),
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temporary.write_text(json.dumps(self._entries, sort_keys=True), encoding="utf-8")
+        os.replace(temporary, self.path)
+        self._dirty = False
+
+
+def default_url_cache_path(root: Path = REPO_ROOT) -> Path:
+    return root / DEFAULT_URL_CACHE
+
+
+class _RetryableStatus(Exception):
+    def __init__(self, status: int, retry_after: float | None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _HostPool:
+    """Per-origin keep-alive connections and the semaphore bounding them."""
+
+    def __init__(self, per_host: int):
+        self.per_host = per_host
+        self.connections_opened = 0
+        self._idle: dict[tuple[str, str, int], list[_Connection]] = {}
+        self._limits: dict[tuple[str, str, int], asyncio.Semaphore] = {}
+        self._ssl: ssl.SSLContext | None = None
+
+    def limit(self, origin: tuple[str, str, int]) -> asyncio.Semaphore:
+        if origin not in self._limits:
+            self._limits[origin] = asyncio.Semaphore(self.per_host)
+        return self._limits[origin]
+
+    async def acquire(self, origin: tuple[str, str, int]) -> _Connection:
+        idle = self._idle.get(origin)
+        if idle:
+            connection = idle.pop()
+            connection.reused = True
+            return connection
+        scheme, host, port = origin
+        context = None
+        if scheme == "https":
+            self._ssl = self._ssl or ssl.create_default_context()
+            context = self._ssl
+        reader, writer = await asyncio.open_connection(host, port, ssl=context)
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    def release(self, origin: tuple[str, str, int], connection: _Connection) -> None:
+        self._idle.setdefault(origin, []).append(connection)
+
+    async def close(self) -> None:
+        for connections in self._idle.values():
+            for connection in connections:
+                connection.close()
+                try:
+                    await connection.writer.wait_closed()
+                except (OSError, ssl.SSLError):
+                    pass
+        self._idle.clear()
+
+
+def _ascii_host(parts: SplitResult) -> str:
+    """The host, IDNA-encoded: ``bücher.example`` -> ``xn--bcher-kva.example``."""
+    host = parts.hostname or ""
+    return host if host.isascii() else host.encode("idna").decode("ascii")
+
+
+def _origin(url: str) -> tuple[str, str, int]:
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    port = parts.port or (443 if scheme == "https" else 80)
+    return scheme, _ascii_host(parts), port
+
+
+def request_target(url: str) -> tuple[str, str]:
+    """The ASCII request target and ``Host`` header value for ``url``."""
+    parts = urlsplit(url)
+    host = _ascii_host(parts)
+    if ":" in host:
+        host = f"[{host}]"
+    if parts.port is not None:
+        host = f"{host}:{parts.port}"
+    target = quote(parts.path or "/", safe=PATH_SAFE)
+    if parts.query:
+        target += "?" + quote(parts.query, safe=QUERY_SAFE)
+    return target, host
+
+
+async def _drain(reader: asyncio.StreamReader, headers: dict[str, str]) -> bool:
+    """Consume the response body; ``False`` when the connection cannot be reused."""
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        total = 0
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+            total += size
+            if total > MAX_DRAIN:
+                return False
+            if size == 0:
+                while (await reader.readline()).strip():
+                    pass
+                return True
+            await reader.readexactly(size + 2)
+    if "content-length" in headers:
+        length = int(headers["content-length"])
+        if length > MAX_DRAIN:
+            return False
+        await reader.readexactly(length)
+        return True
+    return False
+
+
+async def _exchange(
+    connection: _Connection, method: str, url: str
+) -> tuple[int, dict[str, str], bool]:
+    target, host = request_target(url)
+    request = (
+        f"{method} {target} HTTP/1.1\r\nHost: {host}\r\n"
+        f"User-Agent: {USER_AGENT}\r\nAccept: */*\r\nConnection: keep-alive\r\n\r\n"
+    )
+    connection.writer.write(request.encode("ascii"))
+    await connection.writer.drain()
+    status_line = await connection.reader.readline()
+    if not status_line:
+        raise ConnectionResetError("connection closed before a response")
+    fields = status_line.decode("latin-1").split(None, 2)
+    if len(fields) < 2 or not fields[1].isdigit():
+        raise ConnectionError(f"malformed status line {status_line!r}")
+    status = int(fields[1])
+    headers: dict[str, str] = {}
+    while True:
+        line = (await connection.reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if method == "HEAD" or status in (204, 304) or status < 200:
+        reusable = True
+    else:
+        reusable = await _drain(connection.reader, headers)
+    reusable = reusable and headers.get("connection", "").lower() != "close"
+    return status, headers, reusable
+
+
+class UrlChecker:
+    """One run's connection pool, limits and request counters."""
+
+    def __init__(
+        self,
+        per_host: int = DEFAULT_PER_HOST,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+    ):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.requests = 0
+        self._pool = _HostPool(per_host)
+
+    @property
+    def connections_opened(self) -> int:
+        return self._pool.connections_opened
+
+    async def _request(self, method: str, url: str) -> tuple[int, dict[str, str]]:
+        origin = _origin(url)
+        async with self._pool.limit(origin):
+            while True:
+                connection = await self._pool.acquire(origin)
+                self.requests += 1
+                try:
+                    status, headers, reusable = await asyncio.wait_for(
+                        _exchange(connection, method, url), self.timeout
+                    )
+                except (OSError, asyncio.IncompleteReadError, ValueError):
+                    connection.close()
+                    # The server may have dropped an idle keep-alive connection.
+                    if connection.reused:
+                        continue
+                    raise
+                except BaseException:
+                    connection.close()
+                    raise
+                if reusable:
+                    self._pool.release(origin, connection)
+                else:
+                    connection.close()
+                return status, headers
+
+    async def _follow(self, method: str, url: str) -> tuple[int, str, dict[str, str]]:
+        for _ in range(MAX_REDIRECTS + 1):
+            status, headers = await self._request(method, url)
+            if status not in REDIRECT_STATUSES or "location" not in headers:
+                return status, url, headers
+            url = urljoin(url, headers["location"])
+        raise ConnectionError(f"more than {MAX_REDIRECTS} redirects")
+
+    async def _attempt(self, url: str) -> UrlResult:
+        status, final_url, headers = await self._follow("HEAD", url)
+        method = "HEAD"
+        if 400 <= status < 500 and status != 429 or status == 501:
+            # Plenty of servers answer HEAD with 403/404/405/501 but GET with 200.
+            status, final_url, headers = await self._follow("GET", url)
+            method = "GET"
+        if status == 429 or status >= 500:
+            retry_after = headers.get("retry-after", "")
+            raise _RetryableStatus(status, float(retry_after) if retry_after.isdigit() else None)
+        return UrlResult(url, status, method=method, final_url=final_url)
+
+    async def check(self, url: str) -> UrlResult:
+        if urlsplit(url).hostname is None:
+            return UrlResult(url, 0, "no host in URL", attempts=0)
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                result = await self._attempt(url)
+                result.attempts = attempts
+                return result
+            except _RetryableStatus as error:
+                failure = UrlResult(url, error.status, "", "GET", attempts, final_url=url)
+                delay = error.retry_after
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as error:
+                message = str(error) or type(error).__name__
+                failure = UrlResult(url, 0, message, attempts=attempts)
+                delay = None
+            if attempts > self.retries:
+                return failure
+            if delay is None:
+                delay = self.backoff * 2 ** (attempts - 1)
+            await asyncio.sleep(min(delay, self.timeout))
+
+    async def close(self) -> None:
+        await self._pool.close()
+
+
+@dataclass
+class UrlReport:
+    results: list[UrlResult] = field(default_factory=list)
+    requests: int = 0
+    connections: int = 0
+    cache_hits: int = 0
+    seconds: float = 0.0
+
+    @property
+    def broken(self) -> list[UrlResult]:
+        return [result for result in self.results if not result.ok]
+
+
+async def _check_all(
+    urls: list[str], cache: UrlCache, checker: UrlChecker, concurrency: int
+) -> list[UrlResult]:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one(url: str) -> UrlResult:
+        cached = cache.get(url)
+        if cached is not None:
+            return cached
+        async with limit:
+            result = await checker.check(url)
+        cache.put(result)
+        return result
+
+    try:
+        return list(await asyncio.gather(*(one(url) for url in urls)))
+    finally:
+        await checker.close()
+
+
+def check_urls(
+    urls: Iterable[str],
+    cache: UrlCache | None = None,
+    per_host: int = DEFAULT_PER_HOST,
+    timeout: float = DEFAULT_TIMEOUT,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    concurrency: int = 32,
+) -> UrlReport:
+    """Check each distinct URL, in input order; fresh cache entries are not requested."""
+    started = time.perf_counter()
+    cache = cache or UrlCache()
+    checker = UrlChecker(per_host, timeout, retries, backoff)
+    unique = list(dict.fromkeys(urls))
+    results = asyncio.run(_check_all(unique, cache, checker, concurrency))
+    cache.save()
+    return UrlReport(
+        results,
+        checker.requests,
+        checker.connections_opened,
+        cache.hits,
+        time.perf_counter() - started,
+    )
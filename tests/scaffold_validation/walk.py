@@ -0,0 +1,143 @@
+"""Pruned ``os.scandir`` traversal and a per-run existence cache.
+
+Ignore rules come from ``.validationignore`` at the tree root (falling back
+to ``DEFAULT_IGNORES``) and are applied to each directory entry *before*
+it is entered, so the cost of a walk depends on the validated tree only,
+not on the size of ``.git`` or a virtualenv. Entry types come from the
+``DirEntry`` (``d_type``), so listing a directory costs no per-entry stat.
+
+Rules use a small gitignore subset, one per line: blank lines and ``#``
+comments are skipped, a trailing ``/`` matches directories only, a
+pattern containing ``/`` is matched against the root-relative path, and
+any other pattern against the entry name (``fnmatch`` syntax).
+"""
+
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+import os
+from pathlib import Path
+import stat
+
+
+IGNORE_FILE = ".validationignore"
+DEFAULT_IGNORES = (".git/", "tests/", ".venv/")
+
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    pattern: str
+    directories_only: bool
+    anchored: bool
+
+    def matches(self, relative: str, name: str, is_dir: bool) -> bool:
+        if self.directories_only and not is_dir:
+            return False
+        return fnmatchcase(relative if self.anchored else name, self.pattern)
+
+
+def parse_ignore_rules(lines: list[str]) -> list[IgnoreRule]:
+    rules: list[IgnoreRule] = []
+    for line in lines:
+        pattern = line.strip()
+        if not pattern or pattern.startswith("#"):
+            continue
+        directories_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        anchored = "/" in pattern
+        rules.append(IgnoreRule(pattern.lstrip("/"), directories_only, anchored))
+    return rules
+
+
+def load_ignore_rules(root: Path) -> list[IgnoreRule]:
+    config = root / IGNORE_FILE
+    if config.is_file():
+        return parse_ignore_rules(config.read_text(encoding="utf-8").splitlines())
+    return parse_ignore_rules(list(DEFAULT_IGNORES))
+
+
+@dataclass
+class Tree:
+    """Everything a walk saw: sorted files and directories plus a child index."""
+
+    root: Path
+    files: list[Path] = field(default_factory=list)
+    directories: list[Path] = field(default_factory=list)
+    children: dict[Path, list[Path]] = field(default_factory=dict)
+    # Normalized path string -> True for directories, False for files.
+    kinds: dict[str, bool] = field(default_factory=dict)
+    directories_scanned: int = 0
+
+
+def walk_tree(root: Path, rules: list[IgnoreRule], prefix: str = "") -> Tree:
+    """Walk ``root`` once, never entering ignored or symlinked directories.
+
+    ``prefix`` is the rule-relative path of ``root`` (ending in ``/``) when
+    walking a subtree of the directory the rules belong to.
+    """
+    tree = Tree(root)
+    tree.kinds[os.path.normpath(root)] = True
+    pending: list[tuple[Path, str]] = [(root, prefix)]
+    while pending:
+        directory, prefix = pending.pop()
+        tree.directories_scanned += 1
+        entries: list[Path] = []
+        try:
+            with os.scandir(directory) as scanner:
+                listing = list(scanner)
+        except OSError:
+            listing = []
+        for entry in listing:
+            is_dir = entry.is_dir()
+            relative = f"{prefix}{entry.name}"
+            if any(rule.matches(relative, entry.name, is_dir) for rule in rules):
+                continue
+            path = directory / entry.name
+            entries.append(path)
+            tree.kinds[os.path.normpath(path)] = is_dir
+            if is_dir:
+                tree.directories.append(path)
+                if not entry.is_symlink():
+                    pending.append((path, f"{relative}/"))
+            else:
+                tree.files.append(path)
+        tree.children[directory] = sorted(entries)
+    tree.files.sort()
+    tree.directories.sort()
+    return tree
+
+
+class StatCache:
+    """Existence and type lookups answered from a walk, stat-ing only misses.
+
+    Paths the walk saw cost nothing; anything else (ignored directories,
+    targets outside the root, missing files) is stat-ed once per run and
+    remembered, so a README linked from fifty guides is resolved once.
+    """
+
+    def __init__(self, tree: Tree):
+        self._kinds = tree.kinds
+        self._misses: dict[str, bool | None] = {}
+        self.stat_calls = 0
+
+    def kind(self, path: Path | str) -> bool | None:
+        """``True`` for a directory, ``False`` for a file, ``None`` if missing."""
+        key = os.path.normpath(path)
+        known = self._kinds.get(key)
+        if known is not None:
+            return known
+        if key not in self._misses:
+            self.stat_calls += 1
+            try:
+                self._misses[key] = stat.S_ISDIR(os.stat(key).st_mode)
+            except OSError:
+                self._misses[key] = None
+        return self._misses[key]
+
+    def exists(self, path: Path | str) -> bool:
+        return self.kind(path) is not None
+
+    def is_file(self, path: Path | str) -> bool:
+        return self.kind(path) is False
+
+    def is_dir(self, path: Path | str) -> bool:
+        return self.kind(path) is True
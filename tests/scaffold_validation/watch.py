@@ -0,0 +1,397 @@
+"""Long-running watch mode that revalidates only what a change can affect.
+
+A ``WatchSession`` keeps one corpus and the link graph (who links to whom)
+in memory for the life of the process. On each batch of changed paths it
+drops just those documents, re-walks the tree (a directory listing, no
+reads), re-runs the tree checks on the changed markdown files and on every
+file linking to them, and re-runs the manifest checklist (as ``run`` does)
+of scaffolds the batch touched. A deleted or renamed directory drops the
+results of every file below it and revalidates every file linking into
+it. Unchanged files are never re-read, and files over the corpus stream
+threshold are scanned (see ``stream``) rather than loaded.
+
+Changes come from inotify (through ``ctypes``, Linux only) or, anywhere
+else or when inotify is unavailable, from polling ``(mtime_ns, size)``
+signatures of the walked files.
+"""
+
+import ctypes
+import ctypes.util
+from dataclasses import dataclass
+import errno
+import os
+from pathlib import Path, PurePosixPath
+import select
+import struct
+import sys
+import time
+from typing import Callable, Iterator, Protocol
+
+from scaffold_validation import checks
+from scaffold_validation.changed import ChangeSet, link_dependents
+from scaffold_validation.corpus import Corpus
+from scaffold_validation.manifest import MANIFEST_NAME, read_manifest, run_checklist
+from scaffold_validation.stream import linked_files, scan_failures
+from scaffold_validation.walk import IgnoreRule, walk_tree
+
+
+# Editors often save as write-temp-then-rename; collect the whole burst.
+DEBOUNCE_SECONDS = 0.02
+DEFAULT_POLL_INTERVAL = 0.25
+
+
+@dataclass
+class Revalidation:
+    changed: list[str]
+    revalidated: list[str]
+    failures: list[str]
+    total_failures: int
+    seconds: float
+
+
+class WatchSession:
+    """In-memory corpus, link graph and per-subject results for one tree."""
+
+    def __init__(self, root: Path):
+        self.corpus = Corpus(root)
+        self.manifest = read_manifest(root, self.corpus)
+        self._outgoing: dict[str, set[str]] = {}
+        self._incoming: dict[str, set[str]] = {}
+        self._results: dict[tuple[str, str], list[str]] = {}
+        self._scaffold_results: dict[str, list[str]] = {}
+
+    def _link(self, relative: str, targets: set[str] | None = None) -> None:
+        for target in self._outgoing.pop(relative, set()):
+            self._incoming.get(target, set()).discard(relative)
+        if targets is None:
+            return
+        self._outgoing[relative] = targets
+        for target in targets:
+            self._incoming.setdefault(target, set()).add(relative)
+
+    def _check_document(self, relative: str) -> list[str]:
+        for name in checks.TREE_CHECKS:
+            self._results.pop((name, relative), None)
+        if relative not in self.corpus.relative_files or not relative.endswith(".md"):
+            self._link(relative)
+            return []
+        path = self.corpus.root / relative
+        if self.corpus.is_large(path):
+            self._link(relative, linked_files(self.corpus, path))
+            results = scan_failures(self.corpus, path)
+        else:
+            document = self.corpus.document(path)
+            self._link(relative, checks.linked_files(document))
+            results = {
+                name: check(self.corpus, document) for name, check in checks.TREE_CHECKS.items()
+            }
+        failures: list[str] = []
+        for name, check_failures in results.items():
+            self._results[(name, relative)] = check_failures
+            failures += check_failures
+        return failures
+
+    def _check_scaffold(self, scaffold: str) -> list[str]:
+        failures: list[str] = []
+        checklist = self.manifest.checklist_for(scaffold)
+        for _, _, check_failures in run_checklist(self.corpus, checklist):
+            failures += check_failures
+        if checklist:
+            self._scaffold_results[scaffold] = failures
+        else:
+            self._scaffold_results.pop(scaffold, None)
+        return failures
+
+    def _removed_subtrees(self, removed: set[str]) -> set[str]:
+        """Files with results or links below a removed path that was a directory."""
+        prefixes = tuple(f"{path}/" for path in removed)
+        if not prefixes:
+            return set()
+        subjects = {relative for _, relative in self._results} | set(self._outgoing)
+        return {relative for relative in subjects if relative.startswith(prefixes)}
+
+    def start(self) -> Revalidation:
+        """Validate the whole tree once and build the link graph."""
+        started = time.perf_counter()
+        relatives = [self.corpus.relative(path) for path in self.corpus.markdown_paths()]
+        failures: list[str] = []
+        for relative in relatives:
+            failures += self._check_document(relative)
+        for scaffold in self.manifest.names:
+            failures += self._check_scaffold(scaffold)
+        return Revalidation(
+            [], relatives, failures, len(failures), time.perf_counter() - started
+        )
+
+    def apply(self, changed: set[str]) -> Revalidation:
+        """Revalidate after ``changed`` (root-relative paths) were edited, added or removed."""
+        started = time.perf_counter()
+        self.corpus.refresh(changed)
+        present = self.corpus.relative_files
+        gone = self._removed_subtrees(changed - present)
+        if gone:
+            self.corpus.refresh(gone)
+        changes = ChangeSet(changed & present, (changed - present) | gone)
+        affected = sorted(
+            {path for path in changed | gone if path.endswith(".md")}
+            | (link_dependents(self._incoming, changes) & present)
+        )
+        failures: list[str] = []
+        for relative in affected:
+            failures += self._check_document(relative)
+
+        previous = set(self.manifest.names)
+        if MANIFEST_NAME in changed or not self.manifest.source:
+            # A discovered manifest follows the directories on disk.
+            self.manifest = read_manifest(self.corpus.root, self.corpus)
+        if MANIFEST_NAME in changed:
+            scaffolds = previous | set(self.manifest.names)
+        else:
+            touched = {PurePosixPath(path).parts[0] for path in changed | gone}
+            scaffolds = touched & (previous | set(self.manifest.names))
+        for scaffold in sorted(scaffolds):
+            failures += self._check_scaffold(scaffold)
+
+        total = sum(len(result) for result in self._results.values())
+        total += sum(len(result) for result in self._scaffold_results.values())
+        return Revalidation(
+            sorted(changed), affected, failures, total, time.perf_counter() - started
+        )
+
+
+class Watcher(Protocol):
+    def changes(self, timeout: float) -> set[str]: ...
+
+    def close(self) -> None: ...
+
+
+class PollingWatcher:
+    """Detect changes by diffing ``(mtime_ns, size)`` of every walked file."""
+
+    def __init__(
+        self, root: Path, rules: list[IgnoreRule], interval: float = DEFAULT_POLL_INTERVAL
+    ):
+        self.root = root
+        self.rules = rules
+        self.interval = interval
+        self._snapshot = self._signatures()
+
+    def _signatures(self) -> dict[str, tuple[int, int]]:
+        signatures: dict[str, tuple[int, int]] = {}
+        for path in walk_tree(self.root, self.rules).files:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            relative = path.relative_to(self.root).as_posix()
+            signatures[relative] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+    def changes(self, timeout: float) -> set[str]:
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self._signatures()
+            changed = {
+                path
+                for path in current.keys() | self._snapshot.keys()
+                if current.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = current
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self) -> None:
+        pass
+
+
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Linux inotify over ``ctypes``: one watch per walked directory.
+
+    A directory that is deleted or moved away loses its watch and those of
+    its subdirectories, so a descriptor number the kernel hands out again
+    is never read with a stale path.
+    """
+
+    def __init__(self, root: Path, rules: list[IgnoreRule]):
+        self.root = root
+        self.rules = rules
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories: dict[int, str] = {}
+        self._watch_tree(root)
+
+    def _watch(self, directory: Path) -> None:
+        descriptor = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), WATCH_MASK
+        )
+        if descriptor < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        relative = directory.relative_to(self.root).as_posix()
+        self._directories[descriptor] = "" if relative == "." else f"{relative}/"
+
+    def _forget(self, prefix: str) -> None:
+        """Drop the watches on the directory at ``prefix`` and everything below it."""
+        for descriptor, watched in list(self._directories.items()):
+            if watched.startswith(prefix):
+                del self._directories[descriptor]
+                # Fails harmlessly when the kernel already removed the watch.
+                self._libc.inotify_rm_watch(self._fd, descriptor)
+
+    def _watch_tree(self, directory: Path) -> set[str]:
+        """Watch ``directory`` and its subdirectories; return the files inside."""
+        relative = directory.relative_to(self.root).as_posix()
+        tree = walk_tree(directory, self.rules, "" if relative == "." else f"{relative}/")
+        for path in [directory, *tree.directories]:
+            self._watch(path)
+        return {path.relative_to(self.root).as_posix() for path in tree.files}
+
+    def _ignored(self, relative: str, is_dir: bool) -> bool:
+        parts = PurePosixPath(relative).parts
+        return any(
+            rule.matches("/".join(parts[:depth]), parts[depth - 1], depth < len(parts) or is_dir)
+            for depth in range(1, len(parts) + 1)
+            for rule in self.rules
+        )
+
+    def _drain(self) -> set[str]:
+        changed: set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            except OSError as error:  # pragma: no cover - defensive
+                if error.errno == errno.EINTR:
+                    continue
+                raise
+            offset = 0
+            while offset < len(data):
+                descriptor, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                name = data[offset + EVENT_HEADER.size : offset + EVENT_HEADER.size + length]
+                offset += EVENT_HEADER.size + length
+                if mask & IN_Q_OVERFLOW:
+                    changed |= {"."}
+                    continue
+                if mask & IN_IGNORED:
+                    self._directories.pop(descriptor, None)
+                    continue
+                prefix = self._directories.get(descriptor)
+                if prefix is None:
+                    continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    # The parent's IN_DELETE/IN_MOVED_FROM reports the path.
+                    self._forget(prefix)
+                    continue
+                relative = prefix + os.fsdecode(name.rstrip(b"\0"))
+                is_dir = bool(mask & IN_ISDIR)
+                if self._ignored(relative, is_dir):
+                    continue
+                if is_dir and mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._forget(f"{relative}/")
+                if is_dir and mask & (IN_CREATE | IN_MOVED_TO):
+                    changed |= self._watch_tree(self.root / relative)
+                changed.add(relative)
+
+    def changes(self, timeout: float) -> set[str]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = self._drain()
+        while select.select([self._fd], [], [], DEBOUNCE_SECONDS)[0]:
+            changed |= self._drain()
+        if "." in changed:
+            # The kernel queue overflowed: treat every file as changed.
+            changed = {
+                path.relative_to(self.root).as_posix()
+                for path in walk_tree(self.root, self.rules).files
+            }
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def make_watcher(
+    root: Path,
+    rules: list[IgnoreRule],
+    polling: bool = False,
+    interval: float = DEFAULT_POLL_INTERVAL,
+) -> Watcher:
+    """inotify where available, otherwise (or when ``polling``) a polling watcher."""
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root, rules)
+        except (AttributeError, OSError):
+            pass
+    return PollingWatcher(root, rules, interval)
+
+
+def watch(
+    root: Path,
+    report: Callable[[Revalidation], None],
+    watcher: Watcher | None = None,
+    batches: int | None = None,
+    timeout: float = 1.0,
+) -> WatchSession:
+    """Validate once, then revalidate each batch of changes until interrupted.
+
+    ``batches`` bounds the number of non-empty change batches handled
+    (``None`` runs until ``KeyboardInterrupt``).
+    """
+    session = WatchSession(root)
+    watcher = watcher or make_watcher(root, session.corpus.ignore_rules)
+    report(session.start())
+    handled = 0
+    try:
+        while batches is None or handled < batches:
+            changed = watcher.changes(timeout)
+            if changed:
+                report(session.apply(changed))
+                handled += 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return session
+
+
+def format_revalidation(result: Revalidation) -> Iterator[str]:
+    if result.changed:
+        yield (
+            f"{len(result.changed)} change(s): revalidated {len(result.revalidated)} file(s) "
+            f"in {result.seconds * 1000:.1f} ms"
+        )
+    else:
+        yield f"validated {len(result.revalidated)} file(s) in {result.seconds * 1000:.1f} ms"
+    for failure in result.failures:
+        yield f"- {failure}"
+    yield f"{result.total_failures} failure(s) in tree"
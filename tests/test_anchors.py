@@ -0,0 +1,58 @@
+from pathlib import Path
+import tempfile
+import unittest
+
+from helpers import write
+from scaffold_validation.anchors import github_slug, heading_slugs, html_anchors
+from scaffold_validation.cache import ValidationCache, anchor_failures
+from scaffold_validation.corpus import Corpus
+from scaffold_validation.parallel import validate_tree
+from scaffold_validation.tokenizer import Heading
+
+
+class AnchorTests(unittest.TestCase):
+    def test_github_slug_matches_renderer(self):
+        cases = {
+            "01 — Philosophy": "01--philosophy",
+            "Step 3: Write `AGENTS.md`": "step-3-write-agentsmd",
+            "See [the guide](guide.md)!": "see-the-guide",
+            "snake_case & Dashes-ok": "snake_case--dashes-ok",
+            "Café <em>menu</em>": "café-menu",
+        }
+        for text, slug in cases.items():
+            self.assertEqual(github_slug(text), slug, text)
+
+    def test_duplicate_headings_get_numbered_suffixes(self):
+        texts = ["Notes", "Notes", "Notes-1", "Notes"]
+        headings = [Heading(2, text, line) for line, text in enumerate(texts, start=1)]
+        self.assertEqual(heading_slugs(headings), ["notes", "notes-1", "notes-1-1", "notes-2"])
+        self.assertEqual(
+            html_anchors('<a name="custom"></a> <a id=\'other\' href="#x">'), ["custom", "other"]
+        )
+
+    def test_broken_fragments_are_reported_by_every_runner(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            write(
+                root / "README.md",
+                "# Root\n\n## Setup Steps\n\n<a name=\"pinned\"></a>\n\n"
+                "[ok](#setup-steps) [pinned](#pinned) [bad](#missing)\n"
+                "[guide](guide.md#usage) [stale](guide.md#install) [asset](logo.png#x)\n",
+            )
+            write(root / "guide.md", "# Guide\n\n## Usage\n")
+
+            cache = ValidationCache(Corpus(root), None)
+            failures = anchor_failures(cache, cache.corpus.markdown_paths())
+
+            self.assertEqual(
+                failures,
+                [
+                    "README.md -> #missing (no heading anchor #missing in README.md)",
+                    "README.md -> guide.md#install (no heading anchor #install in guide.md)",
+                ],
+            )
+            self.assertEqual(validate_tree(root, jobs=1)["anchors"], failures)
+
+
+if __name__ == "__main__":
+    unittest.main()
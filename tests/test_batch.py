@@ -0,0 +1,99 @@
+from contextlib import redirect_stdout
+import io
+import json
+from pathlib import Path
+import tempfile
+import unittest
+
+from scaffold_validation.batch import read_root_list, validate_repositories
+from scaffold_validation.cli import main
+from scaffold_validation.corpus import load_corpus
+from scaffold_validation.manifest import load_manifest
+from scaffold_validation.parallel import validate_tree
+from scaffold_validation.synthetic import generate_tree
+
+
+class BatchValidationTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self._tmp.name)
+        self.clean = self.base / "clean"
+        self.broken = self.base / "broken"
+        generate_tree(self.clean, scaffolds=2, paragraphs=1)
+        names = generate_tree(self.broken, scaffolds=3, paragraphs=1)
+        (self.broken / names[2] / "02-assessment-checklist.md").write_text(
+            "# 02 Checklist\n\n[gone](gone.md)\n", encoding="utf-8"
+        )
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_each_entry_matches_a_standalone_run_whatever_the_pool(self):
+        roots = [self.clean, self.base / "missing", self.broken]
+
+        serial = validate_repositories(roots, jobs=1, chunk_size=4)
+        pooled = validate_repositories(roots, jobs=2, chunk_size=4)
+
+        for batch in (serial, pooled):
+            self.assertEqual(
+                [repository.root for repository in batch.repositories],
+                [str(root.resolve()) for root in roots],
+            )
+            self.assertEqual(batch.repositories[0].report, validate_tree(self.clean, jobs=1))
+            self.assertEqual(batch.repositories[2].report, validate_tree(self.broken, jobs=1))
+            self.assertEqual(batch.repositories[1].failures, [f"{roots[1]} is not a directory"])
+            self.assertEqual(
+                [len(repository.failures) for repository in batch.repositories], [0, 1, 1]
+            )
+            self.assertEqual(batch.repositories[2].scaffolds, 3)
+            self.assertGreater(batch.repositories[2].seconds, 0)
+
+    def test_a_malformed_manifest_is_reported_without_aborting_the_batch(self):
+        bad = self.base / "bad"
+        bad.mkdir()
+        (bad / "scaffolds.toml").write_text("[[scaffold\n", encoding="utf-8")
+        roots = [self.clean, bad, self.broken]
+
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                report = validate_repositories(roots, jobs=jobs, chunk_size=4)
+                self.assertEqual(report.repositories[0].failures, [])
+                self.assertEqual(len(report.repositories[1].failures), 1)
+                self.assertTrue(report.repositories[1].error.startswith(f"{bad.resolve()}: "))
+                self.assertEqual(
+                    report.repositories[2].report, validate_tree(self.broken, jobs=1)
+                )
+
+    def test_batch_reads_current_trees_and_leaves_shared_caches_alone(self):
+        corpus, manifest = load_corpus(self.clean), load_manifest(self.clean)
+        self.assertEqual(validate_repositories([self.clean], jobs=1).failing, [])
+        (self.clean / "README.md").write_text("no heading\n", encoding="utf-8")
+
+        for jobs in (1, 2):
+            report = validate_repositories([self.clean, self.broken], jobs=jobs)
+            self.assertEqual(len(report.failing), 2)
+        self.assertIs(load_corpus(self.clean), corpus)
+        self.assertIs(load_manifest(self.clean), manifest)
+
+    def test_batch_command_reads_a_root_list_and_writes_json(self):
+        listing = self.base / "repos.txt"
+        listing.write_text("# org sweep\nclean\n\nbroken  # has a dead link\n", encoding="utf-8")
+        self.assertEqual(read_root_list(listing), [self.clean.resolve(), self.broken.resolve()])
+        report = self.base / "out" / "batch.json"
+
+        with redirect_stdout(io.StringIO()) as output:
+            code = main(["batch", "--from", str(listing), "--jobs", "1", "--json", str(report)])
+
+        self.assertEqual(code, 1)
+        self.assertIn("2 repositories, 1 failing, 1 failure(s)", output.getvalue())
+        self.assertIn("  [links] ", output.getvalue())
+        data = json.loads(report.read_text(encoding="utf-8"))
+        self.assertEqual(data["repositories"][0]["failures"], {})
+        self.assertEqual(list(data["repositories"][1]["failures"]), ["links"])
+
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(main(["batch", str(self.clean), "--jobs", "1"]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+from contextlib import redirect_stdout
+import io
+import json
+import os
+from pathlib import Path
+import tempfile
+import unittest
+from unittest import mock
+
+from helpers import write as write_file
+from scaffold_validation import cache as cache_module
+from scaffold_validation.cache import (
+    ValidationCache,
+    default_cache_path,
+    load_cache,
+    suite_failures,
+)
+from scaffold_validation.cli import main
+from scaffold_validation.corpus import Corpus
+
+
+ROOT = Path(__file__).resolve().parents[1]
+OLD_MTIME_NS = 1_000_000_000_000_000_000
+
+
+def write(path: Path, text: str) -> None:
+    # Settled files: the cache may trust their stat signature.
+    write_file(path, text, mtime_ns=OLD_MTIME_NS)
+
+
+def build_tree(root: Path) -> None:
+    write(root / "README.md", "# Root\n\n[demo](demo/README.md)\n")
+    write(
+        root / "demo" / "README.md",
+        "# Demo\n\n[00-philosophy.md](00-philosophy.md)\n[templates/](templates/)\n",
+    )
+    write(root / "demo" / "00-philosophy.md", "# 00 — Philosophy\n\n[back](README.md)\n")
+    write(root / "demo" / "01-process-overview.md", "# 01 — Overview\n")
+    write(root / "demo" / "templates" / "plan.md.template", "# Plan\n\n- [ ] step\n")
+
+
+def run(root: Path, cache_path: Path) -> tuple[list[str], ValidationCache]:
+    cache = ValidationCache(Corpus(root), cache_path)
+    return suite_failures(cache), cache
+
+
+class ValidationCacheTests(unittest.TestCase):
+    def test_warm_run_matches_cold_run_without_reading_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            build_tree(root)
+            cache_path = root / ".validation-cache" / "results.json"
+
+            cold, cold_cache = run(root, cache_path)
+            warm, warm_cache = run(root, cache_path)
+
+            self.assertEqual(cold, warm)
+            self.assertEqual(
+                cold, ["demo/README.md missing document index link for 01-process-overview.md"]
+            )
+            self.assertEqual(cold_cache.hits, 0)
+            self.assertEqual(warm_cache.misses, 0)
+            self.assertEqual(warm_cache.corpus.files_read, 0)
+
+    def test_edits_and_dependencies_invalidate_only_what_changed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            build_tree(root)
+            cache_path = root / "cache.json"
+            run(root, cache_path)
+
+            write(root / "demo" / "01-process-overview.md", "no heading\n")
+            (root / "demo" / "00-philosophy.md").rename(root / "demo" / "00-intro.md")
+            write(root / "demo" / "00-intro.md", "# 00 — Intro\n\n[back](README.md)\n")
+
+            failures, cache = run(root, cache_path)
+            cold, _ = run(root, None)
+
+            self.assertEqual(failures, cold)
+            self.assertIn("demo/01-process-overview.md first line is not an H1: no heading", failures)
+            self.assertTrue(
+                any(entry.startswith("demo/README.md -> 00-philosophy.md") for entry in failures)
+            )
+            self.assertIn("demo/README.md missing document index link for 00-intro.md", failures)
+            self.assertEqual(cache.corpus.files_read, 3)
+
+    def test_version_mismatch_and_corrupt_files_start_cold(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            build_tree(root)
+            cache_path = root / "cache.json"
+            run(root, cache_path)
+
+            data = json.loads(cache_path.read_text(encoding="utf-8"))
+            data["version"] = "stale"
+            cache_path.write_text(json.dumps(data), encoding="utf-8")
+            _, stale = run(root, cache_path)
+            self.assertEqual(stale.hits, 0)
+
+            cache_path.write_text("{not json", encoding="utf-8")
+            _, corrupt = run(root, cache_path)
+            self.assertEqual(corrupt.hits, 0)
+
+    def test_cache_location_honours_environment(self):
+        with mock.patch.dict(os.environ, {cache_module.CACHE_ENV: "off"}):
+            self.assertIsNone(default_cache_path(ROOT))
+        with mock.patch.dict(os.environ, {cache_module.CACHE_ENV: "/tmp/x.json"}):
+            self.assertEqual(default_cache_path(ROOT), Path("/tmp/x.json"))
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(default_cache_path(ROOT), ROOT / ".validation-cache" / "results.json")
+        # The unit suite never reuses results left on disk by an earlier run.
+        self.assertIsNone(load_cache(ROOT).path)
+
+    def test_check_command_reports_failures(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            build_tree(root)
+            with redirect_stdout(io.StringIO()) as output:
+                exit_code = main(["--root", str(root), "check", "--no-cache"])
+
+            self.assertEqual(exit_code, 1)
+            self.assertIn("1 failure(s)", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+from contextlib import redirect_stdout
+import io
+from pathlib import Path
+import subprocess
+import tempfile
+import unittest
+
+from helpers import write
+from scaffold_validation.cache import ValidationCache
+from scaffold_validation.changed import (
+    changed_failures,
+    git_changes,
+    parse_name_status,
+)
+from scaffold_validation.cli import main
+from scaffold_validation.corpus import Corpus
+
+
+def git(root: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=root,
+        check=True,
+        capture_output=True,
+    )
+
+
+MANIFEST = """[scaffolds.demo]
+guides = ["README.md"]
+templates = ["AGENTS.md.template"]
+contracts = ["readme-index", "agents-contract"]
+"""
+
+AGENTS = """# AGENTS.md
+
+## Mission
+
+Read these files: `demo/README.md`, `demo/guide.md`.
+"""
+
+
+def build_repo(root: Path) -> None:
+    write(root / "scaffolds.toml", MANIFEST)
+    write(root / "README.md", "# Root\n\n[demo](demo/README.md)\n")
+    write(
+        root / "demo" / "README.md",
+        "# Demo\n\n[00-philosophy.md](00-philosophy.md)\n[templates/](templates/)\n",
+    )
+    write(root / "demo" / "00-philosophy.md", "# 00 — Philosophy\n\n[guide](guide.md)\n")
+    write(root / "demo" / "guide.md", "# Guide\n")
+    write(root / "demo" / "templates" / "AGENTS.md.template", AGENTS)
+    write(root / "other" / "stale.md", "stale file with [a broken link](nowhere.md)\n")
+    git(root, "init", "-q", "-b", "main")
+    git(root, "add", "-A")
+    git(root, "commit", "-q", "-m", "base")
+
+
+def scoped(root: Path) -> tuple[list[str], list[str]]:
+    cache = ValidationCache(Corpus(root), None)
+    return changed_failures(cache, git_changes(root, "HEAD"))
+
+
+class ChangedModeTests(unittest.TestCase):
+    def test_parse_name_status_tracks_renames_and_deletions(self):
+        changes = parse_name_status(
+            ["M", "a.md", "R087", "old.md", "new.md", "D", "gone.md", "C100", "x.md", "y.md"]
+        )
+        self.assertEqual(changes.changed, {"a.md", "new.md", "y.md"})
+        self.assertEqual(changes.deleted, {"old.md", "gone.md"})
+
+    def test_rename_surfaces_broken_inbound_links_only(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            build_repo(root)
+            git(root, "mv", "demo/guide.md", "demo/handbook.md")
+
+            failures, link_scope = scoped(root)
+
+            self.assertEqual(link_scope, ["demo/00-philosophy.md", "demo/handbook.md"])
+            self.assertEqual(len(failures), 1)
+            self.assertTrue(failures[0].startswith("demo/00-philosophy.md -> guide.md"))
+
+    def test_new_guides_and_templates_run_the_scaffold_checklist(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            build_repo(root)
+            write(root / "demo" / "01-process-overview.md", "# Overview\n")
+            write(root / "demo" / "templates" / "AGENTS.md.template", "# Agents\n")
+
+            failures, _ = scoped(root)
+
+            self.assertEqual(
+                failures,
+                [
+                    "demo/01-process-overview.md should start with '# 01'",
+                    "demo/README.md missing document index link for 01-process-overview.md",
+                    "demo/templates/AGENTS.md.template must start with '# AGENTS.md'",
+                    "demo/templates/AGENTS.md.template missing mission/current phase section",
+                    "demo/templates/AGENTS.md.template missing source navigation section",
+                    "demo/templates/AGENTS.md.template has too few file path references (0 < 2)",
+                ],
+            )
+
+    def test_manifest_and_ignore_edits_validate_the_whole_tree(self):
+        for name in ("scaffolds.toml", ".validationignore"):
+            with self.subTest(name=name), tempfile.TemporaryDirectory() as tmp:
+                root = Path(tmp)
+                build_repo(root)
+                with (root / name).open("a", encoding="utf-8") as handle:
+                    handle.write("\n")
+
+                failures, link_scope = scoped(root)
+
+                self.assertIn("other/stale.md", link_scope)
+                self.assertTrue(any(entry.startswith("other/stale.md") for entry in failures))
+
+    def test_changes_are_taken_from_the_merge_base(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            build_repo(root)
+            git(root, "checkout", "-q", "-b", "topic")
+            write(root / "demo" / "guide.md", "# Guide\n\nTopic work.\n")
+            git(root, "commit", "-q", "-am", "topic")
+            git(root, "checkout", "-q", "main")
+            write(root / "other" / "stale.md", "# Stale\n")
+            git(root, "commit", "-q", "-am", "main moved on")
+            git(root, "checkout", "-q", "topic")
+
+            changes = git_changes(root, "main")
+
+            self.assertEqual(changes.touched, {"demo/guide.md"})
+
+    def test_deleted_directory_breaks_directory_links(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            build_repo(root)
+            git(root, "rm", "-q", "-r", "demo/templates")
+
+            with redirect_stdout(io.StringIO()) as output:
+                exit_code = main(["--root", str(root), "changed", "--base", "HEAD"])
+
+            self.assertEqual(exit_code, 1)
+            self.assertIn("demo/README.md -> templates/", output.getvalue())
+            self.assertNotIn("stale.md", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+from contextlib import redirect_stdout
+import io
+from pathlib import Path
+import tempfile
+import unittest
+
+from helpers import write
+from scaffold_validation.cli import main
+from scaffold_validation.context import (
+    TokenCountCache,
+    count_tokens,
+    pack_context,
+    references,
+)
+from scaffold_validation.corpus import Document
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+AGENTS = """# AGENTS.md — Demo
+
+## Mission
+Ship the demo.
+
+## Notes
+See `docs/notes.md` and run `./scripts/check.sh --all`. Code lives in `src/app/`.
+
+## Source of Truth (read in this order)
+1. `spec/index.md`
+2. `spec/{project}-PRD.md`
+3. `spec/guide.md`
+4. `./spec/index.md` (again)
+5. `spec/data-model.md`
+"""
+
+
+def section(title: str, words: int) -> str:
+    return f"## {title}\n\n" + " ".join(["word"] * words) + "\n\n"
+
+
+class ContextPackerTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.project = Path(self._tmp.name)
+        write(self.project / "AGENTS.md", AGENTS)
+        write(self.project / "spec" / "index.md", "# Index\n\n" + section("Order", 40))
+        write(
+            self.project / "spec" / "guide.md",
+            "# Guide\n\n" + section("Small", 30) + section("Huge", 500) + section("Tail", 30),
+        )
+        write(self.project / "docs" / "notes.md", "# Notes\n\n" + section("Body", 60))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_references_put_source_of_truth_first_and_skip_commands(self):
+        document = Document(self.project / "AGENTS.md", "AGENTS.md", AGENTS)
+
+        self.assertEqual(
+            [(reference.path, reference.priority) for reference in references(document)],
+            [
+                ("spec/index.md", 0),
+                ("spec/guide.md", 0),
+                ("spec/index.md", 0),
+                ("spec/data-model.md", 0),
+                ("docs/notes.md", 1),
+                ("src/app/", 1),
+            ],
+        )
+        # "Implementation" is two pieces, "2026" two digit groups.
+        self.assertEqual(count_tokens("Implementation plan, v2026."), 8)
+
+    def test_pack_slices_sections_when_files_do_not_fit(self):
+        counts = TokenCountCache()
+        full = pack_context(self.project / "AGENTS.md", 10_000, counts=counts)
+        self.assertEqual(
+            [packed.relative for packed in full.files],
+            ["spec/index.md", "spec/guide.md", "docs/notes.md"],
+        )
+        self.assertTrue(all(packed.whole for packed in full.files))
+        self.assertEqual(full.missing, ["spec/data-model.md"])
+        self.assertEqual(full.directories, ["src/app/"])
+        index_tokens = full.files[0].tokens
+        bodies = {
+            name: count_tokens((self.project / name).read_text(encoding="utf-8"))
+            for name in ("spec/index.md", "spec/guide.md", "docs/notes.md")
+        }
+        # spec/index.md is referenced twice but would be concatenated once.
+        self.assertEqual(full.naive_tokens, sum(bodies.values()))
+
+        tight = pack_context(self.project / "AGENTS.md", index_tokens + 100, counts=counts)
+
+        self.assertEqual(counts.misses, 3)
+        self.assertEqual(
+            [packed.relative for packed in tight.files], ["spec/index.md", "spec/guide.md"]
+        )
+        guide = tight.files[1]
+        self.assertEqual(guide.sections, ["guide", "small", "tail"])
+        self.assertNotIn("## Huge", guide.text)
+        self.assertIn("## Tail", guide.text)
+        self.assertEqual(tight.omitted, ["docs/notes.md"])
+        self.assertLessEqual(tight.tokens, tight.budget)
+        self.assertEqual(tight.saved_tokens, full.naive_tokens - tight.tokens)
+        self.assertEqual(tight.render().count("<!-- context: "), 2)
+
+    def test_pack_reads_files_as_they_are_now(self):
+        before = pack_context(self.project / "AGENTS.md", 10_000)
+        write(self.project / "docs" / "notes.md", "# Notes\n\nRewritten.\n")
+
+        after = pack_context(self.project / "AGENTS.md", 10_000)
+
+        self.assertNotIn("Rewritten.", before.render())
+        self.assertIn("Rewritten.", after.render())
+
+    def test_pack_command_reports_savings_and_caches_counts(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            argv = ["--root", tmp, "pack", str(self.project / "AGENTS.md"), "--budget", "400"]
+            output_path = Path(tmp) / "bundle.md"
+            with redirect_stdout(io.StringIO()) as output:
+                self.assertEqual(main([*argv, "--output", str(output_path)]), 0)
+            self.assertIn("missing          spec/data-model.md", output.getvalue())
+            self.assertRegex(output.getvalue(), r"naive concatenation \d+, saved \d+")
+            self.assertIn("<!-- context: spec/index.md", output_path.read_text(encoding="utf-8"))
+
+            counts = TokenCountCache(Path(tmp) / ".validation-cache" / "token-counts.json")
+            pack_context(self.project / "AGENTS.md", 400, counts=counts)
+            self.assertEqual((counts.hits, counts.misses), (3, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
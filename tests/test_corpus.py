@@ -0,0 +1,79 @@
+from contextlib import redirect_stdout
+import io
+from pathlib import Path
+import tempfile
+import unittest
+
+from scaffold_validation.cli import main
+from scaffold_validation.corpus import Corpus, load_corpus, read_profile
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+SAMPLE = """# 01 — Sample
+
+See [guide](02-guide.md) and [site](https://example.com).
+
+```text
+[not a link](missing.md)
+## not a heading
+```
+
+## Section {PROJECT_NAME}
+
+| File | Purpose |
+|------|---------|
+| [README.md](README.md) | index |
+"""
+
+
+class CorpusTests(unittest.TestCase):
+    def test_load_corpus_is_shared_per_root(self):
+        self.assertIs(load_corpus(ROOT), load_corpus(ROOT))
+
+    def test_documents_are_read_once_and_tokenized(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "01-sample.md").write_text(SAMPLE, encoding="utf-8")
+            (root / "templates").mkdir()
+            (root / "templates" / "x.md.template").write_text("# X\n", encoding="utf-8")
+            (root / ".git").mkdir()
+            (root / ".git" / "ignored.md").write_text("no h1", encoding="utf-8")
+
+            corpus = Corpus(root)
+            first = corpus.markdown()
+            second = corpus.markdown()
+            self.assertEqual([doc.relative for doc in first], ["01-sample.md"])
+            self.assertIs(first[0], second[0])
+
+            document = first[0]
+            self.assertEqual(
+                document.links, ["02-guide.md", "https://example.com", "README.md"]
+            )
+            self.assertEqual(document.table_links, ["README.md"])
+            self.assertEqual(document.placeholders, ["{PROJECT_NAME}"])
+            self.assertEqual(
+                [(h.level, h.text) for h in document.headings],
+                [(1, "01 — Sample"), (2, "Section {PROJECT_NAME}")],
+            )
+            self.assertEqual([(f.start, f.end, f.info) for f in document.fences], [(5, 8, "text")])
+            self.assertEqual(len(document.table_rows), 3)
+            self.assertEqual(
+                corpus.children(root / "templates"), [root / "templates" / "x.md.template"]
+            )
+
+            corpus.templates()
+            expected = len(SAMPLE.encode("utf-8")) + len(b"# X\n")
+            self.assertEqual((corpus.files_read, corpus.bytes_read), (2, expected))
+
+    def test_profile_reads_each_byte_once(self):
+        profile = read_profile(ROOT, passes=2)
+        self.assertEqual(profile["bytes_read"], profile["bytes_on_disk"])
+        self.assertEqual(profile["files_read"], profile["files"])
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(main(["--root", str(ROOT), "stats", "--passes", "1"]), 0)
+        self.assertIn("bytes_read", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,27 +1,20 @@
 from pathlib import Path
 import unittest
 
+from scaffold_validation.corpus import load_corpus
+from scaffold_validation.manifest import load_manifest
+
 
 ROOT = Path(__file__).resolve().parents[1]
 README = ROOT / "README.md"
 
-EXPECTED_SCAFFOLDS = {
-    "greenfield",
-    "repo-documentation",
-    "refactoring",
-    "feature-addition",
-    "bug-investigation",
-    "testing-retrofit",
-    "migration",
-    "incident-response",
-    "spike",
-}
+MANIFEST = load_manifest(ROOT)
 
 
 class ReadmeCrossReferenceTests(unittest.TestCase):
     def test_root_readme_lists_all_scaffolds(self):
-        content = README.read_text(encoding="utf-8")
-        for scaffold in EXPECTED_SCAFFOLDS:
+        content = load_corpus(ROOT).document(README).text
+        for scaffold in MANIFEST.names:
             self.assertIn(
                 f"[{scaffold}/]({scaffold}/)",
                 content,
@@ -29,12 +22,12 @@ class ReadmeCrossReferenceTests(unittest.TestCase):
             )
 
     def test_root_readme_start_here_links_exist(self):
-        content = README.read_text(encoding="utf-8")
-        for scaffold in EXPECTED_SCAFFOLDS:
+        content = load_corpus(ROOT).document(README).text
+        for scaffold in MANIFEST.names:
             link = f"[{scaffold}/README.md]({scaffold}/README.md)"
             self.assertIn(link, content, f"Root README missing link: {link}")
             self.assertTrue(
-                (ROOT / scaffold / "README.md").exists(),
+                load_corpus(ROOT).exists(ROOT / scaffold / "README.md"),
                 f"Missing scaffold README file for {scaffold}",
             )
 
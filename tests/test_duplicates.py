@@ -0,0 +1,127 @@
+from contextlib import redirect_stdout
+import io
+import json
+import os
+from pathlib import Path
+import tempfile
+import unittest
+
+from helpers import write
+from scaffold_validation.cli import main
+from scaffold_validation.corpus import Corpus
+from scaffold_validation.duplicates import (
+    SignatureIndex,
+    find_duplicates,
+    minhash,
+    shingle_hashes,
+    similarity,
+    words,
+)
+
+
+GUIDANCE = (
+    "Never merge a pull request while any required check is failing or pending. "
+    "Run the full suite locally before pushing, and record the command output in "
+    "the handoff note so the reviewer can compare it with the CI log. Keep every "
+    "change small enough to review in one sitting and link the plan it implements. "
+    "If a check is flaky, quarantine it in a separate commit with an issue reference."
+)
+DRIFTED = GUIDANCE.replace("in one sitting", "within an hour").replace(
+    "with an issue reference", "and tell the owner"
+)
+UNRELATED = (
+    "Capture the exact error message, the stack trace and the version of every "
+    "service involved. Reproduce the symptom on a clean checkout before forming any "
+    "hypothesis about the cause, then write down what was tried and what happened."
+)
+
+
+def signature(text: str) -> tuple[int, ...]:
+    return minhash(shingle_hashes(words(text)))
+
+
+class MinHashTests(unittest.TestCase):
+    def test_similarity_tracks_shared_shingles(self):
+        self.assertEqual(similarity(signature(GUIDANCE), signature(GUIDANCE.upper())), 1.0)
+        drifted = similarity(signature(GUIDANCE), signature(DRIFTED))
+        self.assertGreater(drifted, 0.4)
+        self.assertLess(drifted, 1.0)
+        self.assertLess(similarity(signature(GUIDANCE), signature(UNRELATED)), 0.2)
+
+
+class DuplicateIndexTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        for scaffold in ("alpha", "beta", "gamma"):
+            write(
+                self.root / scaffold / "templates" / "AGENTS.md.template",
+                f"# AGENTS.md\n\n## Merge contract\n\n{GUIDANCE}\n\n## Symptoms\n\n"
+                f"{UNRELATED if scaffold == 'alpha' else 'Short.'}\n",
+            )
+        write(self.root / "delta" / "06-agents.md", f"# 06 — Agents\n\n## Merging\n\n{DRIFTED}\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_reports_identical_groups_and_diverging_copies(self):
+        report = find_duplicates(Corpus(self.root))
+
+        self.assertEqual(
+            [[section.location for section in group] for group in report.copies()],
+            [
+                [
+                    "alpha/templates/AGENTS.md.template#merge-contract",
+                    "beta/templates/AGENTS.md.template#merge-contract",
+                    "gamma/templates/AGENTS.md.template#merge-contract",
+                ]
+            ],
+        )
+        self.assertEqual(len(report.diverging), 3)
+        for pair in report.diverging:
+            self.assertIn("delta/06-agents.md#merging", (pair.first.location, pair.second.location))
+            self.assertLess(pair.first.location, pair.second.location)
+            self.assertEqual((pair.first.line, pair.second.line), (3, 3))
+        self.assertEqual(report.documents, 4)
+        # "Short." sections are too small to compare; alpha's symptoms have no match.
+        self.assertEqual(report.sections, 5)
+
+    def test_index_rehashes_only_changed_files(self):
+        path = self.root / ".validation-cache" / "duplicates.json"
+        self.assertEqual(find_duplicates(Corpus(self.root), path).reindexed, 4)
+        self.assertEqual(find_duplicates(Corpus(self.root), path).reindexed, 0)
+
+        target = self.root / "delta" / "06-agents.md"
+        write(target, f"# 06 — Agents\n\n## Merging\n\n{GUIDANCE}\n")
+        os.utime(target, ns=(1, 1))
+        report = find_duplicates(Corpus(self.root), path)
+        self.assertEqual(report.reindexed, 1)
+        self.assertEqual(report.diverging, [])
+        self.assertEqual(len(report.copies()[0]), 4)
+        self.assertEqual(len(SignatureIndex(path).signatures()), 5)
+
+    def test_cli_writes_json_report(self):
+        output = self.root / "duplicates.json"
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            code = main(
+                [
+                    "--root",
+                    str(self.root),
+                    "duplicates",
+                    "--all",
+                    "--no-cache",
+                    "--json",
+                    str(output),
+                ]
+            )
+        self.assertEqual(code, 0)
+        self.assertIn("identical in 3 files:", stdout.getvalue())
+        self.assertIn("<->  delta/06-agents.md#merging", stdout.getvalue())
+        report = json.loads(output.read_text(encoding="utf-8"))
+        self.assertEqual(len(report["pairs"]), 6)
+        self.assertFalse((self.root / ".validation-cache").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+from contextlib import redirect_stdout
+import io
+from pathlib import Path
+import tempfile
+import unittest
+
+from helpers import write
+from scaffold_validation.cli import main
+from scaffold_validation.corpus import Corpus, load_corpus
+from scaffold_validation.evaluation import (
+    GOLD,
+    GOLD_STANDARD_DIR,
+    IN_PROGRESS,
+    MATRIX_NAME,
+    SILVER,
+    Difference,
+    evaluate,
+)
+from scaffold_validation.synthetic import generate_tree
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+REVIEW = """# Scaffold Effectiveness Review — {scaffold}
+
+## Safety outcomes
+
+- Rollback path verified? `{rollback}`
+- Unsafe workaround needed? `no`
+
+## Reproducibility check
+
+- Equivalent result achieved? `yes`
+
+## Criterion scoring (0-2)
+
+- Structural integrity: `2`
+- Operator clarity: `{clarity}`
+- Execution effectiveness: `2`
+- Safety resilience: `2`
+- Reproducibility: `2`
+
+## Decision
+
+- Status: `{status}`
+"""
+
+MATRIX = """# Scaffold Evaluation Matrix
+
+| Scaffold | Structural integrity | Operator clarity | Effectiveness evidence | Safety resilience | Reproducibility | Score | Status | Evidence |
+|---|---:|---:|---:|---:|---:|---:|---|---|
+| stale | 0 | 0 | 0 | 0 | 0 | 0 | Not started | |
+| scaffold-0003 | 2 | 2 | 0 | 1 | 0 | 5 | Silver validated | tests + docs only |
+
+## Next recommended order
+"""
+
+
+class EvaluationTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.names = generate_tree(self.root, scaffolds=4, paragraphs=1)
+        self.workspace = self.root / GOLD_STANDARD_DIR
+        write(self.workspace / MATRIX_NAME, MATRIX)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def add_run(self, scaffold: str, number: int, missing: bool = False) -> None:
+        directory = self.workspace / "executions" / scaffold / f"run-{number:03d}"
+        write(
+            directory / "run-summary.md",
+            "# Run Summary\n\n## Outputs produced\n- `plan.md`\n- `checklist.md`\n\n"
+            "## Outcome\n- Shipped.\n",
+        )
+        write(directory / "plan.md", "# Plan\n")
+        if not missing:
+            write(directory / "checklist.md", "# Checklist\n")
+
+    def add_review(
+        self, scaffold: str, status: str = GOLD, rollback: str = "yes", clarity: str = "2"
+    ) -> None:
+        write(
+            self.workspace / "reviews" / f"{scaffold}-effectiveness-review.md",
+            REVIEW.format(scaffold=scaffold, status=status, rollback=rollback, clarity=clarity),
+        )
+
+    def test_committed_matrix_differences_are_reported(self):
+        evaluation = evaluate(load_corpus(ROOT))
+        statuses = {score.scaffold: score.status for score in evaluation.scores}
+        self.assertEqual(statuses["bug-investigation"], GOLD)
+        self.assertNotIn(
+            "bug-investigation", {difference.scaffold for difference in evaluation.differences}
+        )
+        self.assertIn("testing-retrofit", evaluation.unreviewed)
+        self.assertNotIn("bug-investigation", evaluation.unreviewed)
+
+    def test_scores_follow_the_framework_criteria(self):
+        gold, unsigned, unsafe, bare = self.names
+        for scaffold in (gold, unsigned, unsafe):
+            self.add_run(scaffold, 1)
+        self.add_run(gold, 2)
+        self.add_run(unsigned, 2, missing=True)
+        self.add_review(gold)
+        self.add_review(unsigned, status=IN_PROGRESS)
+        self.add_review(unsafe, rollback="no", clarity="1")
+        agents = self.root / bare / "templates" / "AGENTS.md.template"
+        write(agents, agents.read_text(encoding="utf-8") + "\nRoll back before retrying.\n")
+
+        evaluation = evaluate(Corpus(self.root))
+        scores = {score.scaffold: score for score in evaluation.scores}
+        self.assertEqual((scores[gold].scores, scores[gold].status), ((2, 2, 2, 2, 2), GOLD))
+        # One complete run caps reproducibility; the threshold holds whatever the review decided.
+        self.assertEqual(scores[unsigned].scores, (2, 2, 2, 2, 1))
+        self.assertEqual(scores[unsigned].status, GOLD)
+        # The review's clarity score stands; safety without a verified rollback is partial.
+        self.assertEqual((scores[unsafe].scores, scores[unsafe].status), ((2, 1, 2, 1, 1), SILVER))
+        # Documented rollback behavior is partial safety evidence; clarity is unjudged.
+        self.assertEqual((scores[bare].scores, scores[bare].status), ((2, 1, 0, 1, 0), SILVER))
+        self.assertEqual(evaluation.unreviewed, [bare])
+        self.assertEqual(
+            scores[gold].evidence,
+            (
+                f"[{gold} review](reviews/{gold}-effectiveness-review.md)",
+                f"[run-001](executions/{gold}/run-001/run-summary.md)",
+                f"[run-002](executions/{gold}/run-002/run-summary.md)",
+            ),
+        )
+        self.assertEqual(
+            evaluation.differences,
+            [
+                Difference(gold, "row", "missing", "computed"),
+                Difference(unsigned, "row", "missing", "computed"),
+                Difference(unsafe, "row", "missing", "computed"),
+                Difference(bare, "Operator clarity", "2", "1"),
+                Difference(bare, "Score", "5", "4"),
+            ],
+        )
+
+        lines = evaluation.updated.splitlines()
+        self.assertNotIn("stale", evaluation.updated)
+        self.assertIn(f"| {bare} | 2 | 1 | 0 | 1 | 0 | 4 | {SILVER} | tests + docs only |", lines)
+        self.assertEqual(lines[-1], "## Next recommended order")
+
+        # A broken link inside a scaffold fails structural integrity.
+        write(self.root / bare / "README.md", "# Bare\n\n[gone](gone.md)\n")
+        scores = {score.scaffold: score for score in evaluate(Corpus(self.root)).scores}
+        self.assertEqual((scores[bare].scores[0], scores[bare].status), (1, IN_PROGRESS))
+
+    def test_new_runs_are_parsed_incrementally_and_written_by_the_cli(self):
+        scaffold = self.names[0]
+        self.add_run(scaffold, 1)
+        self.add_review(scaffold)
+        path = self.root / ".validation-cache" / "evaluation.json"
+        self.assertEqual(evaluate(Corpus(self.root), path).parsed, 2)
+        self.assertEqual(evaluate(Corpus(self.root), path).parsed, 0)
+
+        self.add_run(scaffold, 2)
+        evaluation = evaluate(Corpus(self.root), path)
+        self.assertEqual((evaluation.parsed, evaluation.runs), (1, 2))
+        self.assertEqual(evaluation.scores[0].status, GOLD)
+
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(main(["--root", str(self.root), "evaluate"]), 1)
+            self.assertEqual(main(["--root", str(self.root), "evaluate", "--write"]), 0)
+            self.assertEqual(main(["--root", str(self.root), "evaluate"]), 0)
+        matrix = (self.workspace / MATRIX_NAME).read_text(encoding="utf-8")
+        self.assertIn(f"| {scaffold} | 2 | 2 | 2 | 2 | 2 | 10 | {GOLD} |", matrix)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+from contextlib import redirect_stdout
+import io
+from pathlib import Path
+import tempfile
+import unittest
+
+from helpers import write
+from scaffold_validation.cli import main
+from scaffold_validation.corpus import Corpus
+from scaffold_validation.graph import LinkGraph, default_roots
+
+
+class LinkGraphTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        write(self.root / "README.md", "# Root\n\n[demo](demo/)\n")
+        write(
+            self.root / "demo" / "README.md",
+            "# Demo\n\n[guide](01-guide.md) and [prompts](02-prompts.md#prompt-1)\n",
+        )
+        write(self.root / "demo" / "templates" / "plan.md.template", "# Plan\n")
+        write(self.root / "demo" / "01-guide.md", "# 01 Guide\n\n[prompts](02-prompts.md)\n")
+        write(self.root / "demo" / "02-prompts.md", "# 02 Prompts\n\n[guide](01-guide.md)\n")
+        write(self.root / "notes" / "draft.md", "# Draft\n\n[guide](../demo/01-guide.md)\n")
+        self.corpus = Corpus(self.root)
+        self.graph = LinkGraph.from_corpus(self.corpus)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_analysis_answers_reachability_orphans_in_degree_and_paths(self):
+        analysis = self.graph.analyze(default_roots(self.corpus))
+
+        self.assertEqual(analysis.roots, ["README.md", "demo/README.md"])
+        self.assertEqual(analysis.orphans, ["notes/draft.md"])
+        self.assertEqual(analysis.distance("demo/02-prompts.md"), 1)
+        self.assertIsNone(analysis.distance("notes/draft.md"))
+        self.assertEqual(analysis.path("demo/01-guide.md"), ["demo/README.md", "demo/01-guide.md"])
+        self.assertEqual(analysis.most_linked(1), [("demo/01-guide.md", 3)])
+        self.assertEqual(
+            self.graph.shortest_path("notes/draft.md", "demo/02-prompts.md"),
+            ["notes/draft.md", "demo/01-guide.md", "demo/02-prompts.md"],
+        )
+        self.assertEqual(self.graph.cycles(), [["demo/01-guide.md", "demo/02-prompts.md"]])
+
+    def test_incremental_updates_match_a_rebuild(self):
+        write(self.root / "demo" / "02-prompts.md", "# 02 Prompts\n\n[draft](../notes/draft.md)\n")
+        (self.root / "demo" / "01-guide.md").unlink()
+        changed = {"demo/01-guide.md", "demo/02-prompts.md"}
+        self.corpus.refresh(changed)
+
+        self.graph.update_from_corpus(self.corpus, changed)
+
+        rebuilt = LinkGraph.from_corpus(Corpus(self.root))
+        roots = default_roots(self.corpus)
+        for graph in (self.graph, rebuilt):
+            analysis = graph.analyze(roots)
+            self.assertEqual(analysis.orphans, [])
+            self.assertEqual(
+                analysis.path("notes/draft.md"),
+                ["demo/README.md", "demo/02-prompts.md", "notes/draft.md"],
+            )
+            self.assertEqual(graph.cycles(), [])
+        self.assertEqual(self.graph.incoming("demo/01-guide.md"), ["demo/README.md", "notes/draft.md"])
+        self.assertEqual(self.graph.edge_count, rebuilt.edge_count)
+
+    def test_graph_command_reports_orphans_and_paths(self):
+        argv = ["--root", str(self.root), "graph"]
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(main([*argv, "--strict"]), 1)
+        self.assertIn("orphan: notes/draft.md", output.getvalue())
+        self.assertIn("cycle of 2: demo/01-guide.md, demo/02-prompts.md", output.getvalue())
+
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(main([*argv, "--path", "demo/02-prompts.md"]), 0)
+        self.assertEqual(output.getvalue().strip(), "demo/README.md -> demo/02-prompts.md")
+
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(main([*argv, "--path", "notes/draft.md"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+from contextlib import redirect_stdout
+import io
+import json
+from pathlib import Path
+import subprocess
+import tempfile
+import unittest
+
+from scaffold_validation.cli import main
+from scaffold_validation.corpus import Corpus
+from scaffold_validation.history import (
+    NO_PARENT,
+    History,
+    collect,
+    lead_times,
+    mainline,
+    render_scoreboard,
+    weekly_metrics,
+)
+from scaffold_validation.synthetic import write_history
+
+
+ROOT = Path(__file__).resolve().parents[1]
+DAY = 86400
+
+# Two commits on main, one on a branch authored two days earlier, and the merge.
+LOG = (
+    "\x1e" + "a" * 40 + "\x1f\x1f1600000000\x1f1600000000\x1fDev@Example.com\x1fStart\n\n"
+    "3\t0\tREADME.md\n-\t-\tlogo.png\n"
+    "\x1e" + "b" * 40 + "\x1f" + "a" * 40 + f"\x1f{1600000000 - 2 * DAY}\x1f1600003600"
+    "\x1fother@example.com\x1fRevert \"Start\"\n\n1\t3\tREADME.md\n"
+    "\x1e" + "c" * 40 + "\x1f" + "a" * 40 + "\x1f1600007200\x1f1600007200"
+    "\x1fdev@example.com\x1fHotfix typo\n\n1\t1\tdocs/a.md\n"
+    "\x1e" + "d" * 40 + "\x1f" + "c" * 40 + " " + "b" * 40 + "\x1f1600010800\x1f1600010800"
+    "\x1fdev@example.com\x1fMerge branch 'revert'\n"
+).encode("utf-8")
+
+
+def git(repository: Path, *args: str) -> str:
+    completed = subprocess.run(
+        ["git", *args], cwd=repository, capture_output=True, check=True
+    )
+    return completed.stdout.decode("utf-8").strip()
+
+
+class HistoryRecordTests(unittest.TestCase):
+    def test_log_stream_becomes_columns_that_survive_a_checkpoint(self):
+        history = History()
+        self.assertEqual(history.read_log(io.BytesIO(LOG)), 4)
+        columns = history.columns
+        self.assertEqual(list(columns["added"]), [3, 1, 1, 0])
+        self.assertEqual(list(columns["files"]), [2, 1, 1, 0])
+        self.assertEqual(list(columns["first_parent"]), [NO_PARENT, 0, 0, 2])
+        self.assertEqual(list(columns["second_parent"]), [NO_PARENT, NO_PARENT, NO_PARENT, 1])
+        self.assertEqual(list(columns["flags"]), [0, 1, 2, 0])
+        self.assertEqual(history.authors, ["dev@example.com", "other@example.com"])
+        self.assertEqual(history.head, "d" * 40)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "history.bin"
+            history.save(path)
+            loaded = History.load(path)
+            path.write_bytes(path.read_bytes()[:-1])
+            self.assertIsNone(History.load(path))
+        self.assertEqual(loaded.columns, history.columns)
+        self.assertEqual((loaded.ids, loaded.authors), (history.ids, history.authors))
+        self.assertEqual(loaded.row("b" * 40), 1)
+
+        (week,) = weekly_metrics(loaded)
+        # Start, the hotfix and the merge landed on main; the merge waited on a
+        # branch authored two days before it.
+        self.assertEqual((week.changes, week.commits), (3, 3))
+        self.assertEqual(week.median_lead_seconds, 0)
+        self.assertEqual((week.added, week.deleted, week.churn), (5, 4, 9))
+        self.assertEqual((week.reverts, week.hotfixes, week.authors), (1, 1, 2))
+        self.assertEqual(week.week.weekday(), 0)
+
+
+class HistoryCollectionTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.repository = Path(self._tmp.name) / "repository"
+        self.commits = write_history(self.repository, 12, merge_every=4)
+        self.checkpoint = Path(self._tmp.name) / "cache" / "history.bin"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_checkpoint_limits_later_runs_to_new_commits(self):
+        head = git(self.repository, "rev-parse", "HEAD")
+        git(self.repository, "update-ref", "HEAD", "HEAD~3")
+        first = collect(self.repository, self.checkpoint)
+        self.assertEqual(first.mode, "full")
+
+        git(self.repository, "update-ref", "HEAD", head)
+        second = collect(self.repository, self.checkpoint)
+        self.assertEqual((second.mode, second.new_commits), ("incremental", 3))
+        self.assertEqual(len(second.history), self.commits)
+        third = collect(self.repository, self.checkpoint)
+        self.assertEqual((third.mode, third.new_commits), ("current", 0))
+
+        # A rewound branch no longer contains the checkpoint: start over.
+        git(self.repository, "update-ref", "HEAD", "HEAD~5")
+        rewound = collect(self.repository, self.checkpoint)
+        self.assertEqual(rewound.mode, "full")
+        self.assertEqual(len(rewound.history), rewound.new_commits)
+
+        weeks = weekly_metrics(collect(self.repository).history)
+        self.assertEqual(sum(week.changes for week in weeks), 12 - 5)
+
+    def test_merges_report_branch_lead_time_and_fill_the_scoreboard(self):
+        history = collect(self.repository).history
+        weeks = weekly_metrics(history)
+        self.assertEqual(sum(week.changes for week in weeks), 12)
+        # Changes 4 and 8 were merged a day after their branch commit was authored.
+        self.assertEqual(sum(week.commits for week in weeks), 12)
+        leads = lead_times(history, mainline(history))
+        self.assertEqual([lead for lead in leads if lead], [DAY, DAY])
+
+        scoreboard = render_scoreboard(Corpus(ROOT), weeks[-1])
+        self.assertIn(f"# Metrics Scoreboard — Week of {weeks[-1].week.isoformat()}", scoreboard)
+        self.assertIn(f"- Tasks completed: {weeks[-1].changes}\n", scoreboard)
+        self.assertIn("- Median lead time (intent → done): 0 min\n", scoreboard)
+        self.assertIn("- No-manual-edit rate (%):\n", scoreboard)
+
+        output = Path(self._tmp.name) / "out"
+        with redirect_stdout(io.StringIO()) as stdout:
+            code = main(
+                [
+                    "--root",
+                    str(ROOT),
+                    "history",
+                    "--repo",
+                    str(self.repository),
+                    "--no-checkpoint",
+                    "--weeks",
+                    "1",
+                    "--json",
+                    str(output / "weeks.json"),
+                    "--scoreboard",
+                    str(output / "scoreboard.md"),
+                ]
+            )
+        self.assertEqual(code, 0)
+        self.assertIn(f"{self.commits} commit(s), {self.commits} read from git", stdout.getvalue())
+        self.assertEqual(len(json.loads((output / "weeks.json").read_text(encoding="utf-8"))), 1)
+        self.assertEqual((output / "scoreboard.md").read_text(encoding="utf-8"), scoreboard)
+
+
+if __name__ == "__main__":
+    unittest.main()
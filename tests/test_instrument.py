@@ -0,0 +1,110 @@
+from contextlib import redirect_stdout
+import io
+import json
+from pathlib import Path
+import tempfile
+import unittest
+
+from scaffold_validation.checks import SCAFFOLD_CHECKS, TREE_CHECKS
+from scaffold_validation.cli import main
+from scaffold_validation.instrument import instrumented_run, summarize
+from scaffold_validation.manifest import STRUCTURE_CHECK
+from scaffold_validation.parallel import format_report, validate_tree
+from scaffold_validation.report import budget_violations, sarif_report
+from scaffold_validation.synthetic import generate_tree, inject_faults
+
+
+class InstrumentationTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.names = generate_tree(self.root, scaffolds=3, paragraphs=2)
+        inject_faults(self.root, self.names, {"broken-link": 2, "missing-h1": 1}, seed=5)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_every_check_is_measured_once_per_subject(self):
+        measurements = instrumented_run(self.root)
+        markdown = len(self.names) * 10 + 1
+
+        counts = {}
+        for measurement in measurements:
+            counts[measurement.check] = counts.get(measurement.check, 0) + 1
+        expected = {check: markdown for check in TREE_CHECKS}
+        expected.update({check: len(self.names) for check in SCAFFOLD_CHECKS})
+        self.assertEqual(counts, expected)
+
+        summary = summarize(measurements, top=4)
+        self.assertEqual(summary["totals"]["files"], markdown + len(self.names) * 5)
+        self.assertEqual(summary["checks"]["h1"]["files"], markdown)
+        self.assertGreater(summary["checks"]["links"]["stat_calls"], 0)
+        self.assertEqual(sorted(summary["scaffolds"]), self.names)
+        self.assertEqual(len(summary["slowest_files"]), 4)
+        self.assertEqual(
+            [f"[{f['check']}] {f['message']}" for f in summary["failures"]],
+            format_report(validate_tree(self.root, jobs=1)),
+        )
+
+    def test_manifest_scaffolds_are_measured_and_reported(self):
+        contracts = ", ".join(f'"{check}"' for check in SCAFFOLD_CHECKS)
+        declared = [f'[defaults]\nguides = ["00-philosophy.md"]\ncontracts = [{contracts}]']
+        declared += [f"[scaffolds.{name}]" for name in [*self.names, "ghost"]]
+        (self.root / "scaffolds.toml").write_text("\n".join(declared) + "\n", encoding="utf-8")
+        (self.root / self.names[0] / "00-philosophy.md").unlink()
+
+        measurements = instrumented_run(self.root)
+        structure = {m.subject: m.failures for m in measurements if m.check == STRUCTURE_CHECK}
+        self.assertEqual(sorted(structure), sorted([*self.names, "ghost"]))
+        self.assertEqual(structure["ghost"], ["missing scaffold directory: ghost"])
+        self.assertEqual(len(structure[self.names[0]]), 1)
+        measured = {m.subject for m in measurements if m.check in SCAFFOLD_CHECKS}
+        self.assertEqual(measured, set(self.names[1:]))
+
+        summary = summarize(measurements)
+        self.assertEqual(
+            [f"[{f['check']}] {f['message']}" for f in summary["failures"]],
+            format_report(validate_tree(self.root, jobs=1)),
+        )
+        results = sarif_report(summary, [])["runs"][0]["results"]
+        self.assertIn(
+            "ghost/",
+            [r["locations"][0]["physicalLocation"]["artifactLocation"]["uri"] for r in results],
+        )
+
+    def test_budgets_and_sarif_results(self):
+        summary = summarize(instrumented_run(self.root))
+        self.assertEqual(budget_violations(summary, {"*": 60.0}), [])
+        violations = budget_violations(summary, {"*": 60.0, "h1": 0.0})
+        self.assertEqual(len(violations), 1)
+        self.assertTrue(violations[0].startswith("h1 took "))
+
+        sarif = sarif_report(summary, violations)
+        results = sarif["runs"][0]["results"]
+        self.assertEqual(sarif["version"], "2.1.0")
+        self.assertEqual(len(results), len(summary["failures"]) + 1)
+        self.assertEqual(
+            {r["ruleId"] for r in results}, {"links", "h1", "numbered-h1", "time-budget"}
+        )
+        rule_ids = {rule["id"] for rule in sarif["runs"][0]["tool"]["driver"]["rules"]}
+        self.assertTrue({r["ruleId"] for r in results} <= rule_ids)
+
+    def test_profile_command_writes_reports_and_fails_over_budget(self):
+        json_path = self.root / "out" / "report.json"
+        sarif_path = self.root / "out" / "report.sarif"
+        argv = ["--root", str(self.root), "profile", "--json", str(json_path)]
+        argv += ["--sarif", str(sarif_path)]
+        with redirect_stdout(io.StringIO()) as output:
+            status = main([*argv, "--budget", "links=0"])
+        self.assertEqual(status, 1)
+        self.assertIn("budget exceeded: links took", output.getvalue())
+
+        report = json.loads(json_path.read_text(encoding="utf-8"))
+        self.assertEqual(report["budget"]["limits"], {"links": 0.0})
+        self.assertEqual(len(report["budget"]["violations"]), 1)
+        self.assertIn("slowest_files", report)
+        self.assertIn("runs", json.loads(sarif_path.read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    unittest.main()
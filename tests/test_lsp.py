@@ -0,0 +1,150 @@
+import io
+from pathlib import Path
+import tempfile
+import unittest
+
+from scaffold_validation.lsp import (
+    LanguageServer,
+    Workspace,
+    apply_change,
+    read_message,
+    write_message,
+)
+from scaffold_validation.synthetic import generate_tree
+
+
+GUIDE = "scaffold-0000/03-planning-guide.md"
+TARGET = "scaffold-0000/04-phased-guide.md"
+
+
+def edit(line: int, start: int, end: int, text: str) -> dict:
+    return {
+        "range": {
+            "start": {"line": line, "character": start},
+            "end": {"line": line, "character": end},
+        },
+        "text": text,
+    }
+
+
+class WorkspaceTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        generate_tree(self.root, scaffolds=1, paragraphs=1)
+        self.workspace = Workspace(self.root)
+        self.workspace.start()
+        self.guide = (self.root / GUIDE).read_text(encoding="utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_incremental_edits_update_diagnostics_in_place(self):
+        lines = self.guide.splitlines()
+        broken = self.guide + "\nSee [gone](gone.md).\n\n```\nunclosed\n"
+
+        results = self.workspace.edit(GUIDE, broken)
+
+        diagnostics = {diagnostic.check: diagnostic for diagnostic in results[GUIDE]}
+        self.assertEqual(sorted(diagnostics), ["fences", "links"])
+        self.assertEqual(diagnostics["links"].line, len(lines) + 1)
+        self.assertEqual((diagnostics["links"].start, diagnostics["links"].end), (11, 18))
+        self.assertEqual(diagnostics["fences"].line, len(lines) + 3)
+
+        fixed = apply_change(broken, edit(len(lines) + 1, 11, 18, TARGET.split("/")[1]))
+        fixed = apply_change(fixed, edit(len(lines) + 4, 8, 8, "\n```"))
+        results = self.workspace.edit(GUIDE, fixed)
+
+        self.assertEqual(results[GUIDE], [])
+        self.assertLess(self.workspace.seconds, 0.05)
+        # Nothing was written: closing the buffer goes back to the file on disk.
+        self.assertEqual(self.workspace.edit(GUIDE, None)[GUIDE], [])
+
+    def test_renaming_a_heading_flags_anchors_in_linking_files(self):
+        self.workspace.edit(GUIDE, self.guide + "\n[First](04-phased-guide.md#section-1)\n")
+        target = (self.root / TARGET).read_text(encoding="utf-8")
+
+        results = self.workspace.edit(TARGET, target.replace("## Section 1", "## Renamed"))
+
+        self.assertEqual([diagnostic.check for diagnostic in results[GUIDE]], ["anchors"])
+        self.assertEqual(results[TARGET], [])
+
+    def test_definition_and_placeholder_completion(self):
+        self.workspace.edit(GUIDE, self.guide + "\n[First](04-phased-guide.md#section-1)\n")
+        lines = self.workspace.document(GUIDE).lines
+        link_line = lines.index("See [04-phased-guide.md](04-phased-guide.md).")
+
+        location = self.workspace.definition(GUIDE, link_line, 30)
+        anchored = self.workspace.definition(GUIDE, len(lines) - 1, 3)
+
+        self.assertEqual(location["uri"], (self.root / TARGET).as_uri())
+        self.assertEqual(location["range"]["start"]["line"], 0)
+        self.assertEqual(anchored["range"]["start"]["line"], 2)
+        self.assertIsNone(self.workspace.definition(GUIDE, 0, 2))
+
+        template = "scaffold-0000/templates/plan.md.template"
+        self.workspace.edit(template, "# Plan\n\nOwner: {PRO\n")
+        items = self.workspace.completion(template, 2, 11)
+
+        labels = [item["label"] for item in items]
+        self.assertIn("PROJECT_NAME", labels)
+        edit_text = items[labels.index("PROJECT_NAME")]["textEdit"]
+        self.assertEqual(edit_text["newText"], "PROJECT_NAME}")
+        self.assertEqual(edit_text["range"]["start"]["character"], 8)
+        self.assertEqual(self.workspace.completion(template, 0, 3), [])
+
+
+class ProtocolTests(unittest.TestCase):
+    def test_stdio_session_publishes_diagnostics_and_exits_cleanly(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            generate_tree(root, scaffolds=1, paragraphs=1)
+            uri = (root / GUIDE).as_uri()
+            requests = io.BytesIO()
+            for message in (
+                {"id": 1, "method": "initialize", "params": {"rootUri": root.as_uri()}},
+                {"method": "initialized", "params": {}},
+                {
+                    "method": "textDocument/didOpen",
+                    "params": {"textDocument": {"uri": uri, "version": 1, "text": "no heading\n"}},
+                },
+                {
+                    "method": "textDocument/didChange",
+                    "params": {
+                        "textDocument": {"uri": uri, "version": 2},
+                        "contentChanges": [edit(0, 0, 0, "# 03 — ")],
+                    },
+                },
+                {"id": 2, "method": "textDocument/hover", "params": {}},
+                {"id": 3, "method": "shutdown"},
+                {"method": "exit"},
+            ):
+                write_message(requests, {"jsonrpc": "2.0", **message})
+            requests.seek(0)
+            responses = io.BytesIO()
+
+            code = LanguageServer(root).serve(requests, responses)
+
+            responses.seek(0)
+            messages = []
+            while (message := read_message(responses)) is not None:
+                messages.append(message)
+        self.assertEqual(code, 0)
+        self.assertEqual(messages[0]["result"]["capabilities"]["textDocumentSync"]["change"], 2)
+        published = [
+            message["params"]
+            for message in messages
+            if message.get("method") == "textDocument/publishDiagnostics"
+        ]
+        self.assertEqual(published[0]["uri"], uri)
+        self.assertEqual(
+            sorted(diagnostic["code"] for diagnostic in published[0]["diagnostics"]),
+            ["h1", "numbered-h1"],
+        )
+        self.assertEqual(published[-1]["diagnostics"], [])
+        self.assertEqual(messages[-2]["error"]["code"], -32601)
+        self.assertEqual(messages[-1], {"jsonrpc": "2.0", "id": 3, "result": None})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+from pathlib import Path
+import re
+import tempfile
+import unittest
+
+from helpers import write
+from scaffold_validation.corpus import Corpus, load_corpus
+from scaffold_validation.manifest import Manifest, load_manifest, run_checklist
+from scaffold_validation.parallel import validate_tree
+from scaffold_validation.synthetic import generate_tree
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+IN_HOUSE = """
+[defaults]
+guides = ["README.md", "00-*.md"]
+templates = ["AGENTS.md.template"]
+contracts = ["agents-contract"]
+
+[scaffolds.{first}]
+
+[scaffolds.audit]
+guides = ["README.md", "00-*.md", "01-findings.md"]
+prompts = true
+
+[scaffolds.retired]
+"""
+
+
+class ScaffoldManifestTests(unittest.TestCase):
+    def test_repository_manifest_declares_every_scaffold_and_passes(self):
+        manifest = load_manifest(ROOT)
+        corpus = load_corpus(ROOT)
+
+        self.assertEqual(sorted(manifest.names), sorted(corpus.scaffold_names()))
+        self.assertNotIn("greenfield", manifest.names_with("prompt-structure"))
+        self.assertEqual(len(manifest.names_with("prompt-structure")), len(manifest.names) - 1)
+        results = run_checklist(corpus, manifest.checklist)
+        self.assertEqual([failure for _, _, failures in results for failure in failures], [])
+        self.assertEqual(
+            {check for check, _, _ in results},
+            {"structure", *manifest.specs["spike"].all_contracts},
+        )
+
+    def test_in_house_scaffold_needs_only_a_manifest_entry(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            first = generate_tree(root, scaffolds=1, paragraphs=1)[0]
+            write(root / "scaffolds.toml", IN_HOUSE.format(first=first))
+            write(root / "audit" / "README.md", "# Audit\n")
+            write(root / "audit" / "00-scope.md", "# 00 Scope\n")
+            write(root / "audit" / "templates" / "AGENTS.md.template", "# AGENTS.md\n")
+            manifest = Manifest.parse((root / "scaffolds.toml").read_text(encoding="utf-8"))
+
+            results = {
+                (check, scaffold): failures
+                for check, scaffold, failures in run_checklist(Corpus(root), manifest.checklist)
+            }
+
+            self.assertEqual(results[("structure", first)], [])
+            self.assertEqual(results[("agents-contract", first)], [])
+            self.assertEqual(
+                results[("structure", "audit")],
+                ["audit: missing 01-findings.md", "audit: missing 07-agent-prompts.md"],
+            )
+            # Contracts read the files structure guarantees, so they wait for them.
+            self.assertEqual(results[("agents-contract", "audit")], [])
+            self.assertEqual(results[("prompt-structure", "audit")], [])
+            self.assertEqual(
+                results[("structure", "retired")], ["missing scaffold directory: retired"]
+            )
+
+            report = validate_tree(root, jobs=1)
+            self.assertEqual(
+                report["structure"],
+                [
+                    "audit: missing 01-findings.md",
+                    "audit: missing 07-agent-prompts.md",
+                    "missing scaffold directory: retired",
+                ],
+            )
+
+    def test_manifest_errors_name_the_offending_entry(self):
+        cases = {
+            "[scaffolds.x]\nguide = []\n": "unknown key(s) for x: guide",
+            "[scaffolds.x]\ncontracts = ['readme-index', 'vibes']\n": "contract(s) for x: vibes",
+            "[defaults]\ntemplates = 'AGENTS.md'\n[scaffolds.x]\n": "templates must be a list",
+            "[defaults\n": "scaffolds.toml: ",
+        }
+        for text, message in cases.items():
+            with self.assertRaisesRegex(ValueError, re.escape(message)):
+                Manifest.parse(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+from contextlib import redirect_stdout
+import io
+from pathlib import Path
+import random
+import tempfile
+import unittest
+
+from scaffold_validation.benchmarks import parallel_speedup
+from scaffold_validation.cli import main
+from scaffold_validation.parallel import format_report, merge, validate_tree
+from scaffold_validation.synthetic import generate_tree
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+class ParallelValidationTests(unittest.TestCase):
+    def test_pool_report_matches_serial_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            names = generate_tree(root, scaffolds=6, paragraphs=2)
+            (root / names[4] / "02-assessment-checklist.md").write_text(
+                "no heading, [missing](nowhere.md)\n", encoding="utf-8"
+            )
+            (root / names[1] / "templates" / "log.md.template").write_text(
+                "plain\n", encoding="utf-8"
+            )
+
+            serial = validate_tree(root, jobs=1, chunk_size=5)
+            pooled = validate_tree(root, jobs=3, chunk_size=5)
+
+            self.assertEqual(serial, pooled)
+            self.assertEqual(
+                format_report(serial),
+                [
+                    f"[h1] {names[4]}/02-assessment-checklist.md first line is not an H1: no heading, [missing](nowhere.md)",
+                    f"[numbered-h1] {names[4]}/02-assessment-checklist.md should start with '# 02'",
+                    f"[links] {names[4]}/02-assessment-checklist.md -> nowhere.md (resolved to {(root / names[4] / 'nowhere.md').resolve()})",
+                    f"[template-actionability] {names[1]}/templates/log.md.template should start with an H1",
+                ],
+            )
+
+    def test_merge_is_independent_of_completion_order(self):
+        results = [
+            [("readme-index", "b", ["b-1"]), ("agents-contract", "b", [])],
+            [("readme-index", "a", ["a-1", "a-2"])],
+            [("h1", "z.md", ["z"]), ("h1", "c.md", ["c"])],
+        ]
+        expected = merge(results)
+        for _ in range(5):
+            random.shuffle(results)
+            self.assertEqual(merge(results), expected)
+        self.assertEqual(expected["readme-index"], ["a-1", "a-2", "b-1"])
+        self.assertEqual(expected["h1"], ["c", "z"])
+
+    def test_run_command_matches_serial_output_on_repository(self):
+        outputs = []
+        for jobs in ("1", "2"):
+            with redirect_stdout(io.StringIO()) as output:
+                main(["--root", str(ROOT), "run", "--jobs", jobs])
+            outputs.append(output.getvalue().splitlines()[:-1])
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_benchmark_reports_rows_per_worker_count(self):
+        rows = parallel_speedup(scaffolds=2, jobs=[1, 2], paragraphs=1)
+        self.assertEqual([row["jobs"] for row in rows], [1, 2])
+        self.assertEqual(rows[0]["speedup"], 1.0)
+        with redirect_stdout(io.StringIO()) as output:
+            main(["bench-parallel", "--scaffolds", "1", "--jobs", "1"])
+        self.assertIn("speedup", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+from contextlib import redirect_stdout
+import io
+import json
+from pathlib import Path
+import tempfile
+import unittest
+
+from helpers import write
+from scaffold_validation.cli import main
+from scaffold_validation.corpus import Corpus, Document
+from scaffold_validation.prompts import (
+    PromptLibrary,
+    compile_library,
+    extract_prompts,
+    load_library,
+)
+
+
+ROOT = Path(__file__).resolve().parents[1]
+OLD_MTIME_NS = 1_000_000_000_000_000_000
+
+PLAYBOOK = """# 07 — Agent Prompts
+
+## Purpose
+
+Use these prompts.
+
+## Triage Prompt
+
+```
+Triage {service} for {incident-id}.
+Page {owner} if {service} is down.
+```
+
+## Notes Prompt
+
+No fenced body here.
+
+## Assessment Prompts
+
+### Prompt: Complexity analysis
+
+Intro.
+
+```
+Scan {source_root}.
+```
+"""
+
+
+class PromptLibraryTests(unittest.TestCase):
+    def test_extracts_titles_bodies_and_parameters(self):
+        document = Document(Path("07-agent-prompts.md"), "demo/07-agent-prompts.md", PLAYBOOK)
+
+        prompts = extract_prompts(document, "demo")
+
+        self.assertEqual([prompt.name for prompt in prompts], ["triage", "complexity-analysis"])
+        triage = prompts[0]
+        self.assertEqual(triage.parameters, ["service", "incident-id", "owner"])
+        self.assertEqual(
+            triage.text, "Triage {service} for {incident-id}.\nPage {owner} if {service} is down.\n"
+        )
+        self.assertEqual([slot.line for slot in triage.template.slots], [10, 10, 11, 11])
+        values = {"service": "api", "incident-id": "INC-7", "owner": "sam"}
+        self.assertEqual(triage.fill(values), "Triage api for INC-7.\nPage sam if api is down.\n")
+        with self.assertRaisesRegex(ValueError, "missing parameters: owner"):
+            triage.fill({"service": "api", "incident-id": "INC-7"})
+        self.assertIn("{owner}", triage.fill({}, partial=True))
+
+    def test_duplicate_titles_never_take_an_existing_name(self):
+        text = "# 07\n\n## Review Prompt\n\n```\na\n```\n\n## Review Prompt\n\n```\nb\n```\n"
+        text += "\n### Prompt: Review 1\n\n```\nc\n```\n"
+        document = Document(Path("07-agent-prompts.md"), "demo/07-agent-prompts.md", text)
+
+        names = [prompt.name for prompt in extract_prompts(document, "demo")]
+
+        self.assertEqual(names, ["review", "review-1", "review-1-1"])
+
+    def test_current_library_hashes_only_playbooks_whose_signature_moved(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            write(root / "demo" / "README.md", "# Demo\n")
+            write(root / "demo" / "templates" / "plan.md.template", "# Plan\n")
+            playbook = root / "demo" / "07-agent-prompts.md"
+            write(playbook, PLAYBOOK, mtime_ns=OLD_MTIME_NS)
+            path = root / "library.jsonl"
+            compile_library(Corpus(root), path)
+
+            corpus = Corpus(root)
+            self.assertTrue(load_library(corpus, path).is_current(corpus))
+            self.assertEqual(corpus.files_read, 0)
+
+            # Touched but identical: hashed once, still current.
+            write(playbook, PLAYBOOK)
+            self.assertTrue(PromptLibrary(path).is_current(corpus))
+            self.assertEqual(corpus.files_read, 1)
+
+    def test_library_loads_records_lazily_and_recompiles_when_stale(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            write(root / "demo" / "README.md", "# Demo\n")
+            write(root / "demo" / "templates" / "plan.md.template", "# Plan\n")
+            write(root / "demo" / "07-agent-prompts.md", PLAYBOOK)
+            path = root / "library.jsonl"
+            index = compile_library(Corpus(root), path)
+
+            library = PromptLibrary(path)
+            self.assertEqual(library.names("demo"), ["triage", "complexity-analysis"])
+            self.assertEqual(library.records_loaded, 0)
+            prompt = library.get("demo", "Prompt: Complexity analysis")
+            self.assertIs(library.get("demo", "complexity-analysis"), prompt)
+            self.assertEqual(library.records_loaded, 1)
+            rows = [{"source_root": f"src/{number}"} for number in range(500)]
+            self.assertEqual(prompt.fill_batch(rows)[499], "Scan src/499.\n")
+            with self.assertRaises(KeyError):
+                library.get("demo", "nope")
+
+            write(root / "demo" / "07-agent-prompts.md", PLAYBOOK.replace("Scan", "Audit"))
+            self.assertFalse(library.is_current(Corpus(root)))
+            reloaded = load_library(Corpus(root), path)
+            self.assertNotEqual(reloaded.version, index["version"])
+            updated = reloaded.get("demo", "complexity-analysis")
+            self.assertEqual(updated.text, "Audit {source_root}.\n")
+
+    def test_every_repository_playbook_compiles(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            index = compile_library(Corpus(ROOT), Path(tmp) / "library.jsonl")
+            library = PromptLibrary(Path(tmp) / "library.jsonl")
+            for scaffold, entries in index["prompts"].items():
+                self.assertGreaterEqual(len(entries), 5, scaffold)
+                for name in entries:
+                    self.assertTrue(library.get(scaffold, name).text.strip(), f"{scaffold}/{name}")
+
+            rows = Path(tmp) / "rows.json"
+            batch = [{"source_root": "app"}, {"source_root": "lib"}]
+            rows.write_text(json.dumps(batch), encoding="utf-8")
+            argv = ["--root", str(ROOT), "prompt", "refactoring", "complexity-analysis"]
+            argv += ["--library", str(Path(tmp) / "library.jsonl")]
+            with redirect_stdout(io.StringIO()) as output:
+                self.assertEqual(main([*argv, "--batch", str(rows)]), 0)
+            filled = json.loads(output.getvalue())
+            self.assertIn("For every source file under lib:", filled[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
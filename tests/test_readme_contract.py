@@ -1,48 +1,21 @@
 from pathlib import Path
 import unittest
 
+from scaffold_validation.checks import readme_operator_failures
+from scaffold_validation.corpus import load_corpus
+from scaffold_validation.manifest import load_manifest
+
 
 ROOT = Path(__file__).resolve().parents[1]
-SCAFFOLDS = [
-    "greenfield",
-    "repo-documentation",
-    "refactoring",
-    "feature-addition",
-    "bug-investigation",
-    "testing-retrofit",
-    "migration",
-    "incident-response",
-    "spike",
-]
+MANIFEST = load_manifest(ROOT)
 
 
 class ReadmeContractTests(unittest.TestCase):
     def test_each_scaffold_readme_has_operator_sections(self):
         failures: list[str] = []
-        for scaffold in SCAFFOLDS:
-            readme = ROOT / scaffold / "README.md"
-            content = readme.read_text(encoding="utf-8").lower()
-
-            if not (
-                "## when to use this scaffold" in content
-                or "## who is this for?" in content
-            ):
-                failures.append(
-                    f"{scaffold}/README.md missing audience section (when-to-use or who-is-this-for)"
-                )
-
-            if "## how to use this scaffold" not in content:
-                failures.append(
-                    f"{scaffold}/README.md missing section: ## how to use this scaffold"
-                )
-
-            if "document index" not in content:
-                failures.append(f"{scaffold}/README.md missing document index section")
-
-            if "(templates/)" not in content and "## templates" not in content:
-                failures.append(
-                    f"{scaffold}/README.md missing templates guidance (templates section or templates/ link)"
-                )
+        corpus = load_corpus(ROOT)
+        for scaffold in MANIFEST.names:
+            failures.extend(readme_operator_failures(corpus, scaffold))
 
         if failures:
             self.fail("\n".join(failures))
@@ -0,0 +1,103 @@
+from contextlib import redirect_stdout
+import io
+import json
+from pathlib import Path
+import tempfile
+import unittest
+
+from helpers import write
+from scaffold_validation.cli import main
+from scaffold_validation.corpus import Corpus, Document
+from scaffold_validation.render import TemplateEngine, compile_template
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+TEMPLATE = """# Plan — {PROJECT_NAME}
+
+Last updated: {date}
+Owner: {Project Name} / {PROJECT_NAME}
+
+```json
+{"status": "ok"}
+```
+"""
+
+
+class TemplateRenderingTests(unittest.TestCase):
+    def test_compiled_template_renders_and_reports_unfilled_slots(self):
+        document = Document(Path("plan.md.template"), "t/plan.md.template", TEMPLATE)
+        template = compile_template(document)
+        self.assertEqual(
+            template.names, {"PROJECT_NAME", "date", "Project Name", '"status": "ok"'}
+        )
+
+        text, unfilled = template.render({"PROJECT_NAME": "Acme", "date": "2026-01-02"})
+
+        self.assertTrue(text.startswith("# Plan — Acme\n\nLast updated: 2026-01-02\n"))
+        self.assertIn("Owner: {Project Name} / Acme", text)
+        self.assertIn('{"status": "ok"}', text)
+        self.assertEqual(
+            [(slot.name, slot.line, slot.in_code) for slot in unfilled],
+            [("Project Name", 4, False), ('"status": "ok"', 7, True)],
+        )
+        self.assertEqual(template.render({})[0], TEMPLATE)
+
+    def test_batch_renders_many_projects_from_one_compilation(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            write(root / "demo" / "README.md", "# Demo\n")
+            write(root / "demo" / "templates" / "plan.md.template", TEMPLATE)
+            write(root / "demo" / "templates" / "run.ps1.template", "if ($x) { exit }\n")
+            engine = TemplateEngine(Corpus(root))
+            projects = [
+                {"output": f"out/p{index}", "variables": {"PROJECT_NAME": f"P{index}"}}
+                for index in range(200)
+            ]
+
+            results = engine.render_batch("demo", projects, root, defaults={"date": "today"})
+
+            self.assertEqual(engine.compilations, 2)
+            self.assertEqual(results[7].files, ["plan.md", "run.ps1"])
+            rendered = (root / "out" / "p7" / "plan.md").read_text(encoding="utf-8")
+            self.assertIn("# Plan — P7", rendered)
+            self.assertIn("Last updated: today", rendered)
+            self.assertEqual(results[7].unfilled_names(), ["Project Name"])
+            self.assertEqual(
+                results[7].unfilled_names(include_code=True),
+                [" exit ", '"status": "ok"', "Project Name"],
+            )
+
+    def test_render_command_on_repository_scaffold(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp)
+            write(out / "projects.json", json.dumps([{"output": "a"}, {"output": "b"}]))
+            write(out / "vars.json", json.dumps({"PROJECT_NAME": "Acme", "date": "2026-10-18"}))
+
+            with redirect_stdout(io.StringIO()) as output:
+                status = main(
+                    [
+                        "--root",
+                        str(ROOT),
+                        "render",
+                        "greenfield",
+                        "--projects",
+                        str(out / "projects.json"),
+                        "--vars",
+                        str(out / "vars.json"),
+                        "--strict",
+                    ]
+                )
+            self.assertEqual(status, 1)
+            self.assertIn("rendered 2 project(s)", output.getvalue())
+            agents = (out / "b" / "AGENTS.md").read_text(encoding="utf-8")
+            self.assertNotIn("{PROJECT_NAME}", agents)
+
+            with redirect_stdout(io.StringIO()) as output:
+                self.assertEqual(
+                    main(["--root", str(ROOT), "render", "nope", "--output", str(out / "x")]), 2
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
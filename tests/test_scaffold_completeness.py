@@ -1,71 +1,35 @@
 from pathlib import Path
-import re
 import unittest
 
+from scaffold_validation.cache import load_cache, readme_index_failures
+from scaffold_validation.checks import numbered_guides, process_overview_failures
+from scaffold_validation.corpus import load_corpus
+from scaffold_validation.manifest import load_manifest
 
-ROOT = Path(__file__).resolve().parents[1]
-SCAFFOLDS = [
-    "greenfield",
-    "repo-documentation",
-    "refactoring",
-    "feature-addition",
-    "bug-investigation",
-    "testing-retrofit",
-    "migration",
-    "incident-response",
-    "spike",
-]
 
-NUMBERED_FILE_PATTERN = re.compile(r"^\d{2}-.*\.md$")
+ROOT = Path(__file__).resolve().parents[1]
+MANIFEST = load_manifest(ROOT)
 
 
 class ScaffoldCompletenessTests(unittest.TestCase):
     def test_readme_index_covers_all_numbered_guides(self):
         failures: list[str] = []
 
-        for scaffold in SCAFFOLDS:
-            scaffold_dir = ROOT / scaffold
-            readme = scaffold_dir / "README.md"
-            content = readme.read_text(encoding="utf-8")
-
-            numbered_guides = sorted(
-                path.name
-                for path in scaffold_dir.glob("*.md")
-                if NUMBERED_FILE_PATTERN.match(path.name)
-            )
-
-            for guide in numbered_guides:
-                expected_link = f"[{guide}]({guide})"
-                if expected_link not in content:
-                    failures.append(
-                        f"{scaffold}/README.md missing document index link for {guide}"
-                    )
+        cache = load_cache(ROOT)
 
-            has_templates_index = "[templates/](templates/)" in content
-            has_templates_section = "## templates" in content.lower() and "(templates/" in content
-
-            if not (has_templates_index or has_templates_section):
-                failures.append(f"{scaffold}/README.md missing templates/ index link")
+        for scaffold in MANIFEST.names:
+            guides = numbered_guides(cache.corpus, scaffold)
+            failures.extend(readme_index_failures(cache, scaffold, guides))
 
         if failures:
             self.fail("\n".join(failures))
 
     def test_process_overview_has_sufficient_phase_depth(self):
         failures: list[str] = []
+        corpus = load_corpus(ROOT)
 
-        for scaffold in SCAFFOLDS:
-            process_overview = ROOT / scaffold / "01-process-overview.md"
-            content = process_overview.read_text(encoding="utf-8")
-            lowered = content.lower()
-
-            phase_mentions = lowered.count("phase")
-            lifecycle_mentions = lowered.count("lifecycle")
-            numbered_sections = len(re.findall(r"^###\s+\d+\.", content, re.MULTILINE))
-
-            if phase_mentions < 3 and lifecycle_mentions < 1 and numbered_sections < 4:
-                failures.append(
-                    f"{scaffold}/01-process-overview.md appears shallow (phase={phase_mentions}, lifecycle={lifecycle_mentions}, numbered={numbered_sections})"
-                )
+        for scaffold in MANIFEST.names:
+            failures.extend(process_overview_failures(corpus, scaffold))
 
         if failures:
             self.fail("\n".join(failures))
@@ -0,0 +1,128 @@
+from contextlib import redirect_stdout
+import io
+from pathlib import Path
+import tempfile
+import unittest
+
+from helpers import write
+from scaffold_validation.cli import main
+from scaffold_validation.corpus import Corpus, Document
+from scaffold_validation.search import (
+    HEADING_WEIGHT,
+    SearchIndex,
+    document_sections,
+    update_index,
+)
+
+
+PROMPTS = """# 07 — Agent Prompts
+
+Intro text about prompts.
+
+### Prompt: Rollback rehearsal
+
+```text
+Rehearse the rollback on staging.
+```
+
+## Notes
+
+Nothing about rehearsals here.
+"""
+
+
+def locations(index: SearchIndex, query: str, **options) -> list[str]:
+    return [hit.location for hit in index.search(query, **options)]
+
+
+class SectionTests(unittest.TestCase):
+    def test_sections_follow_headings_and_tag_prompts(self):
+        document = Document(Path("demo/07-agent-prompts.md"), "demo/07-agent-prompts.md", PROMPTS)
+
+        sections = document_sections(document)
+
+        self.assertEqual(
+            [(s.anchor, s.line, s.kind) for s in sections],
+            [
+                ("07--agent-prompts", 1, "section"),
+                ("prompt-rollback-rehearsal", 5, "prompt"),
+                ("notes", 11, "section"),
+            ],
+        )
+        self.assertEqual(sections[1].terms["rollback"], HEADING_WEIGHT + 1)
+        self.assertEqual(sections[1].terms["staging"], 1)
+        self.assertNotIn("the", sections[1].terms)
+
+
+class SearchIndexTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.path = self.root / "index" / "search.idx"
+        write(self.root / "demo" / "07-agent-prompts.md", PROMPTS)
+        write(
+            self.root / "demo" / "05-rollback.md",
+            "# 05 Rollback\n\n## Rollback plan\n\nKeep a rollback plan for every release.\n",
+        )
+        for number in range(8):
+            write(self.root / "other" / f"guide-{number}.md", f"# Guide {number}\n\nRelease notes.\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_bm25_ranks_heading_sections_and_filters_prompts(self):
+        update = update_index(Corpus(self.root), self.path)
+        self.assertEqual((update.mode, update.documents, update.reindexed), ("built", 10, 10))
+
+        with SearchIndex(self.path) as index:
+            self.assertEqual(
+                locations(index, "rollback plan", top=2),
+                ["demo/05-rollback.md#rollback-plan", "demo/05-rollback.md#05-rollback"],
+            )
+            self.assertEqual(
+                locations(index, "rollback", prompts_only=True),
+                ["demo/07-agent-prompts.md#prompt-rollback-rehearsal"],
+            )
+            self.assertEqual(index.search("quokka"), [])
+
+    def test_updates_reindex_only_changed_files_and_compact(self):
+        update_index(Corpus(self.root), self.path)
+        self.assertEqual(update_index(Corpus(self.root), self.path).mode, "unchanged")
+
+        write(self.root / "other" / "guide-3.md", "# Guide 3\n\n## Quokka care\n\nFeed the quokka.\n")
+        (self.root / "other" / "guide-4.md").unlink()
+        update = update_index(Corpus(self.root), self.path)
+        self.assertEqual((update.mode, update.reindexed, update.documents), ("appended", 1, 9))
+        with SearchIndex(self.path) as index:
+            self.assertEqual(locations(index, "quokka"), ["other/guide-3.md#quokka-care"])
+            self.assertNotIn("other/guide-4.md#guide-4", locations(index, "guide"))
+            self.assertEqual(index.live_sections, 13)
+
+        for number in (0, 1, 2, 5, 6):
+            write(self.root / "other" / f"guide-{number}.md", f"# Guide {number}\n\nQuokka notes.\n")
+        self.assertEqual(update_index(Corpus(self.root), self.path).mode, "compacted")
+
+        rebuilt = self.root / "rebuilt.idx"
+        update_index(Corpus(self.root), rebuilt)
+        with SearchIndex(self.path) as index, SearchIndex(rebuilt) as fresh:
+            self.assertEqual(index.section_count, index.live_sections)
+            for query in ("quokka", "rollback plan", "guide notes"):
+                self.assertEqual(
+                    sorted((hit.location, round(hit.score, 9)) for hit in index.search(query, 50)),
+                    sorted((hit.location, round(hit.score, 9)) for hit in fresh.search(query, 50)),
+                )
+
+    def test_search_command_builds_then_queries_the_index(self):
+        argv = ["--root", str(self.root), "search", "--index", str(self.path)]
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(main([*argv, "rollback", "--prompts"]), 0)
+        self.assertIn("demo/07-agent-prompts.md#prompt-rollback-rehearsal:5", output.getvalue())
+        self.assertIn("index built: 10 of 10 file(s) re-indexed", output.getvalue())
+
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(main([*argv, "--no-refresh", "quokka"]), 1)
+        self.assertNotIn("index", output.getvalue().splitlines()[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
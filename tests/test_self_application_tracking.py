@@ -1,6 +1,8 @@
 from pathlib import Path
 import unittest
 
+from scaffold_validation.corpus import load_corpus
+
 
 ROOT = Path(__file__).resolve().parents[1]
 
@@ -17,7 +19,8 @@ class SelfApplicationTrackingTests(unittest.TestCase):
             "meta/self-application/testing-retrofit/coverage-report.md",
         ]
 
-        missing = [path for path in required_files if not (ROOT / path).is_file()]
+        corpus = load_corpus(ROOT)
+        missing = [path for path in required_files if not corpus.is_file(ROOT / path)]
         if missing:
             joined = "\n".join(f"- {path}" for path in missing)
             self.fail(f"Missing self-application tracking artifacts:\n{joined}")
@@ -0,0 +1,114 @@
+from contextlib import redirect_stderr, redirect_stdout
+import io
+import json
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+
+from scaffold_validation.cli import main
+from scaffold_validation.shards import CostHistory, merge_shard_results, plan_shards, run_shard
+
+
+FIXTURE = """import unittest
+
+
+class {name}Tests(unittest.TestCase):
+    def test_one(self):
+        pass
+
+    def test_two(self):
+        self.assertEqual({value}, 1)
+"""
+
+
+class TestShardingTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.start = Path(self._tmp.name)
+        # Fixture modules are named after the test so repeated discovery never clashes.
+        self.prefix = f"test_fixture_{self._testMethodName}"
+        for name, value in (("alpha", 1), ("beta", 1), ("gamma", 2)):
+            (self.start / f"{self.prefix}_{name}.py").write_text(
+                FIXTURE.format(name=name.title(), value=value), encoding="utf-8"
+            )
+        self.history = CostHistory(self.start / "costs.json")
+
+    def tearDown(self):
+        for name in [name for name in sys.modules if name.startswith(self.prefix)]:
+            del sys.modules[name]
+        if str(self.start) in sys.path:
+            sys.path.remove(str(self.start))
+        self._tmp.cleanup()
+
+    def test_plan_balances_files_and_splits_oversized_ones(self):
+        history = CostHistory()
+        history.record(
+            {"a.A.test_1": 4.0, "a.A.test_2": 4.0, "b.B.test_1": 1.0, "c.C.test_1": 2.0}
+        )
+        ids = ["a.A.test_1", "a.A.test_2", "b.B.test_1", "c.C.test_1", "d.D.test_new"]
+
+        shards = plan_shards(ids, history, 2)
+
+        # a costs 8 of 13.75, over the 6.875 fair share, so its tests are split;
+        # d has no history and is charged the mean of known tests (2.75).
+        self.assertEqual(
+            [shard.tests for shard in shards],
+            [["a.A.test_1", "d.D.test_new"], ["a.A.test_2", "b.B.test_1", "c.C.test_1"]],
+        )
+        self.assertEqual([shard.cost for shard in shards], [6.75, 7.0])
+        self.assertEqual(plan_shards(ids, history, 1)[0].tests, ids)
+        self.assertEqual(sorted(history.files()), ["a", "b", "c"])
+        with self.assertRaises(ValueError):
+            plan_shards(ids, history, 0)
+
+    def test_shards_cover_the_suite_once_and_merge_with_costs(self):
+        results = [
+            run_shard(self.start, index, 2, self.history, stream=io.StringIO()) for index in (0, 1)
+        ]
+
+        merged = merge_shard_results(results, self.history)
+
+        self.assertEqual(sorted(merged.outcomes), sorted(results[0]["suite"]))
+        self.assertEqual(len(merged.suite), 6)
+        self.assertEqual(merged.missing, [])
+        self.assertEqual(merged.duplicated, [])
+        self.assertEqual(
+            [failure["test"] for failure in merged.failures],
+            [f"{self.prefix}_gamma.GammaTests.test_two"],
+        )
+        self.assertFalse(merged.ok)
+        self.assertEqual(set(self.history.tests), set(merged.suite))
+
+        dropped = merge_shard_results(results[:1])
+        self.assertTrue(dropped.missing)
+        self.assertEqual(dropped.problems, ["expected shards 0..1, got [0]"])
+        doubled = merge_shard_results([results[0], {**results[1], "tests": results[0]["tests"]}])
+        self.assertEqual(sorted(doubled.duplicated), sorted(results[0]["tests"]))
+
+    def test_shard_and_merge_commands(self):
+        costs = self.start / "costs.json"
+        argv = ["test-shard", "--count", "2", "--start", str(self.start), "--costs", str(costs)]
+        codes = []
+        for index in (0, 1):
+            with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+                output = self.start / f"shard-{index}.json"
+                codes.append(main([*argv, "--index", str(index), "--output", str(output)]))
+        self.assertEqual(sorted(codes), [0, 1])
+
+        shard_files = [str(self.start / f"shard-{index}.json") for index in (0, 1)]
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(main(["merge-shards", *shard_files, "--costs", str(costs)]), 1)
+        self.assertIn("6 of 6 test(s) across 2 shard(s), 1 failure(s)", output.getvalue())
+        self.assertEqual(len(json.loads(costs.read_text(encoding="utf-8"))["tests"]), 6)
+
+        # An unexpanded glob when no shard uploaded results is a problem, not a traceback.
+        glob = str(self.start / "none" / "shard-*.json")
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(main(["merge-shards", glob, "--costs", str(costs)]), 1)
+        self.assertIn(f"problem: cannot read shard results {glob}: ", output.getvalue())
+        self.assertIn("problem: no shard results to merge", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+from pathlib import Path
+import tempfile
+import unittest
+
+from scaffold_validation import checks
+from scaffold_validation.benchmarks import stream_memory
+from scaffold_validation.cache import ValidationCache, suite_failures
+from scaffold_validation.corpus import Corpus, iter_lines, load_corpus
+from scaffold_validation.lsp import Workspace
+from scaffold_validation.parallel import validate_tree
+from scaffold_validation.stream import scan_failures
+from scaffold_validation.synthetic import write_log
+from scaffold_validation.watch import WatchSession
+
+
+SAMPLES = {
+    "empty.md": "",
+    "blank.md": "  \n\t\n",
+    "untitled.md": "\n  Notes first  \n",
+    "03-mixed.md": (
+        "# 02 — Wrong prefix\r\n\r\n"
+        "## Café ünïcode 🚀\r"
+        "See [up](#café-ünïcode-), [gone](#nope), [plan](plan.md#plan)"
+        " and [bad](plan.md#missing).\n"
+        '<a name="manual"></a> [manual](#manual) [x](missing.md)\n\n'
+        "```text\n[in code](nowhere.md)\n"
+    ),
+}
+
+
+class StreamingScanTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        (self.root / "plan.md").write_text("# Plan\n", encoding="utf-8")
+        for name, text in SAMPLES.items():
+            (self.root / name).write_bytes(text.encode("utf-8"))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_lines_and_failures_match_the_loaded_document_at_any_chunk_size(self):
+        corpus = Corpus(self.root)
+        for name in SAMPLES:
+            path = self.root / name
+            document = corpus.document(path)
+            expected = {check: run(corpus, document) for check, run in checks.TREE_CHECKS.items()}
+            for chunk_size in (1, 2, 3, 5, 4096):
+                with self.subTest(name=name, chunk_size=chunk_size):
+                    self.assertEqual(list(iter_lines(path, chunk_size)), document.lines)
+                    self.assertEqual(scan_failures(corpus, path, chunk_size), expected)
+
+        mixed = scan_failures(corpus, self.root / "03-mixed.md", 3)
+        self.assertEqual(len(mixed["anchors"]), 2)
+        self.assertEqual(len(mixed["links"]), 1)
+        self.assertEqual(len(mixed["fences"]), 1)
+        self.assertEqual(len(mixed["numbered-h1"]), 1)
+
+    def test_large_files_are_streamed_in_tree_runs(self):
+        log = self.root / "logs" / "implementation-log.md"
+        write_log(log, 64 * 1024)
+        (self.root / "index.md").write_text(
+            "# Index\n\n[Entry 3](logs/implementation-log.md#entry-3)\n"
+            "[Entry 0](logs/implementation-log.md#entry-0)\n",
+            encoding="utf-8",
+        )
+        self.addCleanup(load_corpus.cache_clear)
+        load_corpus.cache_clear()
+        loaded = validate_tree(self.root, jobs=1)
+
+        load_corpus.cache_clear()
+        corpus = load_corpus(self.root)
+        corpus.stream_threshold = 1024
+        streamed = validate_tree(self.root, jobs=1)
+
+        self.assertTrue(corpus.is_large(log))
+        self.assertLess(corpus.bytes_read, log.stat().st_size)
+        self.assertEqual(streamed, loaded)
+        self.assertEqual(
+            [failure for failure in streamed["anchors"] if failure.startswith("index.md")],
+            [
+                "index.md -> logs/implementation-log.md#entry-0 "
+                "(no heading anchor #entry-0 in logs/implementation-log.md)"
+            ],
+        )
+        self.assertTrue(
+            any(
+                failure.startswith("logs/implementation-log.md -> missing-note.md ")
+                for failure in streamed["links"]
+            )
+        )
+
+    def test_an_unclosed_bracket_paragraph_streams_like_a_loaded_one(self):
+        log = self.root / "logs" / "implementation-log.md"
+        write_log(log, 256 * 1024, "unclosed-bracket")
+        corpus = Corpus(self.root)
+        document = corpus.document(log)
+        expected = {check: run(corpus, document) for check, run in checks.TREE_CHECKS.items()}
+
+        self.assertEqual(scan_failures(corpus, log, 4096), expected)
+        self.assertEqual(len(expected["links"]), 1)
+        self.assertIn("missing-note.md", expected["links"][0])
+
+        rows = stream_memory([1], shapes=["unclosed-bracket"])
+        self.assertEqual([row["mode"] for row in rows], ["load", "stream"])
+        self.assertEqual({row["shape"] for row in rows}, {"unclosed-bracket"})
+
+    def test_cache_watch_and_lsp_stream_large_files(self):
+        log = self.root / "logs" / "implementation-log.md"
+        write_log(log, 64 * 1024)
+        (self.root / "index.md").write_text(
+            "# Index\n\n[Entry 0](logs/implementation-log.md#entry-0)\n", encoding="utf-8"
+        )
+        relative = "logs/implementation-log.md"
+
+        loaded = suite_failures(ValidationCache(Corpus(self.root)))
+        corpus = Corpus(self.root, stream_threshold=1024)
+        cache = ValidationCache(corpus)
+        self.assertEqual(suite_failures(cache), loaded)
+        self.assertEqual(suite_failures(cache), loaded)
+        self.assertLess(corpus.bytes_read, log.stat().st_size)
+
+        expected = WatchSession(self.root).start().failures
+        session = WatchSession(self.root)
+        session.corpus.stream_threshold = 1024
+        self.assertEqual(session.start().failures, expected)
+        self.assertIn(relative, session._incoming["logs/missing-note.md"])
+        self.assertLess(session.corpus.bytes_read, log.stat().st_size)
+
+        workspace = Workspace(self.root)
+        workspace.corpus.stream_threshold = 1024
+        workspace.start()
+        diagnostics = workspace.revalidate({relative, "index.md"})
+        self.assertIn(relative, workspace._incoming["logs/missing-note.md"])
+        self.assertLess(workspace.corpus.bytes_read, log.stat().st_size)
+        self.assertEqual(
+            sorted(d.message for found in diagnostics.values() for d in found),
+            sorted(
+                failure
+                for failure in expected
+                if failure.startswith((f"{relative} ", f"{relative}:", "index.md"))
+            ),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
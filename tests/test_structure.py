@@ -1,71 +1,32 @@
 from pathlib import Path
 import unittest
 
+from scaffold_validation.corpus import load_corpus
+from scaffold_validation.manifest import STRUCTURE_CHECK, load_manifest, run_checklist
+
 
 ROOT = Path(__file__).resolve().parents[1]
-SCAFFOLDS = [
-    "greenfield",
-    "repo-documentation",
-    "refactoring",
-    "feature-addition",
-    "bug-investigation",
-    "testing-retrofit",
-    "migration",
-    "incident-response",
-    "spike",
-]
-REQUIRED_NUMBERED_GUIDES = [
-    "00-philosophy.md",
-    "01-process-overview.md",
-    "02",
-    "03",
-    "04",
-    "05",
-    "06",
-    "07",
-    "08",
-]
+MANIFEST = load_manifest(ROOT)
 
 
 class ScaffoldStructureTests(unittest.TestCase):
-    def test_expected_scaffolds_exist(self):
-        for scaffold in SCAFFOLDS:
-            scaffold_path = ROOT / scaffold
-            self.assertTrue(
-                scaffold_path.is_dir(), f"Missing scaffold directory: {scaffold}"
-            )
-
-    def test_each_scaffold_has_required_top_level_files(self):
-        for scaffold in SCAFFOLDS:
-            scaffold_path = ROOT / scaffold
-            self.assertTrue(
-                (scaffold_path / "README.md").is_file(),
-                f"{scaffold} is missing README.md",
-            )
-            self.assertTrue(
-                (scaffold_path / "templates").is_dir(),
-                f"{scaffold} is missing templates/ directory",
-            )
-
-    def test_each_scaffold_has_numbered_guides_00_to_08(self):
-        for scaffold in SCAFFOLDS:
-            scaffold_path = ROOT / scaffold
-            files = {path.name for path in scaffold_path.glob("*.md")}
-
-            self.assertIn("00-philosophy.md", files, f"{scaffold}: missing 00 guide")
-            self.assertIn("01-process-overview.md", files, f"{scaffold}: missing 01 guide")
-
-            for prefix in REQUIRED_NUMBERED_GUIDES[2:]:
-                matched = any(name.startswith(f"{prefix}-") for name in files)
-                self.assertTrue(matched, f"{scaffold}: missing {prefix}-*.md")
-
-    def test_templates_have_agents_template(self):
-        for scaffold in SCAFFOLDS:
-            agents_template = ROOT / scaffold / "templates" / "AGENTS.md.template"
-            self.assertTrue(
-                agents_template.is_file(),
-                f"{scaffold}: missing templates/AGENTS.md.template",
+    def test_each_scaffold_ships_the_files_its_manifest_entry_requires(self):
+        corpus = load_corpus(ROOT)
+        for scaffold in MANIFEST.names:
+            structure = tuple(
+                requirement
+                for requirement in MANIFEST.checklist_for(scaffold)
+                if requirement.check == STRUCTURE_CHECK
             )
+            with self.subTest(scaffold=scaffold):
+                # The scaffold directory itself plus at least one file.
+                self.assertGreater(len(structure), 1)
+                failures = [
+                    failure
+                    for _, _, failures in run_checklist(corpus, structure)
+                    for failure in failures
+                ]
+                self.assertEqual(failures, [])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,77 @@
+from contextlib import redirect_stdout
+import io
+import json
+from pathlib import Path
+import tempfile
+import unittest
+
+from scaffold_validation.benchmarks import synthetic_throughput, validator_names
+from scaffold_validation.cli import main
+from scaffold_validation.parallel import validate_tree
+from scaffold_validation.synthetic import FAULTS, generate_tree, inject_faults
+
+
+class SyntheticCorpusTests(unittest.TestCase):
+    def test_clean_tree_passes_every_check(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            generate_tree(root, scaffolds=3, paragraphs=2)
+            report = validate_tree(root, jobs=1)
+        self.assertEqual({check: failures for check, failures in report.items() if failures}, {})
+
+    def test_each_injected_fault_is_reported_by_its_check(self):
+        counts = {"broken-link": 3, "missing-h1": 2, "unterminated-fence": 2, "broken-anchor": 1}
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            names = generate_tree(root, scaffolds=4, paragraphs=2)
+            injected = inject_faults(root, names, counts, seed=3)
+            report = validate_tree(root, jobs=1)
+
+        self.assertEqual(len({fault.relative for fault in injected}), sum(counts.values()))
+        for fault in injected:
+            reported = report[FAULTS[fault.kind]]
+            self.assertTrue(
+                any(failure.startswith(f"{fault.relative} ") for failure in reported), fault
+            )
+        for kind, check in FAULTS.items():
+            self.assertEqual(len(report[check]), counts[kind], check)
+
+    def test_injection_is_reproducible_and_validated(self):
+        samples = []
+        for _ in range(2):
+            with tempfile.TemporaryDirectory() as tmp:
+                names = generate_tree(Path(tmp), scaffolds=2, paragraphs=1)
+                samples.append(inject_faults(Path(tmp), names, {"missing-h1": 4}, seed=11))
+        self.assertEqual(samples[0], samples[1])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            names = generate_tree(Path(tmp), scaffolds=1, paragraphs=1)
+            with self.assertRaises(ValueError):
+                inject_faults(Path(tmp), names, {"typo": 1})
+            with self.assertRaises(ValueError):
+                inject_faults(Path(tmp), names, {"broken-link": 10})
+
+    def test_benchmark_reports_throughput_and_rss_per_validator(self):
+        rows = synthetic_throughput(
+            scaffolds=2, paragraphs=1, faults={"broken-link": 1}, isolate=False
+        )
+        self.assertEqual([row["validator"] for row in rows], validator_names())
+        links = next(row for row in rows if row["validator"] == "links")
+        self.assertEqual(links["failures"], 1)
+        self.assertEqual(links["files"], 2 * 10 + 1)
+        for row in rows:
+            self.assertGreater(row["files_per_second"], 0)
+            self.assertGreater(row["peak_rss_kib"], 0)
+
+        with redirect_stdout(io.StringIO()) as output:
+            main(["bench-validators", "--scaffolds", "1", "--validators", "h1", "--json"])
+        [row] = json.loads(output.getvalue())
+        self.assertEqual((row["validator"], row["files"]), ("h1", 11))
+
+        with tempfile.TemporaryDirectory() as tmp, redirect_stdout(io.StringIO()) as output:
+            main(["generate", tmp, "--scaffolds", "1", "--fault", "missing-h1=1"])
+        self.assertIn("16 file(s)", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 from pathlib import Path
 import unittest
 
+from scaffold_validation.corpus import load_corpus
+
 
 ROOT = Path(__file__).resolve().parents[1]
 
@@ -8,12 +10,13 @@ ROOT = Path(__file__).resolve().parents[1]
 class TemplateConsistencyTests(unittest.TestCase):
     def test_all_template_files_use_md_template_extension(self):
         failures: list[str] = []
+        corpus = load_corpus(ROOT)
 
-        for templates_dir in ROOT.glob("*/templates"):
-            if not templates_dir.is_dir():
+        for templates_dir in corpus.directories:
+            if templates_dir.name != "templates" or templates_dir.parent != ROOT:
                 continue
-            for path in templates_dir.iterdir():
-                if path.is_dir():
+            for path in corpus.children(templates_dir):
+                if corpus.is_dir(path):
                     failures.append(
                         f"{path.relative_to(ROOT).as_posix()} should be a file, not a directory"
                     )
@@ -29,10 +32,9 @@ class TemplateConsistencyTests(unittest.TestCase):
     def test_templates_are_not_empty(self):
         failures: list[str] = []
 
-        for template in ROOT.rglob("*.md.template"):
-            content = template.read_text(encoding="utf-8").strip()
-            if not content:
-                failures.append(f"{template.relative_to(ROOT).as_posix()} is empty")
+        for template in load_corpus(ROOT).templates():
+            if not template.text.strip():
+                failures.append(f"{template.relative} is empty")
 
         if failures:
             self.fail("\n".join(failures))
@@ -0,0 +1,138 @@
+from contextlib import redirect_stdout
+import io
+import random
+import time
+import unittest
+
+from scaffold_validation.benchmarks import LEGACY_LINK_PATTERN, tokenizer_stress
+from scaffold_validation.cli import main
+from scaffold_validation.tokenizer import (
+    ChecklistItem,
+    Fence,
+    Heading,
+    IndentedCode,
+    MAX_OPEN_LINK_TEXT,
+    Link,
+    Placeholder,
+    TableRow,
+    scan_links,
+    tokenize,
+)
+
+
+SAMPLE = """# Title #
+
+~~~markdown
+```json
+[inside](tilde.md)
+```
+~~~
+
+````text
+```
+[still inside](nested.md)
+```
+````
+
+Paragraph with [a link](a.md).
+
+    [indented code](code.md) {not_a_prose_placeholder}
+
+- item
+    [list continuation](list.md)
+
+- [ ] open task for {owner}
+- [x] done task
+
+| File | Purpose |
+|------|---------|
+| [README.md](README.md) | index |
+
+```
+unterminated [hidden](hidden.md)
+"""
+
+
+def kinds(tokens, kind):
+    return [token for token in tokens if isinstance(token, kind)]
+
+
+class TokenizerTests(unittest.TestCase):
+    def test_tokenizer_emits_each_token_kind(self):
+        tokens = list(tokenize(SAMPLE.splitlines()))
+
+        self.assertEqual(kinds(tokens, Heading), [Heading(1, "Title", 1)])
+        self.assertEqual(
+            [(f.start, f.end, f.marker) for f in kinds(tokens, Fence)],
+            [(3, 7, "~~~"), (9, 13, "````"), (29, None, "```")],
+        )
+        self.assertEqual(kinds(tokens, IndentedCode), [IndentedCode(17, 17)])
+        self.assertEqual(
+            [link.target for link in kinds(tokens, Link)],
+            ["a.md", "list.md", "README.md"],
+        )
+        self.assertEqual(
+            [(item.checked, item.text) for item in kinds(tokens, ChecklistItem)],
+            [(False, "open task for {owner}"), (True, "done task")],
+        )
+        self.assertEqual(
+            [(p.name, p.in_code) for p in kinds(tokens, Placeholder)],
+            [("{not_a_prose_placeholder}", True), ("{owner}", False)],
+        )
+        self.assertEqual(
+            [row.cells for row in kinds(tokens, TableRow)][-1], ("[README.md](README.md)", "index")
+        )
+
+    def test_scan_links_matches_legacy_pattern_on_single_lines(self):
+        alphabet = "[]()ab# "
+        generator = random.Random(7)
+        for _ in range(2000):
+            line = "".join(generator.choice(alphabet) for _ in range(generator.randint(0, 24)))
+            self.assertEqual(
+                [link.target for link in scan_links(line, 1)],
+                LEGACY_LINK_PATTERN.findall(line),
+                line,
+            )
+
+    def test_link_text_wraps_within_a_paragraph(self):
+        text = (
+            "See [the wrapped\nlink text](a.md) and [b](b.md) [open\nstill open\n"
+            "closed](c.md).\n\n[broken by\n\na blank line](d.md)\n# [heading\n[e](e.md)\n"
+        )
+        links = kinds(tokenize(text.splitlines()), Link)
+        self.assertEqual(
+            links,
+            [
+                Link("the wrapped\nlink text", "a.md", 1),
+                Link("b", "b.md", 2),
+                Link("open\nstill open\nclosed", "c.md", 2),
+                Link("e", "e.md", 10),
+            ],
+        )
+
+    def test_unclosed_link_text_is_dropped_past_the_carry_limit(self):
+        filler = "pasted output line\n" * (MAX_OPEN_LINK_TEXT // 19 + 10)
+        lines = ("Log [truncated\n" + filler + "[x](x.md)\n").splitlines()
+
+        links = kinds(tokenize(lines), Link)
+
+        self.assertEqual(links, [Link("x", "x.md", len(lines))])
+
+    def test_pathological_inputs_stay_linear(self):
+        texts = ("[" * 200_000, "[a](" * 50_000, "[\n" * 100_000, "```\n" + "`` [x](y\n" * 20_000)
+        for text in texts:
+            started = time.perf_counter()
+            list(tokenize(text.splitlines()))
+            self.assertLess(time.perf_counter() - started, 2.0)
+
+    def test_stress_benchmark_reports_every_shape(self):
+        rows = tokenizer_stress([200])
+        self.assertEqual(len({row["shape"] for row in rows}), len(rows))
+        self.assertTrue(all("legacy_seconds" in row for row in rows))
+        with redirect_stdout(io.StringIO()) as output:
+            main(["bench-tokenizer", "--sizes", "100", "--skip-legacy"])
+        self.assertIn("open-brackets", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
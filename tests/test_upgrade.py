@@ -0,0 +1,146 @@
+from contextlib import redirect_stdout
+import io
+from pathlib import Path
+import tempfile
+import unittest
+
+from helpers import write
+from scaffold_validation.cli import main
+from scaffold_validation.corpus import Corpus, load_corpus
+from scaffold_validation.render import TemplateEngine, read_manifest
+from scaffold_validation.upgrade import (
+    CONFLICT_LOCAL,
+    merge3,
+    upgrade_project,
+    upgrade_projects,
+)
+
+
+AGENTS_V1 = """# AGENTS.md — {PROJECT_NAME}
+
+## Mission
+
+{MISSION}
+
+## Rules
+
+- Keep changes small.
+"""
+
+AGENTS_V2 = """# AGENTS.md — {PROJECT_NAME}
+
+## Mission
+
+{MISSION}
+
+## Rules
+
+- Keep changes small.
+- Record evidence for every decision.
+
+## Escalation
+
+Stop and ask when a gate fails.
+"""
+
+
+class MergeTests(unittest.TestCase):
+    def test_non_overlapping_edits_from_both_sides_are_combined(self):
+        base = "a\nb\nc\nd\ne\n"
+        local = "a\nB-local\nc\nd\ne\n"
+        theirs = "a\nb\nc\nd\nE-template\nf\n"
+        self.assertEqual(merge3(base, local, theirs), ("a\nB-local\nc\nd\nE-template\nf\n", 0))
+        self.assertEqual(merge3(base, theirs, theirs), (theirs, 0))
+        self.assertEqual(merge3(base, base, theirs), (theirs, 0))
+
+    def test_overlapping_edits_produce_one_conflict_block(self):
+        merged, conflicts = merge3("a\nb\nc\n", "a\nlocal\nc\n", "a\ntemplate\nc\n")
+        self.assertEqual(conflicts, 1)
+        self.assertEqual(
+            merged,
+            "a\n<<<<<<< local\nlocal\n=======\ntemplate\n>>>>>>> template\nc\n",
+        )
+        _, conflicts = merge3("a\nb\n", "a\nx\nb\n", "a\ny\nb\n")
+        self.assertEqual(conflicts, 1)
+
+
+class UpgradeTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        base = Path(self._tmp.name)
+        self.root = base / "scaffolds"
+        self.projects = base / "projects"
+        write(self.root / "demo" / "README.md", "# Demo\n")
+        write(self.root / "demo" / "templates" / "AGENTS.md.template", AGENTS_V1)
+        write(self.root / "demo" / "templates" / "log.md.template", "# Log — {PROJECT_NAME}\n")
+        engine = TemplateEngine(Corpus(self.root))
+        for name in ("alpha", "beta", "gamma"):
+            variables = {"PROJECT_NAME": name, "MISSION": f"Ship {name}."}
+            engine.render_scaffold("demo", variables, self.projects / name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_upgrade_merges_template_changes_and_keeps_local_edits(self):
+        agents_beta = self.projects / "beta" / "AGENTS.md"
+        write(agents_beta, agents_beta.read_text(encoding="utf-8").replace("Ship beta.", "Ship beta v2."))
+        agents_gamma = self.projects / "gamma" / "AGENTS.md"
+        write(
+            agents_gamma,
+            agents_gamma.read_text(encoding="utf-8").replace(
+                "- Keep changes small.\n", "- Keep changes small.\n- Never force-push.\n"
+            ),
+        )
+        write(self.root / "demo" / "templates" / "AGENTS.md.template", AGENTS_V2)
+        write(self.root / "demo" / "templates" / "plan.md.template", "# Plan — {PROJECT_NAME}\n")
+
+        results = {Path(r.project).name: r for r in upgrade_projects(self.root, self.projects, jobs=2)}
+
+        self.assertEqual(
+            results["alpha"].outcomes,
+            {"AGENTS.md": "updated", "log.md": "unchanged", "plan.md": "added"},
+        )
+        self.assertEqual(results["beta"].outcomes["AGENTS.md"], "merged")
+        self.assertEqual(results["gamma"].outcomes["AGENTS.md"], "conflict")
+
+        beta = agents_beta.read_text(encoding="utf-8")
+        self.assertIn("Ship beta v2.", beta)
+        self.assertIn("## Escalation", beta)
+        self.assertIn(CONFLICT_LOCAL, agents_gamma.read_text(encoding="utf-8"))
+        self.assertEqual((self.projects / "alpha" / "plan.md").read_text(encoding="utf-8"), "# Plan — alpha\n")
+        self.assertIn("plan.md", read_manifest(self.projects / "alpha")["files"])
+
+        again = upgrade_projects(self.root, self.projects, jobs=1)
+        self.assertTrue(all(set(r.outcomes.values()) == {"unchanged"} for r in again))
+
+    def test_one_engine_compiles_each_template_once_across_projects(self):
+        shared = load_corpus(self.root)
+        shared.document(self.root / "demo" / "templates" / "AGENTS.md.template")
+        write(self.root / "demo" / "templates" / "AGENTS.md.template", AGENTS_V2)
+
+        engine = TemplateEngine(Corpus(self.root))
+        for name in ("alpha", "beta", "gamma"):
+            upgrade_project(self.root, self.projects / name, engine=engine)
+        upgrade_projects(self.root, self.projects, jobs=1)
+
+        self.assertEqual(engine.compilations, 1)
+        # The process-wide corpus other callers share is left alone.
+        self.assertIs(load_corpus(self.root), shared)
+
+    def test_upgrade_command_dry_run_writes_nothing(self):
+        write(self.root / "demo" / "templates" / "log.md.template", "# Log — {PROJECT_NAME}\n\nNew.\n")
+        before = (self.projects / "alpha" / "log.md").read_text(encoding="utf-8")
+        argv = ["--root", str(self.root), "upgrade", str(self.projects), "--jobs", "1"]
+
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(main([*argv, "--dry-run"]), 0)
+        self.assertIn("would upgrade 3 project(s): 3 unchanged, 3 updated", output.getvalue())
+        self.assertEqual((self.projects / "alpha" / "log.md").read_text(encoding="utf-8"), before)
+
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(main(argv), 0)
+        self.assertIn("New.", (self.projects / "alpha" / "log.md").read_text(encoding="utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
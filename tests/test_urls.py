@@ -0,0 +1,154 @@
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
+from pathlib import Path
+import tempfile
+import threading
+import time
+import unittest
+
+from scaffold_validation.cli import main
+from scaffold_validation.urls import UrlCache, request_target, check_urls
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def respond(self, status, body=b"", headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command == "GET":
+            self.wfile.write(body)
+
+    def handle_request(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.command, self.path))
+            server.clients.add(self.client_address)
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            hits = sum(1 for _, path in server.requests if path == self.path)
+        try:
+            if self.path.startswith("/slow"):
+                time.sleep(0.05)
+                self.respond(200)
+            elif self.path == "/ok":
+                self.respond(200, b"hello")
+            elif self.path == "/get-only":
+                self.respond(405 if self.command == "HEAD" else 200, b"body" * 100)
+            elif self.path == "/flaky":
+                self.respond(503 if hits == 1 else 200, headers=[("Retry-After", "0")])
+            elif self.path == "/caf%C3%A9?q=%C3%BC%20x":
+                self.respond(200)
+            elif self.path == "/moved":
+                self.respond(301, headers=[("Location", "/ok")])
+            else:
+                self.respond(404, b"missing")
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    do_HEAD = handle_request
+    do_GET = handle_request
+
+
+class UrlCheckTests(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.clients = set()
+        self.server.active = 0
+        self.server.peak = 0
+        threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_statuses_fallback_retry_and_redirects(self):
+        urls = [f"{self.base}/{path}" for path in ("ok", "get-only", "flaky", "moved", "gone")]
+
+        report = check_urls(urls, per_host=1, backoff=0.01)
+
+        results = {result.url.rsplit("/", 1)[1]: result for result in report.results}
+        self.assertEqual([result.ok for result in report.results], [True, True, True, True, False])
+        self.assertEqual(results["get-only"].method, "GET")
+        self.assertEqual(results["flaky"].attempts, 2)
+        self.assertEqual(results["moved"].final_url, f"{self.base}/ok")
+        self.assertEqual(results["gone"].status, 404)
+        self.assertEqual(report.requests, len(self.server.requests))
+        # One host, one request at a time: every request after the first reuses a connection.
+        self.assertEqual(report.connections, 1)
+        self.assertEqual(len(self.server.clients), 1)
+
+        unreachable = check_urls(["http://127.0.0.1:9/"], retries=1, backoff=0.01, timeout=1)
+        self.assertEqual(unreachable.results[0].status, 0)
+        self.assertEqual(unreachable.results[0].attempts, 2)
+        self.assertTrue(unreachable.results[0].error)
+
+    def test_non_ascii_urls_are_encoded_on_the_wire(self):
+        report = check_urls([f"{self.base}/café?q=ü x", f"{self.base}/caf%C3%A9?q=%C3%BC%20x"])
+
+        self.assertTrue(all(result.ok for result in report.results), report.results)
+        self.assertEqual(
+            request_target("https://bücher.example:8443/ä/b?x=1"),
+            ("/%C3%A4/b?x=1", "xn--bcher-kva.example:8443"),
+        )
+
+    def test_per_host_limit_bounds_in_flight_requests(self):
+        urls = [f"{self.base}/slow/{number}" for number in range(12)]
+
+        report = check_urls(urls, per_host=3)
+
+        self.assertEqual(len(report.results), 12)
+        self.assertTrue(all(result.ok for result in report.results))
+        self.assertLessEqual(self.server.peak, 3)
+        self.assertLessEqual(report.connections, 3)
+
+    def test_cache_skips_fresh_results_and_rechecks_expired_ones(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "urls.json"
+            now = [1000.0]
+            clock = lambda: now[0]
+            urls = [f"{self.base}/ok", f"{self.base}/gone"]
+            check_urls(urls, UrlCache(path, ttl=100, error_ttl=10, clock=clock))
+            first = len(self.server.requests)
+
+            again = check_urls(urls, UrlCache(path, ttl=100, error_ttl=10, clock=clock))
+            self.assertEqual(again.requests, 0)
+            self.assertEqual(again.cache_hits, 2)
+            self.assertTrue(all(result.cached for result in again.results))
+            self.assertFalse(again.results[1].ok)
+
+            now[0] += 50
+            later = check_urls(urls, UrlCache(path, ttl=100, error_ttl=10, clock=clock))
+            self.assertEqual(later.cache_hits, 1)
+            self.assertEqual(self.server.requests[first:], [("HEAD", "/gone"), ("GET", "/gone")])
+
+    def test_urls_command_reports_broken_links_with_locations(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "guide.md").write_text(
+                f"# Guide\n\n[ok]({self.base}/ok#intro) and [dead]({self.base}/gone)\n",
+                encoding="utf-8",
+            )
+            with redirect_stdout(io.StringIO()) as output:
+                self.assertEqual(main(["--root", str(root), "urls", "--no-cache"]), 1)
+            self.assertIn(f"- {self.base}/gone (HTTP 404, 1 attempt(s))", output.getvalue())
+            self.assertIn("linked from guide.md:3", output.getvalue())
+            self.assertIn("2 URL(s), 1 broken", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
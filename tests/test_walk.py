@@ -0,0 +1,94 @@
+from pathlib import Path
+import tempfile
+import unittest
+
+from helpers import write
+from scaffold_validation.cache import ValidationCache, link_failures
+from scaffold_validation.corpus import Corpus
+from scaffold_validation.walk import (
+    StatCache,
+    load_ignore_rules,
+    parse_ignore_rules,
+    walk_tree,
+)
+
+
+class TraversalTests(unittest.TestCase):
+    def test_ignored_directories_are_never_entered(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            write(root / "guide.md")
+            write(root / "docs" / "notes.md")
+            for index in range(200):
+                write(root / ".git" / "objects" / f"{index:02x}" / "blob.md")
+            write(root / "tests" / "fixture.md")
+
+            tree = walk_tree(root, load_ignore_rules(root))
+
+            self.assertEqual(tree.directories_scanned, 2)
+            self.assertEqual(
+                [path.relative_to(root).as_posix() for path in tree.files],
+                ["docs/notes.md", "guide.md"],
+            )
+
+    def test_ignore_config_supports_names_paths_and_file_globs(self):
+        rules = parse_ignore_rules(["# comment", "", "drafts/", "*.tmp", "meta/private/"])
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            relatives = ["a.md", "a.tmp", "drafts/x.md", "x/drafts/y.md"]
+            relatives += ["meta/private/z.md", "other/private/z.md"]
+            for relative in relatives:
+                write(root / relative)
+            write(root / "drafts.md")
+
+            files = {path.relative_to(root).as_posix() for path in walk_tree(root, rules).files}
+
+        self.assertEqual(files, {"a.md", "drafts.md", "other/private/z.md"})
+
+    def test_config_file_replaces_the_defaults(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            write(root / ".validationignore", "build/\n")
+            write(root / "tests" / "kept.md")
+            write(root / "build" / "gone.md")
+
+            corpus = Corpus(root)
+            relatives = {corpus.relative(path) for path in corpus.files}
+
+        self.assertEqual(relatives, {".validationignore", "tests/kept.md"})
+
+    def test_stat_cache_answers_walked_paths_and_stats_misses_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            write(root / "README.md")
+            write(root / ".git" / "HEAD", "ref\n")
+            stats = StatCache(walk_tree(root, load_ignore_rules(root)))
+
+            self.assertTrue(stats.is_file(root / "README.md"))
+            self.assertTrue(stats.is_dir(root))
+            self.assertEqual(stats.stat_calls, 0)
+
+            for _ in range(3):
+                self.assertFalse(stats.exists(root / "missing.md"))
+                self.assertTrue(stats.is_file(root / ".git" / "HEAD"))
+            self.assertEqual(stats.stat_calls, 2)
+
+    def test_link_resolution_shares_one_stat_per_target(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            write(root / "README.md")
+            for index in range(50):
+                write(
+                    root / f"guide-{index}.md",
+                    "# Guide\n\n[home](README.md) [gone](missing.md) [up](../outside.md)\n",
+                )
+
+            cache = ValidationCache(Corpus(root), None)
+            failures = link_failures(cache, cache.corpus.markdown_paths())
+
+        self.assertEqual(len(failures), 100)
+        self.assertEqual(cache.corpus.stat_calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
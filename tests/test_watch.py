@@ -0,0 +1,190 @@
+from pathlib import Path
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+from helpers import write
+from scaffold_validation.synthetic import generate_tree
+from scaffold_validation.walk import load_ignore_rules
+from scaffold_validation.watch import (
+    InotifyWatcher,
+    PollingWatcher,
+    WatchSession,
+    format_revalidation,
+    watch,
+)
+
+
+class ScriptedWatcher:
+    """Replays edits as change batches, as a real watcher would report them."""
+
+    def __init__(self, root: Path, edits):
+        self.root = root
+        self.edits = list(edits)
+        self.closed = False
+
+    def changes(self, timeout: float) -> set[str]:
+        if not self.edits:
+            raise KeyboardInterrupt
+        return self.edits.pop(0)(self.root)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class WatchSessionTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.names = generate_tree(self.root, scaffolds=3, paragraphs=2)
+        self.session = WatchSession(self.root)
+        self.initial = self.session.start()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_edit_rereads_only_the_changed_file(self):
+        self.assertEqual(self.initial.total_failures, 0)
+        guide = f"{self.names[1]}/03-planning-guide.md"
+        reads = self.session.corpus.files_read
+        write(self.root / guide, "no heading\n\nSee [gone](gone.md).\n")
+
+        result = self.session.apply({guide})
+
+        self.assertEqual(self.session.corpus.files_read - reads, 1)
+        self.assertIn(guide, result.revalidated)
+        self.assertEqual(len(result.failures), 3)
+        self.assertEqual(result.total_failures, 3)
+        self.assertLess(result.seconds, 0.1)
+
+        write(self.root / guide, "# 03 — Planning Guide\n")
+        self.assertEqual(self.session.apply({guide}).total_failures, 0)
+
+    def test_deleting_a_target_revalidates_files_linking_to_it(self):
+        scaffold = self.names[0]
+        target = f"{scaffold}/04-phased-guide.md"
+        (self.root / target).unlink()
+
+        result = self.session.apply({target})
+
+        linking = {failure.split(" -> ")[0] for failure in result.failures if " -> " in failure}
+        self.assertIn(f"{scaffold}/README.md", result.revalidated)
+        self.assertIn(f"{scaffold}/03-planning-guide.md", linking)
+        self.assertNotIn(target, self.session._outgoing)
+        self.assertIn(
+            f"{scaffold}/README.md broken table link: 04-phased-guide.md", result.failures
+        )
+
+        write(self.root / target, "# 04 — Phased Guide\n")
+        self.assertEqual(self.session.apply({target}).total_failures, 0)
+
+    def test_renamed_directory_drops_its_results_and_rechecks_links_into_it(self):
+        write(self.root / "notes" / "draft.md", "no heading\n")
+        write(self.root / "README.md", "# Root\n\n[draft](notes/draft.md)\n")
+        self.assertEqual(self.session.apply({"README.md", "notes/draft.md"}).total_failures, 1)
+
+        (self.root / "notes").rename(self.root / "archive")
+        result = self.session.apply({"notes", "archive", "archive/draft.md"})
+
+        self.assertIn("README.md", result.revalidated)
+        self.assertNotIn(("h1", "notes/draft.md"), self.session._results)
+        self.assertNotIn("notes/draft.md", self.session._outgoing)
+        self.assertTrue(
+            any(failure.startswith("README.md -> notes/draft.md") for failure in result.failures)
+        )
+        # The broken link and the moved draft's missing H1.
+        self.assertEqual(result.total_failures, 2)
+
+    def test_scaffolds_run_their_manifest_checklist(self):
+        scaffold = self.names[0]
+        write(
+            self.root / "scaffolds.toml",
+            f'[scaffolds.{scaffold}]\nguides = ["README.md", "09-missing.md"]\n'
+            'contracts = ["readme-operator-sections"]\n',
+        )
+        result = self.session.apply({"scaffolds.toml"})
+        self.assertEqual(result.failures, [f"{scaffold}: missing 09-missing.md"])
+
+        # readme-index would flag the new guide, but the manifest does not list it.
+        write(self.root / scaffold / "09-missing.md", "# 09 — Late\n")
+        result = self.session.apply({f"{scaffold}/09-missing.md"})
+        self.assertEqual((result.failures, result.total_failures), ([], 0))
+
+    def test_watch_loop_reports_each_batch_and_closes_the_watcher(self):
+        def break_h1(root):
+            write(root / "README.md", "plain\n")
+            return {"README.md"}
+
+        reports = []
+        watcher = ScriptedWatcher(self.root, [break_h1])
+        watch(self.root, reports.append, watcher)
+
+        self.assertTrue(watcher.closed)
+        self.assertEqual(len(reports), 2)
+        lines = list(format_revalidation(reports[1]))
+        self.assertTrue(lines[0].startswith("1 change(s): revalidated 1 file(s)"))
+        self.assertEqual(lines[-1], "1 failure(s) in tree")
+
+
+class WatcherTests(unittest.TestCase):
+    def exercise(self, make):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            write(root / "guide.md", "# Guide\n")
+            write(root / ".git" / "HEAD", "ref\n")
+            watcher = make(root)
+            try:
+                self.assertEqual(watcher.changes(0.05), set())
+                time.sleep(0.01)
+                write(root / "guide.md", "# Guide, edited\n")
+                write(root / ".git" / "HEAD", "other\n")
+                write(root / "new" / "page.md", "# Page\n")
+                changed = set()
+                deadline = time.monotonic() + 5
+                while not {"guide.md", "new/page.md"} <= changed and time.monotonic() < deadline:
+                    changed |= watcher.changes(0.5)
+            finally:
+                watcher.close()
+        self.assertTrue({"guide.md", "new/page.md"} <= changed, changed)
+        self.assertFalse(any(path.startswith(".git") for path in changed))
+
+    def test_polling_watcher_detects_edits_and_new_files(self):
+        self.exercise(lambda root: PollingWatcher(root, load_ignore_rules(root), interval=0.01))
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_inotify_watcher_detects_edits_and_new_directories(self):
+        self.exercise(lambda root: InotifyWatcher(root, load_ignore_rules(root)))
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_inotify_watcher_drops_watches_of_moved_and_deleted_directories(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            write(root / "old" / "inner" / "page.md", "# Page\n")
+            write(root / "gone" / "page.md", "# Page\n")
+            watcher = InotifyWatcher(root, load_ignore_rules(root))
+            try:
+                (root / "old").rename(root / "new")
+                shutil.rmtree(root / "gone")
+                deadline = time.monotonic() + 5
+                while time.monotonic() < deadline:
+                    watcher.changes(0.2)
+                    if sorted(watcher._directories.values()) == ["", "new/", "new/inner/"]:
+                        break
+                self.assertEqual(
+                    sorted(watcher._directories.values()), ["", "new/", "new/inner/"]
+                )
+
+                write(root / "new" / "inner" / "later.md", "# Later\n")
+                changed = set()
+                while "new/inner/later.md" not in changed and time.monotonic() < deadline:
+                    changed |= watcher.changes(0.5)
+            finally:
+                watcher.close()
+        self.assertIn("new/inner/later.md", changed)
+        self.assertFalse(any(path.startswith("old/") for path in changed))
+
+
+if __name__ == "__main__":
+    unittest.main()